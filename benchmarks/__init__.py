@@ -0,0 +1,4 @@
+"""chart_maker / music_metrics_collector 성능 벤치마크 스크립트 모음.
+
+각 모듈은 `python -m benchmarks.<모듈명>` 으로 실행한다.
+"""
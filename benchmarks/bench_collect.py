@@ -0,0 +1,262 @@
+"""수집 파이프라인 end-to-end 벤치마크 (로컬 GENIE 대역 서버 사용).
+
+`collect_metrics`(곡 상세 수집 → JSONL 기록)와 `generate_song_ids`(검색 → song_data.csv)를
+곡 수별로 실제 HTTP 요청까지 포함해 실행하고 처리량, 요청 지연 p50/p99, 최대 RSS를 잰다.
+서버(benchmarks.genie_server)와 각 측정은 별도 프로세스에서 돌려 서로의 GIL/메모리가 섞이지 않게 한다.
+
+    python -m benchmarks.bench_collect --sizes 1000 10000
+    python -m benchmarks.bench_collect --sizes 1000 --workloads collect --latency-ms 50 --jitter-ms 20 --rate-limit 0.01
+    python -m benchmarks.bench_collect --sizes 1000 10000 100000 --output benchmarks/results/collect.json
+    python -m benchmarks.bench_collect --sizes 10000 --workloads collect --passes 2 --static-rate 0.8 --etag
+
+성능 관련 변경은 같은 옵션으로 변경 전/후를 측정해 비교한다. (100,000곡은 지연 0ms에서도 수 분 걸림)
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+from . import genie_server
+
+WORKLOADS = ("collect", "generate")
+
+_SEARCH_FIELDS = [
+    "platform_seq", "platform_name", "song_type_text", "album_cd", "album_name_kor",
+    "song_cd", "song_name_kor", "artist_cd", "artist_name_kor", "track_cd", "isrc_cd", "interest_yn",
+]
+
+
+def _peak_rss_mb() -> float:
+    import resource
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux는 KB, macOS는 바이트
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def _record_fetch_latency(latencies: List[float]) -> None:
+    """HTTP 요청(Fetcher._fetch_requests)마다 소요 시간을 latencies에 남긴다. (측정용, 동작은 그대로)"""
+    from music_metrics_collector.fetcher import Fetcher
+
+    fetch_requests = Fetcher._fetch_requests
+
+    def timed_fetch_requests(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return fetch_requests(self, *args, **kwargs)
+        finally:
+            latencies.append(time.perf_counter() - start)
+
+    Fetcher._fetch_requests = timed_fetch_requests
+
+
+def _run_collect(size: int, base_url: str, workdir: Path) -> Dict:
+    from music_metrics_collector import main as collector_main
+
+    config = {
+        "enabled_platforms": ["GENIE"],
+        "mode": "requests",
+        "http": {"base_url": base_url, "timeout_sec": 20},
+        "log": {"base_dir": str(workdir / "logs")},
+        "state": {"dir": str(workdir / "state")},
+        "metrics": {"prometheus_file": ""},
+    }
+    targets = [
+        {
+            "platform": "GENIE",
+            "song_id": genie_server.song_id(i),
+            "song_data": {"track_cd": f"T{i:08d}", "isrc_cd": f"KRBEN{i:07d}", "interest_yn": "N"},
+        }
+        for i in range(size)
+    ]
+    stats = collector_main.collect_metrics(config, targets=targets)
+    return {"success": stats["success"], "failed": stats["failed"], **stats.get("page_cache", {})}
+
+
+def _run_generate(size: int, base_url: str, workdir: Path) -> Dict:
+    import yaml
+
+    from music_metrics_collector.generate_song_ids import generate_song_ids
+
+    resource_dir = workdir / "resource"
+    (resource_dir / "GENIE").mkdir(parents=True)
+    with open(resource_dir / "GENIE" / "search_data.csv", "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=_SEARCH_FIELDS)
+        writer.writeheader()
+        for i in range(size):
+            writer.writerow({
+                "platform_seq": "1",
+                "platform_name": "GENIE",
+                "song_type_text": "타이틀",
+                "album_cd": f"A{i // 10:07d}",
+                "album_name_kor": genie_server.album_name(i),
+                "song_cd": f"S{i:08d}",
+                "song_name_kor": genie_server.song_name(i),
+                "artist_cd": f"R{i % 997:05d}",
+                "artist_name_kor": genie_server.artist_name(i),
+                "track_cd": f"T{i:08d}",
+                "isrc_cd": f"KRBEN{i:07d}",
+                "interest_yn": "N",
+            })
+
+    config_path = workdir / "config.yaml"
+    config_path.write_text(yaml.safe_dump({
+        "enabled_platforms": ["GENIE"],
+        "resource_dir": str(resource_dir),
+        "platforms": {"GENIE": {}},
+        "http": {"base_url": base_url, "timeout_sec": 20},
+    }, allow_unicode=True), encoding="utf-8")
+    generate_song_ids(str(config_path))
+
+    with open(resource_dir / "GENIE" / "song_data.csv", encoding="utf-8-sig") as f:
+        found = sum(1 for _ in csv.DictReader(f))
+    return {"success": found, "failed": size - found}
+
+
+def run_one(workload: str, size: int, base_url: str, passes: int = 1) -> Dict:
+    """현재 프로세스에서 측정 한 건을 실행한다. (자식 프로세스 진입점)
+
+    passes가 2 이상이면 같은 작업 디렉토리(상태 파일 포함)에서 반복 실행하고 마지막 실행만 잰다.
+    (페이지 캐시가 찬 상태의 시간별 수집)
+    """
+    latencies: List[float] = []
+    _record_fetch_latency(latencies)
+    with tempfile.TemporaryDirectory(prefix=f"bench_{workload}_") as tmp:
+        workdir = Path(tmp)
+        # collect_metrics는 ~/project/crawler-share 에도 기록하므로 HOME을 임시 디렉토리로 돌린다.
+        os.environ["HOME"] = str(workdir)
+        runner = _run_collect if workload == "collect" else _run_generate
+        for _ in range(passes - 1):
+            runner(size, base_url, workdir)
+        latencies.clear()
+        start = time.perf_counter()
+        outcome = runner(size, base_url, workdir)
+        elapsed = time.perf_counter() - start
+    return {
+        "workload": workload,
+        "tracks": size,
+        "elapsed_sec": round(elapsed, 3),
+        "tracks_per_sec": round(size / elapsed, 2) if elapsed else None,
+        "requests": len(latencies),
+        "p50_ms": round(_percentile(latencies, 0.50) * 1000, 2),
+        "p99_ms": round(_percentile(latencies, 0.99) * 1000, 2),
+        "peak_rss_mb": round(_peak_rss_mb(), 1),
+        **outcome,
+    }
+
+
+def _start_server(args) -> tuple:
+    cmd = [
+        sys.executable, "-m", "benchmarks.genie_server", "--port", "0",
+        "--latency-ms", str(args.latency_ms), "--jitter-ms", str(args.jitter_ms),
+        "--error-rate", str(args.error_rate), "--rate-limit", str(args.rate_limit),
+        "--catalog", str(max(args.sizes)), "--static-rate", str(args.static_rate),
+    ]
+    if args.etag:
+        cmd.append("--etag")
+    if args.seed is not None:
+        cmd += ["--seed", str(args.seed)]
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, text=True)
+    line = proc.stdout.readline().strip()
+    if not line.startswith("listening on "):
+        proc.kill()
+        raise RuntimeError(f"GENIE 대역 서버를 시작하지 못했습니다: {line!r}")
+    return proc, line[len("listening on "):]
+
+
+def _format_row(result: Dict) -> str:
+    row = (
+        f"{result['workload']:<9} {result['tracks']:>8,} {result['elapsed_sec']:>9.1f}s "
+        f"{result['tracks_per_sec']:>9.1f}/s {result['p50_ms']:>8.1f} {result['p99_ms']:>8.1f} "
+        f"{result['peak_rss_mb']:>8.1f} {result['success']:>8,} {result['failed']:>7,}"
+    )
+    if "parsed" in result:
+        row += f"  (304 {result['not_modified']:,} / 재사용 {result['reused']:,} / 파싱 {result['parsed']:,})"
+    return row
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="수집 파이프라인 end-to-end 벤치마크")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000],
+                        help="곡 수 (기본: 1000 10000 100000)")
+    parser.add_argument("--workloads", nargs="+", choices=WORKLOADS, default=list(WORKLOADS))
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="서버 응답 지연 (ms)")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="서버 지연 지터 (ms)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="503 응답 비율")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="429 응답 비율")
+    parser.add_argument("--seed", type=int, default=0, help="서버 난수 시드 (기본: 0)")
+    parser.add_argument("--static-rate", type=float, default=0.0, help="재생수가 변하지 않는 곡 비율 (0~1)")
+    parser.add_argument("--etag", action="store_true", help="서버가 ETag/304 조건부 응답을 지원")
+    parser.add_argument("--passes", type=int, default=1,
+                        help="같은 상태 디렉토리로 반복 실행하고 마지막 실행만 측정 (기본: 1)")
+    parser.add_argument("--output", type=Path, default=None, help="결과를 JSON 파일로 저장")
+    parser.add_argument("--log-level", default="WARNING", help="측정 중 로그 레벨 (기본: WARNING)")
+    parser.add_argument("--child", nargs=3, metavar=("WORKLOAD", "SIZE", "BASE_URL"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        # 수집기 모듈이 import 시 basicConfig를 호출하므로 그 뒤에 레벨을 낮춘다.
+        from music_metrics_collector import utils  # noqa: F401
+
+        logging.getLogger().setLevel(args.log_level)
+        workload, size, base_url = args.child
+        print(json.dumps(run_one(workload, int(size), base_url, args.passes)), flush=True)
+        return
+
+    server, base_url = _start_server(args)
+    print(f"GENIE 대역 서버: {base_url} (지연 {args.latency_ms}±{args.jitter_ms}ms, "
+          f"503 {args.error_rate:.1%}, 429 {args.rate_limit:.1%})")
+    print(f"{'workload':<9} {'tracks':>8} {'elapsed':>10} {'throughput':>11} {'p50 ms':>8} {'p99 ms':>8} "
+          f"{'RSS MB':>8} {'ok':>8} {'failed':>7}")
+    results = []
+    try:
+        for workload in args.workloads:
+            for size in args.sizes:
+                proc = subprocess.run(
+                    [sys.executable, "-m", "benchmarks.bench_collect", "--log-level", args.log_level,
+                     "--passes", str(args.passes), "--child", workload, str(size), base_url],
+                    stdout=subprocess.PIPE, text=True, check=True,
+                )
+                result = json.loads(proc.stdout.strip().splitlines()[-1])
+                results.append(result)
+                print(_format_row(result), flush=True)
+    finally:
+        server.terminate()
+        server.wait()
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps({
+            "server": {
+                "latency_ms": args.latency_ms,
+                "jitter_ms": args.jitter_ms,
+                "error_rate": args.error_rate,
+                "rate_limit": args.rate_limit,
+                "static_rate": args.static_rate,
+                "etag": args.etag,
+            },
+            "passes": args.passes,
+            "results": results,
+        }, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"결과 저장: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""`metrics.add_metrics` 벤치마크.
+
+groupby를 지표마다 반복하던 기존 구현과 한 번 정렬 후 곡 경계 기준 NumPy diff로
+계산하는 구현을 같은 입력으로 비교한다.
+
+    python -m benchmarks.bench_metrics --songs 20000 --days 365
+"""
+
+from __future__ import annotations
+
+import argparse
+from typing import Tuple
+
+import pandas as pd
+
+from chart_maker import metrics
+
+from .common import measure
+from .synthetic import metrics_frame
+
+_INPUT_COLUMNS = ["platform", "song_id", "timestamp", "total_plays", "total_listeners"]
+
+
+def _legacy_add_metrics(df: pd.DataFrame) -> Tuple[pd.DataFrame, int]:
+    """지표마다 groupby().diff()를 수행하던 이전 구현. 비교 기준용."""
+    df = df.sort_values(["platform", "song_id", "timestamp"]).copy()
+    group = df.groupby(["platform", "song_id"], sort=False)
+    df["delta_plays"] = group["total_plays"].diff()
+    df["delta_listeners"] = group["total_listeners"].diff()
+    df["delta_minutes"] = group["timestamp"].diff().dt.total_seconds() / 60.0
+    valid_time = df["delta_minutes"] > 0
+    df["rate_plays_per_min"] = (df["delta_plays"] / df["delta_minutes"]).where(valid_time)
+    df["rate_listeners_per_min"] = (df["delta_listeners"] / df["delta_minutes"]).where(valid_time)
+    anomaly_mask = (df["delta_plays"] < 0) | (df["delta_listeners"] < 0)
+    df["is_anomaly_negative_diff"] = anomaly_mask
+    return df, int(anomaly_mask.sum())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="metrics.add_metrics 벤치마크")
+    parser.add_argument("--songs", type=int, default=20_000, help="곡 수 (기본: 20000)")
+    parser.add_argument("--days", type=int, default=365, help="곡별 일 수 (기본: 365)")
+    parser.add_argument("--repeat", type=int, default=3, help="반복 횟수 (기본: 3)")
+    parser.add_argument("--no-legacy", action="store_true", help="기존 구현 측정 생략")
+    args = parser.parse_args()
+
+    print(f"합성 데이터 생성: {args.songs}곡 × {args.days}일 = {args.songs * args.days:,}행")
+    df = metrics_frame(args.songs, args.days)[_INPUT_COLUMNS]
+
+    new = measure("add_metrics", lambda: metrics.add_metrics(df), repeat=args.repeat)
+    measure(
+        "add_metrics + 7/28행 윈도우",
+        lambda: metrics.add_metrics(
+            df,
+            windows=[
+                metrics.DerivedWindow("total_plays", "delta", 7),
+                metrics.DerivedWindow("total_plays", "delta", 28),
+                metrics.DerivedWindow("total_plays", "growth_pct", 7),
+            ],
+        ),
+        repeat=args.repeat,
+    )
+
+    if not args.no_legacy:
+        old = measure("legacy add_metrics (groupby diff)", lambda: _legacy_add_metrics(df), repeat=args.repeat)
+        expected, expected_anomalies = old.result
+        actual, actual_anomalies = new.result
+        pd.testing.assert_frame_equal(expected, actual)
+        assert expected_anomalies == actual_anomalies
+        print(f"시간 {old.best_sec / new.best_sec:.1f}배 단축")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""`transform.normalize` 시간/메모리 벤치마크.
+
+문자열 키 기반의 기존 구현과 정수 코드 기반 구현을 같은 입력으로 비교한다.
+
+    python -m benchmarks.bench_normalize --songs 20000 --days 90
+"""
+
+from __future__ import annotations
+
+import argparse
+from typing import Tuple
+
+import pandas as pd
+
+from chart_maker import transform
+
+from .common import measure
+from .synthetic import raw_frame
+
+
+def _legacy_normalize(df_raw: pd.DataFrame) -> Tuple[pd.DataFrame, int]:
+    """문자열 key 컬럼으로 정렬/중복 처리하던 이전 구현. 비교 기준용."""
+    df = transform._ensure_columns(df_raw.copy())
+    ts_str = (
+        df["date"].astype(str)
+        + " "
+        + df["hour"].astype(str).str.zfill(2)
+        + ":"
+        + df["minute"].astype(str).str.zfill(2)
+    )
+    df["timestamp"] = pd.to_datetime(ts_str, errors="coerce")
+    df["key"] = df["platform"] + "::" + df["song_id"] + "::" + df["timestamp"].astype(str)
+    dup_counts = df.duplicated("key").sum()
+    df = df.sort_values(["key"]).groupby("key", as_index=False).tail(1)
+    df = df.sort_values(["platform", "song_id", "timestamp"]).reset_index(drop=True)
+    df = df.drop(columns=["key"])
+    df = df[df["timestamp"].notna()].copy()
+    return df, int(dup_counts)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="transform.normalize 벤치마크")
+    parser.add_argument("--songs", type=int, default=20_000, help="곡 수 (기본: 20000)")
+    parser.add_argument("--days", type=int, default=90, help="곡별 일 수 (기본: 90)")
+    parser.add_argument("--dup-rate", type=float, default=0.02, help="중복 재수집 비율 (기본: 0.02)")
+    parser.add_argument("--repeat", type=int, default=3, help="반복 횟수 (기본: 3)")
+    parser.add_argument("--no-legacy", action="store_true", help="기존 구현 측정 생략")
+    args = parser.parse_args()
+
+    df_raw = raw_frame(args.songs, args.days, dup_rate=args.dup_rate)
+    print(f"합성 원본 데이터: {len(df_raw):,}행")
+
+    new = measure(
+        "normalize",
+        lambda: transform.normalize(df_raw),
+        repeat=args.repeat,
+        trace_memory=True,
+    )
+    if not args.no_legacy:
+        old = measure(
+            "legacy normalize (string key)",
+            lambda: _legacy_normalize(df_raw),
+            repeat=args.repeat,
+            trace_memory=True,
+        )
+        expected, expected_dups = old.result
+        actual, actual_dups = new.result
+        pd.testing.assert_frame_equal(expected.reset_index(drop=True), actual)
+        assert expected_dups == actual_dups
+        print(
+            f"시간 {old.best_sec / new.best_sec:.1f}배 단축, "
+            f"최대 할당 {old.peak_mb / new.peak_mb:.1f}배 감소"
+        )
+
+
+if __name__ == "__main__":
+    main()
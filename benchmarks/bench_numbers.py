@@ -0,0 +1,109 @@
+"""`normalizer.normalize_number` / `normalize_numbers` 벤치마크.
+
+수집 페이지에서 긁어 온 모양의 숫자 문자열(쉼표 숫자, 만/억, K/M, 앞뒤 문구)을 만들어
+정규식을 단계마다 따로 찾던 이전 구현과 토큰 정규식 하나로 파싱하는 구현, 일괄 API를 비교한다.
+--distinct는 서로 다른 문자열 수로, 백필처럼 같은 값이 반복되는 입력을 흉내 낸다.
+
+    python -m benchmarks.bench_numbers --count 1000000 --distinct 50000
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+from typing import List, Optional
+
+import numpy as np
+
+from music_metrics_collector import normalizer
+
+from .common import measure
+
+
+def _legacy_normalize_number(text: str) -> Optional[int]:
+    """만/M/K/숫자를 정규식 검색 4번으로 찾던 이전 구현. 비교 기준용."""
+    if not text:
+        return None
+    text = text.strip().replace(',', '')
+    if '만' in text:
+        match = re.search(r'([\d.]+)\s*만', text)
+        if match:
+            try:
+                return int(float(match.group(1)) * 10000)
+            except ValueError:
+                pass
+    if 'M' in text.upper():
+        match = re.search(r'([\d.]+)\s*M', text, re.IGNORECASE)
+        if match:
+            try:
+                return int(float(match.group(1)) * 1000000)
+            except ValueError:
+                pass
+    if 'K' in text.upper():
+        match = re.search(r'([\d.]+)\s*K', text, re.IGNORECASE)
+        if match:
+            try:
+                return int(float(match.group(1)) * 1000)
+            except ValueError:
+                pass
+    match = re.search(r'[\d.]+', text)
+    if match:
+        try:
+            return int(float(match.group(0)))
+        except ValueError:
+            pass
+    digits = re.sub(r'[^\d]', '', text)
+    return int(digits) if digits else None
+
+
+def sample_texts(count: int, distinct: int, seed: int = 0) -> List[str]:
+    """count개의 숫자 문자열 (서로 다른 값은 distinct개)."""
+    rng = np.random.default_rng(seed)
+    values = rng.integers(0, 5_000_000_000, size=distinct)
+    shapes = rng.integers(0, 5, size=distinct)
+    pool = []
+    for value, shape in zip(values.tolist(), shapes.tolist()):
+        if shape == 0:
+            pool.append(f"{value:,}")
+        elif shape == 1:
+            pool.append(f"재생수: {value:,}회")
+        elif shape == 2:
+            pool.append(f"{value / 10_000:.1f}만")
+        elif shape == 3:
+            pool.append(f"{value / 1_000_000:.1f}M plays")
+        else:
+            pool.append(f"{value // 100_000_000}억 {value % 100_000_000 // 10_000:,}만")
+    return [pool[i] for i in rng.integers(0, distinct, size=count).tolist()]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="숫자 문자열 정규화 벤치마크")
+    parser.add_argument("--count", type=int, default=1_000_000, help="문자열 수 (기본: 1000000)")
+    parser.add_argument("--distinct", type=int, default=50_000, help="서로 다른 문자열 수 (기본: 50000)")
+    parser.add_argument("--repeat", type=int, default=3, help="반복 횟수 (기본: 3)")
+    parser.add_argument("--no-legacy", action="store_true", help="이전 구현 측정 생략")
+    args = parser.parse_args()
+
+    texts = sample_texts(args.count, args.distinct)
+    print(f"입력: {len(texts):,}개 (서로 다른 문자열 {args.distinct:,}개)")
+
+    single = measure(
+        "normalize_number (loop)",
+        lambda: [normalizer.normalize_number(t) for t in texts],
+        repeat=args.repeat,
+    )
+    measure("normalize_numbers (batch)", lambda: normalizer.normalize_numbers(texts), repeat=args.repeat)
+    if not args.no_legacy:
+        old = measure(
+            "legacy normalize_number (loop)",
+            lambda: [_legacy_normalize_number(t) for t in texts],
+            repeat=args.repeat,
+        )
+        # "1억 2,345만"은 이전 구현이 만 단위만 읽으므로 값이 다르다.
+        diff = sum(a != b for a, b in zip(single.result, old.result))
+        compound = sum("억" in t for t in texts)
+        print(f"이전 구현과 다른 값: {diff:,}개 (억/만 복합 표기 {compound:,}개)")
+
+
+if __name__ == "__main__":
+    main()
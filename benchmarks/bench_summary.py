@@ -0,0 +1,99 @@
+"""`report.build_summary_table` 벤치마크.
+
+기본 크기는 50,000곡 × 365일(약 1,800만 행)이며, 메모리가 부족한 환경에서는
+--songs / --days 로 줄여서 실행한다.
+
+    python -m benchmarks.bench_summary --songs 50000 --days 365
+    python -m benchmarks.bench_summary --songs 5000 --days 90 --legacy-songs 1000
+"""
+
+from __future__ import annotations
+
+import argparse
+from typing import Dict, Tuple
+
+import pandas as pd
+
+from chart_maker.report import build_summary_table
+from chart_maker.series_index import SongIndex
+
+from .common import measure
+from .synthetic import metrics_frame
+
+
+def _legacy_build_summary_table(df: pd.DataFrame) -> Tuple[pd.DataFrame, Dict[str, int]]:
+    """벡터화 이전 구현 (곡마다 groupby 루프). 비교 기준용."""
+    records = []
+    anomalies_per_platform: Dict[str, int] = {}
+    for (platform, song_id), g in df.groupby(["platform", "song_id"]):
+        g = g.sort_values("timestamp")
+        first = g.iloc[0]
+        last = g.iloc[-1]
+        num_anomalies = int(g["is_anomaly_negative_diff"].sum())
+        anomalies_per_platform[platform] = anomalies_per_platform.get(platform, 0) + num_anomalies
+        records.append(
+            {
+                "platform": platform,
+                "song_id": song_id,
+                "song_name": str(last.get("song_name") or first.get("song_name") or ""),
+                "artist_name": str(last.get("artist_name") or first.get("artist_name") or ""),
+                "first_timestamp": first["timestamp"],
+                "last_timestamp": last["timestamp"],
+                "first_total_plays": first["total_plays"],
+                "last_total_plays": last["total_plays"],
+                "net_plays": (last["total_plays"] or 0) - (first["total_plays"] or 0),
+                "first_total_listeners": first["total_listeners"],
+                "last_total_listeners": last["total_listeners"],
+                "net_listeners": (last["total_listeners"] or 0) - (first["total_listeners"] or 0),
+                "avg_rate_plays_per_min": g["rate_plays_per_min"].dropna().mean(),
+                "avg_rate_listeners_per_min": g["rate_listeners_per_min"].dropna().mean(),
+                "num_points": len(g),
+                "num_anomalies_negative_diff": num_anomalies,
+            }
+        )
+    return pd.DataFrame(records), anomalies_per_platform
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="build_summary_table 벤치마크")
+    parser.add_argument("--songs", type=int, default=50_000, help="곡 수 (기본: 50000)")
+    parser.add_argument("--days", type=int, default=365, help="곡별 일 수 (기본: 365)")
+    parser.add_argument("--repeat", type=int, default=3, help="반복 횟수 (기본: 3)")
+    parser.add_argument(
+        "--legacy-songs",
+        type=int,
+        default=1_000,
+        help="기존 루프 구현을 측정할 곡 수 (0이면 생략, 기본: 1000). 전체 곡 수로 선형 환산해 출력",
+    )
+    args = parser.parse_args()
+
+    print(f"합성 데이터 생성: {args.songs}곡 × {args.days}일 = {args.songs * args.days:,}행")
+    df = metrics_frame(args.songs, args.days)
+
+    measure("SongIndex.build", lambda: SongIndex.build(df), repeat=args.repeat)
+    vectorized = measure("build_summary_table", lambda: build_summary_table(df), repeat=args.repeat)
+    index = SongIndex.build(df)
+    measure(
+        "build_summary_table (index 재사용)",
+        lambda: build_summary_table(df, index=index),
+        repeat=args.repeat,
+    )
+
+    if args.legacy_songs > 0:
+        n_legacy = min(args.legacy_songs, args.songs)
+        df_legacy = df.iloc[: n_legacy * args.days]
+        legacy = measure(
+            f"legacy loop ({n_legacy}곡)",
+            lambda: _legacy_build_summary_table(df_legacy),
+            repeat=1,
+        )
+        expected, _ = legacy.result
+        actual, _ = build_summary_table(df_legacy)
+        pd.testing.assert_frame_equal(expected, actual)
+
+        estimated = legacy.best_sec * args.songs / n_legacy
+        print(f"legacy loop 전체 환산: 약 {estimated:.1f}s  (벡터화 대비 {estimated / vectorized.best_sec:.0f}배)")
+
+
+if __name__ == "__main__":
+    main()
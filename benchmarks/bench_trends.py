@@ -0,0 +1,48 @@
+"""`trends.TrendEngine` 벤치마크.
+
+기본 크기는 100,000곡 × 730일(약 7,300만 행)이며, 메모리가 부족한 환경에서는
+--songs / --days 로 줄여서 실행한다.
+
+    python -m benchmarks.bench_trends --songs 100000 --days 730
+"""
+
+from __future__ import annotations
+
+import argparse
+
+from chart_maker.series_index import SongIndex
+from chart_maker.trends import TrendEngine, TrendQuery
+
+from .common import measure
+from .synthetic import metrics_frame
+
+_COLUMNS = ["platform", "song_id", "timestamp", "total_plays", "total_listeners", "delta_plays"]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="TrendEngine 벤치마크")
+    parser.add_argument("--songs", type=int, default=100_000, help="곡 수 (기본: 100000)")
+    parser.add_argument("--days", type=int, default=730, help="곡별 일 수 (기본: 730)")
+    parser.add_argument("--repeat", type=int, default=3, help="반복 횟수 (기본: 3)")
+    args = parser.parse_args()
+
+    print(f"합성 데이터 생성: {args.songs}곡 × {args.days}일 = {args.songs * args.days:,}행")
+    df = metrics_frame(args.songs, args.days)[_COLUMNS]
+    index = SongIndex.build(df)
+
+    engine = measure("TrendEngine 생성", lambda: TrendEngine(index), repeat=args.repeat).result
+    for spec in ("recent_mean:3", "sum:7", "sum:28", "wow:7", "ewma:7"):
+        query = TrendQuery.parse(spec)
+        measure(f"top_movers {spec}", lambda: engine.top_movers(query, 10), repeat=args.repeat)
+
+    # 캐시를 비우고 기준일 스냅샷 전체(2개 컬럼 × 4개 지표)를 측정
+    def snapshot():
+        engine._snapshots.clear()
+        return engine.snapshot()
+
+    measure("snapshot (기준일 전체 지표)", snapshot, repeat=args.repeat)
+    measure("snapshot (메모리 캐시)", engine.snapshot, repeat=args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""벤치마크 공통 유틸리티: 시간/메모리 측정 및 결과 출력."""
+
+from __future__ import annotations
+
+import gc
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+
+@dataclass
+class Measurement:
+    """한 항목의 측정 결과."""
+
+    label: str
+    best_sec: float
+    peak_mb: Optional[float] = None
+    result: Any = None
+
+    def __str__(self) -> str:
+        text = f"{self.label:<40} {self.best_sec:10.3f}s"
+        if self.peak_mb is not None:
+            text += f"  peak {self.peak_mb:9.1f} MB"
+        return text
+
+
+def measure(
+    label: str,
+    fn: Callable[[], Any],
+    repeat: int = 3,
+    trace_memory: bool = False,
+) -> Measurement:
+    """fn을 repeat번 실행해 최소 소요 시간을 측정한다.
+
+    trace_memory=True이면 마지막 1회를 tracemalloc으로 한 번 더 실행해
+    Python/NumPy 할당 최고치(MB)를 함께 기록한다. (시간 측정에는 포함하지 않음)
+    """
+    best = float("inf")
+    result = None
+    for _ in range(max(1, repeat)):
+        gc.collect()
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+
+    peak_mb = None
+    if trace_memory:
+        gc.collect()
+        tracemalloc.start()
+        try:
+            fn()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        peak_mb = peak / (1024 * 1024)
+
+    m = Measurement(label=label, best_sec=best, peak_mb=peak_mb, result=result)
+    print(m, flush=True)
+    return m
@@ -0,0 +1,141 @@
+"""`data/logs` 모양의 합성 수집 이력(JSONL) 생성기.
+
+곡 × 일 × 하루 수집 횟수만큼 `{out}/{YYYY-MM-DD}_{PLATFORM}.jsonl` 파일을 만든다.
+각 레코드는 chart_maker가 읽는 필드(platform, song_id, date, hour, minute, total_plays,
+total_listeners ...)와 수집기 로그 필드(req_date, platform_song_ids, track_cd, isrc_cd,
+res_listeners)를 함께 가진다. 실제 로그처럼 다음이 섞인다.
+
+- 누락(gap): gap_rate 비율의 (곡, 수집 시각)은 기록이 없다.
+- 중복(dup): dup_rate 비율은 같은 시각으로 한 번 더 기록된다. (뒤 레코드 값이 조금 더 큼)
+- 감소(drop): drop_rate 비율은 누적값이 직전보다 작게 기록된다. (음수 diff)
+
+    python -m benchmarks.gen_logs --out /tmp/logs --songs 2000 --days 60 --hours 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import List
+
+import numpy as np
+
+BASE_DAY = np.datetime64("2025-01-01")
+
+
+@dataclass
+class HistoryStats:
+    """생성 결과 요약."""
+
+    files: int = 0
+    records: int = 0
+    gaps: int = 0
+    duplicates: int = 0
+    drops: int = 0
+
+
+def collection_hours(hours: int) -> List[int]:
+    """하루 수집 횟수에 맞춘 수집 시각(시). 1회면 09시, 그 외에는 09시부터 균등 간격."""
+    return sorted({(9 + i * 24 // hours) % 24 for i in range(hours)})
+
+
+def _song_prefixes(songs: int, platform: str) -> List[str]:
+    """곡마다 변하지 않는 필드를 미리 직렬화한 JSON 앞부분."""
+    prefixes = []
+    for i in range(songs):
+        song_id = str(10_000_000 + i)
+        fixed = {
+            "platform": platform,
+            "song_id": song_id,
+            "platform_song_ids": song_id,
+            "song_name": f"곡{i}",
+            "artist_name": f"가수{i % 997}",
+            "album_name": f"앨범{i // 10}",
+            "track_cd": f"T{i:08d}",
+            "isrc_cd": f"KRSYN{i:07d}",
+        }
+        prefixes.append(json.dumps(fixed, ensure_ascii=False)[:-1])
+    return prefixes
+
+
+def write_history(
+    out_dir: Path,
+    songs: int,
+    days: int,
+    hours: int = 1,
+    gap_rate: float = 0.02,
+    dup_rate: float = 0.01,
+    drop_rate: float = 0.001,
+    platform: str = "GENIE",
+    seed: int = 0,
+) -> HistoryStats:
+    """합성 이력을 out_dir에 쓴다. 같은 인자와 seed면 같은 파일이 나온다."""
+    rng = np.random.default_rng(seed)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    prefixes = _song_prefixes(songs, platform)
+    slots = collection_hours(hours)
+    stats = HistoryStats()
+
+    plays = rng.integers(1_000, 5_000_000, size=songs)
+    listeners = plays // 3
+    # 곡마다 인기도가 다르므로 증가 폭의 기준값도 곡별로 둔다.
+    popularity = rng.lognormal(mean=3.0, sigma=1.5, size=songs) / len(slots)
+
+    for day in range(days):
+        date = str(BASE_DAY + day)
+        lines: List[str] = []
+        for hour in slots:
+            plays = plays + rng.poisson(popularity * 10)
+            listeners = listeners + rng.poisson(popularity)
+            minutes = rng.integers(0, 3, size=songs)
+            present = rng.random(songs) >= gap_rate
+            dropped = rng.random(songs) < drop_rate
+            duplicated = rng.random(songs) < dup_rate
+            reported_plays = np.where(dropped, np.maximum(plays - rng.integers(1, 1_000, size=songs), 0), plays)
+
+            stats.gaps += int((~present).sum())
+            stats.drops += int((dropped & present).sum())
+            for i in np.flatnonzero(present):
+                tail = (
+                    f', "req_date": "{date}", "date": "{date}", "hour": {hour}, "minute": {minutes[i]}, '
+                    f'"total_plays": {reported_plays[i]}, "total_listeners": {listeners[i]}, '
+                    f'"res_listeners": {listeners[i]}}}'
+                )
+                lines.append(prefixes[i] + tail)
+                if duplicated[i]:
+                    # 같은 시각 재수집: 값이 조금 더 큰 레코드가 뒤에 온다.
+                    lines.append(prefixes[i] + tail.replace(
+                        f'"total_plays": {reported_plays[i]},', f'"total_plays": {reported_plays[i] + 1},'
+                    ))
+                    stats.duplicates += 1
+        (out_dir / f"{date}_{platform}.jsonl").write_text("\n".join(lines) + "\n", encoding="utf-8")
+        stats.files += 1
+        stats.records += len(lines)
+    return stats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="data/logs 모양의 합성 수집 이력 생성")
+    parser.add_argument("--out", type=Path, required=True, help="출력 디렉토리")
+    parser.add_argument("--songs", type=int, default=2_000, help="곡 수 (기본: 2000)")
+    parser.add_argument("--days", type=int, default=60, help="일 수 (기본: 60)")
+    parser.add_argument("--hours", type=int, default=1, help="하루 수집 횟수 (기본: 1)")
+    parser.add_argument("--gap-rate", type=float, default=0.02, help="누락 비율 (기본: 0.02)")
+    parser.add_argument("--dup-rate", type=float, default=0.01, help="중복 재수집 비율 (기본: 0.01)")
+    parser.add_argument("--drop-rate", type=float, default=0.001, help="누적값 감소 비율 (기본: 0.001)")
+    parser.add_argument("--platform", default="GENIE")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    stats = write_history(
+        args.out, args.songs, args.days, args.hours,
+        gap_rate=args.gap_rate, dup_rate=args.dup_rate, drop_rate=args.drop_rate,
+        platform=args.platform, seed=args.seed,
+    )
+    print(json.dumps(asdict(stats)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,314 @@
+"""GENIE 대역 서버: 곡 상세(songInfo)와 검색(searchSong) 페이지를 흉내 낸다.
+
+실제 genie.co.kr에 부하 테스트를 할 수 없으므로, 수집기가 보는 페이지 구조
+(tests/test_parsers_genie.py의 `.song-info .info-list .value`, config.yaml의
+`.daily-chart .total div p`, 검색 결과의 `fnViewSongInfo('ID')`)를 그대로 갖춘
+HTML을 곡 번호마다 만들어 돌려준다. 응답 지연/지터, 5xx 오류율, 429 비율을 조절할 수 있다.
+
+곡 카탈로그는 번호 i마다 결정적으로 만든다.
+
+- song_id: 10000000 + i
+- 곡명: "노래{i:06d}", 아티스트: "가수{i % 997:03d}", 앨범: "앨범{i // 10:05d}"
+- 재생수/청취자수: 곡 번호로 정한 초기값에서 서버 기동 후 경과 시간에 비례해 증가
+  (static_rate 비율의 곡은 값이 변하지 않는 롱테일 곡)
+- 곡 상세 페이지에는 요청마다 바뀌는 스크립트(요청 시각)가 들어 있다.
+- etag=True면 재생수/청취자수로 만든 약한 ETag를 주고 If-None-Match가 같으면 304를 돌려준다.
+
+    python -m benchmarks.genie_server --port 8765 --latency-ms 80 --jitter-ms 40 --error-rate 0.01 --rate-limit 0.02
+
+`config.yaml`의 `http.base_url`을 이 주소로 두면 collect / generate_song_ids가 여기로 요청한다.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import re
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+SONG_ID_BASE = 10_000_000
+
+_SONG_NAME_RE = re.compile(r"노래(\d{6})")
+
+SONG_INFO_TEMPLATE = """<!DOCTYPE html>
+<html lang="ko">
+<head><meta charset="utf-8"><title>{song_name} / {artist_name} - genie</title>
+<script>var requestTime = "{request_time}";</script></head>
+<body>
+<div id="body-content">
+  <div class="song-main-infos">
+    <div class="info-zone">
+      <h2 class="name">{song_name}</h2>
+      <ul class="info-data">
+        <li><span class="attr">아티스트</span><span class="value"><a href="#" onclick="fnGoMore('artistInfo','{artist_id}');return false;">{artist_name}</a></span></li>
+        <li><span class="attr">앨범</span><span class="value"><a href="#" onclick="fnGoMore('albumInfo','{album_id}');return false;">{album_name}</a></span></li>
+        <li><span class="attr">장르</span><span class="value">가요 / 발라드</span></li>
+      </ul>
+    </div>
+  </div>
+  <div class="daily-chart">
+    <div class="total">
+      <div><p>{total_plays:,}</p><span>전체 재생수</span></div>
+      <div><p>{total_listeners:,}</p><span>전체 청취자수</span></div>
+    </div>
+  </div>
+  <div class="song-info">
+    <dl class="info-list"><dt>재생수</dt><dd class="value">{total_plays:,}</dd></dl>
+  </div>
+  <div class="song-info">
+    <dl class="info-list"><dt>청취자수</dt><dd class="value">{total_listeners:,}</dd></dl>
+  </div>
+</div>
+</body>
+</html>
+"""
+
+SEARCH_ITEM_TEMPLATE = """    <tr class="list" songid="{song_id}">
+      <td class="info">
+        <a href="#" class="title ellipsis" title="재생" onclick="fnViewSongInfo('{song_id}');return false;">{song_name}</a>
+        <a href="#" class="artist ellipsis" onclick="fnViewArtist('{artist_id}');return false;">{artist_name}</a>
+        <a href="#" class="albumtitle ellipsis" onclick="fnViewAlbumLayer('{album_id}');return false;">{album_name}</a>
+      </td>
+    </tr>
+"""
+
+SEARCH_TEMPLATE = """<!DOCTYPE html>
+<html lang="ko">
+<head><meta charset="utf-8"><title>지니 검색</title></head>
+<body>
+<div class="music-list-wrap">
+  <table class="list-wrap"><tbody>
+{items}  </tbody></table>
+</div>
+</body>
+</html>
+"""
+
+
+def song_name(index: int) -> str:
+    return f"노래{index:06d}"
+
+
+def artist_name(index: int) -> str:
+    return f"가수{index % 997:03d}"
+
+
+def album_name(index: int) -> str:
+    return f"앨범{index // 10:05d}"
+
+
+def song_id(index: int) -> str:
+    return str(SONG_ID_BASE + index)
+
+
+@dataclass
+class FaultProfile:
+    """응답 지연과 오류 주입 설정."""
+
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0
+    rate_limit: float = 0.0
+    retry_after_sec: int = 1
+    seed: Optional[int] = None
+
+
+class GenieStandIn:
+    """곡 카탈로그와 응답 생성 (HTTP 처리와 분리해 테스트에서 직접 쓸 수 있게 둠)."""
+
+    def __init__(
+        self,
+        catalog_size: int = 1_000_000,
+        faults: Optional[FaultProfile] = None,
+        static_rate: float = 0.0,
+        etag: bool = False,
+    ):
+        self.catalog_size = catalog_size
+        self.faults = faults or FaultProfile()
+        self.static_rate = static_rate
+        self.etag = etag
+        self.started = time.monotonic()
+        self._rng = random.Random(self.faults.seed)
+        self._rng_lock = threading.Lock()
+
+    def _index(self, song_id_text: str) -> Optional[int]:
+        try:
+            index = int(song_id_text) - SONG_ID_BASE
+        except (TypeError, ValueError):
+            return None
+        return index if 0 <= index < self.catalog_size else None
+
+    def counts(self, index: int) -> Tuple[int, int]:
+        """(재생수, 청취자수). static_rate 비율의 곡은 기동 후에도 그대로다."""
+        plays = 1_000 + (index * 7919) % 5_000_000
+        if index % 1000 >= self.static_rate * 1000:
+            plays += int((time.monotonic() - self.started) * (1 + index % 7))
+        return plays, plays // 3 + 1
+
+    def song_etag(self, song_id_text: str) -> Optional[str]:
+        index = self._index(song_id_text)
+        if index is None:
+            return None
+        plays, listeners = self.counts(index)
+        return f'W/"{plays}-{listeners}"'
+
+    def song_info(self, song_id_text: str) -> Optional[str]:
+        index = self._index(song_id_text)
+        if index is None:
+            return None
+        plays, listeners = self.counts(index)
+        return SONG_INFO_TEMPLATE.format(
+            request_time=f"{time.time():.6f}",
+            song_name=song_name(index),
+            artist_name=artist_name(index),
+            album_name=album_name(index),
+            artist_id=80_000_000 + index % 997,
+            album_id=80_000_000 + index // 10,
+            total_plays=plays,
+            total_listeners=listeners,
+        )
+
+    def search(self, query: str) -> str:
+        """쿼리에 들어 있는 곡명과 일치하는 곡 + 같은 앨범 곡 몇 개(오답 후보)를 돌려준다."""
+        indexes = []
+        match = _SONG_NAME_RE.search(query)
+        if match:
+            index = int(match.group(1))
+            if index < self.catalog_size:
+                first = index - index % 10
+                indexes = [index] + [i for i in range(first, min(first + 3, self.catalog_size)) if i != index]
+        items = "".join(
+            SEARCH_ITEM_TEMPLATE.format(
+                song_id=song_id(i),
+                song_name=song_name(i),
+                artist_name=artist_name(i),
+                album_name=album_name(i),
+                artist_id=80_000_000 + i % 997,
+                album_id=80_000_000 + i // 10,
+            )
+            for i in indexes
+        )
+        return SEARCH_TEMPLATE.format(items=items)
+
+    def draw_fault(self) -> Tuple[float, Optional[int]]:
+        """(지연 초, 주입할 상태 코드 또는 None)"""
+        faults = self.faults
+        with self._rng_lock:
+            delay = faults.latency_ms + (self._rng.uniform(-1, 1) * faults.jitter_ms if faults.jitter_ms else 0.0)
+            roll = self._rng.random()
+        status = None
+        if roll < faults.rate_limit:
+            status = 429
+        elif roll < faults.rate_limit + faults.error_rate:
+            status = 503
+        return max(0.0, delay) / 1000.0, status
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # 헤더와 본문을 따로 쓰므로 Nagle + 지연 ACK로 keep-alive 응답마다 ~40ms가 붙지 않게 한다.
+    disable_nagle_algorithm = True
+    server: "GenieServer"
+
+    def do_GET(self):
+        app = self.server.app
+        delay, fault = app.draw_fault()
+        if delay:
+            time.sleep(delay)
+        if fault is not None:
+            headers = {"Retry-After": str(app.faults.retry_after_sec)} if fault == 429 else {}
+            self._send(fault, "<html><body>error</body></html>", headers)
+            return
+
+        parts = urlsplit(self.path)
+        params = parse_qs(parts.query)
+        if parts.path == "/detail/songInfo":
+            xgnm = params.get("xgnm", [""])[0]
+            etag = app.song_etag(xgnm) if app.etag else None
+            if etag is not None and self.headers.get("If-None-Match") == etag:
+                self._send(304, "", {"ETag": etag})
+                return
+            body = app.song_info(xgnm)
+            if body is None:
+                self._send(404, "<html><body>not found</body></html>")
+            else:
+                self._send(200, body, {"ETag": etag} if etag else None)
+        elif parts.path == "/search/searchSong":
+            self._send(200, app.search(params.get("query", [""])[0]))
+        else:
+            self._send(404, "<html><body>not found</body></html>")
+
+    def _send(self, status: int, body: str, headers: Optional[dict] = None) -> None:
+        data = body.encode("utf-8")
+        self.send_response(status)
+        if status != 304:
+            self.send_header("Content-Type", "text/html; charset=UTF-8")
+            self.send_header("Content-Length", str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class GenieServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, app: Optional[GenieStandIn] = None):
+        super().__init__((host, port), _Handler)
+        self.app = app or GenieStandIn()
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start_background(self) -> threading.Thread:
+        thread = threading.Thread(target=self.serve_forever, daemon=True)
+        thread.start()
+        return thread
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="GENIE 대역 서버 (부하 테스트용)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765, help="0이면 빈 포트 (기본: 8765)")
+    parser.add_argument("--catalog", type=int, default=1_000_000, help="곡 수 (기본: 1000000)")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="응답 지연 (ms)")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="지연 ± 지터 (ms, 균등 분포)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="503 응답 비율 (0~1)")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="429 응답 비율 (0~1)")
+    parser.add_argument("--seed", type=int, default=None, help="오류/지터 난수 시드")
+    parser.add_argument("--static-rate", type=float, default=0.0, help="재생수가 변하지 않는 곡 비율 (0~1)")
+    parser.add_argument("--etag", action="store_true", help="곡 상세에 ETag를 주고 If-None-Match에 304로 응답")
+    args = parser.parse_args()
+
+    faults = FaultProfile(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        rate_limit=args.rate_limit,
+        seed=args.seed,
+    )
+    server = GenieServer(args.host, args.port, GenieStandIn(args.catalog, faults, static_rate=args.static_rate, etag=args.etag))
+    # 벤치마크 하네스가 첫 줄에서 주소를 읽는다.
+    print(f"listening on {server.base_url}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    main()
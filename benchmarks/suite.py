@@ -0,0 +1,192 @@
+"""chart_maker 리포트 파이프라인 벤치마크 모음과 결과 이력 비교.
+
+합성 수집 이력(benchmarks.gen_logs)을 만든 뒤 render 명령과 같은 순서로
+단계별 시간을 측정한다.
+
+1. io.load_jsonl           - JSONL 디렉토리 로드
+2. transform.normalize     - 정규화/중복 제거
+3. metrics.add_metrics     - 파생 지표
+4. report.build_summary_table - 곡 인덱스 + 요약 테이블
+5. render.render_songs     - 곡별 PNG + HTML (--render-songs 곡)
+6. charts.plot_platform_summary - 플랫폼 요약 차트
+
+결과는 --history JSON 파일(기본 benchmarks/results/history.json)에 실행마다 추가되고,
+같은 파라미터로 측정한 직전 결과보다 --threshold 이상 느려진 단계를 회귀로 보고한다.
+야간 작업 전에 `--fail-on-regression`으로 실행하면 회귀 시 종료 코드 1을 돌려준다.
+
+    python -m benchmarks.suite --songs 2000 --days 60 --hours 4
+    python -m benchmarks.suite --songs 500 --days 30 --repeat 5 --fail-on-regression
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import platform as platform_mod
+import subprocess
+import sys
+import tempfile
+import warnings
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .common import Measurement, measure
+from .gen_logs import write_history
+
+DEFAULT_HISTORY = Path(__file__).parent / "results" / "history.json"
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).parent, capture_output=True, text=True, timeout=10,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def run_suite(data_dir: Path, out_dir: Path, render_songs: int, repeat: int, trace_memory: bool) -> List[Measurement]:
+    """data_dir의 로그로 단계별 시간을 측정한다. 각 단계 입력은 앞 단계 결과를 쓴다."""
+    from chart_maker import charts, io, metrics, render, report, transform
+    from chart_maker.series_index import SongIndex
+
+    def run(label, fn):
+        return measure(label, fn, repeat=repeat, trace_memory=trace_memory)
+
+    results = []
+    m = run("load_jsonl", lambda: io.load_jsonl(data_dir))
+    results.append(m)
+    df_raw = m.result
+
+    m = run("normalize", lambda: transform.normalize(df_raw))
+    results.append(m)
+    df_norm = m.result[0]
+
+    m = run("add_metrics", lambda: metrics.add_metrics(df_norm))
+    results.append(m)
+    df_metrics = m.result[0]
+
+    def summary():
+        index = SongIndex.build(df_metrics)
+        return index, report.build_summary_table(df_metrics, index=index)[0]
+
+    m = run("build_summary_table", summary)
+    results.append(m)
+    index, df_summary = m.result
+
+    payloads = render.build_payloads(index, df_summary)[:render_songs]
+    results.append(run(
+        f"render_songs ({len(payloads)}곡 png+html)",
+        lambda: render.render_songs(payloads, out_dir / "png", out_dir / "reports", export_png=True, export_html=True),
+    ))
+    results.append(run(
+        "plot_platform_summary",
+        lambda: charts.plot_platform_summary(df_metrics, out_dir / "png", index.platforms[0], index=index),
+    ))
+    return results
+
+
+def compare(previous: Optional[Dict], current: Dict, threshold: float, min_delta_sec: float) -> List[Dict]:
+    """직전 실행 대비 느려진 단계 목록. (비율과 절대 차이 모두 기준을 넘어야 회귀)"""
+    if not previous:
+        return []
+    regressions = []
+    for name, now in current["results"].items():
+        before = previous["results"].get(name)
+        if not before:
+            continue
+        delta = now["best_sec"] - before["best_sec"]
+        if delta > min_delta_sec and now["best_sec"] > before["best_sec"] * (1 + threshold):
+            regressions.append({
+                "name": name,
+                "before_sec": before["best_sec"],
+                "after_sec": now["best_sec"],
+                "ratio": now["best_sec"] / before["best_sec"] if before["best_sec"] else float("inf"),
+            })
+    return regressions
+
+
+def load_history(path: Path) -> List[Dict]:
+    if not path.exists():
+        return []
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def last_matching(history: List[Dict], params: Dict) -> Optional[Dict]:
+    for entry in reversed(history):
+        if entry.get("params") == params:
+            return entry
+    return None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="chart_maker 리포트 파이프라인 벤치마크")
+    parser.add_argument("--songs", type=int, default=2_000, help="곡 수 (기본: 2000)")
+    parser.add_argument("--days", type=int, default=60, help="일 수 (기본: 60)")
+    parser.add_argument("--hours", type=int, default=1, help="하루 수집 횟수 (기본: 1)")
+    parser.add_argument("--render-songs", type=int, default=20, help="렌더링 측정 곡 수 (기본: 20)")
+    parser.add_argument("--repeat", type=int, default=3, help="반복 횟수 (기본: 3, 최소 시간 채택)")
+    parser.add_argument("--memory", action="store_true", help="tracemalloc 최대 할당량도 측정")
+    parser.add_argument("--data-dir", type=Path, default=None,
+                        help="합성 로그 디렉토리 (없으면 생성, 생략 시 임시 디렉토리)")
+    parser.add_argument("--history", type=Path, default=DEFAULT_HISTORY, help="결과 이력 JSON 파일")
+    parser.add_argument("--no-save", action="store_true", help="이력 파일에 추가하지 않음")
+    parser.add_argument("--threshold", type=float, default=0.2, help="회귀 판정 비율 (기본: 0.2 = 20%%)")
+    parser.add_argument("--min-delta", type=float, default=0.05, help="회귀 판정 최소 차이(초, 기본: 0.05)")
+    parser.add_argument("--fail-on-regression", action="store_true", help="회귀가 있으면 종료 코드 1")
+    args = parser.parse_args()
+
+    # 측정 중 단계별 INFO 로그와 한글 글꼴 경고는 출력하지 않는다.
+    logging.getLogger().setLevel(logging.WARNING)
+    warnings.filterwarnings("ignore", message="Glyph .* missing from font")
+
+    params = {"songs": args.songs, "days": args.days, "hours": args.hours, "render_songs": args.render_songs}
+
+    with tempfile.TemporaryDirectory(prefix="chart_bench_") as tmp:
+        data_dir = args.data_dir or Path(tmp) / "logs"
+        if not data_dir.exists() or not any(data_dir.iterdir()):
+            stats = write_history(data_dir, args.songs, args.days, args.hours)
+            print(f"합성 로그 생성: {data_dir} ({stats.files}개 파일, {stats.records:,}건, "
+                  f"누락 {stats.gaps:,} / 중복 {stats.duplicates:,} / 감소 {stats.drops:,})")
+        measurements = run_suite(data_dir, Path(tmp) / "out", args.render_songs, args.repeat, args.memory)
+
+    current = {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "python": platform_mod.python_version(),
+        "params": params,
+        "results": {
+            m.label: {"best_sec": round(m.best_sec, 4), **({"peak_mb": round(m.peak_mb, 1)} if m.peak_mb is not None else {})}
+            for m in measurements
+        },
+    }
+
+    history = load_history(args.history)
+    previous = last_matching(history, params)
+    regressions = compare(previous, current, args.threshold, args.min_delta)
+    if previous:
+        print(f"\n직전 결과 ({previous.get('commit')}, {previous['timestamp']}) 대비:")
+        for name, now in current["results"].items():
+            before = previous["results"].get(name)
+            if before:
+                change = (now["best_sec"] / before["best_sec"] - 1) * 100 if before["best_sec"] else 0.0
+                print(f"  {name:<40} {before['best_sec']:8.3f}s → {now['best_sec']:8.3f}s ({change:+.1f}%)")
+    for r in regressions:
+        print(f"회귀: {r['name']} {r['before_sec']:.3f}s → {r['after_sec']:.3f}s ({r['ratio']:.2f}배)")
+
+    if not args.no_save:
+        args.history.parent.mkdir(parents=True, exist_ok=True)
+        history.append(current)
+        args.history.write_text(json.dumps(history, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"결과 저장: {args.history}")
+
+    if regressions and args.fail_on_regression:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
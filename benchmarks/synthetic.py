@@ -0,0 +1,85 @@
+"""벤치마크용 합성 데이터 생성기."""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+BASE_DATE = np.datetime64("2025-01-01T09:00")
+
+
+def metrics_frame(songs: int, days: int, seed: int = 0) -> pd.DataFrame:
+    """`metrics.add_metrics` 결과와 같은 모양의 곡 × 일 DataFrame을 만든다.
+
+    (platform, song_id, timestamp) 순으로 정렬되어 있고, 약 0.1%의 행에
+    누적값 감소(음수 diff) 이상치가 들어간다.
+    """
+    rng = np.random.default_rng(seed)
+    n = songs * days
+
+    song_ids = np.array([str(10_000_000 + i) for i in range(songs)], dtype=object)
+    timestamps = BASE_DATE + np.arange(days).astype("timedelta64[D]")
+
+    plays_inc = rng.integers(0, 500, size=(songs, days))
+    listeners_inc = rng.integers(0, 50, size=(songs, days))
+    drops = rng.random(size=(songs, days)) < 0.001
+    plays_inc[drops] = -5
+
+    total_plays = plays_inc.cumsum(axis=1).astype(np.float64)
+    total_listeners = listeners_inc.cumsum(axis=1).astype(np.float64)
+
+    delta_plays = np.full((songs, days), np.nan)
+    delta_plays[:, 1:] = np.diff(total_plays, axis=1)
+    delta_listeners = np.full((songs, days), np.nan)
+    delta_listeners[:, 1:] = np.diff(total_listeners, axis=1)
+    delta_minutes = np.full((songs, days), np.nan)
+    delta_minutes[:, 1:] = 24 * 60.0
+
+    df = pd.DataFrame(
+        {
+            "platform": np.full(n, "GENIE", dtype=object),
+            "song_id": np.repeat(song_ids, days),
+            "song_name": np.repeat(np.array([f"곡{i}" for i in range(songs)], dtype=object), days),
+            "artist_name": np.repeat(np.array([f"가수{i % 997}" for i in range(songs)], dtype=object), days),
+            "timestamp": np.tile(timestamps, songs),
+            "total_plays": total_plays.ravel(),
+            "total_listeners": total_listeners.ravel(),
+            "delta_plays": delta_plays.ravel(),
+            "delta_listeners": delta_listeners.ravel(),
+            "delta_minutes": delta_minutes.ravel(),
+        }
+    )
+    df["rate_plays_per_min"] = df["delta_plays"] / df["delta_minutes"]
+    df["rate_listeners_per_min"] = df["delta_listeners"] / df["delta_minutes"]
+    df["is_anomaly_negative_diff"] = (df["delta_plays"] < 0) | (df["delta_listeners"] < 0)
+    return df
+
+
+def raw_frame(songs: int, days: int, dup_rate: float = 0.02, seed: int = 0) -> pd.DataFrame:
+    """`io.load_jsonl` 결과와 같은 모양(문자열 date, 정수 hour/minute)의 원본 DataFrame을 만든다.
+
+    행 순서는 수집 순서처럼 날짜 우선이며, dup_rate 비율만큼 같은 키의 재수집 행이 섞인다.
+    """
+    rng = np.random.default_rng(seed)
+    n = songs * days
+
+    song_ids = np.array([str(10_000_000 + i) for i in range(songs)], dtype=object)
+    dates = np.datetime_as_string(BASE_DATE.astype("datetime64[D]") + np.arange(days), unit="D")
+
+    df = pd.DataFrame(
+        {
+            "platform": np.full(n, "GENIE", dtype=object),
+            "song_id": np.tile(song_ids, days),
+            "song_name": np.tile(np.array([f"곡{i}" for i in range(songs)], dtype=object), days),
+            "artist_name": np.tile(np.array([f"가수{i % 997}" for i in range(songs)], dtype=object), days),
+            "date": np.repeat(dates.astype(object), songs),
+            "hour": np.full(n, 9),
+            "minute": rng.integers(0, 3, size=n),
+            "total_plays": rng.integers(0, 10_000_000, size=n),
+            "total_listeners": rng.integers(0, 1_000_000, size=n),
+        }
+    )
+    if dup_rate > 0:
+        dups = df.sample(frac=dup_rate, random_state=seed)
+        df = pd.concat([df, dups], ignore_index=True)
+    return df
@@ -6,28 +6,43 @@ import logging
 from pathlib import Path
 from typing import Optional
 
-import matplotlib.pyplot as plt
-import pandas as pd
+import matplotlib
 
-from .utils import ensure_dir
+# 화면 출력 없이 파일로만 저장하므로 비대화형 백엔드를 고정한다 (워커 프로세스 포함).
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from .series_index import SongIndex, SongSeries  # noqa: E402
+from .trends import DEFAULT_MOVERS_QUERY, TrendEngine, TrendQuery  # noqa: E402
+from .utils import atomic_path, ensure_dir  # noqa: E402
 
 logger = logging.getLogger(__name__)
 
 
-def plot_song_totals(df: pd.DataFrame, outdir: Path, platform: str, song_id: str) -> None:
-    """곡별 total_plays / total_listeners 시계열 라인 차트를 생성한다."""
-    df_song = df[(df["platform"] == platform) & (df["song_id"] == song_id)].copy()
-    if df_song.empty:
+def _has_values(values) -> bool:
+    """배열/Series에 결측이 아닌 값이 하나라도 있는지 확인한다."""
+    return bool(pd.notna(values).any())
+
+
+def plot_song_totals(series: SongSeries, outdir: Path, platform: str, song_id: str) -> None:
+    """곡별 total_plays / total_listeners 시계열 라인 차트를 생성한다.
+
+    series는 이미 해당 곡의 행만 담은 시계열(곡 단위 DataFrame 또는 배열 딕셔너리)이다.
+    """
+    timestamps = series["timestamp"]
+    if len(timestamps) == 0:
         return
 
     outdir = ensure_dir(outdir)
     plt.figure(figsize=(10, 6))
 
-    plt.plot(df_song["timestamp"], df_song["total_plays"], label="total_plays", marker="o")
-    if df_song["total_listeners"].notna().any():
+    plt.plot(timestamps, series["total_plays"], label="total_plays", marker="o")
+    if _has_values(series["total_listeners"]):
         plt.plot(
-            df_song["timestamp"],
-            df_song["total_listeners"],
+            timestamps,
+            series["total_listeners"],
             label="total_listeners",
             marker="o",
         )
@@ -41,26 +56,30 @@ def plot_song_totals(df: pd.DataFrame, outdir: Path, platform: str, song_id: str
     plt.tight_layout()
 
     out_path = outdir / f"{platform}_{song_id}_totals.png"
-    plt.savefig(out_path)
+    with atomic_path(out_path) as tmp_path:
+        plt.savefig(tmp_path)
     plt.close()
     logger.info("곡별 totals 차트 저장: %s", out_path)
 
 
-def plot_song_deltas(df: pd.DataFrame, outdir: Path, platform: str, song_id: str) -> None:
-    """곡별 delta_plays / delta_listeners 시계열 차트를 생성한다."""
-    df_song = df[(df["platform"] == platform) & (df["song_id"] == song_id)].copy()
-    if df_song.empty:
+def plot_song_deltas(series: SongSeries, outdir: Path, platform: str, song_id: str) -> None:
+    """곡별 delta_plays / delta_listeners 시계열 차트를 생성한다.
+
+    series는 이미 해당 곡의 행만 담은 시계열(곡 단위 DataFrame 또는 배열 딕셔너리)이다.
+    """
+    timestamps = series["timestamp"]
+    if len(timestamps) == 0:
         return
 
     outdir = ensure_dir(outdir)
     plt.figure(figsize=(10, 6))
 
-    if df_song["delta_plays"].notna().any():
-        plt.plot(df_song["timestamp"], df_song["delta_plays"], label="delta_plays", marker="o")
-    if df_song["delta_listeners"].notna().any():
+    if _has_values(series["delta_plays"]):
+        plt.plot(timestamps, series["delta_plays"], label="delta_plays", marker="o")
+    if _has_values(series["delta_listeners"]):
         plt.plot(
-            df_song["timestamp"],
-            df_song["delta_listeners"],
+            timestamps,
+            series["delta_listeners"],
             label="delta_listeners",
             marker="o",
         )
@@ -74,7 +93,8 @@ def plot_song_deltas(df: pd.DataFrame, outdir: Path, platform: str, song_id: str
     plt.tight_layout()
 
     out_path = outdir / f"{platform}_{song_id}_delta.png"
-    plt.savefig(out_path)
+    with atomic_path(out_path) as tmp_path:
+        plt.savefig(tmp_path)
     plt.close()
     logger.info("곡별 delta 차트 저장: %s", out_path)
 
@@ -84,56 +104,64 @@ def plot_platform_summary(
     outdir: Path,
     platform: str,
     topn: int = 10,
+    index: Optional[SongIndex] = None,
+    query: TrendQuery = DEFAULT_MOVERS_QUERY,
+    engine: Optional[TrendEngine] = None,
 ) -> None:
-    """플랫폼 단위 요약 차트(최종 재생수 상위 N곡, 최근 증가량 상위 N곡)를 생성한다."""
-    df_plat = df[df["platform"] == platform].copy()
-    if df_plat.empty:
+    """플랫폼 단위 요약 차트(최종 재생수 상위 N곡, 추세 질의 상위 N곡)를 생성한다.
+
+    index/engine을 넘기면 곡별 구간 오프셋과 일자 인덱스를 재사용하므로
+    전체 프레임을 다시 정렬하지 않는다. 두 번째 차트의 기준은 query로 바꿀 수 있다.
+    (기본: 최근 3포인트 delta_plays 평균)
+    """
+    if engine is not None:
+        index = engine.index
+    if index is None:
+        index = SongIndex.build(df)
+    if engine is None:
+        engine = TrendEngine(index)
+
+    songs = index.platform_songs(platform)
+    if len(songs) == 0:
         return
 
     outdir = ensure_dir(outdir)
+    song_ids = index.song_ids[songs].astype(str)
 
     # 최종 시점 기준 total_plays 상위 N곡
-    last_points = (
-        df_plat.sort_values("timestamp")
-        .groupby("song_id", as_index=False)
-        .tail(1)
+    last_points = pd.DataFrame(
+        {
+            "song_id": song_ids,
+            "total_plays": index.column("total_plays")[index.last_rows(songs)],
+        }
     )
     top_totals = last_points.nlargest(topn, "total_plays")
 
     plt.figure(figsize=(10, 6))
-    plt.bar(top_totals["song_id"].astype(str), top_totals["total_plays"])
+    plt.bar(top_totals["song_id"], top_totals["total_plays"])
     plt.title(f"{platform} - 최종 total_plays 상위 {topn}곡")
     plt.xlabel("song_id")
     plt.ylabel("total_plays")
     plt.xticks(rotation=45, ha="right")
     plt.tight_layout()
     out_path = outdir / f"{platform}_top{topn}_totals.png"
-    plt.savefig(out_path)
+    with atomic_path(out_path) as tmp_path:
+        plt.savefig(tmp_path)
     plt.close()
     logger.info("플랫폼 요약 totals 차트 저장: %s", out_path)
 
-    # 최근 3포인트 기준 평균 delta_plays 상위 N곡
-    df_plat = df_plat.sort_values("timestamp")
-    last3 = df_plat.groupby("song_id").tail(3)
-    avg_delta = (
-        last3.groupby("song_id")["delta_plays"]
-        .mean()
-        .reset_index()
-        .rename(columns={"delta_plays": "avg_delta_plays"})
-    )
-    top_delta = avg_delta.nlargest(topn, "avg_delta_plays")
+    # 추세 질의 기준 상위 N곡
+    top_delta = engine.top_movers(query, topn, platform)
 
     plt.figure(figsize=(10, 6))
-    plt.bar(top_delta["song_id"].astype(str), top_delta["avg_delta_plays"])
-    plt.title(f"{platform} - 최근 delta_plays 평균 상위 {topn}곡")
+    plt.bar(top_delta["song_id"], top_delta[query.name])
+    plt.title(f"{platform} - {query.label} 상위 {topn}곡")
     plt.xlabel("song_id")
-    plt.ylabel("avg_delta_plays")
+    plt.ylabel(query.name)
     plt.xticks(rotation=45, ha="right")
     plt.tight_layout()
     out_path = outdir / f"{platform}_top{topn}_delta.png"
-    plt.savefig(out_path)
+    with atomic_path(out_path) as tmp_path:
+        plt.savefig(tmp_path)
     plt.close()
     logger.info("플랫폼 요약 delta 차트 저장: %s", out_path)
-
-
-
@@ -9,7 +9,8 @@ from typing import Iterable, List
 
 import pandas as pd
 
-from .utils import ensure_dir
+from . import log_index
+from .utils import ensure_dir, find_log_files, open_log
 
 logger = logging.getLogger(__name__)
 
@@ -18,15 +19,13 @@ def load_jsonl(path: Path) -> pd.DataFrame:
     """JSONL 파일을 읽어서 pandas DataFrame으로 반환한다.
     
     디렉토리를 입력받으면 재귀적으로 모든 하위 디렉토리의 *.jsonl 파일을 로드합니다.
+    압축된 로그(*.jsonl.gz, *.jsonl.zst, 월별 보관 파일 포함)는 스트리밍으로 풀어서 읽습니다.
     """
     records: List[dict] = []
 
+    files = find_log_files(path)
     if path.is_dir():
-        # 디렉토리인 경우 재귀적으로 모든 하위 디렉토리의 *.jsonl 파일 로드
-        files = sorted(path.rglob("*.jsonl"))
         logger.info("디렉토리에서 %d개의 JSONL 파일을 찾았습니다: %s", len(files), path)
-    else:
-        files = [path]
 
     if not files:
         logger.warning(f"JSONL 파일을 찾을 수 없습니다: {path}")
@@ -34,7 +33,7 @@ def load_jsonl(path: Path) -> pd.DataFrame:
 
     for f in files:
         try:
-            with f.open("r", encoding="utf-8") as fh:
+            with open_log(f) as fh:
                 for line in fh:
                     line = line.strip()
                     if not line:
@@ -55,6 +54,33 @@ def load_jsonl(path: Path) -> pd.DataFrame:
     return df
 
 
+def load_song_jsonl(path: Path, song_id: str) -> pd.DataFrame:
+    """JSONL 파일(또는 디렉토리)에서 song_id 곡의 레코드만 읽어 DataFrame으로 반환한다.
+
+    수집기가 남긴 사이드카 인덱스(*.jsonl.idx)가 있으면 해당 줄만 읽고,
+    없는 파일은 순차 조회한다. (chart_maker.log_index 참고)
+    """
+    files = find_log_files(path)
+    if not files:
+        logger.warning(f"JSONL 파일을 찾을 수 없습니다: {path}")
+        return pd.DataFrame()
+
+    records: List[dict] = []
+    for f in files:
+        try:
+            records.extend(log_index.iter_matching_records(f, "platform_song_ids", [song_id]))
+        except Exception as e:
+            logger.error("JSONL 파일 읽기 실패 (%s): %s", f, e)
+
+    if not records:
+        logger.warning("song_id=%s 레코드가 없습니다.", song_id)
+        return pd.DataFrame()
+
+    df = pd.DataFrame(records)
+    logger.info("song_id=%s 레코드 %d개를 로드했습니다. (파일 %d개)", song_id, len(df), len(files))
+    return df
+
+
 def save_summary_csv(df_summary: pd.DataFrame, out_dir: Path) -> None:
     """플랫폼별 요약 정보를 CSV로 저장한다."""
     if df_summary.empty:
@@ -0,0 +1,171 @@
+"""수집기 사이드카 인덱스(`*.jsonl.idx`)를 이용한 곡 단위 로그 조회.
+
+수집기(music_metrics_collector.logstore)는 일자별 로그 한 줄을 쓸 때마다
+`<바이트 오프셋>\\t<바이트 길이>\\t<song_id>\\t<track_cd>\\t<isrc_cd>` 한 줄을
+사이드카 파일에 추가한다. 여기서는 로그 파일을 mmap으로 열고 인덱스가 가리키는
+줄만 잘라 파싱하므로, 곡 하나의 이력을 꺼내는 비용이 전체 레코드 수가 아니라
+일자 파일 수에 비례한다.
+
+인덱스가 없는 파일, 인덱스 이후에 추가된 구간(인덱스 기록 전 중단 등),
+압축된 보관 파일은 값이 포함된 줄만 파싱하는 순차 조회로 대신한다.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import mmap
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Collection, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# 사이드카 형식(경로, 컬럼 순서)은 수집기(logstore)의 정의를 그대로 쓴다.
+from music_metrics_collector.logstore import INDEX_FIELDS, SIDECAR_SUFFIX, sidecar_path  # noqa: F401
+
+from .utils import open_log
+
+logger = logging.getLogger(__name__)
+
+
+# 이전 로그 형식(song_id 필드)과 현재 형식(platform_song_ids)을 함께 지원
+_FIELD_FALLBACKS = {"platform_song_ids": "song_id"}
+
+
+@dataclass
+class SidecarLookup:
+    """사이드카 인덱스 조회 결과"""
+
+    # 값이 일치하는 줄의 (오프셋, 길이) 목록 (파일 순서)
+    spans: List[Tuple[int, int]] = field(default_factory=list)
+    # 인덱스가 다루는 마지막 바이트 위치 (이후 구간은 순차 조회)
+    covered: int = 0
+
+
+def _span_pattern(name: str, values: Collection[str]) -> "re.Pattern[bytes]":
+    """name 컬럼 값이 values 중 하나인 사이드카 줄의 오프셋/길이를 잡는 정규식."""
+    skip = INDEX_FIELDS.index(name)
+    alternatives = b"|".join(re.escape(v.encode("utf-8")) for v in sorted(values))
+    return re.compile(
+        rb"^(\d+)\t(\d+)\t(?:[^\t\n]*\t){%d}(?:%s)(?:\t|$)" % (skip, alternatives),
+        re.MULTILINE,
+    )
+
+
+def lookup_sidecar(log_path: Path, name: str, values: Collection[str]) -> Optional[SidecarLookup]:
+    """사이드카 인덱스에서 name 값이 values에 속하는 줄을 찾는다. 인덱스가 없으면 None.
+
+    줄마다 파이썬에서 분해하지 않고 정규식 한 번으로 일치하는 줄만 뽑는다.
+    """
+    path = sidecar_path(log_path)
+    if name not in INDEX_FIELDS or not path.exists():
+        return None
+
+    data = path.read_bytes()
+    result = SidecarLookup()
+    for m in _span_pattern(name, values).finditer(data):
+        result.spans.append((int(m.group(1)), int(m.group(2))))
+
+    # 인덱스 줄은 오프셋 순으로 추가되므로 마지막 온전한 줄이 다루는 끝 위치를 사용한다.
+    end = data.rfind(b"\n")
+    if end > 0:
+        offset, length = data[data.rfind(b"\n", 0, end) + 1:end].split(b"\t")[:2]
+        result.covered = int(offset) + int(length)
+    return result
+
+
+def record_value(rec: Dict[str, Any], name: str) -> Optional[str]:
+    """레코드의 필드 값을 문자열로 반환한다. (이전 형식 필드명도 확인)"""
+    value = rec.get(name)
+    if value is None and name in _FIELD_FALLBACKS:
+        value = rec.get(_FIELD_FALLBACKS[name])
+    return None if value is None else str(value)
+
+
+def _needles(values: Collection[str]) -> List[bytes]:
+    """따옴표 없이 JSON 이스케이프된 값 (ensure_ascii 여부에 따른 두 표현 모두)"""
+    return sorted({
+        json.dumps(v, ensure_ascii=ascii_only)[1:-1].encode("utf-8")
+        for v in values
+        for ascii_only in (False, True)
+    })
+
+
+def _iter_region_lines(buf: mmap.mmap, start: int, stop: int) -> Iterator[bytes]:
+    pos = start
+    while pos < stop:
+        end = buf.find(b"\n", pos, stop)
+        end = stop if end < 0 else end + 1
+        yield buf[pos:end]
+        pos = end
+
+
+def _filter_lines(
+    lines: Iterable[bytes],
+    name: str,
+    values: Collection[str],
+    source: Path,
+) -> Iterator[Dict[str, Any]]:
+    """값이 포함된 줄만 파싱해 name 필드 값이 일치하는 레코드를 반환한다."""
+    needles = _needles(values)
+    for line in lines:
+        if not any(n in line for n in needles) or not line.strip():
+            continue
+        try:
+            rec = json.loads(line)
+        except json.JSONDecodeError as e:
+            logger.warning("JSONL 파싱 실패 (%s): %s", source, e)
+            continue
+        if record_value(rec, name) in values:
+            yield rec
+
+
+def iter_matching_records(
+    log_path: Path,
+    name: str,
+    values: Collection[str],
+) -> Iterator[Dict[str, Any]]:
+    """로그 파일에서 name 필드 값이 values에 속하는 레코드를 파일 순서대로 반환한다.
+
+    name이 인덱스 필드이고 사이드카가 있으면 해당 줄만 mmap에서 잘라 파싱한다.
+    인덱스가 로그와 맞지 않으면(파일이 다시 쓰인 경우 등) 경고 후 순차 조회한다.
+    """
+    values = frozenset(str(v) for v in values)
+    if not log_path.name.endswith(".jsonl"):
+        # 압축된 보관 파일은 사이드카가 없으므로 풀면서 순차 조회한다.
+        with open_log(log_path) as f:
+            lines = (line.encode("utf-8") for line in f)
+            yield from _filter_lines(lines, name, values, log_path)
+        return
+
+    size = log_path.stat().st_size
+    if size == 0 or not values:
+        return
+
+    index = lookup_sidecar(log_path, name, values)
+    with log_path.open("rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+        start = 0
+        if index is not None:
+            spans = sorted(index.spans)
+            found: List[Dict[str, Any]] = []
+            stale = index.covered > size
+            for offset, length in spans:
+                if stale:
+                    break
+                try:
+                    rec = json.loads(buf[offset:offset + length])
+                except json.JSONDecodeError:
+                    stale = True
+                    break
+                if record_value(rec, name) not in values:
+                    stale = True
+                    break
+                found.append(rec)
+
+            if stale:
+                logger.warning("사이드카 인덱스가 로그와 맞지 않아 전체를 읽습니다: %s", log_path)
+            else:
+                yield from found
+                start = index.covered
+
+        yield from _filter_lines(_iter_region_lines(buf, start, size), name, values, log_path)
@@ -13,16 +13,52 @@
         --input data/logs/2025-12-17_GENIE.jsonl \
         --outdir output \
         --topn 10
+
+    # 곡별 차트/리포트를 4개 프로세스로 병렬 렌더링
+    python -m chart_maker.main render \
+        --input data/logs \
+        --outdir output \
+        --jobs 4
+
+    # 플랫폼 요약의 급상승 차트를 7일 증가량 합계 기준으로, 일자별 추세 CSV도 저장
+    python -m chart_maker.main render \
+        --input data/logs \
+        --outdir output \
+        --movers sum:7 \
+        --export-trends
+
+    # 최근 30일 청취자 증가량 상위 50곡 (특정 기획사)
+    python -m chart_maker.main query \
+        --input data/logs \
+        --last-days 30 \
+        --where mem_cd=L20220049 \
+        --top 50
+
+    # 느린 단계 진단: cProfile/스택 샘플/단계별 메모리를 output/profile 에 저장
+    python -m chart_maker.main render \
+        --input data/logs \
+        --outdir output \
+        --profile
+
+    # 특정 ISRC들의 시계열을 CSV로 저장
+    python -m chart_maker.main query \
+        --input data/logs \
+        --isrc QZEKE1873038,KRA381200123 \
+        --output isrc_series.csv
 """
 
 from __future__ import annotations
 
 import argparse
 import logging
+from contextlib import nullcontext
 from pathlib import Path
 from typing import Optional
 
-from . import charts, io, metrics, report, transform, utils
+# charts(matplotlib)는 PNG를 만들 때만 불러온다. (CSV/HTML만 만들 때 기동 시간 절약)
+from . import io, metrics, query, render, report, transform, utils
+from .series_index import SongIndex
+from .trends import DEFAULT_MOVERS_QUERY, TrendEngine, TrendQuery
 
 
 logger = logging.getLogger(__name__)
@@ -85,6 +121,109 @@ def _parse_args() -> argparse.Namespace:
         action="store_false",
         help="PNG 생성을 비활성화",
     )
+    render.add_argument(
+        "--html-mode",
+        dest="html_mode",
+        choices=list(report.HTML_MODES),
+        default="shared",
+        help=(
+            "HTML 리포트 방식. shared: plotly.js를 reports/assets에 한 번만 기록하고 "
+            "곡별 페이지에는 데이터만 포함 (기본), standalone: 페이지마다 plotly.js 포함"
+        ),
+    )
+    render.add_argument(
+        "--html-dashboard",
+        dest="html_dashboard",
+        action="store_true",
+        default=False,
+        help="전체 곡 리포트를 탐색하는 reports/index.html 대시보드 생성",
+    )
+    render.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="곡별 차트/리포트 렌더링 프로세스 수 (기본: 1, 0이면 CPU 코어 수)",
+    )
+    render.add_argument(
+        "--movers",
+        type=TrendQuery.parse,
+        default=DEFAULT_MOVERS_QUERY,
+        help=(
+            "플랫폼 요약 급상승 차트 기준 (recent_mean:N, sum:N, wow:N, ewma:N). "
+            "기본: recent_mean:3 (최근 3포인트 delta_plays 평균)"
+        ),
+    )
+    render.add_argument(
+        "--export-trends",
+        dest="export_trends",
+        action="store_true",
+        default=False,
+        help="마지막 날짜 기준 곡별 7/28일 합계, 전주 대비 증가율, EWMA를 trends/ 에 CSV로 저장 (일자별 캐시)",
+    )
+    render.add_argument(
+        "--profile",
+        action="store_true",
+        default=False,
+        help=(
+            "cProfile, flamegraph용 스택 샘플(stacks.folded), 단계별(load/transform/metrics/summary/render/write) "
+            "tracemalloc 결과를 <outdir>/profile 에 저장"
+        ),
+    )
+    render.add_argument(
+        "--profile-no-memory",
+        dest="profile_memory",
+        action="store_false",
+        default=True,
+        help="--profile에서 tracemalloc을 끔 (렌더링이 4~5배 느려지는 것을 피하고 시간 분포만 볼 때)",
+    )
+
+    q = sub.add_parser(
+        "query",
+        help="수집 로그를 전부 로드하지 않고 조건/기간으로 걸러 CSV로 출력",
+    )
+    q.add_argument(
+        "--input",
+        required=True,
+        help="수집 로그 디렉토리 또는 JSONL 파일 (파일명 YYYY-MM-DD_PLATFORM.jsonl 기준으로 기간 프루닝)",
+    )
+    q.add_argument("--since", default=None, help="시작 req_date (YYYY-MM-DD, 포함)")
+    q.add_argument("--until", default=None, help="종료 req_date (YYYY-MM-DD, 포함)")
+    q.add_argument(
+        "--last-days",
+        dest="last_days",
+        type=int,
+        default=None,
+        help="마지막 수집일 기준 최근 N일 (--until이 있으면 그 날짜 기준)",
+    )
+    q.add_argument("--platform", default=None, help="특정 플랫폼만 (예: GENIE)")
+    q.add_argument("--song-id", dest="song_id", default=None, help="platform_song_ids 조건 (쉼표로 여러 개)")
+    q.add_argument("--isrc", default=None, help="isrc_cd 조건 (쉼표로 여러 개)")
+    q.add_argument("--mem-cd", dest="mem_cd", default=None, help="mem_cd 조건 (쉼표로 여러 개)")
+    q.add_argument(
+        "--where",
+        action="append",
+        default=[],
+        help="필드=값[,값...] 조건 (여러 번 지정 가능, 예: --where interest_yn=Y)",
+    )
+    q.add_argument(
+        "--columns",
+        default=",".join(query.DEFAULT_SERIES_COLUMNS),
+        help="시계열 출력 컬럼 (쉼표 구분, 기본: %(default)s)",
+    )
+    q.add_argument(
+        "--top",
+        type=int,
+        default=None,
+        help="지정하면 곡별 기간 내 --metric 증가량 상위 N곡을 출력",
+    )
+    q.add_argument("--metric", default="res_listeners", help="--top 기준 지표 (기본: res_listeners)")
+    q.add_argument("--output", default=None, help="결과 CSV 경로 (생략 시 표준 출력)")
+    q.add_argument(
+        "--no-index",
+        dest="use_index",
+        action="store_false",
+        help="파일 통계 인덱스(.query_index.json)를 사용/갱신하지 않음",
+    )
 
     return parser.parse_args()
 
@@ -97,17 +236,63 @@ def cmd_render(
     topn: int,
     export_html: bool,
     export_png: bool,
+    jobs: int = 1,
+    html_mode: str = "shared",
+    html_dashboard: bool = False,
+    movers: TrendQuery = DEFAULT_MOVERS_QUERY,
+    export_trends: bool = False,
+    profile: bool = False,
+    profile_memory: bool = True,
 ) -> None:
     utils.setup_logging()
 
+    profiler = None
+    if profile:
+        from music_metrics_collector.profiling import Profiler
+
+        if render.resolve_jobs(jobs) > 1:
+            logger.warning("--profile은 현재 프로세스만 기록합니다. 곡별 렌더링까지 보려면 --jobs 1로 실행하세요.")
+        profiler = Profiler(Path(outdir) / "profile", trace_memory=profile_memory).start()
+    try:
+        _render(
+            input_path, outdir, platform, song_id, topn, export_html, export_png, jobs,
+            html_mode, html_dashboard, movers, export_trends,
+            phase=profiler.phase if profiler is not None else (lambda name: nullcontext()),
+        )
+    finally:
+        if profiler is not None:
+            logger.info("프로파일 요약: %s", profiler.stop())
+
+
+def _render(
+    input_path: Path,
+    outdir: Path,
+    platform: Optional[str],
+    song_id: Optional[str],
+    topn: int,
+    export_html: bool,
+    export_png: bool,
+    jobs: int,
+    html_mode: str,
+    html_dashboard: bool,
+    movers: TrendQuery,
+    export_trends: bool,
+    phase,
+) -> None:
     logger.info("입력 JSONL 로드 시작: %s", input_path)
-    df_raw = io.load_jsonl(input_path)
+    with phase("load"):
+        if song_id:
+            # 곡 하나만 그릴 때는 사이드카 인덱스로 해당 곡 레코드만 읽는다.
+            df_raw = io.load_song_jsonl(input_path, str(song_id))
+        else:
+            df_raw = io.load_jsonl(input_path)
     if df_raw.empty:
         logger.error("입력 데이터가 비어 있습니다. 종료합니다.")
         return
 
     # 정규화/정제
-    df_norm, dup_count = transform.normalize(df_raw)
+    with phase("transform"):
+        df_norm, dup_count = transform.normalize(df_raw)
     logger.info("정규화 완료. 중복 충돌 건수: %d", dup_count)
 
     # 필터링
@@ -121,46 +306,100 @@ def cmd_render(
         return
 
     # 파생 지표 계산
-    df_metrics, num_anomalies = metrics.add_metrics(df_norm)
+    with phase("metrics"):
+        df_metrics, num_anomalies = metrics.add_metrics(df_norm)
     logger.info("파생 지표 계산 완료. 음수 diff 이상치: %d건", num_anomalies)
 
-    # 요약 테이블 생성
-    df_summary, anomalies_per_platform = report.build_summary_table(df_metrics)
+    # 곡별 구간 인덱스 (차트/리포트가 공통으로 사용)
+    with phase("summary"):
+        index = SongIndex.build(df_metrics)
+        trend_engine = TrendEngine(index)
+
+        # 요약 테이블 생성
+        df_summary, anomalies_per_platform = report.build_summary_table(df_metrics, index=index)
 
     outdir = Path(outdir)
     png_dir = outdir / "png"
     html_dir = outdir / "reports"
     csv_dir = outdir / "csv"
 
-    # 곡별 차트 생성 (PNG)
-    if export_png:
-        for (plat, sid), g in df_metrics.groupby(["platform", "song_id"]):
-            charts.plot_song_totals(g, png_dir, plat, sid)
-            charts.plot_song_deltas(g, png_dir, plat, sid)
+    with phase("render"):
+        # 곡별 차트(PNG) / HTML 리포트
+        if export_html and html_mode == "shared":
+            report.write_plotly_asset(html_dir)
+
+        if export_png or export_html:
+            payloads = render.build_payloads(index, df_summary if export_html else None)
+            render.render_songs(
+                payloads,
+                png_dir,
+                html_dir,
+                export_png=export_png,
+                export_html=export_html,
+                jobs=jobs,
+                html_mode=html_mode,
+            )
 
         # 플랫폼 요약 차트
-        plats = [platform] if platform else sorted(df_metrics["platform"].unique())
-        for plat in plats:
-            charts.plot_platform_summary(df_metrics, png_dir, plat, topn=topn)
-
-    # 곡별 HTML 리포트
-    if export_html:
-        for (plat, sid), g in df_metrics.groupby(["platform", "song_id"]):
-            row = df_summary[
-                (df_summary["platform"] == plat) & (df_summary["song_id"] == sid)
-            ]
-            if row.empty:
-                continue
-            summary_row = row.iloc[0]
-            out_path = html_dir / f"{plat}_{sid}_report.html"
-            report.generate_song_report_html(g, summary_row, out_path)
-
-    # 요약 CSV 저장
-    io.save_summary_csv(df_summary, csv_dir)
+        if export_png:
+            from . import charts
+
+            plats = [platform] if platform else sorted(set(index.platforms))
+            for plat in plats:
+                charts.plot_platform_summary(
+                    df_metrics, png_dir, plat, topn=topn, query=movers, engine=trend_engine
+                )
+
+        if export_html and html_dashboard:
+            report.generate_dashboard_html(df_summary, html_dir)
+
+    with phase("write"):
+        # 요약 CSV 저장
+        io.save_summary_csv(df_summary, csv_dir)
+
+        # 일자별 추세 스냅샷 (같은 날짜/데이터면 캐시 재사용)
+        if export_trends:
+            trend_engine.snapshot(cache_dir=outdir / "trends")
 
     logger.info("렌더링 완료. 출력 디렉토리: %s", outdir)
 
 
+def cmd_query(args: argparse.Namespace) -> None:
+    utils.setup_logging()
+
+    input_path = Path(args.input)
+    try:
+        where = query.parse_where(args.where)
+    except ValueError as e:
+        logger.error("%s", e)
+        return
+    for name, value in (
+        (query.SONG_FIELD, args.song_id),
+        ("isrc_cd", args.isrc),
+        ("mem_cd", args.mem_cd),
+    ):
+        if value:
+            where.update(query.parse_where([f"{name}={value}"]))
+
+    since, until = query.resolve_period(input_path, args.since, args.until, args.last_days)
+    spec = query.QuerySpec(
+        since=since,
+        until=until,
+        platform=args.platform,
+        where=where,
+        columns=tuple(c.strip() for c in args.columns.split(",") if c.strip()),
+    )
+    count = query.run_query(
+        input_path,
+        spec,
+        top=args.top,
+        metric=args.metric,
+        output=Path(args.output) if args.output else None,
+        use_index=args.use_index,
+    )
+    logger.info("질의 완료: %d행 (기간 %s ~ %s)", count, since or "-", until or "-")
+
+
 def main() -> None:
     args = _parse_args()
 
@@ -173,7 +412,16 @@ def main() -> None:
             topn=args.topn,
             export_html=args.export_html,
             export_png=args.export_png,
+            jobs=args.jobs,
+            html_mode=args.html_mode,
+            html_dashboard=args.html_dashboard,
+            movers=args.movers,
+            export_trends=args.export_trends,
+            profile=args.profile,
+            profile_memory=args.profile_memory,
         )
+    elif args.command == "query":
+        cmd_query(args)
 
 
 if __name__ == "__main__":
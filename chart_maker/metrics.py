@@ -3,14 +3,94 @@
 from __future__ import annotations
 
 import logging
-from typing import Tuple
+from dataclasses import dataclass
+from typing import Sequence, Tuple
 
+import numpy as np
 import pandas as pd
 
+from .series_index import SongIndex
+
 logger = logging.getLogger(__name__)
 
 
-def add_metrics(df: pd.DataFrame) -> Tuple[pd.DataFrame, int]:
+WINDOW_KINDS = ("delta", "mean", "growth_pct")
+
+
+@dataclass(frozen=True)
+class DerivedWindow:
+    """add_metrics에서 추가로 계산할 곡 단위 윈도우 지표.
+
+    periods는 행(수집 시점) 개수 기준이다. 하루 한 번 수집한 로그라면
+    DerivedWindow("total_plays", "delta", 7)이 7일 증가량이 된다.
+
+    kind:
+        - delta: periods 행 전 값과의 차이
+        - mean: 최근 periods 행 이동 평균 (결측이 섞이면 NaN)
+        - growth_pct: periods 행 전 대비 증가율(%)
+    """
+
+    column: str
+    kind: str
+    periods: int
+
+    @property
+    def name(self) -> str:
+        """결과 컬럼명. 예: delta7_total_plays"""
+        return f"{self.kind}{self.periods}_{self.column}"
+
+
+def segment_positions(offsets: np.ndarray) -> np.ndarray:
+    """각 행이 자기 곡 구간에서 몇 번째 행인지(0부터)를 반환한다."""
+    lengths = np.diff(offsets)
+    starts = np.repeat(offsets[:-1], lengths)
+    return np.arange(offsets[-1]) - starts
+
+
+def segment_diff(values: np.ndarray, positions: np.ndarray, periods: int = 1) -> np.ndarray:
+    """곡 구간 안에서 periods 행 전 값과의 차이. 이전 값이 없는 위치는 NaN."""
+    values = values.astype(np.float64, copy=False)
+    out = np.full(len(values), np.nan)
+    if periods < len(values):
+        out[periods:] = values[periods:] - values[:-periods]
+    out[positions < periods] = np.nan
+    return out
+
+
+def segment_rolling_mean(values: np.ndarray, positions: np.ndarray, window: int) -> np.ndarray:
+    """곡 구간 안에서 최근 window 행의 이동 평균. 행이 모자라거나 결측이 있으면 NaN."""
+    values = values.astype(np.float64, copy=False)
+    valid = ~np.isnan(values)
+    csum = np.concatenate(([0.0], np.cumsum(np.where(valid, values, 0.0))))
+    ccnt = np.concatenate(([0], np.cumsum(valid)))
+
+    out = np.full(len(values), np.nan)
+    stop = np.arange(window, len(values) + 1)
+    total = csum[stop] - csum[stop - window]
+    count = ccnt[stop] - ccnt[stop - window]
+    out[window - 1:] = np.where(count == window, total / window, np.nan)
+    out[positions < window - 1] = np.nan
+    return out
+
+
+def _window_values(window: DerivedWindow, values: np.ndarray, positions: np.ndarray) -> np.ndarray:
+    """DerivedWindow 하나를 계산한다."""
+    if window.kind == "delta":
+        return segment_diff(values, positions, window.periods)
+    if window.kind == "mean":
+        return segment_rolling_mean(values, positions, window.periods)
+    if window.kind == "growth_pct":
+        delta = segment_diff(values, positions, window.periods)
+        base = values.astype(np.float64) - delta
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(base > 0, delta / base * 100.0, np.nan)
+    raise ValueError(f"지원하지 않는 window kind입니다: {window.kind} (지원: {WINDOW_KINDS})")
+
+
+def add_metrics(
+    df: pd.DataFrame,
+    windows: Sequence[DerivedWindow] = (),
+) -> Tuple[pd.DataFrame, int]:
     """
     곡별 시계열에 파생 지표를 추가한다.
 
@@ -21,6 +101,11 @@ def add_metrics(df: pd.DataFrame) -> Tuple[pd.DataFrame, int]:
         - rate_plays_per_min
         - rate_listeners_per_min
         - is_anomaly_negative_diff (음수 diff 여부)
+        - windows로 지정한 추가 지표 (DerivedWindow.name)
+
+    (platform, song_id, timestamp) 정렬은 한 번만 수행하고(이미 정렬된 입력은 생략),
+    곡 경계를 기준으로 연속 배열에서 NumPy diff를 계산하므로 지표 수만큼
+    groupby를 반복하지 않는다. 증가율 컬럼은 float64이며 계산 불가 시 NaN이다.
 
     Returns:
         (지표가 추가된 DataFrame, 음수 diff 이상치 개수)
@@ -28,40 +113,41 @@ def add_metrics(df: pd.DataFrame) -> Tuple[pd.DataFrame, int]:
     if df.empty:
         return df.copy(), 0
 
-    df = df.copy()
+    index = SongIndex.build(df)
+    # 얕은 복사: 새 컬럼만 추가하므로 입력 DataFrame은 변경되지 않는다.
+    df = index.df.copy(deep=False)
+    positions = segment_positions(index.offsets)
 
-    df = df.sort_values(["platform", "song_id", "timestamp"])
+    total_plays = index.float_column("total_plays")
+    total_listeners = index.float_column("total_listeners")
 
-    df["delta_plays"] = (
-        df.groupby(["platform", "song_id"])["total_plays"].diff()
-    )
-    df["delta_listeners"] = (
-        df.groupby(["platform", "song_id"])["total_listeners"].diff()
-    )
+    delta_plays = segment_diff(total_plays, positions)
+    delta_listeners = segment_diff(total_listeners, positions)
 
     # 분 단위 시간 차이
-    df["delta_minutes"] = (
-        df.groupby(["platform", "song_id"])["timestamp"]
-        .diff()
-        .dt.total_seconds()
-        .div(60.0)
-    )
+    ts = index.column("timestamp")
+    delta_minutes = np.full(len(ts), np.nan)
+    delta_minutes[1:] = (ts[1:] - ts[:-1]) / np.timedelta64(1, "m")
+    delta_minutes[positions < 1] = np.nan
 
     # 증가율 (분당)
     # delta_minutes <= 0 인 경우는 NaN 처리
-    valid_time = df["delta_minutes"] > 0
-    df["rate_plays_per_min"] = pd.NA
-    df["rate_listeners_per_min"] = pd.NA
+    valid_time = delta_minutes > 0
+    with np.errstate(invalid="ignore", divide="ignore"):
+        rate_plays = np.where(valid_time, delta_plays / delta_minutes, np.nan)
+        rate_listeners = np.where(valid_time, delta_listeners / delta_minutes, np.nan)
+
+    df["delta_plays"] = delta_plays
+    df["delta_listeners"] = delta_listeners
+    df["delta_minutes"] = delta_minutes
+    df["rate_plays_per_min"] = rate_plays
+    df["rate_listeners_per_min"] = rate_listeners
 
-    df.loc[valid_time, "rate_plays_per_min"] = (
-        df.loc[valid_time, "delta_plays"] / df.loc[valid_time, "delta_minutes"]
-    )
-    df.loc[valid_time, "rate_listeners_per_min"] = (
-        df.loc[valid_time, "delta_listeners"] / df.loc[valid_time, "delta_minutes"]
-    )
+    for window in windows:
+        df[window.name] = _window_values(window, index.float_column(window.column), positions)
 
     # 누적값이 감소하는 경우 이상치로 표시
-    anomaly_mask = (df["delta_plays"] < 0) | (df["delta_listeners"] < 0)
+    anomaly_mask = (delta_plays < 0) | (delta_listeners < 0)
     df["is_anomaly_negative_diff"] = anomaly_mask
     num_anomalies = int(anomaly_mask.sum())
 
@@ -69,6 +155,3 @@ def add_metrics(df: pd.DataFrame) -> Tuple[pd.DataFrame, int]:
         logger.warning("누적값 감소 이상치 %d건 발견 (음수 diff)", num_anomalies)
 
     return df, num_anomalies
-
-
-
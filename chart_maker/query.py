@@ -0,0 +1,478 @@
+"""수집 로그(JSONL)를 전부 메모리에 올리지 않고 질의하는 스캐너.
+
+`data/logs/{req_date}_{platform}.jsonl` 파일을 다음 순서로 걸러 가며 읽는다.
+
+1. 파티션 프루닝: 파일명의 req_date/플랫폼으로 기간·플랫폼 밖의 파일을 건너뛴다.
+2. 파일 통계 인덱스: 파일별 req_date 최소/최대값과 song_id/track_cd/isrc_cd/mem_cd
+   목록을 `.query_index.json`에 캐시해 두고, 찾는 키가 없는 파일은 열지 않는다.
+   (통계가 없거나 파일 크기/수정 시각이 바뀐 파일은 스캔하면서 통계를 모아 다음
+   질의부터 쓴다. 인덱스에 통계가 있는 파일은 파일명 대신 실제 req_date 범위로 기간 프루닝)
+3. 조건 푸시다운: 동등 조건 값의 JSON 표현이 줄에 없으면 json.loads를 생략한다.
+4. 컬럼 푸시다운: 필요한 필드만 남기고, 상위 N 질의는 곡별 처음/마지막 값만 유지한다.
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+import logging
+import os
+import sys
+from dataclasses import asdict, dataclass, field
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, TextIO, Tuple
+
+from music_metrics_collector.logstore import LOG_NAME_RE
+
+from . import log_index
+from .utils import atomic_path, find_log_files, open_log
+
+logger = logging.getLogger(__name__)
+
+
+DATE_FIELD = "req_date"
+SONG_FIELD = "platform_song_ids"
+# 레코드에 없으면 파일명의 플랫폼으로 채운다. (수집기 로그는 파일명에만 플랫폼이 있다)
+PLATFORM_FIELD = "platform"
+# 파일 통계 인덱스에 값 목록을 저장하는 필드 (파일 단위 프루닝에 사용)
+INDEXED_FIELDS = ("platform_song_ids", "track_cd", "isrc_cd", "mem_cd")
+INDEX_FILENAME = ".query_index.json"
+INDEX_VERSION = 1
+
+DEFAULT_SERIES_COLUMNS = (
+    "req_date",
+    "platform_song_ids",
+    "song_name_kor",
+    "artist_name_kor",
+    "res_listeners",
+)
+TOP_COLUMNS = ("song_name_kor", "artist_name_kor", "mem_cd", "isrc_cd")
+
+@dataclass(frozen=True)
+class Partition:
+    """로그 파일 하나와 파일명에서 얻은 파티션 값."""
+
+    path: Path
+    req_date: Optional[str]
+    platform: Optional[str]
+
+
+@dataclass
+class FileStats:
+    """파일 하나의 요약 통계 (파일 단위 프루닝용)."""
+
+    size: int
+    mtime_ns: int
+    rows: int = 0
+    min_date: Optional[str] = None
+    max_date: Optional[str] = None
+    keys: Dict[str, List[str]] = field(default_factory=dict)
+
+    def may_contain(self, predicates: Dict[str, frozenset]) -> bool:
+        """인덱스된 필드 조건 중 하나라도 값이 겹치지 않으면 False."""
+        for name, values in predicates.items():
+            present = self.keys.get(name)
+            if present is not None and values.isdisjoint(present):
+                return False
+        return True
+
+    def overlaps(self, since: Optional[str], until: Optional[str]) -> bool:
+        """파일의 req_date 범위가 [since, until]과 겹치는지 확인한다."""
+        if self.min_date is None:
+            return self.rows > 0
+        if since and self.max_date < since:
+            return False
+        if until and self.min_date > until:
+            return False
+        return True
+
+
+@dataclass
+class QuerySpec:
+    """질의 조건.
+
+    where는 필드 → 허용 값 집합(IN 조건)이며, 값은 문자열로 비교한다.
+    """
+
+    since: Optional[str] = None
+    until: Optional[str] = None
+    platform: Optional[str] = None
+    where: Dict[str, frozenset] = field(default_factory=dict)
+    columns: Tuple[str, ...] = DEFAULT_SERIES_COLUMNS
+
+
+def parse_where(items: Iterable[str]) -> Dict[str, frozenset]:
+    """'field=v1,v2' 형식 조건 목록을 {field: {v1, v2}}로 변환한다. 같은 필드는 교집합."""
+    where: Dict[str, frozenset] = {}
+    for item in items:
+        name, sep, values = item.partition("=")
+        if not sep or not name.strip():
+            raise ValueError(f"조건 형식이 잘못되었습니다: {item!r} (예: mem_cd=L20220049)")
+        parsed = frozenset(v.strip() for v in values.split(",") if v.strip())
+        name = name.strip()
+        where[name] = where[name] & parsed if name in where else parsed
+    return where
+
+
+def discover_partitions(root: Path) -> List[Partition]:
+    """입력 경로의 JSONL 파일을 req_date, 플랫폼 순으로 나열한다."""
+    files = find_log_files(root)
+    partitions = []
+    for path in files:
+        m = LOG_NAME_RE.match(path.name)
+        if m:
+            partitions.append(Partition(path, m.group(1), m.group(2)))
+        else:
+            partitions.append(Partition(path, None, None))
+    partitions.sort(key=lambda p: (p.req_date or "", p.platform or "", str(p.path)))
+    return partitions
+
+
+def prune_partitions(
+    partitions: Sequence[Partition],
+    spec: QuerySpec,
+    index: Optional["StatsIndex"] = None,
+) -> List[Partition]:
+    """파일명의 req_date/플랫폼이 조건 밖인 파일을 제외한다. (파일명 규칙이 다르면 유지)
+
+    파일명 날짜와 내용의 req_date가 다른 파일(수동으로 옮긴 파일 등)도 있으므로,
+    인덱스에 최신 통계가 있으면 파일명 대신 실제 req_date 범위로 판단한다.
+    """
+    kept = []
+    for p in partitions:
+        if p.req_date is not None:
+            stats = index.peek(p.path) if index is not None else None
+            if stats is not None:
+                if not stats.overlaps(spec.since, spec.until):
+                    continue
+            else:
+                # 월별 보관 파일(YYYY-MM)은 조건 날짜의 월과 비교한다.
+                n = len(p.req_date)
+                if (spec.since and p.req_date < spec.since[:n]) or (spec.until and p.req_date > spec.until[:n]):
+                    continue
+        if spec.platform and p.platform is not None and p.platform != spec.platform:
+            continue
+        kept.append(p)
+    return kept
+
+
+def _record_date(rec: Dict[str, Any]) -> Optional[str]:
+    value = rec.get(DATE_FIELD) or rec.get("date")
+    return None if value is None else str(value)
+
+
+def _iter_lines(path: Path) -> Iterator[str]:
+    """파일의 비어 있지 않은 줄을 순회한다."""
+    with open_log(path) as f:
+        for line in f:
+            if line.strip():
+                yield line
+
+
+class _StatsBuilder:
+    """레코드를 한 건씩 받아 파일 하나의 FileStats를 만든다."""
+
+    def __init__(self, path: Path):
+        # 읽기 전에 크기/수정 시각을 잡아 두어, 읽는 도중 추가된 줄이 있으면 다음에 다시 계산한다.
+        st = path.stat()
+        self.stats = FileStats(size=st.st_size, mtime_ns=st.st_mtime_ns)
+        self._keys: Dict[str, set] = {name: set() for name in INDEXED_FIELDS}
+
+    def add(self, rec: Dict[str, Any]) -> None:
+        stats = self.stats
+        stats.rows += 1
+        d = _record_date(rec)
+        if d is not None:
+            stats.min_date = d if stats.min_date is None else min(stats.min_date, d)
+            stats.max_date = d if stats.max_date is None else max(stats.max_date, d)
+        for name in INDEXED_FIELDS:
+            value = rec.get(name)
+            if value not in (None, ""):
+                self._keys[name].add(str(value))
+
+    def finish(self) -> FileStats:
+        self.stats.keys = {name: sorted(values) for name, values in self._keys.items()}
+        return self.stats
+
+
+def compute_file_stats(path: Path) -> FileStats:
+    """파일 하나를 읽어 통계 인덱스 항목을 만든다."""
+    builder = _StatsBuilder(path)
+    for line in _iter_lines(path):
+        try:
+            rec = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        builder.add(rec)
+    return builder.finish()
+
+
+class StatsIndex:
+    """파일별 FileStats를 JSON 파일 하나에 캐시한다.
+
+    read_only이면(인덱스 디렉토리에 쓸 수 없을 때) 저장된 통계만 쓰고 새로 모으지 않는다.
+    """
+
+    def __init__(self, path: Optional[Path], read_only: bool = False):
+        self.path = path
+        self.read_only = read_only or path is None
+        self._entries: Dict[str, FileStats] = {}
+        self._dirty = False
+        if path is not None and path.exists():
+            try:
+                data = json.loads(path.read_text(encoding="utf-8"))
+                if data.get("version") == INDEX_VERSION:
+                    self._entries = {k: FileStats(**v) for k, v in data.get("files", {}).items()}
+            except (OSError, ValueError, TypeError) as e:
+                logger.warning("질의 인덱스를 읽지 못해 다시 만듭니다 (%s): %s", path, e)
+
+    def peek(self, path: Path) -> Optional[FileStats]:
+        """파일이 바뀌지 않았을 때만 캐시된 통계를 반환한다. (계산하지 않음)"""
+        cached = self._entries.get(str(path.resolve()))
+        if cached is None:
+            return None
+        st = path.stat()
+        if cached.size != st.st_size or cached.mtime_ns != st.st_mtime_ns:
+            return None
+        return cached
+
+    def put(self, path: Path, stats: FileStats) -> None:
+        """스캔하면서 모은 통계를 기록한다. (저장은 save에서)"""
+        if self.read_only:
+            return
+        self._entries[str(path.resolve())] = stats
+        self._dirty = True
+
+    def get(self, path: Path) -> FileStats:
+        """파일의 통계를 반환한다. 캐시가 없거나 파일이 바뀌었으면 다시 계산한다."""
+        cached = self.peek(path)
+        if cached is not None:
+            return cached
+        stats = compute_file_stats(path)
+        self.put(path, stats)
+        return stats
+
+    def save(self) -> None:
+        """변경된 인덱스를 저장한다. (쓰기 실패는 경고만 남김)"""
+        if self.read_only or not self._dirty:
+            return
+        payload = {
+            "version": INDEX_VERSION,
+            "files": {k: asdict(v) for k, v in self._entries.items()},
+        }
+        try:
+            with atomic_path(self.path) as tmp_path:
+                tmp_path.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+            self._dirty = False
+        except OSError as e:
+            logger.warning("질의 인덱스를 저장하지 못했습니다 (%s): %s", self.path, e)
+
+
+def _needles(where: Dict[str, frozenset]) -> List[Tuple[str, ...]]:
+    """줄 단위 사전 필터: 조건마다 줄에 반드시 포함되어야 하는 값 표현 후보.
+
+    따옴표 없이 JSON 이스케이프된 값만 사용하므로 문자열/숫자 필드 모두에 맞는다.
+    (ensure_ascii 여부에 따른 두 표현을 모두 후보로 둔다)
+    """
+    needles = []
+    for values in where.values():
+        options = set()
+        for v in values:
+            options.add(json.dumps(v, ensure_ascii=False)[1:-1])
+            options.add(json.dumps(v)[1:-1])
+        needles.append(tuple(options))
+    return needles
+
+
+def _iter_candidates(path: Path, needles: List[Tuple[str, ...]]) -> Iterator[Dict[str, Any]]:
+    """사전 필터를 통과한 줄만 파싱해 반환한다."""
+    for line in _iter_lines(path):
+        # 동등 조건 값이 줄에 문자열로 없으면 파싱하지 않는다. (실제 비교는 파싱 후)
+        if any(not any(n in line for n in options) for options in needles):
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as e:
+            logger.warning("JSONL 파싱 실패 (%s): %s", path, e)
+
+
+def _iter_indexing(path: Path, index: StatsIndex) -> Iterator[Dict[str, Any]]:
+    """모든 줄을 파싱해 반환하면서 통계를 모으고, 끝까지 읽으면 인덱스에 기록한다."""
+    builder = _StatsBuilder(path)
+    for line in _iter_lines(path):
+        try:
+            rec = json.loads(line)
+        except json.JSONDecodeError as e:
+            logger.warning("JSONL 파싱 실패 (%s): %s", path, e)
+            continue
+        builder.add(rec)
+        yield rec
+    index.put(path, builder.finish())
+
+
+def scan(
+    root: Path,
+    spec: QuerySpec,
+    index: Optional[StatsIndex] = None,
+    extra_columns: Sequence[str] = (),
+) -> Iterator[Dict[str, Any]]:
+    """조건에 맞는 레코드를 필요한 컬럼만 남겨 파일(날짜) 순서대로 반환한다."""
+    partitions = prune_partitions(discover_partitions(root), spec, index)
+    indexed_where = {k: v for k, v in spec.where.items() if k in INDEXED_FIELDS}
+    needles = _needles(spec.where)
+    lookup = next((k for k in log_index.INDEX_FIELDS if k in spec.where), None)
+    columns = tuple(dict.fromkeys((*spec.columns, *extra_columns)))
+
+    scanned = skipped = 0
+    for part in partitions:
+        stats = index.peek(part.path) if index is not None else None
+        if stats is not None:
+            if not stats.overlaps(spec.since, spec.until) or not stats.may_contain(indexed_where):
+                skipped += 1
+                continue
+        scanned += 1
+        if stats is None and index is not None and not index.read_only:
+            # 통계가 없거나 오래된 파일은 통계를 모으면서 한 번만 읽는다. (사전 필터 없이 전체 파싱)
+            records = _iter_indexing(part.path, index)
+        elif lookup is not None:
+            # 수집기 사이드카 인덱스가 있으면 해당 줄만 읽는다. (없으면 순차 조회)
+            records = log_index.iter_matching_records(part.path, lookup, spec.where[lookup])
+        else:
+            records = _iter_candidates(part.path, needles)
+        for rec in records:
+            d = _record_date(rec)
+            if spec.since and (d is None or d < spec.since):
+                continue
+            if spec.until and (d is None or d > spec.until):
+                continue
+            if spec.platform and part.platform is None and rec.get("platform", spec.platform) != spec.platform:
+                continue
+            if any(str(rec.get(k)) not in values for k, values in spec.where.items()):
+                continue
+            row = {c: rec.get(c) for c in columns}
+            if row.get(PLATFORM_FIELD) is None and PLATFORM_FIELD in row:
+                row[PLATFORM_FIELD] = part.platform
+            yield row
+
+    if index is not None:
+        index.save()
+    logger.info("질의 대상 파일 %d개 스캔, 인덱스로 %d개 제외", scanned, skipped)
+
+
+def _to_float(value: Any) -> Optional[float]:
+    if value is None or value == "":
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def top_growth(
+    records: Iterable[Dict[str, Any]],
+    metric: str,
+    limit: int,
+) -> List[Dict[str, Any]]:
+    """곡별로 기간 내 첫/마지막 metric 값의 차이(증가량) 상위 limit곡을 반환한다.
+
+    곡은 (플랫폼, song_id)로 구분한다. (플랫폼이 다르면 song_id가 같아도 다른 곡)
+    곡마다 처음과 마지막 관측만 유지하므로 메모리는 곡 수에만 비례한다.
+    같은 날짜에 여러 레코드가 있으면 나중 레코드가 우선한다.
+    """
+    songs: Dict[Tuple[Optional[str], str], Dict[str, Any]] = {}
+    for rec in records:
+        value = _to_float(rec.get(metric))
+        if value is None:
+            continue
+        platform = rec.get(PLATFORM_FIELD)
+        song_id = str(rec.get(SONG_FIELD))
+        d = _record_date(rec)
+        state = songs.get((platform, song_id))
+        if state is None:
+            state = {PLATFORM_FIELD: platform, SONG_FIELD: song_id, "first_date": d, "first_value": value}
+            songs[(platform, song_id)] = state
+        elif d is not None and state["first_date"] is not None and d < state["first_date"]:
+            state["first_date"], state["first_value"] = d, value
+        if state.get("last_date") is None or d is None or d >= state["last_date"]:
+            state["last_date"], state["last_value"] = d, value
+            for c in TOP_COLUMNS:
+                state[c] = rec.get(c)
+
+    rows = []
+    for state in songs.values():
+        state["growth"] = state["last_value"] - state["first_value"]
+        rows.append(state)
+    rows.sort(key=lambda r: r["growth"], reverse=True)
+    return rows[:limit]
+
+
+def resolve_period(
+    root: Path,
+    since: Optional[str],
+    until: Optional[str],
+    last_days: Optional[int],
+) -> Tuple[Optional[str], Optional[str]]:
+    """--last-days를 파일명 기준 마지막 req_date로부터의 기간으로 변환한다."""
+    if last_days is None:
+        return since, until
+    dates = [p.req_date for p in discover_partitions(root) if p.req_date]
+    end = until or (max(dates) if dates else date.today().isoformat())
+    start = (date.fromisoformat(end) - timedelta(days=last_days - 1)).isoformat()
+    return max(start, since) if since else start, end
+
+
+def write_csv(rows: Iterable[Dict[str, Any]], columns: Sequence[str], out: TextIO) -> int:
+    """결과를 CSV로 기록하고 행 수를 반환한다."""
+    writer = csv.DictWriter(out, fieldnames=list(columns), extrasaction="ignore", lineterminator="\n")
+    writer.writeheader()
+    count = 0
+    for row in rows:
+        writer.writerow(row)
+        count += 1
+    return count
+
+
+def run_query(
+    input_path: Path,
+    spec: QuerySpec,
+    top: Optional[int] = None,
+    metric: str = "res_listeners",
+    output: Optional[Path] = None,
+    use_index: bool = True,
+) -> int:
+    """질의를 실행해 CSV로 출력하고 결과 행 수를 반환한다.
+
+    top이 주어지면 곡별 metric 증가량 상위 top곡, 아니면 조건에 맞는 시계열 행을 출력한다.
+    """
+    index = None
+    if use_index:
+        index_dir = input_path if input_path.is_dir() else input_path.parent
+        index = StatsIndex(index_dir / INDEX_FILENAME, read_only=not os.access(index_dir, os.W_OK))
+
+    if top is not None:
+        records = scan(
+            input_path, spec, index, extra_columns=(DATE_FIELD, PLATFORM_FIELD, SONG_FIELD, metric, *TOP_COLUMNS)
+        )
+        rows: Iterable[Dict[str, Any]] = top_growth(records, metric, top)
+        columns: Sequence[str] = (
+            PLATFORM_FIELD,
+            SONG_FIELD,
+            *TOP_COLUMNS,
+            "first_date",
+            "first_value",
+            "last_date",
+            "last_value",
+            "growth",
+        )
+    else:
+        rows = scan(input_path, spec, index)
+        columns = spec.columns
+
+    if output is None:
+        return write_csv(rows, columns, sys.stdout)
+    with atomic_path(output) as tmp_path:
+        with tmp_path.open("w", encoding="utf-8-sig", newline="") as f:
+            count = write_csv(rows, columns, f)
+    logger.info("질의 결과 %d행 저장: %s", count, output)
+    return count
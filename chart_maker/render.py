@@ -0,0 +1,158 @@
+"""곡별 PNG/HTML 산출물을 프로세스 풀로 병렬 렌더링하는 모듈.
+
+워커에는 전체 DataFrame 대신 곡 하나의 시계열을 NumPy 배열로 담은
+`SongPayload`만 전달한다. 각 산출물은 임시 파일에 쓴 뒤 원자적으로 교체된다.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .series_index import SongIndex
+
+logger = logging.getLogger(__name__)
+
+
+# 곡별 차트/리포트에 필요한 시계열 컬럼
+SERIES_COLUMNS = (
+    "timestamp",
+    "total_plays",
+    "total_listeners",
+    "delta_plays",
+    "delta_listeners",
+)
+
+
+@dataclass
+class SongPayload:
+    """워커 프로세스로 전달되는 곡 단위 렌더링 입력."""
+
+    platform: str
+    song_id: str
+    arrays: Dict[str, np.ndarray]
+    summary: Optional[Dict[str, Any]] = None
+
+
+def build_payloads(
+    index: SongIndex,
+    df_summary: Optional[pd.DataFrame] = None,
+) -> List[SongPayload]:
+    """곡 인덱스를 곡별 배열 페이로드 목록으로 변환한다.
+
+    각 페이로드의 배열은 인덱스가 가진 컬럼 배열의 슬라이스(뷰)이므로
+    전체 프레임을 곡마다 필터링하거나 복사하지 않는다.
+    """
+    summaries: Dict[tuple, Dict[str, Any]] = {}
+    if df_summary is not None and not df_summary.empty:
+        for rec in df_summary.to_dict("records"):
+            summaries[(rec["platform"], rec["song_id"])] = rec
+
+    payloads: List[SongPayload] = []
+    for i, (plat, sid) in enumerate(index.keys()):
+        payloads.append(
+            SongPayload(
+                platform=plat,
+                song_id=sid,
+                arrays=index.arrays(i, SERIES_COLUMNS),
+                summary=summaries.get((plat, sid)),
+            )
+        )
+    return payloads
+
+
+def render_song(
+    payload: SongPayload,
+    png_dir: Path,
+    html_dir: Path,
+    export_png: bool,
+    export_html: bool,
+    html_mode: str = "standalone",
+) -> None:
+    """곡 하나의 PNG 차트와 HTML 리포트를 생성한다. (워커에서 실행)"""
+    plat, sid = payload.platform, payload.song_id
+
+    # 워커 프로세스에서 필요할 때만 무거운 렌더링 모듈을 불러온다. (HTML만 만들면 matplotlib 불필요)
+    if export_png:
+        from . import charts
+
+        charts.plot_song_totals(payload.arrays, png_dir, plat, sid)
+        charts.plot_song_deltas(payload.arrays, png_dir, plat, sid)
+
+    if export_html and payload.summary is not None:
+        from . import report
+
+        out_path = html_dir / f"{plat}_{sid}_report.html"
+        report.generate_song_report_html(
+            payload.arrays,
+            pd.Series(payload.summary),
+            out_path,
+            html_mode=html_mode,
+        )
+
+
+def resolve_jobs(jobs: int) -> int:
+    """--jobs 값을 실제 워커 수로 변환한다. (0 이하이면 CPU 코어 수)"""
+    if jobs <= 0:
+        return os.cpu_count() or 1
+    return jobs
+
+
+def render_songs(
+    payloads: List[SongPayload],
+    png_dir: Path,
+    html_dir: Path,
+    export_png: bool,
+    export_html: bool,
+    jobs: int = 1,
+    html_mode: str = "standalone",
+) -> int:
+    """곡별 산출물을 렌더링한다.
+
+    jobs가 1이면 현재 프로세스에서 순차 실행하고, 그 외에는 ProcessPoolExecutor로
+    곡 단위 작업을 분배한다. 곡 하나의 실패는 로그만 남기고 나머지 작업은 계속한다.
+
+    Returns:
+        렌더링에 실패한 곡 수
+    """
+    if not payloads or not (export_png or export_html):
+        return 0
+
+    workers = min(resolve_jobs(jobs), len(payloads))
+    failed = 0
+
+    if workers == 1:
+        for payload in payloads:
+            try:
+                render_song(payload, png_dir, html_dir, export_png, export_html, html_mode)
+            except Exception as e:
+                failed += 1
+                logger.error("곡 렌더링 실패 (%s/%s): %s", payload.platform, payload.song_id, e)
+        return failed
+
+    logger.info("곡별 렌더링을 %d개 워커로 실행합니다. (대상 %d곡)", workers, len(payloads))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(
+                render_song, payload, png_dir, html_dir, export_png, export_html, html_mode
+            ): payload
+            for payload in payloads
+        }
+        for future in as_completed(futures):
+            payload = futures[future]
+            try:
+                future.result()
+            except Exception as e:
+                failed += 1
+                logger.error("곡 렌더링 실패 (%s/%s): %s", payload.platform, payload.song_id, e)
+
+    if failed:
+        logger.warning("곡 렌더링 실패 %d건", failed)
+    return failed
@@ -2,132 +2,230 @@
 
 from __future__ import annotations
 
+import html
+import json
 import logging
 from pathlib import Path
-from typing import Dict, Tuple
+from typing import Dict, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
-import plotly.graph_objs as go
-from plotly.offline import plot as plot_offline
 
-from .utils import ensure_dir
+from .series_index import SongIndex, SongSeries
+from .utils import atomic_path, ensure_dir
 
 logger = logging.getLogger(__name__)
 
 
-def build_summary_table(df: pd.DataFrame) -> Tuple[pd.DataFrame, Dict[str, int]]:
-    """플랫폼별 요약 테이블을 생성한다."""
+def _pick_text(last_values: np.ndarray, first_values: np.ndarray) -> List[str]:
+    """곡별 마지막 값이 비어 있으면 첫 값을, 둘 다 비어 있으면 빈 문자열을 고른다."""
+    return [str(a or b or "") for a, b in zip(last_values.tolist(), first_values.tolist())]
+
+
+def build_summary_table(
+    df: pd.DataFrame,
+    index: Optional[SongIndex] = None,
+) -> Tuple[pd.DataFrame, Dict[str, int]]:
+    """플랫폼별 요약 테이블을 생성한다.
+
+    곡별 첫/마지막 행은 `SongIndex` 오프셋으로 한 번에 가져오고, 평균/합계는
+    구간 단위 NumPy 집계로 계산하므로 곡 수만큼 Python 루프를 돌지 않는다.
+    index를 넘기면 이미 계산된 곡 구간을 재사용한다.
+    """
     if df.empty:
         return pd.DataFrame(), {}
 
-    records = []
-    anomalies_per_platform: Dict[str, int] = {}
-
-    for (platform, song_id), g in df.groupby(["platform", "song_id"]):
-        g = g.sort_values("timestamp")
-        first = g.iloc[0]
-        last = g.iloc[-1]
-
-        net_plays = (last["total_plays"] or 0) - (first["total_plays"] or 0)
-        net_listeners = (last["total_listeners"] or 0) - (first["total_listeners"] or 0)
-
-        avg_rate_plays = g["rate_plays_per_min"].dropna().mean()
-        avg_rate_listeners = g["rate_listeners_per_min"].dropna().mean()
-
-        num_points = len(g)
-        num_anomalies = int(g["is_anomaly_negative_diff"].sum())
-
-        anomalies_per_platform.setdefault(platform, 0)
-        anomalies_per_platform[platform] += num_anomalies
-
-        records.append(
-            {
-                "platform": platform,
-                "song_id": song_id,
-                "song_name": str(last.get("song_name") or first.get("song_name") or ""),
-                "artist_name": str(
-                    last.get("artist_name") or first.get("artist_name") or ""
-                ),
-                "first_timestamp": first["timestamp"],
-                "last_timestamp": last["timestamp"],
-                "first_total_plays": first["total_plays"],
-                "last_total_plays": last["total_plays"],
-                "net_plays": net_plays,
-                "first_total_listeners": first["total_listeners"],
-                "last_total_listeners": last["total_listeners"],
-                "net_listeners": net_listeners,
-                "avg_rate_plays_per_min": avg_rate_plays,
-                "avg_rate_listeners_per_min": avg_rate_listeners,
-                "num_points": num_points,
-                "num_anomalies_negative_diff": num_anomalies,
-            }
-        )
-
-    df_summary = pd.DataFrame(records)
+    if index is None:
+        index = SongIndex.build(df)
+
+    first = index.first_rows()
+    last = index.last_rows()
+
+    def take(name: str, rows: np.ndarray) -> np.ndarray:
+        if name not in index.df.columns:
+            return np.full(len(rows), None, dtype=object)
+        return index.column(name)[rows]
+
+    first_plays = take("total_plays", first)
+    last_plays = take("total_plays", last)
+    first_listeners = take("total_listeners", first)
+    last_listeners = take("total_listeners", last)
+    num_anomalies = index.segment_sum("is_anomaly_negative_diff").astype(np.int64)
+
+    df_summary = pd.DataFrame(
+        {
+            "platform": index.platforms,
+            "song_id": index.song_ids,
+            "song_name": _pick_text(take("song_name", last), take("song_name", first)),
+            "artist_name": _pick_text(take("artist_name", last), take("artist_name", first)),
+            "first_timestamp": take("timestamp", first),
+            "last_timestamp": take("timestamp", last),
+            "first_total_plays": first_plays,
+            "last_total_plays": last_plays,
+            "net_plays": last_plays - first_plays,
+            "first_total_listeners": first_listeners,
+            "last_total_listeners": last_listeners,
+            "net_listeners": last_listeners - first_listeners,
+            "avg_rate_plays_per_min": index.segment_mean("rate_plays_per_min"),
+            "avg_rate_listeners_per_min": index.segment_mean("rate_listeners_per_min"),
+            "num_points": np.diff(index.offsets),
+            "num_anomalies_negative_diff": num_anomalies,
+        }
+    )
+
+    per_platform = pd.Series(num_anomalies).groupby(index.platforms).sum()
+    anomalies_per_platform: Dict[str, int] = {
+        str(plat): int(count) for plat, count in per_platform.items()
+    }
     return df_summary, anomalies_per_platform
 
 
+# 곡 리포트 차트 구성: (div id, 섹션 제목, 차트 제목, y축 이름, [(컬럼, 값이 없어도 표시 여부)])
+_SONG_CHARTS = (
+    (
+        "totals",
+        "누적 지표 차트",
+        "누적 지표 (total_plays / total_listeners)",
+        "count",
+        (("total_plays", True), ("total_listeners", False)),
+    ),
+    (
+        "delta",
+        "증가량 차트",
+        "증가량 (delta_plays / delta_listeners)",
+        "delta",
+        (("delta_plays", False), ("delta_listeners", False)),
+    ),
+)
+
+HTML_MODES = ("shared", "standalone")
+
+# shared 모드에서 reports/ 기준으로 plotly.js를 두는 디렉토리
+ASSET_DIR = "assets"
+
+
+def plotly_asset_name() -> str:
+    """설치된 plotly 버전이 들어간 공유 plotly.js 파일의 상대 경로를 반환한다."""
+    from plotly.offline import get_plotlyjs_version
+
+    return f"{ASSET_DIR}/plotly-{get_plotlyjs_version()}.min.js"
+
+
+def write_plotly_asset(html_dir: Path) -> Path:
+    """리포트 디렉토리에 plotly.js를 한 번만 기록하고 경로를 반환한다.
+
+    파일명에 버전이 들어가므로 이미 존재하면 다시 쓰지 않는다.
+    """
+    from plotly.offline import get_plotlyjs
+
+    out_path = html_dir / plotly_asset_name()
+    if out_path.exists():
+        return out_path
+
+    ensure_dir(out_path.parent)
+    with atomic_path(out_path) as tmp_path:
+        tmp_path.write_text(get_plotlyjs(), encoding="utf-8")
+    logger.info("공유 plotly.js 저장: %s", out_path)
+    return out_path
+
+
+def _song_traces(df_song: SongSeries, columns) -> List[Tuple[str, object, object]]:
+    """차트에 그릴 (이름, x, y) 목록을 만든다. 값이 전부 결측인 선택 컬럼은 제외한다."""
+    traces = []
+    for col, always in columns:
+        if always or pd.notna(df_song[col]).any():
+            traces.append((col, df_song["timestamp"], df_song[col]))
+    return traces
+
+
+def _json_values(values) -> list:
+    """배열을 JSON 직렬화 가능한 리스트로 바꾼다. (timestamp는 ISO 문자열, 결측은 null)"""
+    arr = np.asarray(values)
+    if np.issubdtype(arr.dtype, np.datetime64):
+        out = np.datetime_as_string(arr, unit="s").tolist()
+        return [None if v == "NaT" else v for v in out]
+    mask = pd.notna(arr)
+    return [v if ok else None for v, ok in zip(arr.tolist(), mask)]
+
+
+def _standalone_chart_divs(df_song: SongSeries) -> List[str]:
+    """plotly.js를 페이지에 직접 포함하는 기존 방식의 차트 div 목록."""
+    import plotly.graph_objs as go
+    from plotly.offline import plot as plot_offline
+
+    divs = []
+    for n, (_, _, title, y_title, columns) in enumerate(_SONG_CHARTS):
+        fig = go.Figure()
+        for name, x, y in _song_traces(df_song, columns):
+            fig.add_trace(go.Scatter(x=x, y=y, mode="lines+markers", name=name))
+        fig.update_layout(title=title, xaxis_title="timestamp", yaxis_title=y_title)
+        # 첫 번째 차트에서만 Plotly.js 포함
+        divs.append(plot_offline(fig, include_plotlyjs=(n == 0), output_type="div"))
+    return divs
+
+
+def _shared_chart_divs(df_song: SongSeries) -> List[str]:
+    """공유 plotly.js를 사용하고 데이터 JSON만 담는 차트 div 목록."""
+    figures = {}
+    for div_id, _, title, y_title, columns in _SONG_CHARTS:
+        figures[div_id] = {
+            "data": [
+                {
+                    "type": "scatter",
+                    "mode": "lines+markers",
+                    "name": name,
+                    "x": _json_values(x),
+                    "y": _json_values(y),
+                }
+                for name, x, y in _song_traces(df_song, columns)
+            ],
+            "layout": {
+                "title": {"text": title},
+                "xaxis": {"title": {"text": "timestamp"}},
+                "yaxis": {"title": {"text": y_title}},
+            },
+        }
+
+    # "</script>"가 데이터에 들어 있어도 스크립트 블록이 끊기지 않도록 이스케이프
+    payload = json.dumps(figures, ensure_ascii=False).replace("</", "<\\/")
+    divs = [f'<div id="chart-{div_id}" style="height:450px"></div>' for div_id, *_ in _SONG_CHARTS]
+    divs[-1] += (
+        "\n<script>\n"
+        f"var figures = {payload};\n"
+        "Object.keys(figures).forEach(function (key) {\n"
+        '  Plotly.newPlot("chart-" + key, figures[key].data, figures[key].layout, {responsive: true});\n'
+        "});\n"
+        "</script>"
+    )
+    return divs
+
+
 def generate_song_report_html(
-    df_song: pd.DataFrame,
+    df_song: SongSeries,
     summary_row: pd.Series,
     out_path: Path,
+    html_mode: str = "standalone",
 ) -> None:
-    """단일 곡에 대한 HTML 리포트를 생성한다."""
-    if df_song.empty:
+    """단일 곡에 대한 HTML 리포트를 생성한다.
+
+    df_song은 해당 곡의 행만 담은 시계열(곡 단위 DataFrame 또는 배열 딕셔너리)이다.
+
+    html_mode:
+        - standalone: plotly.js 전체를 페이지에 포함 (파일 하나로 열람 가능)
+        - shared: `write_plotly_asset`로 기록한 공유 plotly.js를 참조하고
+          페이지에는 차트 데이터 JSON만 포함
+    """
+    if len(df_song["timestamp"]) == 0:
         return
+    if html_mode not in HTML_MODES:
+        raise ValueError(f"지원하지 않는 html_mode입니다: {html_mode} (지원: {HTML_MODES})")
 
-    out_dir = ensure_dir(out_path.parent)
-
-    # totals line chart
-    fig_totals = go.Figure()
-    fig_totals.add_trace(
-        go.Scatter(
-            x=df_song["timestamp"],
-            y=df_song["total_plays"],
-            mode="lines+markers",
-            name="total_plays",
-        )
-    )
-    if df_song["total_listeners"].notna().any():
-        fig_totals.add_trace(
-            go.Scatter(
-                x=df_song["timestamp"],
-                y=df_song["total_listeners"],
-                mode="lines+markers",
-                name="total_listeners",
-            )
-        )
-    fig_totals.update_layout(
-        title="누적 지표 (total_plays / total_listeners)",
-        xaxis_title="timestamp",
-        yaxis_title="count",
-    )
+    ensure_dir(out_path.parent)
 
-    # delta line chart
-    fig_delta = go.Figure()
-    if df_song["delta_plays"].notna().any():
-        fig_delta.add_trace(
-            go.Scatter(
-                x=df_song["timestamp"],
-                y=df_song["delta_plays"],
-                mode="lines+markers",
-                name="delta_plays",
-            )
-        )
-    if df_song["delta_listeners"].notna().any():
-        fig_delta.add_trace(
-            go.Scatter(
-                x=df_song["timestamp"],
-                y=df_song["delta_listeners"],
-                mode="lines+markers",
-                name="delta_listeners",
-            )
-        )
-    fig_delta.update_layout(
-        title="증가량 (delta_plays / delta_listeners)",
-        xaxis_title="timestamp",
-        yaxis_title="delta",
-    )
+    if html_mode == "shared":
+        chart_divs = _shared_chart_divs(df_song)
+    else:
+        chart_divs = _standalone_chart_divs(df_song)
 
     # HTML 구성
     html_parts = []
@@ -137,6 +235,8 @@ def generate_song_report_html(
     html_parts.append('<meta charset="utf-8">')
     html_parts.append('<meta http-equiv="Content-Type" content="text/html; charset=utf-8">')
     html_parts.append('<title>곡 리포트</title>')
+    if html_mode == "shared":
+        html_parts.append(f'<script src="{plotly_asset_name()}"></script>')
     html_parts.append('</head>')
     html_parts.append('<body>')
 
@@ -145,19 +245,109 @@ def generate_song_report_html(
     # escape=False로 설정하여 한글 등 특수문자가 HTML entities로 변환되지 않도록 함
     html_parts.append(summary_row.to_frame().to_html(header=False, border=1, escape=False))
 
-    html_parts.append("<h2>누적 지표 차트</h2>")
-    # 첫 번째 차트에서만 Plotly.js 포함
-    html_parts.append(plot_offline(fig_totals, include_plotlyjs=True, output_type="div"))
-
-    html_parts.append("<h2>증가량 차트</h2>")
-    # 두 번째 차트부터는 Plotly.js 제외 (이미 포함됨)
-    html_parts.append(plot_offline(fig_delta, include_plotlyjs=False, output_type="div"))
+    for (_, section, *_), div in zip(_SONG_CHARTS, chart_divs):
+        html_parts.append(f"<h2>{section}</h2>")
+        html_parts.append(div)
 
     html_parts.append("</body></html>")
 
     out_html = "\n".join(html_parts)
-    out_path.write_text(out_html, encoding="utf-8")
+    with atomic_path(out_path) as tmp_path:
+        tmp_path.write_text(out_html, encoding="utf-8")
     logger.info("곡 HTML 리포트 저장: %s", out_path)
 
 
+# 대시보드 곡 목록에 표시할 요약 컬럼
+_DASHBOARD_COLUMNS = [
+    "platform",
+    "song_id",
+    "song_name",
+    "artist_name",
+    "last_total_listeners",
+    "net_listeners",
+    "last_total_plays",
+    "net_plays",
+    "num_points",
+]
+
+
+def _format_cell(value) -> str:
+    """대시보드 표 셀 값을 문자열로 변환한다."""
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        return f"{int(value):,}"
+    if isinstance(value, (int, np.integer)):
+        return f"{int(value):,}"
+    return str(value)
+
+
+def generate_dashboard_html(df_summary: pd.DataFrame, html_dir: Path) -> Optional[Path]:
+    """모든 곡 리포트를 한 화면에서 탐색하는 reports/index.html을 생성한다.
+
+    곡 목록 표만 담고, 곡을 선택하면 해당 곡 리포트를 iframe으로 지연 로드한다.
+    """
+    if df_summary.empty:
+        return None
+
+    ensure_dir(html_dir)
+    cols = [c for c in _DASHBOARD_COLUMNS if c in df_summary.columns]
+    rows = []
+    for rec in df_summary[cols].to_dict("records"):
+        href = f"{rec['platform']}_{rec['song_id']}_report.html"
+        cells = "".join(f"<td>{html.escape(_format_cell(rec[c]))}</td>" for c in cols)
+        rows.append(f'<tr data-href="{html.escape(href)}">{cells}</tr>')
+
+    header = "".join(f"<th>{c}</th>" for c in cols)
+    page = f"""<!DOCTYPE html>
+<html lang="ko">
+<head>
+<meta charset="utf-8">
+<title>곡 리포트 대시보드</title>
+<style>
+body {{ margin: 0; font-family: sans-serif; display: flex; height: 100vh; }}
+#list {{ width: 45%; overflow: auto; border-right: 1px solid #ccc; }}
+#viewer {{ flex: 1; border: 0; }}
+table {{ border-collapse: collapse; width: 100%; font-size: 13px; }}
+th, td {{ padding: 4px 6px; border-bottom: 1px solid #eee; text-align: left; white-space: nowrap; }}
+tbody tr {{ cursor: pointer; }}
+tbody tr:hover, tbody tr.active {{ background: #eef4ff; }}
+#filter {{ width: calc(100% - 16px); margin: 8px; padding: 4px; }}
+</style>
+</head>
+<body>
+<div id="list">
+<input id="filter" placeholder="곡명 / 아티스트 / song_id 검색 ({len(rows)}곡)">
+<table>
+<thead><tr>{header}</tr></thead>
+<tbody>
+{chr(10).join(rows)}
+</tbody>
+</table>
+</div>
+<iframe id="viewer" name="viewer"></iframe>
+<script>
+var rows = document.querySelectorAll("tbody tr");
+rows.forEach(function (tr) {{
+  tr.addEventListener("click", function () {{
+    rows.forEach(function (r) {{ r.classList.remove("active"); }});
+    tr.classList.add("active");
+    document.getElementById("viewer").src = tr.dataset.href;
+  }});
+}});
+document.getElementById("filter").addEventListener("input", function (e) {{
+  var q = e.target.value.toLowerCase();
+  rows.forEach(function (tr) {{
+    tr.style.display = tr.textContent.toLowerCase().indexOf(q) >= 0 ? "" : "none";
+  }});
+}});
+</script>
+</body>
+</html>
+"""
 
+    out_path = html_dir / "index.html"
+    with atomic_path(out_path) as tmp_path:
+        tmp_path.write_text(page, encoding="utf-8")
+    logger.info("리포트 대시보드 저장: %s (%d곡)", out_path, len(rows))
+    return out_path
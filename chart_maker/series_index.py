@@ -0,0 +1,207 @@
+"""(platform, song_id)별 시계열 구간을 한 번만 계산해 두는 곡 인덱스.
+
+`SongIndex`는 platform, song_id, timestamp 순으로 정렬된 DataFrame에서
+곡별 시작/끝 오프셋을 미리 구해 두고, 이후에는 곡 하나를 꺼낼 때
+전체 프레임을 다시 필터링하지 않고 NumPy 슬라이스(뷰)만 반환한다.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Any, Dict, Iterable, Iterator, Mapping, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+SORT_COLUMNS = ["platform", "song_id", "timestamp"]
+
+# 곡 하나의 시계열: 컬럼명 → 배열. 곡 단위 DataFrame과 `SongIndex.arrays()` 결과 모두 해당한다.
+SongSeries = Mapping[str, Any]
+
+
+def _is_grouped_and_sorted(
+    plat: np.ndarray,
+    sid: np.ndarray,
+    ts: Optional[np.ndarray],
+    starts: np.ndarray,
+) -> bool:
+    """곡 구간이 연속이고 각 구간의 timestamp가 오름차순인지 확인한다."""
+    keys = list(zip(plat[starts], sid[starts]))
+    if len(set(keys)) != len(keys):
+        return False
+    if ts is None or len(ts) < 2:
+        return True
+    backwards = ts[1:] < ts[:-1]
+    # 구간 경계(다른 곡으로 넘어가는 위치)의 역행은 정상
+    backwards[starts[1:] - 1] = False
+    return not backwards.any()
+
+
+def _segment_starts(plat: np.ndarray, sid: np.ndarray) -> np.ndarray:
+    """인접 행의 (platform, song_id)가 바뀌는 위치를 구간 시작점으로 반환한다."""
+    changed = (plat[1:] != plat[:-1]) | (sid[1:] != sid[:-1])
+    return np.concatenate(([0], np.flatnonzero(changed) + 1)).astype(np.int64)
+
+
+class SongIndex:
+    """정렬된 DataFrame 위의 곡별 구간 오프셋 인덱스."""
+
+    def __init__(
+        self,
+        df: pd.DataFrame,
+        offsets: np.ndarray,
+        columns: Optional[Dict[str, np.ndarray]] = None,
+    ):
+        self.df = df
+        self.offsets = offsets
+        # pandas 문자열 컬럼의 to_numpy()는 매번 결측 검사를 하므로 변환 결과를 캐시한다.
+        self._columns: Dict[str, np.ndarray] = dict(columns or {})
+        self.platforms = self.column("platform")[offsets[:-1]]
+        self.song_ids = self.column("song_id")[offsets[:-1]]
+        self._positions: Dict[Tuple[str, str], int] = {
+            key: i for i, key in enumerate(zip(self.platforms, self.song_ids))
+        }
+
+    @classmethod
+    def build(cls, df: pd.DataFrame) -> "SongIndex":
+        """DataFrame으로부터 인덱스를 만든다.
+
+        add_metrics/normalize 결과처럼 이미 정렬된 입력은 정렬 없이 O(N)으로 처리하고,
+        그렇지 않은 경우에만 한 번 안정 정렬한다.
+        """
+        if df.empty:
+            return cls(df, np.zeros(1, dtype=np.int64))
+
+        def key_columns(frame: pd.DataFrame) -> Dict[str, np.ndarray]:
+            return {col: frame[col].to_numpy() for col in SORT_COLUMNS if col in frame.columns}
+
+        columns = key_columns(df)
+        starts = _segment_starts(columns["platform"], columns["song_id"])
+        if not _is_grouped_and_sorted(
+            columns["platform"], columns["song_id"], columns.get("timestamp"), starts
+        ):
+            df = df.sort_values(list(columns), kind="stable")
+            columns = key_columns(df)
+            starts = _segment_starts(columns["platform"], columns["song_id"])
+
+        offsets = np.append(starts, len(df)).astype(np.int64)
+        return cls(df, offsets, columns)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def keys(self) -> Iterator[Tuple[str, str]]:
+        """(platform, song_id) 키를 인덱스 순서대로 반환한다."""
+        return zip(self.platforms, self.song_ids)
+
+    def position(self, platform: str, song_id: str) -> Optional[int]:
+        """키에 해당하는 곡 번호를 반환한다. 없으면 None."""
+        return self._positions.get((platform, song_id))
+
+    def bounds(self, i: int) -> Tuple[int, int]:
+        """i번째 곡의 [start, stop) 행 범위를 반환한다."""
+        return int(self.offsets[i]), int(self.offsets[i + 1])
+
+    def column(self, name: str) -> np.ndarray:
+        """컬럼 전체의 NumPy 배열을 반환한다. (한 번 변환 후 캐시)"""
+        arr = self._columns.get(name)
+        if arr is None:
+            arr = self.df[name].to_numpy()
+            self._columns[name] = arr
+        return arr
+
+    def arrays(self, i: int, columns: Iterable[str]) -> Dict[str, np.ndarray]:
+        """i번째 곡의 컬럼별 NumPy 슬라이스(복사 없는 뷰)를 반환한다."""
+        start, stop = self.bounds(i)
+        return {
+            col: self.column(col)[start:stop]
+            for col in columns
+            if col in self.df.columns
+        }
+
+    def platform_songs(self, platform: str) -> np.ndarray:
+        """해당 플랫폼에 속한 곡 번호 배열을 반환한다."""
+        return np.flatnonzero(self.platforms == platform)
+
+    def first_rows(self, songs: Optional[np.ndarray] = None) -> np.ndarray:
+        """곡별 첫 행의 위치를 반환한다."""
+        starts = self.offsets[:-1]
+        return starts if songs is None else starts[songs]
+
+    def last_rows(self, songs: Optional[np.ndarray] = None) -> np.ndarray:
+        """곡별 마지막 행의 위치를 반환한다."""
+        lasts = self.offsets[1:] - 1
+        return lasts if songs is None else lasts[songs]
+
+    def float_column(self, name: str) -> np.ndarray:
+        """컬럼을 float64 배열로 반환한다. (pd.NA/None 등은 NaN)"""
+        arr = self.column(name)
+        if arr.dtype.kind == "f":
+            return arr
+        return pd.to_numeric(self.df[name], errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+
+    def segment_sum(self, name: str) -> np.ndarray:
+        """곡별 합계를 반환한다. (결측 제외, 불리언 컬럼은 True 개수)"""
+        values = self.column(name)
+        if values.dtype.kind == "b":
+            values = values.astype(np.int64)
+        else:
+            values = np.nan_to_num(self.float_column(name), nan=0.0)
+        if len(values) == 0:
+            return values
+        return np.add.reduceat(values, self.offsets[:-1])
+
+    def segment_mean(self, name: str) -> np.ndarray:
+        """곡별로 결측을 제외한 평균을 반환한다. (값이 없으면 NaN)"""
+        values = self.float_column(name)
+        if len(values) == 0:
+            return np.zeros(0, dtype=np.float64)
+        valid = ~np.isnan(values)
+        starts = self.offsets[:-1]
+        total = np.add.reduceat(np.where(valid, values, 0.0), starts)
+        count = np.add.reduceat(valid.astype(np.int64), starts)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(count > 0, total / count, np.nan)
+
+    def tail_mean(
+        self,
+        name: str,
+        n: int,
+        songs: Optional[np.ndarray] = None,
+        stops: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """곡별 마지막 n개 행에서 결측을 제외한 평균을 반환한다. (값이 없으면 NaN)
+
+        stops를 주면 곡별 구간 끝 대신 해당 위치(미포함) 이전의 n개 행을 사용한다.
+        """
+        values = self.float_column(name)
+        starts = self.offsets[:-1]
+        if stops is None:
+            stops = self.offsets[1:]
+        if songs is not None:
+            starts = starts[songs]
+            stops = stops[songs]
+        lo = np.maximum(starts, stops - n)
+
+        if n * len(starts) < len(values):
+            # 곡 수 × n이 전체 행보다 적으면 마지막 n개 행만 모아서 계산한다.
+            total = np.zeros(len(starts))
+            count = np.zeros(len(starts), dtype=np.int64)
+            for k in range(1, n + 1):
+                pos = stops - k
+                picked = values[np.maximum(pos, 0)]
+                ok = (pos >= lo) & ~np.isnan(picked)
+                total += np.where(ok, picked, 0.0)
+                count += ok
+        else:
+            valid = ~np.isnan(values)
+            csum = np.concatenate(([0.0], np.cumsum(np.where(valid, values, 0.0))))
+            ccnt = np.concatenate(([0], np.cumsum(valid)))
+            total = csum[stops] - csum[lo]
+            count = ccnt[stops] - ccnt[lo]
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(count > 0, total / count, np.nan)
@@ -3,9 +3,9 @@
 from __future__ import annotations
 
 import logging
-from datetime import datetime
 from typing import Tuple
 
+import numpy as np
 import pandas as pd
 
 logger = logging.getLogger(__name__)
@@ -48,13 +48,19 @@ def _ensure_columns(df: pd.DataFrame) -> pd.DataFrame:
 
 
 def _build_timestamp(df: pd.DataFrame) -> pd.Series:
-    """date + hour + minute 로 timestamp 컬럼 생성."""
-    # "YYYY-MM-DD HH:MM" 형식 문자열 생성 후 to_datetime
-    ts_str = df["date"].astype(str) + " " + df["hour"].astype(str).str.zfill(2) + ":" + df[
-        "minute"
-    ].astype(str).str.zfill(2)
-    ts = pd.to_datetime(ts_str, errors="coerce")
-    return ts
+    """date + hour + minute 로 timestamp 컬럼 생성.
+
+    "YYYY-MM-DD HH:MM" 문자열을 행마다 만들지 않고, 날짜만 파싱한 뒤(중복 날짜는
+    to_datetime 캐시로 한 번만 파싱) 분 단위 오프셋을 더한다.
+    시/분이 범위를 벗어나거나 날짜 파싱에 실패하면 NaT가 된다.
+    """
+    day = pd.to_datetime(df["date"], errors="coerce")
+    hour = df["hour"].to_numpy()
+    minute = df["minute"].to_numpy()
+    valid = (hour >= 0) & (hour < 24) & (minute >= 0) & (minute < 60)
+    offset = pd.to_timedelta(np.where(valid, hour * 60 + minute, 0), unit="m")
+    ts = day + offset
+    return ts.where(valid)
 
 
 def normalize(df_raw: pd.DataFrame) -> Tuple[pd.DataFrame, int]:
@@ -62,47 +68,60 @@ def normalize(df_raw: pd.DataFrame) -> Tuple[pd.DataFrame, int]:
     원본 DataFrame을 정규화/정제한다.
 
     - 필수 컬럼 보정
-    - timestamp 생성
-    - (platform, song_id, timestamp) 중복 처리
+    - timestamp 생성 (파싱 실패 행 제거)
+    - (platform, song_id, timestamp) 중복 처리: 마지막에 등장한 레코드 채택
     - 정렬
 
+    중복 판정과 정렬은 문자열 키 대신 정수 코드(platform/song_id factorize 코드,
+    int64 timestamp)에 대한 한 번의 안정 정렬로 처리하고, 최종 행 선택도
+    한 번의 take로 끝내므로 원본 크기의 중간 복사본을 여러 번 만들지 않는다.
+
     Returns:
-        (정제된 DataFrame, 중복 충돌 건수)
+        (정제된 DataFrame, 중복 충돌 건수). 중복 건수에는 timestamp 파싱에 실패해 제거한 행 중
+        같은 platform/song_id끼리의 중복도 포함한다. (문자열 키에서 NaT가 같은 키였던 것과 동일)
     """
     if df_raw.empty:
         return df_raw.copy(), 0
 
-    df = df_raw.copy()
-    df = _ensure_columns(df)
+    # 얕은 복사: 컬럼 교체만 하므로 원본 DataFrame은 변경되지 않는다.
+    df = _ensure_columns(df_raw.copy(deep=False))
+
+    # timestamp 생성, 잘못된 timestamp(파싱 실패)는 정렬/중복 처리 전에 제외
+    ts = _build_timestamp(df)
+    valid = ts.notna().to_numpy()
+    removed = int((~valid).sum())
+    if removed > 0:
+        logger.warning("timestamp 파싱 실패로 %d개 레코드를 제거했습니다.", removed)
 
-    # timestamp 생성
-    df["timestamp"] = _build_timestamp(df)
+    rows = np.flatnonzero(valid)
+    plat_codes, _ = pd.factorize(df["platform"].to_numpy()[rows], sort=True)
+    song_codes, _ = pd.factorize(df["song_id"].to_numpy()[rows], sort=True)
+    ts_values = ts.to_numpy()[rows].astype(np.int64)
 
-    # 고유 키 정의
-    df["key"] = df["platform"] + "::" + df["song_id"] + "::" + df["timestamp"].astype(str)
+    # platform, song_id, timestamp 순 안정 정렬 (같은 키 안에서는 입력 순서 유지)
+    order = np.lexsort((ts_values, song_codes, plat_codes))
+    plat_codes = plat_codes[order]
+    song_codes = song_codes[order]
+    ts_values = ts_values[order]
 
     # 중복 처리: 같은 키가 여러 번 나오면 마지막 레코드 채택
-    dup_counts = df.duplicated("key").sum()
+    is_last = np.ones(len(order), dtype=bool)
+    is_last[:-1] = (
+        (plat_codes[1:] != plat_codes[:-1])
+        | (song_codes[1:] != song_codes[:-1])
+        | (ts_values[1:] != ts_values[:-1])
+    )
+    dup_counts = int(len(order) - is_last.sum())
+    if removed > 0:
+        # 제거한 행끼리의 중복도 함께 센다. (같은 platform/song_id의 NaT는 같은 키)
+        invalid = df[["platform", "song_id"]].iloc[np.flatnonzero(~valid)]
+        dup_counts += int(invalid.duplicated().sum())
     if dup_counts > 0:
         logger.info("중복 키 %d건 발견 (마지막 레코드만 사용)", dup_counts)
 
-    # groupby로 마지막 레코드 선택
-    df = df.sort_values(["key"]).groupby("key", as_index=False).tail(1)
-
-    # 정렬: platform, song_id, timestamp
-    df = df.sort_values(["platform", "song_id", "timestamp"]).reset_index(drop=True)
-
-    # key 컬럼은 더 이상 필요 없으므로 제거
-    df = df.drop(columns=["key"])
-
-    # 잘못된 timestamp(파싱 실패)는 제거
-    before = len(df)
-    df = df[df["timestamp"].notna()].copy()
-    removed = before - len(df)
-    if removed > 0:
-        logger.warning("timestamp 파싱 실패로 %d개 레코드를 제거했습니다.", removed)
-
-    return df, int(dup_counts)
-
-
+    keep = rows[order[is_last]]
+    df = df.take(keep)
+    df["timestamp"] = ts.take(keep).to_numpy()
+    df = df.reset_index(drop=True)
 
+    return df, dup_counts
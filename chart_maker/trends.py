@@ -0,0 +1,360 @@
+"""곡별 누적 지표의 일 단위 추세(롤링 합계, 전주 대비 증가율, EWMA, 상위 급상승 곡) 계산 모듈.
+
+`TrendEngine`은 `SongIndex`의 정렬된 행에서 곡-일자별 마지막 관측값만 추려
+(곡 번호 × 일수 + 일자) 정수 키로 정렬된 평탄 배열을 만든다. 특정 날짜 기준의
+누적값은 이 키에 대한 searchsorted 한 번으로 전체 곡을 동시에 조회하므로,
+곡 × 일 크기의 밀집 행렬을 만들지 않고도 모든 윈도우 연산을 벡터화할 수 있다.
+
+누적값(total_*)은 단조 증가하는 카운터이므로 N일 증가량 합계는
+"기준일 누적값 - N일 전 누적값"과 같다. 수집이 비는 날은 직전 관측값을 사용한다.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .series_index import SongIndex
+from .utils import atomic_path, ensure_dir
+
+logger = logging.getLogger(__name__)
+
+
+DAY = np.timedelta64(1, "D")
+
+# 추세를 계산하는 누적 카운터 컬럼 → add_metrics의 행 단위 증가량 컬럼
+COUNTER_COLUMNS: Dict[str, str] = {
+    "total_plays": "delta_plays",
+    "total_listeners": "delta_listeners",
+}
+
+QUERY_KINDS = ("recent_mean", "sum", "wow", "ewma")
+
+
+@dataclass(frozen=True)
+class TrendQuery:
+    """곡별 추세 값 하나를 정의하는 질의.
+
+    kind:
+        - recent_mean: 최근 window개 수집 시점의 행 단위 증가량 평균
+        - sum: 최근 window일 증가량 합계
+        - wow: 최근 window일 증가량의 직전 window일 대비 증가율(%)
+        - ewma: 일 평균 증가량의 지수이동평균 (span=window일)
+    """
+
+    kind: str
+    window: int
+    column: str = "total_plays"
+
+    def __post_init__(self) -> None:
+        if self.kind not in QUERY_KINDS:
+            raise ValueError(f"지원하지 않는 추세 질의입니다: {self.kind} (지원: {QUERY_KINDS})")
+        if self.column not in COUNTER_COLUMNS:
+            raise ValueError(f"지원하지 않는 추세 컬럼입니다: {self.column}")
+        if self.window < 1:
+            raise ValueError(f"window는 1 이상이어야 합니다: {self.window}")
+
+    @classmethod
+    def parse(cls, spec: str, column: str = "total_plays") -> "TrendQuery":
+        """'sum:7', 'wow:7', 'ewma:14', 'recent_mean:3' 형식의 문자열을 해석한다."""
+        kind, sep, window = spec.partition(":")
+        if not sep or not window.isdigit():
+            raise ValueError(f"추세 질의 형식이 잘못되었습니다: {spec!r} (예: sum:7)")
+        return cls(kind.strip(), int(window), column)
+
+    @property
+    def name(self) -> str:
+        """결과 컬럼명. 예: sum7_total_plays"""
+        if self.kind == "recent_mean":
+            # 기존 플랫폼 요약 차트의 컬럼명 유지
+            return f"avg_{COUNTER_COLUMNS[self.column]}"
+        return f"{self.kind}{self.window}_{self.column}"
+
+    @property
+    def label(self) -> str:
+        """차트 제목용 설명."""
+        delta = COUNTER_COLUMNS[self.column]
+        if self.kind == "recent_mean":
+            return f"최근 {delta} 평균"
+        if self.kind == "sum":
+            return f"최근 {self.window}일 {delta} 합계"
+        if self.kind == "wow":
+            return f"{self.window}일 {delta} 직전 대비 증가율(%)"
+        return f"{delta} EWMA({self.window}일)"
+
+
+DEFAULT_MOVERS_QUERY = TrendQuery("recent_mean", 3)
+
+
+class TrendEngine:
+    """곡-일자 단위 누적값 위의 벡터화 추세 엔진.
+
+    snapshot()의 결과는 기준일별로 메모리에 캐시되며, cache_dir을 주면
+    기준일까지의 데이터 지문(fingerprint)을 파일명에 담아 CSV로도 재사용한다.
+    """
+
+    def __init__(
+        self,
+        index: SongIndex,
+        windows: Sequence[int] = (7, 28),
+        ewma_span: int = 7,
+    ):
+        self.index = index
+        self.windows = tuple(windows)
+        self.ewma_span = ewma_span
+        self._values: Dict[str, np.ndarray] = {}
+        self._snapshots: Dict[int, pd.DataFrame] = {}
+
+        n_songs = len(index)
+        if n_songs == 0 or len(index.df) == 0:
+            self.day0: Optional[np.datetime64] = None
+            self.n_days = 0
+            self._rows = np.zeros(0, dtype=np.int64)
+            self._song = np.zeros(0, dtype=np.int64)
+            self._day = np.zeros(0, dtype=np.int64)
+            self._keys = np.zeros(0, dtype=np.int64)
+            return
+
+        days = index.column("timestamp").astype("datetime64[D]")
+        song_of_row = np.repeat(np.arange(n_songs, dtype=np.int64), np.diff(index.offsets))
+
+        # 곡-일자별 마지막 행 (같은 날 여러 번 수집한 경우 최신 값)
+        last = np.ones(len(days), dtype=bool)
+        last[:-1] = (song_of_row[1:] != song_of_row[:-1]) | (days[1:] != days[:-1])
+        rows = np.flatnonzero(last)
+
+        self.day0 = days.min()
+        self.n_days = int((days.max() - self.day0) // DAY) + 1
+        self._rows = rows
+        self._song = song_of_row[rows]
+        self._day = ((days[rows] - self.day0) // DAY).astype(np.int64)
+        # 곡 순서 → 일자 순서로 정렬된 조회 키
+        self._keys = self._song * self.n_days + self._day
+
+    @classmethod
+    def build(cls, df: pd.DataFrame, **kwargs) -> "TrendEngine":
+        """add_metrics 결과 DataFrame으로부터 엔진을 만든다."""
+        return cls(SongIndex.build(df), **kwargs)
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    @property
+    def latest_day(self) -> Optional[np.datetime64]:
+        """데이터의 마지막 날짜."""
+        if self.day0 is None:
+            return None
+        return self.day0 + (self.n_days - 1) * DAY
+
+    def _day_number(self, as_of) -> int:
+        """기준일(날짜 문자열/Timestamp/None)을 day0 기준 일 번호로 변환한다.
+
+        마지막 날짜 이후는 마지막 날짜로 본다. (day0 이전은 음수: 관측 없음)
+        """
+        if as_of is None:
+            return self.n_days - 1
+        day = np.datetime64(pd.Timestamp(as_of).date(), "D")
+        return min(int((day - self.day0) // DAY), self.n_days - 1)
+
+    def daily_values(self, column: str) -> np.ndarray:
+        """곡-일자별 마지막 관측 누적값 (float64, 캐시)."""
+        values = self._values.get(column)
+        if values is None:
+            values = self.index.float_column(column)[self._rows]
+            self._values[column] = values
+        return values
+
+    def _lookup(self, day: int) -> Tuple[np.ndarray, np.ndarray]:
+        """곡별로 day 이전(포함) 마지막 일자 행의 위치와 유효 여부를 반환한다."""
+        songs = np.arange(len(self), dtype=np.int64)
+        if day < 0 or len(self._keys) == 0:
+            return np.zeros(len(songs), dtype=np.int64), np.zeros(len(songs), dtype=bool)
+        # 키가 다음 곡 구간으로 넘어가지 않도록 마지막 날짜로 제한한다.
+        day = min(day, self.n_days - 1)
+        pos = np.searchsorted(self._keys, songs * self.n_days + day, side="right") - 1
+        # pos < 0: 첫 곡의 day 이전 관측이 없음 (0으로 자르면 곡 0의 행을 가리킨다)
+        found = pos >= 0
+        pos = np.where(found, pos, 0)
+        return pos, found & (self._song[pos] == songs)
+
+    def value_at(self, column: str, day: int) -> np.ndarray:
+        """곡별 day 시점 누적값. 그 이전 관측이 없으면 NaN."""
+        pos, found = self._lookup(day)
+        return np.where(found, self.daily_values(column)[pos], np.nan)
+
+    def window_sum(self, column: str, window: int, day: int) -> np.ndarray:
+        """곡별 (day - window, day] 구간 증가량 합계."""
+        return self.value_at(column, day) - self.value_at(column, day - window)
+
+    def growth_pct(self, column: str, window: int, day: int) -> np.ndarray:
+        """최근 window일 증가량의 직전 window일 대비 증가율(%). 직전 증가량이 0 이하이면 NaN."""
+        current = self.window_sum(column, window, day)
+        previous = self.window_sum(column, window, day - window)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(previous > 0, (current - previous) / previous * 100.0, np.nan)
+
+    def _until(self, day: int, column: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """day까지의 (곡 번호, 일자, 누적값) 일자 행. 마지막 날짜 기준이면 복사하지 않는다."""
+        values = self.daily_values(column)
+        if day >= self.n_days - 1:
+            return self._song, self._day, values
+        mask = self._day <= day
+        return self._song[mask], self._day[mask], values[mask]
+
+    def ewma(self, column: str, span: int, day: int) -> np.ndarray:
+        """곡별 일 평균 증가량의 지수이동평균 (day까지의 관측 기준).
+
+        관측 간격이 g일이면 그 구간의 일 평균 증가량에 (1-alpha)^g 만큼 감쇠를 적용한다.
+        점화식을 전개하면 각 구간의 기여도가 (1-alpha)^(마지막 관측일 - 구간 끝 일자)로
+        닫힌 형태가 되므로, 곡 수 × 일수만큼 반복하지 않고 곡 구간별 합(reduceat)으로 계산한다.
+        """
+        n_songs = len(self)
+        result = np.full(n_songs, np.nan)
+        song, obs_day, values = self._until(day, column)
+        if len(song) == 0:
+            return result
+
+        # 인접한 두 일자 행 사이 구간 k(행 k → k+1). 곡이 바뀌는 구간은 제외한다.
+        same = song[1:] == song[:-1]
+        gap = np.diff(obs_day).astype(np.float64)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            rate = np.diff(values) / gap
+        valid = same & ~np.isnan(rate)
+
+        # 행은 곡 → 일자 순이므로 곡 구간의 시작/끝을 한 번에 구한다.
+        starts = np.flatnonzero(np.concatenate(([True], ~same)))
+        ends = np.append(starts[1:], len(song)) - 1
+        present = song[starts]
+        last_day = np.repeat(obs_day[ends], np.diff(np.append(starts, len(song))))
+
+        # 행별 감쇠 decay^(마지막 관측일 - 관측일). power 대신 exp(x * log(decay))로 계산한다.
+        log_decay = np.log(1.0 - 2.0 / (span + 1.0))
+        decayed = np.exp((last_day - obs_day).astype(np.float64) * log_decay)
+        # 구간 가중치: 곡별 첫 구간은 decayed[k+1] (초기값), 이후 구간은
+        # decayed[k+1] * (1 - decay^gap) = decayed[k+1] - decayed[k]
+        weight = decayed[1:] - np.where(same, decayed[:-1], 0.0)
+        first_steps = starts[ends > starts]
+        weight[first_steps] = decayed[first_steps + 1]
+
+        # 구간 k는 행 k+1에 귀속시켜 곡 구간별 reduceat으로 합산한다.
+        contrib = np.zeros(len(song))
+        contrib[1:] = np.where(valid, weight * rate, 0.0)
+        counts = np.zeros(len(song), dtype=np.int64)
+        counts[1:] = valid
+        total = np.add.reduceat(contrib, starts)
+        has_step = np.add.reduceat(counts, starts) > 0
+        result[present[has_step]] = total[has_step]
+        return result
+
+    def recent_mean(self, column: str, n: int, day: int) -> np.ndarray:
+        """곡별로 day까지의 마지막 n개 수집 시점 행 단위 증가량 평균."""
+        pos, found = self._lookup(day)
+        stops = np.where(found, self._rows[pos] + 1, self.index.offsets[:-1])
+        return self.index.tail_mean(COUNTER_COLUMNS[column], n, stops=stops)
+
+    def evaluate(self, query: TrendQuery, as_of=None) -> np.ndarray:
+        """질의 하나를 전체 곡에 대해 계산한다. (곡 번호 순서)"""
+        if self.day0 is None:
+            return np.zeros(len(self), dtype=np.float64)
+        day = self._day_number(as_of)
+        if query.kind == "recent_mean":
+            return self.recent_mean(query.column, query.window, day)
+        if query.kind == "sum":
+            return self.window_sum(query.column, query.window, day)
+        if query.kind == "wow":
+            return self.growth_pct(query.column, query.window, day)
+        return self.ewma(query.column, query.window, day)
+
+    def top_movers(
+        self,
+        query: TrendQuery,
+        n: int = 10,
+        platform: Optional[str] = None,
+        as_of=None,
+    ) -> pd.DataFrame:
+        """질의 값 기준 상위 n곡을 반환한다. (platform, song_id, query.name)"""
+        values = self.evaluate(query, as_of)
+        songs = (
+            np.arange(len(self))
+            if platform is None
+            else self.index.platform_songs(platform)
+        )
+        df = pd.DataFrame(
+            {
+                "platform": self.index.platforms[songs],
+                "song_id": self.index.song_ids[songs].astype(str),
+                query.name: values[songs],
+            }
+        )
+        return df.nlargest(n, query.name).reset_index(drop=True)
+
+    def snapshot_queries(self) -> Tuple[TrendQuery, ...]:
+        """snapshot()에 포함되는 질의 목록."""
+        queries = []
+        for column in COUNTER_COLUMNS:
+            if column not in self.index.df.columns:
+                continue
+            for window in self.windows:
+                queries.append(TrendQuery("sum", window, column))
+            queries.append(TrendQuery("wow", self.windows[0], column))
+            queries.append(TrendQuery("ewma", self.ewma_span, column))
+        return tuple(queries)
+
+    def fingerprint(self, as_of=None) -> str:
+        """기준일까지의 입력 데이터 지문. 같은 날짜라도 데이터가 늘면 달라진다."""
+        day = self._day_number(as_of)
+        h = hashlib.sha1(f"{len(self)}:{self.day0}".encode())
+        for column in COUNTER_COLUMNS:
+            if column in self.index.df.columns:
+                song, obs_day, values = self._until(day, column)
+                h.update(f":{len(song)}:{int(song.sum())}:{int(obs_day.sum())}".encode())
+                h.update(f":{np.nansum(values):.6f}".encode())
+        for query in self.snapshot_queries():
+            h.update(f":{query.name}".encode())
+        return h.hexdigest()[:12]
+
+    def snapshot(self, as_of=None, cache_dir: Optional[Path] = None) -> pd.DataFrame:
+        """기준일의 곡별 추세 테이블을 반환한다.
+
+        컬럼: platform, song_id, as_of, sum{N}_*, wow{N}_*, ewma{N}_*
+        """
+        if self.day0 is None:
+            return pd.DataFrame()
+
+        day = self._day_number(as_of)
+        cached = self._snapshots.get(day)
+        if cached is not None:
+            return cached
+
+        as_of_date = str(self.day0 + day * DAY)
+        cache_path = None
+        if cache_dir is not None:
+            cache_path = Path(cache_dir) / f"trends_{as_of_date}_{self.fingerprint(as_of_date)}.csv"
+            if cache_path.exists():
+                logger.info("추세 캐시 사용: %s", cache_path)
+                df = pd.read_csv(cache_path, dtype={"platform": str, "song_id": str, "as_of": str})
+                self._snapshots[day] = df
+                return df
+
+        data = {
+            "platform": self.index.platforms,
+            "song_id": self.index.song_ids.astype(str),
+            "as_of": np.full(len(self), as_of_date, dtype=object),
+        }
+        for query in self.snapshot_queries():
+            data[query.name] = self.evaluate(query, as_of_date)
+        df = pd.DataFrame(data)
+        self._snapshots[day] = df
+
+        if cache_path is not None:
+            ensure_dir(cache_path.parent)
+            with atomic_path(cache_path) as tmp_path:
+                df.to_csv(tmp_path, index=False)
+            logger.info("추세 스냅샷 저장: %s", cache_path)
+        return df
@@ -1,7 +1,13 @@
 """공통 유틸리티: 로깅 설정, 경로 유틸리티 등."""
 
 import logging
+import os
+from contextlib import contextmanager
 from pathlib import Path
+from typing import Iterator, List
+
+# 로그 확장자/압축 판별과 열기는 수집기(logstore)와 같은 구현을 쓴다. (코덱 추가 시 한 곳만 수정)
+from music_metrics_collector.logstore import LOG_SUFFIXES, is_log_file, open_log  # noqa: F401
 
 
 def setup_logging(level: int = logging.INFO) -> None:
@@ -18,4 +24,24 @@ def ensure_dir(path: Path) -> Path:
     return path
 
 
+@contextmanager
+def atomic_path(path: Path) -> Iterator[Path]:
+    """같은 디렉토리의 임시 경로를 제공하고, 블록이 성공하면 path로 원자적으로 교체한다.
+
+    임시 파일명은 확장자를 유지하므로 matplotlib savefig의 포맷 추론이 그대로 동작한다.
+    블록에서 예외가 나면 임시 파일을 지우고 기존 path는 건드리지 않는다.
+    """
+    tmp_path = path.with_name(f".{path.stem}.{os.getpid()}.tmp{path.suffix}")
+    try:
+        yield tmp_path
+        os.replace(tmp_path, path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
 
+def find_log_files(path: Path) -> List[Path]:
+    """디렉토리면 하위의 모든 로그 파일을 정렬해서, 파일이면 그대로 반환한다."""
+    if not path.is_dir():
+        return [path]
+    return sorted(p for p in path.rglob("*.jsonl*") if p.is_file() and is_log_file(p))
@@ -1,132 +1,244 @@
-"""data/logs 디렉토리의 JSONL 로그를 읽어 플랫폼/곡별 차트를 생성하는 스크립트."""
+"""data/logs 디렉토리의 JSONL 로그를 읽어 플랫폼/곡별 차트를 생성하는 스크립트.
+
+matplotlib(및 글꼴 목록 로드)은 그릴 데이터가 있을 때 처음으로 불러온다.
+"""
 
 import argparse
-import json
 import logging
+from array import array
 from collections import defaultdict
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 
-import matplotlib.pyplot as plt
-import matplotlib.font_manager as fm
+import numpy as np
 import platform
 
+from .logstore import is_log_file, iter_log_records
 from .main import load_config
 
 logger = logging.getLogger(__name__)
 
+# 차트로 그리는 메트릭 (한 번의 순회로 함께 집계)
+METRICS = ("total_plays", "total_listeners")
+_NAN = float("nan")
+
+
+def _font_candidates() -> Tuple[str, ...]:
+    """OS별 기본 한글 폰트 후보 목록 (앞에 있을수록 우선)."""
+    system = platform.system()
+    if system == "Darwin":  # macOS
+        return ("AppleGothic", "NanumGothic", "Malgun Gothic")
+    if system == "Windows":
+        return ("Malgun Gothic", "맑은 고딕", "MalgunGothic")
+    return ("NanumGothic", "Malgun Gothic", "DejaVu Sans")  # Linux 등
+
+
+@lru_cache(maxsize=None)
+def _resolve_korean_font() -> Optional[str]:
+    """설치된 글꼴 중 첫 번째 한글 폰트 후보 이름. (프로세스당 한 번만 조회)
+
+    후보마다 fontManager.ttflist 전체를 훑는 대신 글꼴 이름 집합을 한 번 만들어 찾는다.
+    """
+    import matplotlib.font_manager as fm
+
+    try:
+        installed = {f.name for f in fm.fontManager.ttflist}
+    except Exception:
+        # 폰트 조회 중 오류가 나더라도 전체 흐름에는 영향 주지 않음
+        return None
+    return next((name for name in _font_candidates() if name in installed), None)
+
 
 def _setup_matplotlib_font() -> None:
     """Matplotlib에서 한글이 깨지지 않도록 폰트를 설정한다."""
-    system = platform.system()
+    import matplotlib.pyplot as plt
 
-    # OS별 기본 한글 폰트 후보 목록
-    if system == "Darwin":  # macOS
-        candidates = ["AppleGothic", "NanumGothic", "Malgun Gothic"]
-    elif system == "Windows":
-        candidates = ["Malgun Gothic", "맑은 고딕", "MalgunGothic"]
-    else:  # Linux 등
-        candidates = ["NanumGothic", "Malgun Gothic", "DejaVu Sans"]
-
-    for name in candidates:
-        try:
-            if any(f.name == name for f in fm.fontManager.ttflist):
-                plt.rcParams["font.family"] = name
-                logger.info(f"Matplotlib 한글 폰트 사용: {name}")
-                break
-        except Exception:
-            # 폰트 조회 중 오류가 나더라도 전체 흐름에는 영향 주지 않음
-            continue
+    name = _resolve_korean_font()
+    if name is not None:
+        plt.rcParams["font.family"] = name
+        logger.info(f"Matplotlib 한글 폰트 사용: {name}")
 
     # 마이너스 기호(-)가 깨지지 않도록 설정
     plt.rcParams["axes.unicode_minus"] = False
 
 
-def _load_logs(base_dir: Path) -> List[Dict]:
-    """data/logs/{date}/{platform}.jsonl 구조의 모든 로그를 읽어 리스트로 반환한다."""
-    records: List[Dict] = []
+def _iter_records(base_dir: Path) -> Iterator[Dict]:
+    """data/logs/{date}/{platform}.jsonl 구조의 로그 레코드를 한 줄씩 순회한다.
+
+    logstore.compact_logs로 압축/월별 보관된 파일도 스트리밍으로 풀어서 읽는다.
+
+    전체 레코드를 리스트로 모으지 않으므로 메모리 사용량이 레코드 수에 비례하지 않는다.
+    """
     if not base_dir.exists():
         logger.warning(f"로그 디렉토리가 없습니다: {base_dir}")
-        return records
+        return
 
+    count = 0
     for date_dir in sorted(base_dir.iterdir()):
         if not date_dir.is_dir():
             continue
-        for jsonl_file in sorted(date_dir.glob("*.jsonl")):
+        # 압축된 일자 파일(*.jsonl.gz/zst)과 월별 보관 디렉토리(YYYY-MM/)도 같은 방식으로 읽는다.
+        for jsonl_file in sorted(p for p in date_dir.iterdir() if is_log_file(p)):
             try:
-                with jsonl_file.open("r", encoding="utf-8") as f:
-                    for line in f:
-                        line = line.strip()
-                        if not line:
-                            continue
-                        try:
-                            rec = json.loads(line)
-                            records.append(rec)
-                        except json.JSONDecodeError as e:
-                            logger.warning(f"JSON 파싱 실패 ({jsonl_file}): {e} / line={line[:80]}")
+                for rec in iter_log_records(jsonl_file):
+                    count += 1
+                    yield rec
             except Exception as e:
                 logger.error(f"로그 파일 읽기 실패: {jsonl_file} - {e}")
-    logger.info(f"총 {len(records)}개의 로그 레코드를 읽었습니다.")
-    return records
+    logger.info(f"총 {count}개의 로그 레코드를 읽었습니다.")
 
 
-def _aggregate_by_song(
-    records: List[Dict],
-    metric_key: str,
-    platform_filter: Optional[str] = None,
-) -> Dict[str, Dict[str, float]]:
-    """
-    (플랫폼, 곡)별로 날짜/메트릭을 집계한다.
+class SongMetricAggregator:
+    """로그 레코드를 한 번만 순회하며 여러 메트릭을 (플랫폼, 곡) × 날짜 배열에 동시에 누적한다.
 
-    반환 구조:
-        { "<platform>::<song_name>": { "YYYY-MM-DD": value_sum, ... }, ... }
+    레코드는 chunk_size개씩 고정 크기 버퍼(array)에 (곡 번호, 날짜 번호, 값)으로 쌓였다가
+    NumPy 배열로 합산되므로, 메모리 사용량은 레코드 수가 아니라 곡 수 × 날짜 수에 비례한다.
+    값이 없는(None) 레코드는 해당 (곡, 날짜)에 기록되지 않는다.
     """
-    agg: Dict[str, Dict[str, float]] = defaultdict(lambda: defaultdict(float))
 
-    for rec in records:
+    def __init__(
+        self,
+        metrics: Sequence[str],
+        platform_filter: Optional[str] = None,
+        chunk_size: int = 65536,
+    ):
+        self.metrics = tuple(metrics)
+        self.platform_filter = platform_filter
+        self.chunk_size = chunk_size
+        self.songs: Dict[Tuple[str, str], int] = {}
+        self.dates: Dict[str, int] = {}
+
+        self._sums = {m: np.zeros((0, 0)) for m in self.metrics}
+        self._seen = {m: np.zeros((0, 0), dtype=bool) for m in self.metrics}
+        self._song_buf = array("q")
+        self._date_buf = array("q")
+        self._value_bufs = {m: array("d") for m in self.metrics}
+
+    def add(self, rec: Dict) -> None:
+        """레코드 하나를 버퍼에 추가한다. (버퍼가 차면 배열로 합산)"""
         platform = rec.get("platform")
-        if platform_filter and platform != platform_filter:
-            continue
-        song_name = rec.get("song_name") or "(제목없음)"
+        if self.platform_filter and platform != self.platform_filter:
+            return
         date = rec.get("date")
-        value = rec.get(metric_key)
         if date is None:
-            continue
-        if value is None:
-            continue
-        key = f"{platform}::{song_name}"
-        agg[key][date] += float(value)
-
-    return agg
+            return
+
+        # 플랫폼이 없는 레코드도 곡 제목 순 정렬에서 문자열끼리 비교되도록 "None"으로 둔다.
+        song_key = (platform or "None", rec.get("song_name") or "(제목없음)")
+        song_idx = self.songs.setdefault(song_key, len(self.songs))
+        date_idx = self.dates.setdefault(date, len(self.dates))
+
+        self._song_buf.append(song_idx)
+        self._date_buf.append(date_idx)
+        for m in self.metrics:
+            value = rec.get(m)
+            self._value_bufs[m].append(_NAN if value is None else float(value))
+
+        if len(self._song_buf) >= self.chunk_size:
+            self.flush()
+
+    def extend(self, records: Iterable[Dict]) -> "SongMetricAggregator":
+        """레코드 스트림 전체를 누적한다."""
+        for rec in records:
+            self.add(rec)
+        self.flush()
+        return self
+
+    def _grow(self) -> None:
+        """곡/날짜 수가 늘어난 만큼 누적 배열을 (2배 단위로) 확장한다. 넘친 축만 늘린다."""
+        n_songs, n_dates = len(self.songs), len(self.dates)
+        for m in self.metrics:
+            sums = self._sums[m]
+            rows, cols = sums.shape
+            if n_songs <= rows and n_dates <= cols:
+                continue
+            shape = (
+                max(n_songs, rows * 2) if n_songs > rows else rows,
+                max(n_dates, cols * 2) if n_dates > cols else cols,
+            )
+            new_sums = np.zeros(shape)
+            new_seen = np.zeros(shape, dtype=bool)
+            new_sums[:rows, :cols] = sums
+            new_seen[:rows, :cols] = self._seen[m]
+            self._sums[m] = new_sums
+            self._seen[m] = new_seen
+
+    def flush(self) -> None:
+        """버퍼에 쌓인 레코드를 누적 배열에 합산하고 버퍼를 비운다."""
+        if not self._song_buf:
+            return
+        self._grow()
+        song_idx = np.frombuffer(self._song_buf, dtype=np.int64)
+        date_idx = np.frombuffer(self._date_buf, dtype=np.int64)
+        for m in self.metrics:
+            values = np.frombuffer(self._value_bufs[m], dtype=np.float64)
+            valid = ~np.isnan(values)
+            np.add.at(self._sums[m], (song_idx[valid], date_idx[valid]), values[valid])
+            self._seen[m][song_idx[valid], date_idx[valid]] = True
+
+        self._song_buf = array("q")
+        self._date_buf = array("q")
+        self._value_bufs = {m: array("d") for m in self.metrics}
+
+    def has_positive(self, metric: str) -> bool:
+        """해당 메트릭에 0보다 큰 값이 하나라도 있는지 확인한다."""
+        self.flush()
+        n_songs, n_dates = len(self.songs), len(self.dates)
+        sums = self._sums[metric][:n_songs, :n_dates]
+        return bool((sums[self._seen[metric][:n_songs, :n_dates]] > 0).any())
+
+    def song_series(
+        self,
+        metric: str,
+    ) -> Dict[str, List[Tuple[str, List[str], np.ndarray]]]:
+        """플랫폼별 [(곡 제목, 날짜 목록, 값 배열), ...]을 곡 제목 순으로 반환한다.
+
+        날짜는 YYYY-MM-DD 문자열 순으로 정렬되며, 값이 없는 날짜는 제외된다.
+        """
+        self.flush()
+        n_songs, n_dates = len(self.songs), len(self.dates)
+        sums = self._sums[metric][:n_songs, :n_dates]
+        seen = self._seen[metric][:n_songs, :n_dates]
+
+        date_labels = np.array(list(self.dates), dtype=object)
+        date_order = np.argsort(date_labels, kind="stable")
+        sums = sums[:, date_order]
+        seen = seen[:, date_order]
+        date_labels = date_labels[date_order]
+
+        per_platform: Dict[str, List[Tuple[str, List[str], np.ndarray]]] = defaultdict(list)
+        for (plat, song_name), i in sorted(self.songs.items()):
+            mask = seen[i]
+            if not mask.any():
+                continue
+            per_platform[plat].append((song_name, date_labels[mask].tolist(), sums[i, mask]))
+        return per_platform
 
 
 def _plot_metric_by_song(
-    agg: Dict[str, Dict[str, float]],
+    aggregator: SongMetricAggregator,
     metric_label: str,
     output_dir: Path,
     platform: Optional[str] = None,
 ):
     """곡별로 날짜-메트릭 선 그래프를 그려 PNG로 저장한다."""
-    if not agg:
+    per_platform = aggregator.song_series(metric_label)
+    if not per_platform:
         logger.warning(f"{metric_label}에 대한 집계 데이터가 없습니다.")
         return
 
+    import matplotlib.pyplot as plt
+
     output_dir.mkdir(parents=True, exist_ok=True)
 
     # 플랫폼별로 파일 나누기
-    per_platform: Dict[str, Dict[str, Dict[str, float]]] = defaultdict(dict)
-    for key, date_map in agg.items():
-        plat, song = key.split("::", 1)
-        per_platform[plat][song] = date_map
-
     for plat, songs in per_platform.items():
         if platform and plat != platform:
             continue
 
         plt.figure(figsize=(10, 6))
-        for song_name, date_map in sorted(songs.items()):
-            dates = sorted(date_map.keys())
-            values = [date_map[d] for d in dates]
+        for song_name, dates, values in songs:
             plt.plot(dates, values, marker="o", label=song_name)
 
         plt.title(f"{plat} - {metric_label} (곡별)")
@@ -144,27 +256,27 @@ def _plot_metric_by_song(
 
 def analyze_logs(config_path: str, platform: Optional[str] = None):
     """JSON 로그를 읽어 날짜/플랫폼/곡별 차트를 생성한다."""
-    # Matplotlib 한글 폰트 설정 (한 번만 수행)
-    _setup_matplotlib_font()
-
     config = load_config(config_path)
     log_config = config.get("log", {})
     base_dir = Path(log_config.get("base_dir", "data/logs"))
     output_dir = Path("data/charts")
 
-    records = _load_logs(base_dir)
-    if not records:
+    # 한 번의 순회로 모든 메트릭을 함께 집계
+    aggregator = SongMetricAggregator(METRICS, platform_filter=platform)
+    aggregator.extend(_iter_records(base_dir))
+    if not aggregator.songs:
         return
 
+    # Matplotlib 한글 폰트 설정 (한 번만 수행, 그릴 데이터가 있을 때만)
+    _setup_matplotlib_font()
+
     # total_plays 차트
-    plays_agg = _aggregate_by_song(records, "total_plays", platform_filter=platform)
-    _plot_metric_by_song(plays_agg, "total_plays", output_dir, platform=platform)
+    _plot_metric_by_song(aggregator, "total_plays", output_dir, platform=platform)
 
     # total_listeners 차트 (값이 있는 경우에만)
-    listeners_agg = _aggregate_by_song(records, "total_listeners", platform_filter=platform)
     # 값이 전부 0/없으면 스킵
-    if any(v > 0 for song in listeners_agg.values() for v in song.values()):
-        _plot_metric_by_song(listeners_agg, "total_listeners", output_dir, platform=platform)
+    if aggregator.has_positive("total_listeners"):
+        _plot_metric_by_song(aggregator, "total_listeners", output_dir, platform=platform)
 
 
 def main():
@@ -0,0 +1,336 @@
+"""수집한 곡 상세 페이지 보관과 오프라인 재파싱(reparse).
+
+로그에는 파싱한 숫자만 남으므로 GENIE 마크업이 바뀌어 파싱이 틀렸거나 새 지표를 추가했을 때
+지난 날짜를 다시 만들 수 없다. archive.enabled가 true이면 수집할 때 페이지의 메트릭 구간
+(collector.metrics_fragment, 기본은 스크립트/스타일/주석을 뺀 본문)을 압축해 내용 해시로 보관한다.
+요청마다 바뀌는 부분을 뺐으므로 값이 그대로인 곡은 날짜가 바뀌어도 같은 파일 하나를 가리킨다.
+
+    {archive.dir}/objects/ab/abcdef....html.gz           # 해시 → 압축된 구간 (중복 저장 없음)
+    {archive.dir}/manifest/{YYYY-MM-DD}_{PLATFORM}.jsonl  # {"song_id", "sha"} (수집 순서)
+
+304 Not Modified 응답은 page_cache에 남은 지난 구간 해시를 가리킨다. retention_days가 지난
+manifest는 수집이 끝날 때 지우고, 남은 manifest가 가리키지 않는 object도 함께 지운다.
+
+reparse는 네트워크 없이 보관본을 collector.parse_metrics(또는 --selectors로 준 선택자)로 다시
+파싱해 `{out}/{YYYY-MM-DD}_{PLATFORM}.jsonl`을 만든다. manifest(일자×플랫폼) 단위로 프로세스에
+나눠 처리하고, 곡 고정 필드는 현재 song_data.csv에서 가져온다.
+
+    python -m music_metrics_collector.archive reparse --since 2026-01-01 --jobs 0 --out data/reparsed
+    python -m music_metrics_collector.archive prune --retention-days 90
+"""
+
+import argparse
+import gzip
+import json
+import logging
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set, TextIO, Tuple
+
+from .logstore import CODECS, LOG_NAME_RE, _zstandard, rebuild_index
+from .pagecache import fragment_hash
+
+logger = logging.getLogger(__name__)
+
+OBJECT_SUFFIX = ".html"
+
+
+@dataclass
+class ArchiveStats:
+    """보관/정리/재파싱 결과 요약."""
+
+    stored: int = 0  # 새로 쓴 object
+    deduplicated: int = 0  # 이미 있는 object를 가리킨 항목
+    manifests_removed: int = 0
+    objects_removed: int = 0
+    records: int = 0
+    missing: int = 0  # 재파싱 시 object가 없어 건너뛴 항목
+
+
+def _compress(data: bytes, codec: str) -> bytes:
+    if codec == "gzip":
+        return gzip.compress(data, compresslevel=6)
+    if codec == "zstd":
+        return _zstandard().ZstdCompressor(level=10).compress(data)
+    raise ValueError(f"지원하지 않는 압축 코덱: {codec} (가능: {', '.join(CODECS)})")
+
+
+def _decompress(data: bytes, codec: str) -> bytes:
+    if codec == "gzip":
+        return gzip.decompress(data)
+    return _zstandard().ZstdDecompressor().decompress(data)
+
+
+class PageArchive:
+    """내용 해시로 중복을 없앤 페이지 보관소. req_date를 주면 add로 그 날짜 manifest에 기록한다."""
+
+    def __init__(self, root: Path, codec: str = "gzip", req_date: Optional[str] = None):
+        if codec not in CODECS:
+            raise ValueError(f"지원하지 않는 압축 코덱: {codec} (가능: {', '.join(CODECS)})")
+        self.root = root
+        self.codec = codec
+        self.req_date = req_date
+        self.stats = ArchiveStats()
+        self._manifests: Dict[str, TextIO] = {}
+        self._lock = threading.Lock()  # 플랫폼 수집 풀의 작업 스레드가 함께 쓴다.
+
+    @classmethod
+    def from_config(cls, config: dict, req_date: Optional[str] = None) -> Optional["PageArchive"]:
+        """archive.enabled가 true일 때만 보관소 (기본: 사용 안 함)."""
+        archive_config = config.get('archive', {})
+        if not archive_config.get('enabled', False):
+            return None
+        return cls(
+            Path(archive_config.get('dir', 'data/archive')),
+            codec=archive_config.get('codec', 'gzip'),
+            req_date=req_date,
+        )
+
+    @property
+    def manifest_dir(self) -> Path:
+        return self.root / "manifest"
+
+    def object_path(self, digest: str) -> Path:
+        return self.root / "objects" / digest[:2] / (digest + OBJECT_SUFFIX + CODECS[self.codec])
+
+    def add(self, platform: str, song_id: str, content: Optional[str], digest: Optional[str] = None) -> None:
+        """song_id의 오늘 페이지를 보관한다.
+
+        content가 None(304 응답)이면 digest가 가리키는 지난 보관본을 기록한다.
+        digest를 생략하면 content의 해시를 쓴다.
+        """
+        if digest is None:
+            if content is None:
+                return
+            digest = fragment_hash(content)
+        path = self.object_path(digest)
+        stored = False
+        if not path.exists():
+            if content is None:
+                return  # 보관을 켜기 전에 받은 페이지
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp_path.write_bytes(_compress(content.encode("utf-8"), self.codec))
+            os.replace(tmp_path, path)
+            stored = True
+
+        with self._lock:
+            if stored:
+                self.stats.stored += 1
+            else:
+                self.stats.deduplicated += 1
+            manifest = self._manifests.get(platform)
+            if manifest is None:
+                self.manifest_dir.mkdir(parents=True, exist_ok=True)
+                manifest = self._manifests[platform] = open(
+                    self.manifest_dir / f"{self.req_date}_{platform}.jsonl", "a", encoding="utf-8"
+                )
+            manifest.write(json.dumps({"song_id": song_id, "sha": digest}) + "\n")
+
+    def read(self, digest: str) -> Optional[str]:
+        path = self.object_path(digest)
+        if not path.exists():
+            return None
+        return _decompress(path.read_bytes(), self.codec).decode("utf-8")
+
+    def close(self) -> None:
+        for manifest in self._manifests.values():
+            manifest.close()
+        self._manifests.clear()
+
+    def manifests(
+        self, since: Optional[str] = None, until: Optional[str] = None, platforms: Optional[Set[str]] = None
+    ) -> List[Tuple[str, str, Path]]:
+        """(날짜, 플랫폼, 경로) 목록 (날짜순). since/until은 YYYY-MM-DD, 양 끝 포함."""
+        if not self.manifest_dir.exists():
+            return []
+        found = []
+        for path in self.manifest_dir.glob("*.jsonl"):
+            match = LOG_NAME_RE.match(path.name)
+            if match is None:
+                continue
+            day, platform = match.groups()
+            if (since and day < since) or (until and day > until) or (platforms and platform not in platforms):
+                continue
+            found.append((day, platform, path))
+        return sorted(found)
+
+    def prune(self, before: str) -> ArchiveStats:
+        """before(YYYY-MM-DD) 이전 manifest와, 남은 manifest가 가리키지 않는 object를 지운다."""
+        stats = ArchiveStats()
+        for day, _, path in self.manifests():
+            if day < before:
+                path.unlink()
+                stats.manifests_removed += 1
+        if not stats.manifests_removed:
+            return stats
+
+        referenced = {digest for _, _, path in self.manifests() for _, digest in iter_manifest(path)}
+        for path in (self.root / "objects").glob("*/*" + OBJECT_SUFFIX + "*"):
+            if path.name.split(".", 1)[0] not in referenced:
+                path.unlink()
+                stats.objects_removed += 1
+        logger.info(
+            f"Archive pruned before {before}: {stats.manifests_removed} manifests, "
+            f"{stats.objects_removed} objects removed"
+        )
+        return stats
+
+
+def iter_manifest(path: Path) -> Iterator[Tuple[str, str]]:
+    """manifest의 (song_id, sha)를 기록 순서대로 반환한다."""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                entry = json.loads(line)
+                yield entry['song_id'], entry['sha']
+
+
+def prune_from_config(config: dict, today: str) -> Optional[ArchiveStats]:
+    """archive.retention_days(0/생략은 무기한)가 지난 보관본을 정리한다."""
+    archive = PageArchive.from_config(config)
+    retention_days = config.get('archive', {}).get('retention_days', 0)
+    if archive is None or not retention_days:
+        return None
+    before = (date.fromisoformat(today) - timedelta(days=retention_days)).isoformat()
+    return archive.prune(before)
+
+
+# 재파싱 워커 프로세스 상태 (_init_worker에서 한 번 설정)
+_WORKER: Dict = {}
+
+
+def _init_worker(root: str, codec: str, songs: Dict[Tuple[str, str], Dict], selectors: Optional[Dict[str, str]]):
+    _WORKER.update(archive=PageArchive(Path(root), codec), songs=songs, selectors=selectors, collectors={})
+
+
+def _reparse_manifest(day: str, platform: str, manifest_path: str, out_path: str) -> Tuple[int, int]:
+    """manifest 하나를 다시 파싱해 out_path에 쓴다. (기록한 레코드 수, 보관본이 없는 항목 수)"""
+    from .factory import CollectorFactory
+    from .records import RecordTemplate
+
+    archive: PageArchive = _WORKER['archive']
+    collector = _WORKER['collectors'].get(platform)
+    if collector is None:
+        # 파싱만 하므로 Fetcher 없이 만든다.
+        collector = _WORKER['collectors'][platform] = CollectorFactory.get_class(platform)(None)
+
+    parsed = {}  # 같은 보관본(값이 그대로인 날)은 한 번만 파싱
+    lines, missing = [], 0
+    for song_id, digest in iter_manifest(Path(manifest_path)):
+        metrics = parsed.get(digest)
+        if metrics is None:
+            html = archive.read(digest)
+            if html is None:
+                missing += 1
+                continue
+            metrics = parsed[digest] = collector.parse_metrics(html, custom_selectors=_WORKER['selectors'])
+        template = RecordTemplate(platform, song_id, _WORKER['songs'].get((platform, song_id), {}))
+        lines.append(template.success_line(day, metrics) + "\n")
+
+    out = Path(out_path)
+    tmp_path = out.with_name(f".{out.name}.{os.getpid()}.tmp")
+    tmp_path.write_text("".join(lines), encoding="utf-8")
+    os.replace(tmp_path, out)
+    rebuild_index(out)
+    return len(lines), missing
+
+
+def reparse(
+    config: dict,
+    out_dir: Path,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    platforms: Optional[Set[str]] = None,
+    selectors: Optional[Dict[str, str]] = None,
+    jobs: int = 1,
+) -> ArchiveStats:
+    """보관본을 다시 파싱해 out_dir에 일자×플랫폼 JSONL을 만든다. jobs가 0 이하이면 CPU 코어 수."""
+    from .main import build_targets_from_config
+
+    archive = PageArchive.from_config({**config, 'archive': {**config.get('archive', {}), 'enabled': True}})
+    manifests = archive.manifests(since, until, platforms)
+    stats = ArchiveStats()
+    if not manifests:
+        logger.warning(f"No archived pages under {archive.manifest_dir} for the given period")
+        return stats
+
+    songs = {
+        (target['platform'].upper(), target['song_id']): target.get('song_data', {})
+        for target in build_targets_from_config(config)
+    }
+    out_dir.mkdir(parents=True, exist_ok=True)
+    tasks = [(day, platform, str(path), str(out_dir / f"{day}_{platform}.jsonl")) for day, platform, path in manifests]
+    init_args = (str(archive.root), archive.codec, songs, selectors)
+
+    workers = min(jobs if jobs > 0 else (os.cpu_count() or 1), len(tasks))
+    if workers == 1:
+        _init_worker(*init_args)
+        results = [_reparse_manifest(*task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=init_args) as pool:
+            results = list(pool.map(_reparse_manifest, *zip(*tasks)))
+
+    for (day, platform, _, out_path), (records, missing) in zip(tasks, results):
+        stats.records += records
+        stats.missing += missing
+        logger.info(f"Reparsed {day} {platform}: {records} records -> {out_path}")
+    return stats
+
+
+def main(argv: Optional[list] = None) -> None:
+    """CLI 엔트리포인트: 보관본 재파싱(reparse), 보관 기간 정리(prune)."""
+    from .main import load_config
+    from .utils import get_seoul_date
+
+    parser = argparse.ArgumentParser(description="곡 상세 페이지 보관본 재파싱 및 정리")
+    parser.add_argument("--config", default="config.yaml", help="설정 파일 경로 (기본: config.yaml)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_reparse = sub.add_parser("reparse", help="보관본을 다시 파싱해 JSONL 로그 생성 (네트워크 사용 안 함)")
+    p_reparse.add_argument("--out", default=None, help="출력 디렉토리 (기본: {archive.dir}/reparsed)")
+    p_reparse.add_argument("--since", default=None, help="시작 날짜 YYYY-MM-DD (포함)")
+    p_reparse.add_argument("--until", default=None, help="끝 날짜 YYYY-MM-DD (포함)")
+    p_reparse.add_argument("--platform", action="append", default=None, help="플랫폼 (여러 번 지정 가능)")
+    p_reparse.add_argument(
+        "--selectors",
+        default=None,
+        help='지표 이름 → CSS 선택자 JSON (예: \'{"total_plays": ".daily-chart .total div p"}\')',
+    )
+    p_reparse.add_argument("--jobs", type=int, default=0, help="프로세스 수 (기본: 0 = CPU 코어 수)")
+
+    p_prune = sub.add_parser("prune", help="보관 기간이 지난 manifest와 가리키는 곳이 없는 object 삭제")
+    p_prune.add_argument("--retention-days", type=int, default=None,
+                         help="보관 일수 (기본: archive.retention_days)")
+    args = parser.parse_args(argv)
+
+    config = load_config(args.config)
+    if args.command == "reparse":
+        out_dir = Path(args.out) if args.out else Path(config.get('archive', {}).get('dir', 'data/archive')) / "reparsed"
+        stats = reparse(
+            config,
+            out_dir,
+            since=args.since,
+            until=args.until,
+            platforms={p.upper() for p in args.platform} if args.platform else None,
+            selectors=json.loads(args.selectors) if args.selectors else None,
+            jobs=args.jobs,
+        )
+        print(f"레코드 {stats.records}건 → {out_dir} (보관본 없음 {stats.missing}건)")
+    elif args.command == "prune":
+        if args.retention_days is not None:
+            config = {**config, 'archive': {**config.get('archive', {}), 'retention_days': args.retention_days}}
+        stats = prune_from_config({**config, 'archive': {**config.get('archive', {}), 'enabled': True}},
+                                  get_seoul_date())
+        if stats is None:
+            print("보관 기간(archive.retention_days 또는 --retention-days)이 없습니다.")
+        else:
+            print(f"manifest {stats.manifests_removed}개, object {stats.objects_removed}개 삭제")
+
+
+if __name__ == "__main__":
+    main()
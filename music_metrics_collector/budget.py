@@ -0,0 +1,151 @@
+"""시간 예산이 있는 수집 실행: 곡별 소요 시간 학습, 우선순위 정렬, 미룬 곡 기록.
+
+`--deadline` / `collect.time_budget_sec`을 주면 collect_metrics는
+
+1. 대상을 우선순위(미룬 곡 → 등급/관심곡) 다음 예상 소요 시간 짧은 순으로 정렬하고,
+2. 다음 곡의 예상 소요 시간을 더하면 예산을 넘는 시점부터 새 곡을 시작하지 않으며,
+3. 시작하지 못한 곡을 `{state.dir}/deferred_tracks.json`에 남겨 다음 실행에서 먼저 수집한다.
+
+곡별 소요 시간은 실행마다 지수 이동 평균으로 `{state.dir}/track_latency.json`에 누적한다.
+한 번도 수집하지 않은 곡은 같은 플랫폼 곡들의 중앙값(없으면 default_latency_sec)으로 추정한다.
+"""
+
+import json
+import logging
+import os
+import statistics
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+LATENCY_FILENAME = "track_latency.json"
+DEFERRED_FILENAME = "deferred_tracks.json"
+
+# 등급별 우선순위 (작을수록 먼저)
+_TIER_PRIORITY = {"hourly": 0, "daily": 1, "weekly": 2}
+
+
+def target_key(target: Dict) -> str:
+    return f"{target['platform'].upper()}:{target['song_id']}"
+
+
+def _load_json(path: Path, default):
+    if not path.exists():
+        return default
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError) as e:
+        logger.warning(f"상태 파일을 읽지 못해 무시합니다: {path} ({e})")
+        return default
+
+
+def _save_json(path: Path, data) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+class LatencyModel:
+    """곡별 수집 소요 시간(초)의 지수 이동 평균."""
+
+    def __init__(self, path: Path, alpha: float = 0.3, default_sec: float = 3.0):
+        self.path = path
+        self.alpha = alpha
+        self.default_sec = default_sec
+        self.latencies: Dict[str, float] = _load_json(path, {})
+        self._platform_median: Dict[str, float] = {}
+
+    def observe(self, key: str, seconds: float) -> None:
+        prev = self.latencies.get(key)
+        self.latencies[key] = seconds if prev is None else prev + self.alpha * (seconds - prev)
+        self._platform_median.clear()
+
+    def estimate(self, key: str) -> float:
+        known = self.latencies.get(key)
+        if known is not None:
+            return known
+        platform = key.split(":", 1)[0]
+        median = self._platform_median.get(platform)
+        if median is None:
+            values = [v for k, v in self.latencies.items() if k.startswith(platform + ":")]
+            median = statistics.median(values) if values else self.default_sec
+            self._platform_median[platform] = median
+        return median
+
+    def save(self) -> None:
+        _save_json(self.path, {k: round(v, 4) for k, v in self.latencies.items()})
+
+
+def priority(target: Dict, deferred: Iterable[str] = ()) -> int:
+    """대상의 우선순위. 지난 실행에서 미룬 곡 → 등급(hourly/daily/weekly) → 관심곡 순."""
+    tier = target.get('tier')
+    if tier is not None:
+        rank = _TIER_PRIORITY.get(tier, 1)
+    else:
+        interest = str(target.get('song_data', {}).get('interest_yn', '')).strip().upper() == 'Y'
+        rank = 0 if interest else 1
+    # 미룬 곡은 같은 등급 안에서 먼저 (등급 사이 순서는 유지)
+    return rank * 2 + (0 if target_key(target) in deferred else 1)
+
+
+def order_targets(targets: Sequence[Dict], model: LatencyModel, deferred: Iterable[str] = ()) -> List[Dict]:
+    """우선순위 다음 예상 소요 시간이 짧은 순으로 정렬한다. (같으면 원래 순서)"""
+    deferred = set(deferred)
+    return sorted(
+        targets,
+        key=lambda t: (priority(t, deferred), model.estimate(target_key(t))),
+    )
+
+
+class TimeBudget:
+    """실행 시작부터의 경과 시간이 예산을 넘지 않게 새 작업 시작 여부를 판단한다."""
+
+    def __init__(self, budget_sec: float, clock=time.monotonic):
+        self.budget_sec = budget_sec
+        self._clock = clock
+        self.started = clock()
+
+    @property
+    def elapsed(self) -> float:
+        return self._clock() - self.started
+
+    def fits(self, estimate_sec: float) -> bool:
+        return self.elapsed + estimate_sec <= self.budget_sec
+
+
+class DeferredTracks:
+    """예산 때문에 시작하지 못한 곡 목록 (다음 실행에서 먼저 수집)."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.keys: List[str] = _load_json(path, {}).get('keys', [])
+
+    def save(self, keys: List[str], run_at: str, covered: Optional[Iterable[str]] = None) -> None:
+        """
+        이번 실행에서 미룬 곡 목록을 저장한다.
+
+        covered(이번 실행의 대상 곡)를 주면 일부만 수집한 실행으로 보고, 대상 밖의 기존 항목은
+        그대로 두고 새로 미룬 곡을 뒤에 붙인다. 없으면 전체 실행이므로 목록을 바꾼다.
+        """
+        if covered is not None:
+            covered = set(covered)
+            keys = [key for key in self.keys if key not in covered] + list(keys)
+        self.keys = keys
+        _save_json(self.path, {'run_at': run_at, 'keys': keys})
+
+
+def state_paths(config: dict) -> Dict[str, Path]:
+    state_dir = Path(config.get('state', {}).get('dir', 'data/state'))
+    return {
+        'latency': state_dir / LATENCY_FILENAME,
+        'deferred': state_dir / DEFERRED_FILENAME,
+    }
+
+
+def time_budget_from_config(config: dict, override: Optional[float] = None) -> Optional[float]:
+    """CLI --deadline 값이 있으면 우선, 없으면 collect.time_budget_sec. (0/미설정은 제한 없음)"""
+    value = override if override is not None else config.get('collect', {}).get('time_budget_sec')
+    return float(value) if value else None
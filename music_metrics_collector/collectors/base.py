@@ -1,14 +1,22 @@
 """플랫폼별 Collector의 공통 기본 클래스 정의."""
 
 from abc import ABC, abstractmethod
-from typing import Optional, List, Dict, Tuple
+from typing import TYPE_CHECKING, Optional, List, Dict, Tuple
 import logging
+import re
 
 from ..models import TrackInfo, MetricsResult
-from ..fetcher import Fetcher
+from ..pagecache import fragment_hash
+from ..timing import TIMINGS
+
+if TYPE_CHECKING:
+    from ..fetcher import Fetcher
 
 logger = logging.getLogger(__name__)
 
+# 메트릭과 무관하게 요청마다 바뀌는 부분 (토큰/타임스탬프가 든 스크립트, 스타일, 주석)
+_VOLATILE_RE = re.compile(r"<script\b.*?</script>|<style\b.*?</style>|<!--.*?-->", re.S | re.I)
+
 
 class BaseCollector(ABC):
     """플랫폼별 Collector의 추상 기본 클래스."""
@@ -16,7 +24,7 @@ class BaseCollector(ABC):
     PLATFORM: str = ""  # 하위 클래스에서 플랫폼 이름으로 재정의
     SUPPORTED_METRICS: List[str] = []  # 하위 클래스에서 지원 지표 목록 재정의: ['total_plays', 'total_listeners']
     
-    def __init__(self, fetcher: Fetcher):
+    def __init__(self, fetcher: "Fetcher"):
         """
         Collector를 초기화한다.
 
@@ -52,6 +60,55 @@ class BaseCollector(ABC):
             파싱된 값을 담은 MetricsResult
         """
         pass
+
+    def metrics_fragment(self, html: str) -> Optional[str]:
+        """
+        parse_metrics 결과를 좌우하는 HTML 구간. 이 구간의 해시가 지난번과 같으면 파싱을 건너뛴다.
+
+        기본값은 스크립트/스타일/주석을 뺀 문서 전체다. 메트릭이 특정 블록에만 있는 플랫폼은
+        그 블록만 돌려주도록 재정의하면 재사용률이 높아진다. None이면 재사용하지 않는다.
+        """
+        return _VOLATILE_RE.sub("", html)
+
+    def _parse_cached(self, url: str, song_id: Optional[str] = None) -> MetricsResult:
+        """조건부 요청/구간 해시로 지난 메트릭을 재사용하고, 바뀐 경우에만 파싱한다.
+
+        fetcher.archive가 있으면 메트릭 구간을 보관한다. (archive.py)
+        """
+        cache = self.fetcher.page_cache
+        archive = getattr(self.fetcher, "archive", None)
+        html = self.fetcher.fetch_page(url)
+        key = self.fetcher.resolve_url(url)
+        if html is None:
+            logger.debug(f"{self.PLATFORM} page not modified, reusing metrics: {url}")
+            if archive is not None:
+                with TIMINGS.stage("archive"):
+                    archive.add(self.PLATFORM, song_id, None, cache.fragment_digest(key))
+            return cache.not_modified_metrics(key)
+
+        digest = None
+        if cache is not None or archive is not None:
+            fragment = self.metrics_fragment(html)
+            digest = fragment_hash(fragment) if fragment is not None else None
+            if archive is not None:
+                # 구간이 없으면(None) 재파싱할 수 있도록 HTML 전체를 보관한다.
+                with TIMINGS.stage("archive"):
+                    if fragment is None:
+                        archive.add(self.PLATFORM, song_id, html)
+                    else:
+                        archive.add(self.PLATFORM, song_id, fragment, digest)
+        if cache is None:
+            with TIMINGS.stage("parse"):
+                return self.parse_metrics(html, custom_selectors=None)
+
+        metrics = cache.reuse(key, digest)
+        if metrics is not None:
+            logger.debug(f"{self.PLATFORM} metrics fragment unchanged, skipping parse: {url}")
+            return metrics
+        with TIMINGS.stage("parse"):
+            metrics = self.parse_metrics(html, custom_selectors=None)
+        cache.store(key, digest, metrics)
+        return metrics
     
     def _extract_text_with_js(self, page, selector: str) -> Optional[str]:
         """
@@ -66,12 +123,13 @@ class BaseCollector(ABC):
         """
         try:
             # Use Playwright's evaluate with selector as argument to avoid escaping issues
-            text = page.evaluate("""
-                (selector) => {
-                    const element = document.querySelector(selector);
-                    return element ? element.textContent.trim() : null;
-                }
-            """, selector)
+            with TIMINGS.stage("selector_eval"):
+                text = page.evaluate("""
+                    (selector) => {
+                        const element = document.querySelector(selector);
+                        return element ? element.textContent.trim() : null;
+                    }
+                """, selector)
             return text
         except Exception as e:
             logger.debug(f"JavaScript selector '{selector}' failed: {e}")
@@ -126,8 +184,7 @@ class BaseCollector(ABC):
                 )
             else:
                 # 전통적인 HTML 파싱 사용 (이 모드에서는 곡 제목 미수집)
-                html = self.fetcher.fetch_html(url)
-                metrics = self.parse_metrics(html, custom_selectors=None)
+                metrics = self._parse_cached(url, track_info.song_id)
                 song_name = None
                 artist_name = None
                 album_name = None
@@ -188,55 +245,59 @@ class BaseCollector(ABC):
         except ImportError:
             raise ImportError("playwright not installed. Install with: pip install playwright && playwright install chromium")
         
-        playwright = sync_playwright().start()
-        browser = playwright.chromium.launch(headless=True)
-        page = browser.new_page()
+        with TIMINGS.stage("browser_launch"):
+            playwright = sync_playwright().start()
+            browser = playwright.chromium.launch(headless=True)
+            page = browser.new_page()
         
         try:
-            page.goto(url, wait_until='networkidle', timeout=self.fetcher.timeout * 1000)
+            with TIMINGS.stage("fetch"), TIMINGS.stage("browser_navigate"):
+                page.goto(self.fetcher.resolve_url(url), wait_until='networkidle', timeout=self.fetcher.timeout * 1000)
             
-            metrics = MetricsResult()
-            song_name = None
-            artist_name = None
-            album_name = None
+            # 선택자 평가 + 숫자 변환 (requests 경로의 parse 단계에 해당)
+            with TIMINGS.stage("parse"):
+                metrics = MetricsResult()
+                song_name = None
+                artist_name = None
+                album_name = None
             
-            # 곡 제목 추출 (선택자 제공 시)
-            if song_name_selector:
-                song_name = self._extract_text_with_js(page, song_name_selector)
-                if song_name:
-                    song_name = song_name.strip()
-                    logger.debug(f"Found song name using selector '{song_name_selector}': {song_name}")
+                # 곡 제목 추출 (선택자 제공 시)
+                if song_name_selector:
+                    song_name = self._extract_text_with_js(page, song_name_selector)
+                    if song_name:
+                        song_name = song_name.strip()
+                        logger.debug(f"Found song name using selector '{song_name_selector}': {song_name}")
             
-            # 아티스트명 추출 (선택자 제공 시)
-            if artist_name_selector:
-                artist_name = self._extract_text_with_js(page, artist_name_selector)
-                if artist_name:
-                    artist_name = artist_name.strip()
-                    logger.debug(f"Found artist name using selector '{artist_name_selector}': {artist_name}")
+                # 아티스트명 추출 (선택자 제공 시)
+                if artist_name_selector:
+                    artist_name = self._extract_text_with_js(page, artist_name_selector)
+                    if artist_name:
+                        artist_name = artist_name.strip()
+                        logger.debug(f"Found artist name using selector '{artist_name_selector}': {artist_name}")
             
-            # 앨범명 추출 (선택자 제공 시)
-            if album_name_selector:
-                album_name = self._extract_text_with_js(page, album_name_selector)
-                if album_name:
-                    album_name = album_name.strip()
-                    logger.debug(f"Found album name using selector '{album_name_selector}': {album_name}")
+                # 앨범명 추출 (선택자 제공 시)
+                if album_name_selector:
+                    album_name = self._extract_text_with_js(page, album_name_selector)
+                    if album_name:
+                        album_name = album_name.strip()
+                        logger.debug(f"Found album name using selector '{album_name_selector}': {album_name}")
             
-            # 각 지표를 JavaScript querySelector로 추출
-            for metric_name, selector in custom_selectors.items():
-                if metric_name not in self.SUPPORTED_METRICS:
-                    logger.warning(f"Unsupported metric '{metric_name}' for {self.PLATFORM}")
-                    continue
+                # 각 지표를 JavaScript querySelector로 추출
+                for metric_name, selector in custom_selectors.items():
+                    if metric_name not in self.SUPPORTED_METRICS:
+                        logger.warning(f"Unsupported metric '{metric_name}' for {self.PLATFORM}")
+                        continue
                 
-                text = self._extract_text_with_js(page, selector)
-                if text:
-                    from ..normalizer import extract_number_from_text
-                    num = extract_number_from_text(text)
-                    if num is not None:
-                        if metric_name == 'total_plays':
-                            metrics.total_plays = num
-                        elif metric_name == 'total_listeners':
-                            metrics.total_listeners = num
-                        logger.debug(f"Found {metric_name} using JavaScript selector '{selector}': {num}")
+                    text = self._extract_text_with_js(page, selector)
+                    if text:
+                        from ..normalizer import extract_number_from_text
+                        num = extract_number_from_text(text)
+                        if num is not None:
+                            if metric_name == 'total_plays':
+                                metrics.total_plays = num
+                            elif metric_name == 'total_listeners':
+                                metrics.total_listeners = num
+                            logger.debug(f"Found {metric_name} using JavaScript selector '{selector}': {num}")
             
             return metrics, song_name, artist_name, album_name
         finally:
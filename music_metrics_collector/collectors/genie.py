@@ -1,8 +1,8 @@
 """GENIE 플랫폼용 Collector 구현."""
 
 from typing import Optional, Dict
-from bs4 import BeautifulSoup
 import logging
+import re
 
 from .base import BaseCollector
 from ..models import MetricsResult
@@ -10,6 +10,23 @@ from ..normalizer import extract_number_from_text
 
 logger = logging.getLogger(__name__)
 
+# 메트릭이 들어 있는 블록 (일간 차트의 전체 재생수/청취자수, 곡 정보의 재생수/청취자수)
+_METRIC_BLOCK_RE = re.compile(
+    r'<div\b[^>]*\bclass="[^"]*(?<![\w-])(?:daily-chart|song-info)(?![\w-])[^"]*"[^>]*>', re.I
+)
+_DIV_TAG_RE = re.compile(r"<(/?)div\b", re.I)
+
+
+def _block_end(html: str, start: int) -> int:
+    """start 위치의 <div>와 짝이 맞는 </div> 바로 뒤 위치 (짝이 없으면 문서 끝)."""
+    depth = 0
+    for m in _DIV_TAG_RE.finditer(html, start):
+        depth += -1 if m.group(1) else 1
+        if depth == 0:
+            end = html.find(">", m.end())
+            return len(html) if end < 0 else end + 1
+    return len(html)
+
 
 class GenieCollector(BaseCollector):
     """GENIE 플랫폼에서 곡 메트릭을 수집하는 Collector."""
@@ -21,6 +38,24 @@ class GenieCollector(BaseCollector):
         """GENIE 곡 상세 페이지 URL을 생성한다."""
         return f"https://www.genie.co.kr/detail/songInfo?xgnm={song_id}"
     
+    def metrics_fragment(self, html: str) -> Optional[str]:
+        """
+        메트릭 블록(.daily-chart, .song-info)만 이어 붙인 구간.
+
+        곡 제목/추천 목록 등 나머지 영역이 바뀌어도 재사용되고, 보관(archive)도 이 구간만 한다.
+        블록을 찾지 못하면(페이지 구조 변경) 텍스트 주변 탐색이 문서 전체를 봐야 하므로 기본 구간을 쓴다.
+        """
+        blocks = []
+        pos = 0
+        for m in _METRIC_BLOCK_RE.finditer(html):
+            if m.start() < pos:  # 앞 블록 안에 중첩된 블록
+                continue
+            pos = _block_end(html, m.start())
+            blocks.append(html[m.start():pos])
+        if not blocks:
+            return super().metrics_fragment(html)
+        return super().metrics_fragment("\n".join(blocks))
+
     def parse_metrics(self, html: str, custom_selectors: Optional[Dict[str, str]] = None) -> MetricsResult:
         """
         GENIE 곡 상세 HTML에서 메트릭을 파싱한다.
@@ -33,6 +68,9 @@ class GenieCollector(BaseCollector):
             html: HTML 문자열
             custom_selectors: 지표 이름 → CSS 선택자 딕셔너리 (있으면 우선 사용)
         """
+        # bs4는 첫 파싱 때 로드한다. (CLI 기동 시간 단축)
+        from bs4 import BeautifulSoup
+
         soup = BeautifulSoup(html, 'html.parser')
         
         total_plays = None
@@ -1,29 +1,89 @@
-"""플랫폼별 Collector 인스턴스를 생성하는 팩토리."""
+"""플랫폼별 Collector 인스턴스를 생성하는 팩토리.
+
+Collector 클래스는 플러그인 레지스트리에서 찾는다. 내장 Collector(GENIE)와 함께
+`music_metrics_collector.collectors` 엔트리 포인트 그룹에 등록된 패키지의 Collector를
+처음 조회할 때 한 번 발견해 두고, 클래스는 해당 플랫폼을 실제로 쓸 때 import한다.
+
+    # 플러그인 패키지의 pyproject.toml
+    [project.entry-points."music_metrics_collector.collectors"]
+    MELON = "melon_collector:MelonCollector"
+
+엔트리 포인트 이름이 플랫폼 이름(대소문자 무시)이며, 내장 Collector와 이름이 같으면 플러그인이 우선한다.
+"""
 
 import logging
-from typing import Dict, Type
+from importlib.metadata import EntryPoint, entry_points
+from typing import TYPE_CHECKING, Dict, Optional, Type
 
 from .collectors.base import BaseCollector
-from .collectors.genie import GenieCollector
-from .fetcher import Fetcher
+
+if TYPE_CHECKING:
+    from .fetcher import Fetcher
 
 logger = logging.getLogger(__name__)
 
+ENTRY_POINT_GROUP = "music_metrics_collector.collectors"
+
+# 내장 Collector (플랫폼 → "모듈:클래스")
+BUILTIN_COLLECTORS = {
+    "GENIE": "music_metrics_collector.collectors.genie:GenieCollector",
+}
+
 
 class CollectorFactory:
     """Collector 생성용 팩토리 클래스."""
 
-    _collectors: Dict[str, Type[BaseCollector]] = {
-        "GENIE": GenieCollector,
-    }
+    # 로드했거나 register로 등록한 Collector 클래스
+    _collectors: Dict[str, Type[BaseCollector]] = {}
+    # 발견한 Collector (로드 전, 처음 조회할 때 채운다)
+    _entry_points: Optional[Dict[str, EntryPoint]] = None
+
+    @classmethod
+    def _discover(cls) -> Dict[str, EntryPoint]:
+        if cls._entry_points is None:
+            found = {
+                platform: EntryPoint(name=platform, value=value, group=ENTRY_POINT_GROUP)
+                for platform, value in BUILTIN_COLLECTORS.items()
+            }
+            for entry_point in entry_points(group=ENTRY_POINT_GROUP):
+                platform = entry_point.name.upper()
+                if platform in found:
+                    logger.info(f"Collector plugin {entry_point.value} overrides {found[platform].value}")
+                found[platform] = entry_point
+            cls._entry_points = found
+        return cls._entry_points
+
+    @classmethod
+    def register(cls, platform: str, collector_class: Type[BaseCollector]) -> None:
+        """엔트리 포인트 없이 Collector 클래스를 직접 등록한다."""
+        cls._collectors[platform.upper()] = collector_class
 
     @classmethod
-    def create(cls, platform: str, fetcher: Fetcher) -> BaseCollector:
+    def get_class(cls, platform: str) -> Type[BaseCollector]:
+        """
+        플랫폼의 Collector 클래스를 반환한다. (처음 조회할 때 import)
+
+        Raises:
+            ValueError: 지원하지 않는 플랫폼인 경우
+        """
+        platform_upper = platform.upper()
+        collector_class = cls._collectors.get(platform_upper)
+        if collector_class is None:
+            entry_point = cls._discover().get(platform_upper)
+            if entry_point is None:
+                raise ValueError(
+                    f"Unsupported platform: {platform}. Supported platforms: {cls.get_supported_platforms()}"
+                )
+            collector_class = cls._collectors[platform_upper] = entry_point.load()
+        return collector_class
+
+    @classmethod
+    def create(cls, platform: str, fetcher: "Fetcher") -> BaseCollector:
         """
         지정한 플랫폼에 대한 Collector 인스턴스를 생성한다.
 
         Args:
-            platform: 플랫폼 이름 (GENIE)
+            platform: 플랫폼 이름 (GENIE 또는 플러그인 플랫폼)
             fetcher: HTTP Fetcher 인스턴스
 
         Returns:
@@ -32,21 +92,15 @@ class CollectorFactory:
         Raises:
             ValueError: 지원하지 않는 플랫폼인 경우
         """
-        platform_upper = platform.upper()
-        collector_class = cls._collectors.get(platform_upper)
-
-        if collector_class is None:
-            raise ValueError(f"Unsupported platform: {platform}. Supported platforms: {list(cls._collectors.keys())}")
+        return cls.get_class(platform)(fetcher)
 
-        return collector_class(fetcher)
-    
     @classmethod
     def is_supported(cls, platform: str) -> bool:
         """해당 플랫폼이 지원되는지 여부를 반환한다."""
-        return platform.upper() in cls._collectors
-    
+        platform_upper = platform.upper()
+        return platform_upper in cls._collectors or platform_upper in cls._discover()
+
     @classmethod
     def get_supported_platforms(cls) -> list:
         """지원되는 플랫폼 이름 목록을 반환한다."""
-        return list(cls._collectors.keys())
-
+        return sorted(set(cls._collectors) | set(cls._discover()))
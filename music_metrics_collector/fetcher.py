@@ -1,39 +1,167 @@
 """HTTP 요청을 담당하는 Fetcher - requests 우선, 필요 시 Playwright 사용."""
 
+import ipaddress
 import logging
-from typing import Optional
+import socket
+import time
+from typing import List, Optional
+from urllib.parse import urlsplit, urlunsplit
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError, NewConnectionError
+
+from .archive import PageArchive
+from .pagecache import PageCache
+from .timing import HTTP_CONNECT_STAGES, TIMINGS
 
 logger = logging.getLogger(__name__)
 
 
+def _resolve(host: str, port: int) -> List[str]:
+    """host의 주소 목록 (중복 제거, getaddrinfo 순서 유지). 실패하면 [host]로 urllib3에 맡긴다."""
+    try:
+        ipaddress.ip_address(host.strip("[]"))
+        return [host]
+    except ValueError:
+        pass
+    try:
+        infos = socket.getaddrinfo(host, port, 0, socket.SOCK_STREAM)
+    except OSError:
+        return [host]
+    return list(dict.fromkeys(info[4][0] for info in infos)) or [host]
+
+
+class _TimedConnectionMixin:
+    """새 연결의 DNS 조회와 TCP 연결 시간을 나눠 기록한다.
+
+    urllib3는 조회와 연결을 create_connection 한 번에 처리하므로, 먼저 주소를 조회한 뒤
+    주소마다 _dns_host를 바꿔 가며 원래 _new_conn을 호출한다. (여러 주소 순차 시도는 유지)
+    """
+
+    def _new_conn(self):
+        host = self._dns_host
+        with TIMINGS.stage("http_dns"):
+            addresses = _resolve(host, self.port)
+        with TIMINGS.stage("http_connect"):
+            try:
+                for i, address in enumerate(addresses):
+                    self._dns_host = address
+                    try:
+                        return super()._new_conn()
+                    except (NewConnectionError, ConnectTimeoutError):
+                        if i == len(addresses) - 1:
+                            raise
+            finally:
+                self._dns_host = host
+
+
+class _TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class _TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    def connect(self):
+        # HTTPSConnection.connect = _new_conn(DNS + TCP) + TLS 핸드셰이크
+        start = time.perf_counter()
+        before = TIMINGS.thread_sum(("http_dns", "http_connect"))
+        super().connect()
+        inner = TIMINGS.thread_sum(("http_dns", "http_connect")) - before
+        TIMINGS.observe("http_tls", max(0.0, time.perf_counter() - start - inner))
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class _TimedAdapter(HTTPAdapter):
+    """연결 단계 계측용 커넥션 풀을 쓰는 어댑터."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _TimedHTTPConnectionPool,
+            "https": _TimedHTTPSConnectionPool,
+        }
+
+
 class Fetcher:
     """HTTP Fetcher 클래스 (requests / Playwright 지원)."""
     
-    def __init__(self, mode: str = "auto", timeout_sec: int = 20):
+    def __init__(
+        self,
+        mode: str = "auto",
+        timeout_sec: int = 20,
+        base_url: Optional[str] = None,
+        page_cache: Optional[PageCache] = None,
+        archive: Optional[PageArchive] = None,
+    ):
         """
         Fetcher를 초기화한다.
 
         Args:
             mode: "requests" | "playwright" | "auto"
             timeout_sec: 요청 타임아웃(초)
+            base_url: 주면 모든 요청의 scheme/host를 이 주소로 바꾼다.
+                (예: "http://127.0.0.1:8765" - 로컬 GENIE 대역 서버로 부하 테스트할 때)
+            page_cache: 주면 fetch_page가 조건부 요청을 보내고 검증자를 기록한다. (pagecache.py)
+            archive: 주면 collector가 받은 페이지의 메트릭 구간을 보관한다. (archive.py)
         """
         self.mode = mode
         self.timeout = timeout_sec
+        self.base_url = base_url.rstrip("/") if base_url else None
+        self.page_cache = page_cache
+        self.archive = archive
         self._playwright = None
         self._browser = None
-        
-    def _fetch_requests(self, url: str, headers: Optional[dict] = None) -> str:
-        """requests 라이브러리를 사용해 HTML을 가져온다."""
+        self._session: Optional[requests.Session] = None
+
+    @property
+    def session(self) -> requests.Session:
+        """곡 사이에 연결을 재사용하는 세션 (연결 단계 계측 어댑터 장착)."""
+        if self._session is None:
+            session = requests.Session()
+            adapter = _TimedAdapter()
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            self._session = session
+        return self._session
+
+    def _fetch_requests(self, url: str, headers: Optional[dict] = None, conditional: bool = False) -> Optional[str]:
+        """requests 라이브러리를 사용해 HTML을 가져온다. conditional이면 304일 때 None."""
         default_headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
         }
+        if conditional:
+            default_headers.update(self.page_cache.conditional_headers(url))
         if headers:
             default_headers.update(headers)
             
-        response = requests.get(url, headers=default_headers, timeout=self.timeout)
-        response.raise_for_status()
-        return response.text
+        # 헤더까지만 받고(stream) 본문은 따로 읽어 TTFB와 다운로드 시간을 나눈다.
+        start = time.perf_counter()
+        connect_before = TIMINGS.thread_sum(HTTP_CONNECT_STAGES)
+        response = self.session.get(url, headers=default_headers, timeout=self.timeout, stream=True)
+        connect_sec = TIMINGS.thread_sum(HTTP_CONNECT_STAGES) - connect_before
+        TIMINGS.observe("http_ttfb", max(0.0, time.perf_counter() - start - connect_sec))
+        with TIMINGS.stage("http_download"):
+            try:
+                if conditional and response.status_code == 304:
+                    # 빈 본문까지 읽어야 close() 전에 연결이 풀로 돌아간다.
+                    response.content
+                    return None
+                response.raise_for_status()
+                if conditional:
+                    self.page_cache.remember_validators(
+                        url, response.headers.get('ETag'), response.headers.get('Last-Modified')
+                    )
+                return response.text
+            finally:
+                response.close()
     
     def _fetch_playwright(self, url: str) -> str:
         """Playwright를 사용해 HTML을 가져온다 (JS 렌더링이 필요한 경우)."""
@@ -43,17 +171,28 @@ class Fetcher:
             raise ImportError("playwright not installed. Install with: pip install playwright && playwright install chromium")
         
         if self._playwright is None:
-            self._playwright = sync_playwright().start()
-            self._browser = self._playwright.chromium.launch(headless=True)
+            with TIMINGS.stage("browser_launch"):
+                self._playwright = sync_playwright().start()
+                self._browser = self._playwright.chromium.launch(headless=True)
         
         page = self._browser.new_page()
         try:
-            page.goto(url, wait_until='networkidle', timeout=self.timeout * 1000)
-            content = page.content()
+            with TIMINGS.stage("browser_navigate"):
+                page.goto(url, wait_until='networkidle', timeout=self.timeout * 1000)
+            with TIMINGS.stage("browser_content"):
+                content = page.content()
             return content
         finally:
             page.close()
     
+    def resolve_url(self, url: str) -> str:
+        """base_url이 설정되어 있으면 url의 scheme/host를 바꾸고 경로 앞에 base_url 경로를 붙인다."""
+        if not self.base_url:
+            return url
+        base = urlsplit(self.base_url)
+        parts = urlsplit(url)
+        return urlunsplit((base.scheme, base.netloc, base.path + parts.path, parts.query, parts.fragment))
+
     def fetch_html(self, url: str, headers: Optional[dict] = None) -> str:
         """
         지정한 URL에서 HTML을 가져온다.
@@ -68,19 +207,44 @@ class Fetcher:
         Raises:
             Exception: 요청 실패 시 예외 발생
         """
-        if self.mode == "playwright":
-            return self._fetch_playwright(url)
-        elif self.mode == "requests":
-            return self._fetch_requests(url, headers)
-        else:  # auto mode
-            try:
+        url = self.resolve_url(url)
+        with TIMINGS.stage("fetch"):
+            if self.mode == "playwright":
+                return self._fetch_playwright(url)
+            elif self.mode == "requests":
                 return self._fetch_requests(url, headers)
+            else:  # auto mode
+                try:
+                    return self._fetch_requests(url, headers)
+                except Exception as e:
+                    logger.warning(f"requests failed for {url}: {e}. Falling back to playwright...")
+                    return self._fetch_playwright(url)
+    
+    def fetch_page(self, url: str) -> Optional[str]:
+        """
+        곡 상세 페이지를 가져온다. page_cache가 있으면 조건부 요청을 보낸다.
+
+        Returns:
+            HTML 문자열, 서버가 304 Not Modified를 돌려주면 None
+            (page_cache가 없거나 playwright 모드면 항상 HTML)
+        """
+        if self.page_cache is None or self.mode == "playwright":
+            return self.fetch_html(url)
+        url = self.resolve_url(url)
+        with TIMINGS.stage("fetch"):
+            try:
+                return self._fetch_requests(url, conditional=True)
             except Exception as e:
+                if self.mode != "auto":
+                    raise
                 logger.warning(f"requests failed for {url}: {e}. Falling back to playwright...")
                 return self._fetch_playwright(url)
-    
+
     def close(self):
-        """Playwright 관련 리소스를 정리한다."""
+        """HTTP 세션과 Playwright 관련 리소스를 정리한다."""
+        if self._session is not None:
+            self._session.close()
+            self._session = None
         if self._browser:
             self._browser.close()
             self._browser = None
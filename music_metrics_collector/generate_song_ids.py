@@ -583,7 +583,12 @@ def generate_song_ids(config_path: str) -> None:
     # enabled_platforms에 포함된 플랫폼만 처리
     enabled_platforms = set(config.get("enabled_platforms", []))
 
-    fetcher = Fetcher(mode="requests", timeout_sec=config.get("http", {}).get("timeout_sec", 20))
+    http_config = config.get("http", {})
+    fetcher = Fetcher(
+        mode="requests",
+        timeout_sec=http_config.get("timeout_sec", 20),
+        base_url=http_config.get("base_url"),
+    )
 
     try:
         for platform_name in platforms_config.keys():
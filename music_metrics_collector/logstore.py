@@ -0,0 +1,370 @@
+"""일자별 JSONL 로그 기록 및 사이드카 오프셋 인덱스.
+
+로그 한 줄을 `{날짜}_{플랫폼}.jsonl`에 추가할 때마다 같은 디렉토리의
+`{날짜}_{플랫폼}.jsonl.idx`에 아래 형식의 한 줄을 덧붙인다. (탭 구분)
+
+    <바이트 오프셋>\t<바이트 길이>\t<song_id>\t<track_cd>\t<isrc_cd>
+
+song_id는 로그의 platform_song_ids 값이다. 인덱스는 로그 줄을 쓴 다음에 기록하므로
+중간에 중단되면 인덱스가 로그보다 짧을 수 있다. 읽는 쪽은 인덱스가 다루는 마지막
+바이트 이후 구간만 순차적으로 읽으면 된다. (chart_maker.log_index 참고)
+
+기존 로그에 인덱스를 만들려면:
+
+    python -m music_metrics_collector.logstore index data/logs
+
+수집이 끝난(오늘 이전) 일자 파일은 압축 보관할 수 있다. (compact_logs 참고)
+(req_date, song_id)마다 마지막 성공 레코드만 남기고 gzip/zstd로 압축하며,
+--monthly를 주면 `{YYYY-MM}_{플랫폼}.jsonl.gz` 월별 파일 하나로 합친다.
+
+    python -m music_metrics_collector.logstore compact data/logs --codec zstd --monthly
+
+압축/보관 파일은 open_log/iter_log_records로 풀어서 읽는다.
+"""
+
+import argparse
+import gzip
+import io
+import json
+import logging
+import os
+import re
+import shutil
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional, Sequence, TextIO, Tuple
+
+logger = logging.getLogger(__name__)
+
+SIDECAR_SUFFIX = ".idx"
+# 사이드카 인덱스 컬럼 (오프셋/길이 다음 순서)
+INDEX_FIELDS = ("platform_song_ids", "track_cd", "isrc_cd")
+
+# 압축 코덱 → 파일 확장자 (zstd는 zstandard 패키지가 있을 때만 사용 가능)
+CODECS = {"gzip": ".gz", "zstd": ".zst"}
+LOG_SUFFIXES = (".jsonl", ".jsonl.gz", ".jsonl.zst")
+# 일자 파일(YYYY-MM-DD_PLATFORM)과 월별 보관 파일(YYYY-MM_PLATFORM)
+LOG_NAME_RE = re.compile(r"^(\d{4}-\d{2}(?:-\d{2})?)_([A-Za-z0-9]+)\.jsonl(?:\.gz|\.zst)?$")
+# 날짜 디렉토리 구조: {YYYY-MM-DD}/{PLATFORM}.jsonl
+_DAY_DIR_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+_NESTED_NAME_RE = re.compile(r"^([A-Za-z0-9]+)\.jsonl(?:\.gz|\.zst)?$")
+
+
+def sidecar_path(log_path: Path) -> Path:
+    """로그 파일의 사이드카 인덱스 경로를 반환한다."""
+    return log_path.with_name(log_path.name + SIDECAR_SUFFIX)
+
+
+def index_values(record: Dict) -> Tuple[str, ...]:
+    """레코드의 사이드카 인덱스 컬럼 값 (INDEX_FIELDS 순서)."""
+    values = []
+    for name in INDEX_FIELDS:
+        value = record.get(name)
+        # 탭/줄바꿈은 인덱스 형식을 깨뜨리므로 공백으로 치환
+        values.append("" if value is None else str(value).replace("\t", " ").replace("\n", " "))
+    return tuple(values)
+
+
+def _index_line(offset: int, length: int, values: Sequence[str]) -> str:
+    return "\t".join([str(offset), str(length), *values]) + "\n"
+
+
+def append_line(log_path: Path, line: str, values: Sequence[str] = (), with_index: bool = True) -> None:
+    """이미 JSON으로 직렬화한 한 줄을 추가한다. values는 사이드카 인덱스 컬럼 값 (index_values 참고)."""
+    data = (line + "\n").encode("utf-8")
+    with open(log_path, "ab") as f:
+        offset = f.seek(0, os.SEEK_END)
+        f.write(data)
+    if with_index:
+        with open(sidecar_path(log_path), "a", encoding="utf-8") as idx:
+            idx.write(_index_line(offset, len(data), values))
+
+
+def append_record(log_path: Path, record: Dict, with_index: bool = True) -> None:
+    """레코드를 JSONL 한 줄로 추가하고, with_index이면 사이드카 인덱스도 갱신한다."""
+    append_line(log_path, json.dumps(record, ensure_ascii=False), index_values(record), with_index)
+
+
+def rebuild_index(log_path: Path) -> int:
+    """기존 로그 파일 전체를 읽어 사이드카 인덱스를 새로 만든다. 인덱스된 줄 수를 반환한다."""
+    count = 0
+    tmp_path = sidecar_path(log_path).with_suffix(".idx.tmp")
+    with open(log_path, "rb") as f, open(tmp_path, "w", encoding="utf-8") as idx:
+        offset = 0
+        for raw in f:
+            length = len(raw)
+            if raw.strip():
+                try:
+                    record = json.loads(raw)
+                except json.JSONDecodeError as e:
+                    logger.warning(f"JSON 파싱 실패 ({log_path}, offset={offset}): {e}")
+                else:
+                    idx.write(_index_line(offset, length, index_values(record)))
+                    count += 1
+            offset += length
+    os.replace(tmp_path, sidecar_path(log_path))
+    return count
+
+
+def rebuild_indexes(paths: Iterable[Path], force: bool = False) -> Dict[str, int]:
+    """여러 로그 파일의 인덱스를 만든다. force가 아니면 인덱스가 있는 파일은 건너뛴다."""
+    results: Dict[str, int] = {}
+    for path in paths:
+        if not force and sidecar_path(path).exists():
+            continue
+        results[str(path)] = rebuild_index(path)
+        logger.info(f"사이드카 인덱스 생성: {sidecar_path(path)} ({results[str(path)]}줄)")
+    return results
+
+
+def _collect_log_files(target: Path) -> Iterable[Path]:
+    if target.is_dir():
+        return sorted(target.rglob("*.jsonl"))
+    return [target]
+
+
+def is_log_file(path: Path) -> bool:
+    """수집 로그 파일(압축 포함)인지 확인한다."""
+    return path.name.endswith(LOG_SUFFIXES)
+
+
+def _zstandard():
+    try:
+        import zstandard
+    except ImportError as e:
+        raise RuntimeError("zstd 압축 로그를 다루려면 zstandard 패키지가 필요합니다 (pip install zstandard)") from e
+    return zstandard
+
+
+def open_log(path: Path) -> TextIO:
+    """로그 파일을 텍스트 스트림으로 연다. 압축 파일은 읽는 만큼만 풀어서 반환한다."""
+    name = path.name
+    if name.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8")
+    if name.endswith(".zst"):
+        # 월별 파일은 여러 프레임을 이어 붙인 형태이므로 프레임 경계를 넘어 읽는다.
+        reader = _zstandard().ZstdDecompressor().stream_reader(
+            path.open("rb"), read_across_frames=True, closefd=True
+        )
+        return io.TextIOWrapper(reader, encoding="utf-8")
+    return path.open("r", encoding="utf-8")
+
+
+def iter_log_records(path: Path) -> Iterator[Dict]:
+    """로그 파일(압축 포함)의 레코드를 한 줄씩 반환한다. 깨진 줄은 경고 후 건너뛴다."""
+    with open_log(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as e:
+                logger.warning(f"JSON 파싱 실패 ({path}): {e} / line={line[:80]}")
+
+
+def _open_writer(path: Path, codec: str, append: bool = False) -> BinaryIO:
+    """압축 쓰기 스트림을 연다. append이면 기존 파일 뒤에 새 gzip 멤버/zstd 프레임을 붙인다."""
+    mode = "ab" if append else "wb"
+    if codec == "gzip":
+        return gzip.open(path, mode)
+    if codec == "zstd":
+        return _zstandard().ZstdCompressor(level=10).stream_writer(path.open(mode), closefd=True)
+    raise ValueError(f"지원하지 않는 압축 코덱: {codec} (가능: {', '.join(CODECS)})")
+
+
+def _dedupe_key(record: Dict) -> Optional[Tuple[str, str]]:
+    day = record.get("req_date")
+    song_id = record.get("platform_song_ids", record.get("song_id"))
+    if day is None or song_id is None:
+        return None
+    return str(day), str(song_id)
+
+
+def dedupe_lines(lines: Iterable[str]) -> Tuple[List[str], int]:
+    """(req_date, song_id)마다 마지막 성공 레코드만 남긴다.
+
+    성공 레코드가 없는 곡은 마지막 실패 레코드를 남기고, 키가 없는 레코드(이전 형식의
+    시간 단위 로그 등)는 그대로 둔다. 남은 줄은 원래 순서를 유지한다.
+    반환값은 (남은 줄 목록, 제거된 줄 수)이다.
+    """
+    keyless: List[Tuple[int, str]] = []
+    latest: Dict[Tuple[str, str], Tuple[int, str, bool]] = {}
+    total = 0
+    for pos, line in enumerate(lines):
+        line = line.strip()
+        if not line:
+            continue
+        total += 1
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            logger.warning(f"JSON 파싱 실패로 압축 대상에서 제외: {e} / line={line[:80]}")
+            continue
+        key = _dedupe_key(record)
+        if key is None:
+            keyless.append((pos, line))
+            continue
+        ok = not record.get("error")
+        prev = latest.get(key)
+        if prev is None or ok or not prev[2]:
+            latest[key] = (pos, line, ok)
+
+    kept = sorted(keyless + [(pos, line) for pos, line, _ in latest.values()])
+    return [line + "\n" for _, line in kept], total - len(kept)
+
+
+@dataclass
+class CompactionStats:
+    """압축 작업 결과 요약"""
+
+    files: int = 0
+    records_in: int = 0
+    records_out: int = 0
+    bytes_in: int = 0
+    bytes_out: int = 0
+
+
+def _sealed_day_files(log_dir: Path, before: str) -> Dict[Tuple[str, str, bool], List[Path]]:
+    """before 이전 일자 파일을 (일자, 플랫폼, 날짜 디렉토리 구조 여부) → [파일들]로 묶는다.
+
+    수집기 구조(`{날짜}_{플랫폼}.jsonl`)와 날짜 디렉토리 구조(`{날짜}/{플랫폼}.jsonl`,
+    analyze_logs 입력)를 모두 다루며, 평문/압축 파일을 함께 묶는다.
+    """
+    groups: Dict[Tuple[str, str, bool], List[Path]] = {}
+    for path in sorted(log_dir.iterdir()):
+        if path.is_dir() and _DAY_DIR_RE.match(path.name) and path.name < before:
+            for child in sorted(path.iterdir()):
+                m = _NESTED_NAME_RE.match(child.name)
+                if m and child.is_file():
+                    groups.setdefault((path.name, m.group(1), True), []).append(child)
+            continue
+        m = LOG_NAME_RE.match(path.name)
+        if m and len(m.group(1)) == 10 and m.group(1) < before and path.is_file():
+            groups.setdefault((m.group(1), m.group(2), False), []).append(path)
+    # 같은 일자라면 이미 압축된 파일이 먼저 쓰인 것이므로 앞에 둔다. (마지막 레코드 우선)
+    for paths in groups.values():
+        paths.sort(key=lambda p: (p.name.endswith(".jsonl"), p.name))
+    return groups
+
+
+def _target_path(log_dir: Path, name: str, platform: str, nested: bool, suffix: str) -> Path:
+    if nested:
+        return log_dir / name / f"{platform}{suffix}"
+    return log_dir / f"{name}_{platform}{suffix}"
+
+
+def _remove_sources(paths: Iterable[Path], keep: Path) -> None:
+    for path in paths:
+        if path == keep:
+            continue
+        path.unlink()
+        sidecar = sidecar_path(path)
+        if sidecar.exists():
+            sidecar.unlink()
+        # 월별로 합친 뒤 비게 된 날짜 디렉토리 정리
+        if path.parent != keep.parent and not any(path.parent.iterdir()):
+            path.parent.rmdir()
+
+
+def compact_logs(
+    log_dir: Path,
+    before: str,
+    codec: str = "gzip",
+    monthly: bool = False,
+) -> CompactionStats:
+    """before(YYYY-MM-DD) 이전 일자 로그를 중복 제거 후 압축한다.
+
+    일자별로 `{날짜}_{플랫폼}.jsonl{.gz|.zst}` 파일 하나를 만들고 원본 평문 파일과
+    사이드카 인덱스를 지운다. monthly이면 일자 파일 대신 `{YYYY-MM}_{플랫폼}` 월별 파일에
+    이어 붙인다. 날짜 디렉토리 구조는 `{날짜}/{플랫폼}`, `{YYYY-MM}/{플랫폼}`으로 유지한다.
+    결과 파일은 임시 파일에 쓴 뒤 교체하므로 중간에 실패해도 원본은 남는다.
+    """
+    suffix = ".jsonl" + CODECS[codec] if codec in CODECS else None
+    if suffix is None:
+        raise ValueError(f"지원하지 않는 압축 코덱: {codec} (가능: {', '.join(CODECS)})")
+
+    stats = CompactionStats()
+    groups = _sealed_day_files(log_dir, before)
+    if not monthly:
+        # 이미 같은 코덱으로 압축됐고 다른 파일이 없는 일자는 건너뛴다.
+        groups = {
+            k: v for k, v in groups.items()
+            if v != [_target_path(log_dir, k[0], k[1], k[2], suffix)]
+        }
+
+    months: Dict[Tuple[str, str, bool], List[Tuple[str, List[Path]]]] = {}
+    for (day, platform, nested), paths in sorted(groups.items()):
+        key = (day[:7] if monthly else day, platform, nested)
+        months.setdefault(key, []).append((day, paths))
+
+    for (name, platform, nested), days in months.items():
+        target = _target_path(log_dir, name, platform, nested, suffix)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+        # 월별 파일이 있으면 압축된 바이트를 그대로 복사한 뒤 새 멤버/프레임을 붙인다.
+        append = monthly and target.exists()
+        prior_size = target.stat().st_size if append else 0
+        try:
+            if append:
+                shutil.copyfile(target, tmp_path)
+            with _open_writer(tmp_path, codec, append=append) as out:
+                for day, paths in days:
+                    lines: List[str] = []
+                    for path in paths:
+                        stats.bytes_in += path.stat().st_size
+                        with open_log(path) as f:
+                            lines.extend(f)
+                    kept, dropped = dedupe_lines(lines)
+                    stats.records_in += len(kept) + dropped
+                    stats.records_out += len(kept)
+                    out.write("".join(kept).encode("utf-8"))
+            os.replace(tmp_path, target)
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
+
+        for _, paths in days:
+            _remove_sources(paths, keep=target)
+            stats.files += len(paths)
+        stats.bytes_out += target.stat().st_size - prior_size
+        logger.info(f"로그 압축 완료: {target} (일자 {len(days)}개)")
+
+    return stats
+
+
+def main(argv: Optional[list] = None) -> None:
+    """CLI 엔트리포인트: 사이드카 인덱스 생성(index), 지난 일자 로그 압축(compact)."""
+    from .utils import get_seoul_date
+
+    parser = argparse.ArgumentParser(description="JSONL 로그 사이드카 인덱스 생성 및 압축 보관")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_index = sub.add_parser("index", help="기존 JSONL 로그에 사이드카 인덱스 생성")
+    p_index.add_argument("target", help="로그 디렉토리 또는 JSONL 파일 (예: data/logs)")
+    p_index.add_argument("--force", action="store_true", help="이미 있는 인덱스도 다시 생성")
+
+    p_compact = sub.add_parser("compact", help="지난 일자 로그를 중복 제거 후 압축")
+    p_compact.add_argument("target", help="로그 디렉토리 (예: data/logs)")
+    p_compact.add_argument("--codec", choices=sorted(CODECS), default="gzip", help="압축 코덱 (기본: gzip)")
+    p_compact.add_argument("--monthly", action="store_true", help="월별 파일 하나로 합쳐서 보관")
+    p_compact.add_argument(
+        "--before",
+        default=None,
+        help="이 날짜(YYYY-MM-DD) 이전 일자만 압축 (기본: 오늘, Asia/Seoul)",
+    )
+    args = parser.parse_args(argv)
+
+    if args.command == "index":
+        results = rebuild_indexes(_collect_log_files(Path(args.target)), force=args.force)
+        print(f"인덱스 생성 파일 {len(results)}개, 총 {sum(results.values())}줄")
+    elif args.command == "compact":
+        stats = compact_logs(Path(args.target), args.before or get_seoul_date(), args.codec, args.monthly)
+        print(
+            f"압축 파일 {stats.files}개, 레코드 {stats.records_in} → {stats.records_out}, "
+            f"{stats.bytes_in:,} → {stats.bytes_out:,} bytes"
+        )
+
+
+if __name__ == "__main__":
+    main()
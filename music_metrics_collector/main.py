@@ -5,16 +5,21 @@ import csv
 import json
 import logging
 import sys
+import threading
 import time
 from pathlib import Path
 from typing import Dict, List, Optional
 import yaml
 
+from . import budget
 from .factory import CollectorFactory
-from .fetcher import Fetcher
+from .logstore import append_line
+from .pagecache import PageCache
+from .records import RecordTemplate
+from .runstate import COMPLETED, RunManager
+from .timing import TIMINGS, format_track_timing, prometheus_path, track_timings_path
 from .models import TrackInfo, MetricsResult
-from .utils import get_seoul_date, get_current_hour, get_current_minute
-from .scheduler import Scheduler
+from .utils import get_seoul_date, get_current_hour, get_current_minute, get_iso8601_now
 
 logger = logging.getLogger(__name__)
 
@@ -175,22 +180,68 @@ def build_targets_from_config(config: dict) -> List[Dict]:
     return targets
 
 
-def collect_metrics(config: dict) -> Dict[str, int]:
+def select_targets(config: dict, song_ids: List[str]) -> List[Dict]:
+    """설정의 수집 대상 중 song_ids에 해당하는 곡만 고른다. (없는 ID는 경고)"""
+    wanted = set(song_ids)
+    with TIMINGS.stage("load"):
+        targets = [t for t in build_targets_from_config(config) if str(t['song_id']) in wanted]
+    missing = wanted - {str(t['song_id']) for t in targets}
+    if missing:
+        logger.warning(f"Song IDs not found in targets: {sorted(missing)}")
+    return targets
+
+
+def collect_metrics(
+    config: dict,
+    targets: Optional[List[Dict]] = None,
+    time_budget_sec: Optional[float] = None,
+) -> Dict[str, int]:
     """
     설정된 모든 대상에 대해 메트릭을 수집하고 JSON 로그에 기록한다.
 
+    Args:
+        config: 설정 딕셔너리
+        targets: 수집 대상 (생략 시 설정 전체, adaptive 모드에서는 주기가 돌아온 곡만)
+        time_budget_sec: 실행 시간 예산(초). 생략 시 collect.time_budget_sec, 둘 다 없으면 제한 없음.
+            예산이 있으면 우선순위/예상 소요 시간 순으로 수집하고, 예산을 넘길 곡부터는
+            시작하지 않고 다음 실행으로 미룬다. (budget.py 참고)
+
     Returns:
-        통계 요약 딕셔너리
+        통계 요약 딕셔너리 (collected: 수집에 성공한 'PLATFORM:song_id' 목록,
+        deferred: 시간 예산 때문에 미룬 'PLATFORM:song_id' 목록)
     """
     enabled_platforms = set(config.get('enabled_platforms', []))
     
     # 설정으로부터 타깃 목록 생성 (CSV/레거시 형식 모두 지원)
-    targets = build_targets_from_config(config)
+    # 대상을 받은 실행(--song-id, adaptive)은 일부만 수집하므로 미룬 곡 목록을 덮어쓰지 않고 합친다.
+    covered_keys = None
+    if targets is None:
+        with TIMINGS.stage("load"):
+            targets = build_targets_from_config(config)
+    else:
+        covered_keys = {f"{t['platform'].upper()}:{t['song_id']}" for t in targets}
     
     mode = config.get('mode', 'auto')
     timeout = config.get('http', {}).get('timeout_sec', 20)
+    base_url = config.get('http', {}).get('base_url')
     
-    fetcher = Fetcher(mode=mode, timeout_sec=timeout)
+    # requests/urllib3는 실제로 수집할 때만 로드한다. (status 등 다른 명령의 기동 시간 단축)
+    from .archive import PageArchive, prune_from_config
+    from .fetcher import Fetcher
+    from .pools import CollectorPools
+
+    # 조건부 요청 + 변하지 않은 메트릭 재사용 (http.page_cache: false로 끔)
+    page_cache = PageCache.from_config(config)
+    # 재파싱용 페이지 보관 (archive.enabled: true로 켬)
+    archive = PageArchive.from_config(config, get_seoul_date())
+
+    def make_fetcher() -> Fetcher:
+        return Fetcher(mode=mode, timeout_sec=timeout, base_url=base_url, page_cache=page_cache, archive=archive)
+
+    def make_fallback_fetcher() -> Fetcher:
+        return Fetcher(
+            mode='playwright', timeout_sec=timeout, base_url=base_url, page_cache=page_cache, archive=archive
+        )
     
     # JSON 로그 파일 기본 디렉토리 (날짜/플랫폼별 파일 생성)
     log_config = config.get('log', {})
@@ -202,31 +253,134 @@ def collect_metrics(config: dict) -> Dict[str, int]:
         'success': 0,
         'failed': 0,
         'skipped': 0,
-        'platform_stats': {}
+        'platform_stats': {},
+        'collected': [],
+        'deferred': [],
     }
+
+    # 곡별 소요 시간 학습 / 시간 예산 (예산이 있을 때만 순서를 바꾼다)
+    budget_paths = budget.state_paths(config)
+    latency_model = budget.LatencyModel(
+        budget_paths['latency'],
+        default_sec=config.get('collect', {}).get('default_latency_sec', 3.0),
+    )
+    deferred_tracks = budget.DeferredTracks(budget_paths['deferred'])
+    time_budget_sec = budget.time_budget_from_config(config, time_budget_sec)
+    time_budget = None
+    if time_budget_sec:
+        targets = budget.order_targets(targets, latency_model, deferred_tracks.keys)
+        time_budget = budget.TimeBudget(time_budget_sec)
+        logger.info(f"Time budget: {time_budget_sec:.0f}s for {len(targets)} targets")
     
     today = get_seoul_date()
     current_hour = get_current_hour()
     current_minute = get_current_minute()
+
+    # 곡별 단계 시간 기록 (metrics.track_timings: true일 때만)
+    timings_path = track_timings_path(config, today)
+    timings_file = None
+    if timings_path is not None:
+        timings_path.parent.mkdir(parents=True, exist_ok=True)
+        timings_file = open(timings_path, 'a', encoding='utf-8')
+    run_start = time.monotonic()
     
+    # 기록/통계는 플랫폼 작업 스레드가 함께 쓰므로 잠금 안에서 갱신한다.
+    lock = threading.Lock()
+    # 시간 예산 때문에 곡을 미루기 시작한 플랫폼 (다른 플랫폼은 계속 수집한다)
+    deferring_platforms = set()
+
+    def collect_track(worker, track_info, record, track_key, selectors):
+        """곡 하나를 수집해 기록한다. (플랫폼 풀의 작업 스레드에서 실행)"""
+        platform, song_id = track_info.platform, track_info.song_id
+        # 예산 안에 끝나지 않을 곡부터는 새로 시작하지 않고 그 플랫폼의 남은 곡을 모두 다음 실행으로 미룸
+        if time_budget is not None:
+            with lock:
+                if platform in deferring_platforms or not time_budget.fits(latency_model.estimate(track_key)):
+                    deferring_platforms.add(platform)
+                    stats['deferred'].append(track_key)
+                    return
+        track_start = time.monotonic()
+        track_status = 'failed'
+        TIMINGS.begin_track()
+
+        # 날짜_플랫폼명.jsonl 형식의 JSON 로그 파일 경로 구성
+        log_file_path = Path(log_base_dir) / f"{today}_{platform}.jsonl"
+
+        try:
+            # 메트릭과 곡 제목/아티스트명/앨범명 수집
+            metrics_result, song_name, artist_name, album_name = worker.collector.collect(track_info, **selectors)
+            
+            # auto 모드에서 메트릭이 비어 있으면 playwright로 재시도
+            if mode == 'auto' and metrics_result.is_empty():
+                logger.warning(f"Metrics empty for {platform}:{song_id}, trying playwright fallback...")
+                # 폴백 Collector(브라우저)는 작업 스레드마다 한 번 만들고, 풀을 닫을 때 함께 닫는다.
+                metrics_result, song_name, artist_name, album_name = worker.fallback().collect(
+                    track_info, **selectors
+                )
+            
+
+            # JSON 로그 파일에 쓰기 (song_data.csv 전체 필드 + 수집 결과)
+            log_line = record.success_line(today, metrics_result)
+            
+            with lock, TIMINGS.stage("write"):
+                # 기존 저장 (song_id/track_cd/isrc_cd → 바이트 오프셋 사이드카 인덱스 포함)
+                append_line(log_file_path, log_line, record.index_values)
+
+                # 추가 저장 (crawler-share)
+                share_dir = Path(f"~/project/crawler-share/genie/date={today.replace('-', '')}").expanduser()
+                share_dir.mkdir(parents=True, exist_ok=True)
+                share_file_path = share_dir / f"{today}_{platform}.jsonl"
+                append_line(share_file_path, log_line, with_index=False)
+            
+                stats['success'] += 1
+                stats['platform_stats'][platform]['success'] += 1
+                stats['collected'].append(track_key)
+            track_status = 'success'
+            logger.info(f"✓ Successfully collected {platform}:{song_id} (song: {song_name})")
+            
+        except Exception as e:
+            logger.error(f"✗ Failed to collect {platform}:{song_id}: {e}")
+            
+            # 실패한 항목도 JSON 로그 파일에 기록 (수집 결과 필드는 모두 null)
+            log_line = record.failure_line(today, str(e))
+            
+            with lock, TIMINGS.stage("write"):
+                # 기존 저장 (song_id/track_cd/isrc_cd → 바이트 오프셋 사이드카 인덱스 포함)
+                append_line(log_file_path, log_line, record.index_values)
+
+                # 추가 저장 (crawler-share)
+                share_dir = Path(f"~/project/crawler-share/genie/date={today.replace('-', '')}").expanduser()
+                share_dir.mkdir(parents=True, exist_ok=True)
+                share_file_path = share_dir / f"{today}_{platform}.jsonl"
+                append_line(share_file_path, log_line, with_index=False)
+            
+                stats['failed'] += 1
+                stats['platform_stats'][platform]['failed'] += 1
+        
+        finally:
+            track_stages = TIMINGS.end_track()
+            with lock:
+                latency_model.observe(track_key, time.monotonic() - track_start)
+                if timings_file is not None:
+                    timings_file.write(format_track_timing(track_key, track_status, track_stages, today))
+
+    pools = None
     try:
+        jobs = []
         for target in targets:
             platform = target['platform'].upper()
             song_id = target['song_id']
             song_data = target.get('song_data', {})  # song_data.csv의 전체 데이터
             requested_metrics = target.get('metrics')  # 선택: 지표 이름 → JS 선택자 딕셔너리 또는 지표 이름 리스트
             
-            # 호환성을 위해 일부 필드 추출
-            track_code = song_data.get('track_cd', '')
-            isrc = song_data.get('isrc_cd', '')
-            song_type = song_data.get('song_type', '')
-            
             # 플랫폼별 song_name / artist_name / album_name 선택자 읽기
             platforms_config = config.get('platforms', {})
             platform_config = platforms_config.get(platform, {})
-            song_name_selector = platform_config.get('song_name')
-            artist_name_selector = platform_config.get('artist_name')
-            album_name_selector = platform_config.get('album_name')
+            selectors = {
+                'song_name_selector': platform_config.get('song_name'),
+                'artist_name_selector': platform_config.get('artist_name'),
+                'album_name_selector': platform_config.get('album_name'),
+            }
             
             # 플랫폼 사용 여부 확인
             if platform not in enabled_platforms:
@@ -242,27 +396,25 @@ def collect_metrics(config: dict) -> Dict[str, int]:
             
             # metrics 설정이 있으면 지원 여부 검증
             if requested_metrics:
-                collector_class = CollectorFactory._collectors.get(platform)
-                if collector_class:
-                    supported = collector_class.SUPPORTED_METRICS
-                    # 딕셔너리(선택자 포함)와 리스트(레거시 형식) 모두 지원
-                    if isinstance(requested_metrics, dict):
-                        metric_names = list(requested_metrics.keys())
-                    elif isinstance(requested_metrics, list):
-                        metric_names = requested_metrics
-                    else:
-                        logger.warning(f"Invalid metrics format for {platform}:{song_id}. Expected dict or list.")
-                        requested_metrics = None
-                        metric_names = []
-                    
-                    if metric_names:
-                        invalid = [m for m in metric_names if m not in supported]
-                        if invalid:
-                            logger.warning(
-                                f"Unsupported metrics for {platform}: {invalid}. "
-                                f"Supported: {supported}. Will collect all supported metrics."
-                            )
-                            requested_metrics = None  # 지원하지 않는 값이 있으면 해당 플랫폼의 모든 지원 지표를 수집
+                supported = CollectorFactory.get_class(platform).SUPPORTED_METRICS
+                # 딕셔너리(선택자 포함)와 리스트(레거시 형식) 모두 지원
+                if isinstance(requested_metrics, dict):
+                    metric_names = list(requested_metrics.keys())
+                elif isinstance(requested_metrics, list):
+                    metric_names = requested_metrics
+                else:
+                    logger.warning(f"Invalid metrics format for {platform}:{song_id}. Expected dict or list.")
+                    requested_metrics = None
+                    metric_names = []
+                
+                if metric_names:
+                    invalid = [m for m in metric_names if m not in supported]
+                    if invalid:
+                        logger.warning(
+                            f"Unsupported metrics for {platform}: {invalid}. "
+                            f"Supported: {supported}. Will collect all supported metrics."
+                        )
+                        requested_metrics = None  # 지원하지 않는 값이 있으면 해당 플랫폼의 모든 지원 지표를 수집
             
             track_info = TrackInfo(
                 platform=platform,
@@ -270,202 +422,122 @@ def collect_metrics(config: dict) -> Dict[str, int]:
                 alias=None,  # 현재는 사용하지 않음
                 requested_metrics=requested_metrics
             )
+            # 로그 레코드의 곡 고정 필드(song_data.csv)는 곡마다 한 번만 직렬화
+            record = RecordTemplate.for_track(platform, song_id, song_data)
             
             # 플랫폼별 통계 초기화
             if platform not in stats['platform_stats']:
                 stats['platform_stats'][platform] = {'success': 0, 'failed': 0}
-            
-
-            # 날짜_플랫폼명.jsonl 형식의 JSON 로그 파일 경로 구성
-            Path(log_base_dir).mkdir(parents=True, exist_ok=True)
-            log_file_path = Path(log_base_dir) / f"{today}_{platform}.jsonl"
-
-            try:
-                # Collector 생성
-                collector = CollectorFactory.create(platform, fetcher)
-                
-                # 메트릭과 곡 제목/아티스트명/앨범명 수집
-                metrics_result, song_name, artist_name, album_name = collector.collect(
-                    track_info,
-                    song_name_selector=song_name_selector,
-                    artist_name_selector=artist_name_selector,
-                    album_name_selector=album_name_selector,
-                )
-                
-                # auto 모드에서 메트릭이 비어 있으면 playwright로 재시도
-                if mode == 'auto' and metrics_result.is_empty():
-                    logger.warning(f"Metrics empty for {platform}:{song_id}, trying playwright fallback...")
-                    playwright_fetcher = Fetcher(mode='playwright', timeout_sec=timeout)
-                    playwright_collector = CollectorFactory.create(platform, playwright_fetcher)
-                    metrics_result, song_name, artist_name, album_name = playwright_collector.collect(
-                        track_info,
-                        song_name_selector=song_name_selector,
-                        artist_name_selector=artist_name_selector,
-                        album_name_selector=album_name_selector,
-                    )
-                    playwright_fetcher.close()
-                
-
-                # JSON 로그 파일에 쓰기 (song_data.csv 전체 필드 + 수집 결과)
-                log_entry = {
-                    # song_data.csv의 20개 컬럼 전체
-                    'platform_seq': song_data.get('platform_seq', ''),
-                    'platform_name': song_data.get('platform_name', ''),
-                    'song_type_txt': song_data.get('song_type_txt', ''),
-                    'album_cd': song_data.get('album_cd', ''),
-                    'album_name_kor': song_data.get('album_name_kor', ''),
-                    'album_name_eng': song_data.get('album_name_eng', ''),
-                    'song_cd': song_data.get('song_cd', ''),
-                    'song_name_kor': song_data.get('song_name_kor', ''),
-                    'song_name_eng': song_data.get('song_name_eng', ''),
-                    'song_release_date': song_data.get('song_release_date', ''),
-                    'artist_cd': song_data.get('artist_cd', ''),
-                    'artist_name_kor': song_data.get('artist_name_kor', ''),
-                    'artist_name_eng': song_data.get('artist_name_eng', ''),
-                    'mem_cd': song_data.get('mem_cd', ''),
-                    'mem_name': song_data.get('mem_name', ''),
-                    'track_cd': song_data.get('track_cd', ''),
-                    'isrc_cd': song_data.get('isrc_cd', ''),
-                    'interest_yn': song_data.get('interest_yn', 'n'),
-                    'platform_artist_ids': song_data.get('platform_artist_ids', ''),
-                    'platform_song_ids': song_id,  # JSON 문자열이 아닌 song_id 값만
-                    # 새로 추가된 b2b / new_date 필드
-                    'b2b_artist_cd_spotify': song_data.get('b2b_artist_cd_spotify', ''),
-                    'b2b_artist_cd_apple': song_data.get('b2b_artist_cd_apple', ''),
-                    'b2b_artist_cd_melon': song_data.get('b2b_artist_cd_melon', ''),
-                    'b2b_asset_ids_youtube': song_data.get('b2b_asset_ids_youtube', ''),
-                    'new_date': song_data.get('new_date', ''),
-                    
-                    # 수집 결과 필드
-                    'req_date': today,  # 데이터 수집일
-                    'res_listeners': metrics_result.total_listeners,  # 전체 감상수
-                    
-                    # 국가별 (GENIE는 국내 플랫폼이므로 한국 100%, 나머지 null)
-                    'res_listeners_ko': metrics_result.total_listeners if platform == 'GENIE' else None,
-                    'res_listeners_jp': None,
-                    'res_listeners_cn': None,
-                    'res_listeners_us': None,
-                    'res_listeners_eu': None,
-                    'res_listeners_ea': None,
-                    'res_listeners_etc': None,
-                    
-                    # 성별 비율 (확장 예정)
-                    'res_sex_m_rate': getattr(metrics_result, 'sex_m_rate', None),
-                    'res_sex_w_rate': getattr(metrics_result, 'sex_w_rate', None),
-                    
-                    # 연령별 비율 (확장 예정)
-                    'res_age_10_rate': getattr(metrics_result, 'age_10_rate', None),
-                    'res_age_20_rate': getattr(metrics_result, 'age_20_rate', None),
-                    'res_age_30_rate': getattr(metrics_result, 'age_30_rate', None),
-                    'res_age_40_rate': getattr(metrics_result, 'age_40_rate', None),
-                    'res_age_50_rate': getattr(metrics_result, 'age_50_rate', None),
-                    'res_age_60_rate': getattr(metrics_result, 'age_60_rate', None),
-                    
-                    # 기타 예비 필드
-                    'etc0': None,
-                    'etc1': None,
-                }
-                
-                # 기존 저장
-                with open(log_file_path, 'a', encoding='utf-8') as f:
-                    f.write(json.dumps(log_entry, ensure_ascii=False) + '\n')
-
-                # 추가 저장 (crawler-share)
-                share_dir = Path(f"~/project/crawler-share/genie/date={today.replace('-', '')}").expanduser()
-                share_dir.mkdir(parents=True, exist_ok=True)
-                share_file_path = share_dir / f"{today}_{platform}.jsonl"
-                with open(share_file_path, 'a', encoding='utf-8') as f:
-                    f.write(json.dumps(log_entry, ensure_ascii=False) + '\n')
-                
-                stats['success'] += 1
-                stats['platform_stats'][platform]['success'] += 1
-                logger.info(f"✓ Successfully collected {platform}:{song_id} (song: {song_name})")
-                
-            except Exception as e:
-                logger.error(f"✗ Failed to collect {platform}:{song_id}: {e}")
-                
-                # 실패한 항목도 JSON 로그 파일에 기록
-                log_entry = {
-                    # song_data.csv의 20개 컬럼 전체
-                    'platform_seq': song_data.get('platform_seq', ''),
-                    'platform_name': song_data.get('platform_name', ''),
-                    'song_type_txt': song_data.get('song_type_txt', ''),
-                    'album_cd': song_data.get('album_cd', ''),
-                    'album_name_kor': song_data.get('album_name_kor', ''),
-                    'album_name_eng': song_data.get('album_name_eng', ''),
-                    'song_cd': song_data.get('song_cd', ''),
-                    'song_name_kor': song_data.get('song_name_kor', ''),
-                    'song_name_eng': song_data.get('song_name_eng', ''),
-                    'song_release_date': song_data.get('song_release_date', ''),
-                    'artist_cd': song_data.get('artist_cd', ''),
-                    'artist_name_kor': song_data.get('artist_name_kor', ''),
-                    'artist_name_eng': song_data.get('artist_name_eng', ''),
-                    'mem_cd': song_data.get('mem_cd', ''),
-                    'mem_name': song_data.get('mem_name', ''),
-                    'track_cd': song_data.get('track_cd', ''),
-                    'isrc_cd': song_data.get('isrc_cd', ''),
-                    'interest_yn': song_data.get('interest_yn', 'n'),
-                    'platform_artist_ids': song_data.get('platform_artist_ids', ''),
-                    'platform_song_ids': song_id,  # JSON 문자열이 아닌 song_id 값만
-                    # 새로 추가된 b2b / new_date 필드
-                    'b2b_artist_cd_spotify': song_data.get('b2b_artist_cd_spotify', ''),
-                    'b2b_artist_cd_apple': song_data.get('b2b_artist_cd_apple', ''),
-                    'b2b_artist_cd_melon': song_data.get('b2b_artist_cd_melon', ''),
-                    'b2b_asset_ids_youtube': song_data.get('b2b_asset_ids_youtube', ''),
-                    'new_date': song_data.get('new_date', ''),
-                    
-                    # 수집 결과 필드 (모두 null)
-                    'req_date': today,
-                    'res_listeners': None,
-                    'res_listeners_ko': None,
-                    'res_listeners_jp': None,
-                    'res_listeners_cn': None,
-                    'res_listeners_us': None,
-                    'res_listeners_eu': None,
-                    'res_listeners_ea': None,
-                    'res_listeners_etc': None,
-                    'res_sex_m_rate': None,
-                    'res_sex_w_rate': None,
-                    'res_age_10_rate': None,
-                    'res_age_20_rate': None,
-                    'res_age_30_rate': None,
-                    'res_age_40_rate': None,
-                    'res_age_50_rate': None,
-                    'res_age_60_rate': None,
-                    'etc0': None,
-                    'etc1': None,
-                    'error': str(e)
-                }
-                
-                # 기존 저장
-                with open(log_file_path, 'a', encoding='utf-8') as f:
-                    f.write(json.dumps(log_entry, ensure_ascii=False) + '\n')
+            jobs.append((track_info, record, f"{platform}:{song_id}", selectors))
 
-                # 추가 저장 (crawler-share)
-                share_dir = Path(f"~/project/crawler-share/genie/date={today.replace('-', '')}").expanduser()
-                share_dir.mkdir(parents=True, exist_ok=True)
-                share_file_path = share_dir / f"{today}_{platform}.jsonl"
-                with open(share_file_path, 'a', encoding='utf-8') as f:
-                    f.write(json.dumps(log_entry, ensure_ascii=False) + '\n')
-                
-                stats['failed'] += 1
-                stats['platform_stats'][platform]['failed'] += 1
+        # 플랫폼마다 작업 스레드/요청 간격을 따로 두어 느린 플랫폼이 다른 플랫폼을 막지 않게 한다.
+        # Collector와 폴백 Collector는 작업 스레드마다 한 번만 만든다. (pools.py)
+        pools = CollectorPools(config, stats['platform_stats'], make_fetcher, make_fallback_fetcher)
+        for job in jobs:
+            pools.submit(job[0].platform, collect_track, *job)
+        pools.wait()
                 
     finally:
-        fetcher.close()
+        if pools is not None:
+            pools.close()
+        latency_model.save()
+        if page_cache is not None:
+            page_cache.save()
+            stats['page_cache'] = {
+                'not_modified': page_cache.not_modified,
+                'reused': page_cache.reused,
+                'parsed': page_cache.parsed,
+            }
+        if archive is not None:
+            archive.close()
+            stats['archive'] = {'stored': archive.stats.stored, 'deduplicated': archive.stats.deduplicated}
+            pruned = prune_from_config(config, archive.req_date)
+            if pruned is not None:
+                stats['archive']['objects_removed'] = pruned.objects_removed
+        deferred_tracks.save(stats['deferred'], get_iso8601_now(), covered=covered_keys)
+        if timings_file is not None:
+            timings_file.close()
+        _export_timings(config, stats, time.monotonic() - run_start)
+    
+    if page_cache is not None:
+        logger.info(
+            f"Page cache: {page_cache.not_modified} not modified, "
+            f"{page_cache.reused} unchanged (parse skipped), {page_cache.parsed} parsed"
+        )
+    if archive is not None:
+        logger.info(
+            f"Page archive: {archive.stats.stored} stored, "
+            f"{archive.stats.deduplicated} deduplicated under {archive.root}"
+        )
+    if stats['deferred']:
+        logger.warning(
+            f"Time budget reached after {time_budget.elapsed:.1f}s: "
+            f"{len(stats['deferred'])} targets deferred to the next run"
+        )
     
     logger.info(f"Metrics logged under {log_base_dir} (format: YYYY-MM-DD_PLATFORM.jsonl)")
     
     return stats
 
 
+def _export_timings(config: dict, stats: Dict, duration_sec: float) -> None:
+    """단계별 히스토그램(프로세스 누적)과 이번 실행 요약을 Prometheus 텍스트 파일로 내보낸다."""
+    path = prometheus_path(config)
+    if path is None:
+        return
+    gauges = {
+        'last_run_tracks_success': stats['success'],
+        'last_run_tracks_failed': stats['failed'],
+        'last_run_tracks_skipped': stats['skipped'],
+        'last_run_tracks_deferred': len(stats['deferred']),
+        'last_run_pages_not_modified': stats.get('page_cache', {}).get('not_modified', 0),
+        'last_run_pages_reused': stats.get('page_cache', {}).get('reused', 0),
+        'last_run_duration_seconds': duration_sec,
+        'last_run_timestamp_seconds': time.time(),
+    }
+    try:
+        TIMINGS.write_prometheus(path, gauges)
+    except OSError as e:
+        logger.warning(f"Failed to write timing metrics to {path}: {e}")
+
+
+def collect_due_metrics(config: dict, time_budget_sec: Optional[float] = None) -> Dict[str, int]:
+    """
+    수집 주기 등급(tiers.py)에 따라 이번 실행에서 주기가 돌아온 곡만 수집한다.
+
+    수집에 성공한 곡만 마지막 수집 시각을 갱신하므로 실패한 곡은 다음 실행에서 다시 시도한다.
+    """
+    from .tiers import TierPlanner
+    from .utils import get_seoul_now
+
+    planner = TierPlanner.from_config(config)
+    now = get_seoul_now()
+    targets = planner.select_due(build_targets_from_config(config), now)
+    stats = collect_metrics(config, targets=targets, time_budget_sec=time_budget_sec)
+    # 다음 주기는 이번 실행 시작 시각 기준으로 계산한다. (cron 주기와 맞춤)
+    planner.mark_collected(stats['collected'], now)
+    return stats
+
+
 def main():
     """Main CLI entrypoint."""
     parser = argparse.ArgumentParser(description='Music Metrics Collector')
-    parser.add_argument('command', choices=['collect', 'run-scheduler'], 
+    parser.add_argument('command', choices=['collect', 'run-scheduler', 'status'],
                        help='Command to execute')
     parser.add_argument('--config', default='config.yaml', 
                        help='Path to config file (default: config.yaml)')
+    parser.add_argument('--adaptive', action='store_true',
+                       help='collect: 수집 주기 등급에 따라 주기가 돌아온 곡만 수집')
+    parser.add_argument('--song-id', action='append', default=None, metavar='SONG_ID',
+                       help='collect: 지정한 곡만 수집 (여러 번 지정 가능, --adaptive 무시)')
+    parser.add_argument('--deadline', type=float, default=None, metavar='SECONDS',
+                       help='collect: 실행 시간 예산(초). 넘길 곡은 다음 실행으로 미룸 (기본: collect.time_budget_sec)')
+    parser.add_argument('--profile', action='store_true',
+                       help='collect: cProfile/스택 샘플링/단계별(load, fetch, parse, write) tracemalloc 결과 저장')
+    parser.add_argument('--profile-dir', default=None,
+                       help='collect --profile 결과 디렉토리 (기본: {state.dir}/profile/YYYYMMDD-HHMMSS)')
+    parser.add_argument('--profile-no-memory', dest='profile_memory', action='store_false',
+                       help='collect --profile에서 tracemalloc을 끔 (시간 분포만 볼 때)')
     
     args = parser.parse_args()
     
@@ -476,12 +548,45 @@ def main():
     
     config = load_config(args.config)
     
+    run_manager = RunManager.from_config(config)
+
     if args.command == 'collect':
-        # One-time collection
+        # One-time collection (스케줄 수집과 같은 잠금을 사용하므로 동시에 실행되지 않음)
         start_time = time.time()
         logger.info("Starting metric collection...")
         
-        stats = collect_metrics(config)
+        results = {}
+
+        def run_collection():
+            if args.song_id:
+                results['stats'] = collect_metrics(
+                    config, targets=select_targets(config, args.song_id), time_budget_sec=args.deadline
+                )
+            elif args.adaptive:
+                results['stats'] = collect_due_metrics(config, time_budget_sec=args.deadline)
+            else:
+                results['stats'] = collect_metrics(config, time_budget_sec=args.deadline)
+            return results['stats']
+
+        profiler = None
+        if args.profile:
+            from .profiling import Profiler
+
+            profile_dir = args.profile_dir or (
+                Path(config.get('state', {}).get('dir', 'data/state')) / 'profile' / time.strftime('%Y%m%d-%H%M%S')
+            )
+            profiler = Profiler(Path(profile_dir), trace_memory=args.profile_memory).start()
+            TIMINGS.phase_hook = profiler.stage_hook
+        try:
+            record = run_manager.run(run_collection)
+        finally:
+            if profiler is not None:
+                TIMINGS.phase_hook = None
+                print(f"Profile summary: {profiler.stop()}")
+        if record.status != COMPLETED:
+            logger.error(f"Collection not started: {record.reason}")
+            sys.exit(1)
+        stats = results['stats']
         
         elapsed = time.time() - start_time
         
@@ -493,14 +598,53 @@ def main():
         print(f"Success: {stats['success']}")
         print(f"Failed: {stats['failed']}")
         print(f"Skipped: {stats['skipped']}")
+        if stats['deferred']:
+            print(f"Deferred (time budget): {len(stats['deferred'])}")
+        if 'page_cache' in stats:
+            cache_stats = stats['page_cache']
+            print(f"Page cache: {cache_stats['not_modified']} not modified, "
+                  f"{cache_stats['reused']} unchanged, {cache_stats['parsed']} parsed")
         print("\nPlatform breakdown:")
         for platform, platform_stats in stats['platform_stats'].items():
             print(f"  {platform}: ✓{platform_stats['success']} ✗{platform_stats['failed']}")
         print(f"\nElapsed time: {elapsed:.2f}s")
+        if record.throughput is not None:
+            print(f"Throughput: {record.throughput:.2f} tracks/s")
+        stage_rows = TIMINGS.summary()
+        if stage_rows:
+            print("\nStage timings (p50/p95 are bucket upper bounds):")
+            for row in stage_rows:
+                print(
+                    f"  {row['stage']:<16} n={row['count']:<5} total={row['sum_sec']:.2f}s "
+                    f"mean={row['mean_ms']:.1f}ms p50≤{row['p50_ms']:.0f}ms p95≤{row['p95_ms']:.0f}ms"
+                )
         print("="*50)
         
+    elif args.command == 'status':
+        # 실행 중인 수집과 최근 실행 이력 요약
+        holder = run_manager.lock.holder()
+        if holder is None:
+            print("Active run: none")
+        else:
+            print(f"Active run: {holder.get('run_id')} (pid={holder.get('pid')}, started={holder.get('started_at')})")
+
+        summary = run_manager.history.summary()
+        print(f"Recent runs: {summary['runs']} {summary['status_counts']}")
+        if summary['avg_duration_sec'] is not None:
+            print(f"  avg duration: {summary['avg_duration_sec']}s")
+            print(f"  avg throughput: {summary['avg_throughput']} tracks/s")
+            print(f"  avg success rate: {summary['avg_success_rate']}")
+        for run in run_manager.history.load(limit=10):
+            print(
+                f"  {run.get('started_at')} {run.get('trigger'):>8} {run.get('status'):>9} "
+                f"{run.get('duration_sec')}s ✓{run.get('success')} ✗{run.get('failed')}"
+                + (f" - {run['reason']}" if run.get('reason') else "")
+            )
+        
     elif args.command == 'run-scheduler':
         # Run scheduler
+        from .scheduler import Scheduler
+
         scheduler = Scheduler(config)
         scheduler.start()
         try:
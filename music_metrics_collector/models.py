@@ -5,9 +5,9 @@ from datetime import datetime
 from typing import Optional, List, Dict
 
 
-@dataclass
+@dataclass(slots=True)
 class TrackInfo:
-    """수집 대상 트랙(곡)의 메타데이터 정보."""
+    """수집 대상 트랙(곡)의 메타데이터 정보. (곡마다 만들어지므로 __slots__로 둔다)"""
     platform: str
     song_id: str
     alias: Optional[str] = None
@@ -24,9 +24,9 @@ class TrackInfo:
         return f"{self.platform}:{self.song_id}"
 
 
-@dataclass
+@dataclass(slots=True)
 class MetricsResult:
-    """플랫폼에서 파싱한 메트릭 결과."""
+    """플랫폼에서 파싱한 메트릭 결과. (곡마다 만들어지므로 __slots__로 둔다)"""
     total_plays: Optional[int] = None
     total_listeners: Optional[int] = None
     
@@ -1,7 +1,69 @@
-"""메트릭 숫자 파싱을 위한 정규화 유틸리티."""
+"""메트릭 숫자 파싱을 위한 정규화 유틸리티.
+
+미리 컴파일한 정규식으로 문자열을 한 번 훑어 값을 고른다. 단위가 있는 표기가 우선이며
+순서는 한국어 단위(억/만/천) > M > K > 단위 없는 숫자다. "1억 2,345만", "1억 5천만"처럼
+큰 단위부터 이어지는 한국어 표기는 합산한다.
+
+백필이나 보관 HTML 재파싱처럼 문자열을 대량으로 변환할 때는 normalize_numbers를 쓴다.
+서로 다른 문자열만 한 번씩 변환하고, 쉼표 숫자만 있는 문자열은 토큰 파싱 없이 바로 정수로 바꾼다.
+(단계 시간 계측은 일괄 호출 단위로 한다. 곡 파싱 중의 개별 호출은 parse 단계에 포함된다)
+"""
 
 import re
-from typing import Optional
+from typing import Dict, Iterable, List, Optional
+
+from .timing import TIMINGS
+
+_NUMBER = r"(?:\d+(?:\.\d+)?|\.\d+)"
+
+# 한국어 단위 → 배수
+_KOREAN_SCALES = {"천억": 100_000_000_000, "억": 100_000_000, "천만": 10_000_000, "만": 10_000, "천": 1_000}
+_KOREAN_RE = re.compile(rf"({_NUMBER})\s*(천?억|천?만|천)")
+# 한국어 단위 표기 다음에 공백만 두고 이어지는 토큰 ("1억 2345만 6789"의 뒷부분)
+_KOREAN_NEXT_RE = re.compile(rf"\s*({_NUMBER})\s*(천?억|천?만|천|[KkMm])?")
+# 숫자 + 선택 단위(K/M). 뒤에 영문자가 이어지면 단위로 보지 않는다. ("1234 mins" 등)
+_TOKEN_RE = re.compile(rf"({_NUMBER})\s*([KkMm](?![A-Za-z]))?")
+
+# 쉼표와 숫자만으로 된 문자열 (일괄 변환의 빠른 경로)
+_PLAIN_RE = re.compile(r"\d[\d,]*")
+
+_SCALES = {"M": 1_000_000, "m": 1_000_000, "K": 1_000, "k": 1_000, "": 1}
+# 단위 우선순위 (작을수록 우선)
+_PRIORITY = {"M": 0, "m": 0, "K": 1, "k": 1, "": 2}
+
+
+def _scaled(number: str, scale: int) -> int:
+    if "." in number:
+        return int(float(number) * scale)
+    return int(number) * scale
+
+
+def _korean_number(text: str) -> Optional[int]:
+    """첫 한국어 단위 표기부터 단위가 작아지며 이어지는 토큰을 합산한 값. 없으면 None"""
+    match = _KOREAN_RE.search(text)
+    if match is None:
+        return None
+    scale = _KOREAN_SCALES[match.group(2)]
+    total = _scaled(match.group(1), scale)
+    pos = match.end()
+    while pos < len(text):
+        match = _KOREAN_NEXT_RE.match(text, pos)
+        if match is None:
+            break
+        unit = match.group(2)
+        if unit is None:
+            # 끝의 단위 없는 숫자 (12만 3456회). 앞 단위보다 작은 정수일 때만 더한다.
+            # ("1만 20000회", "12만 2024.01.01"처럼 다른 값이 이어지면 단위 합산값만 쓴다)
+            number = match.group(1)
+            if number.isdecimal() and int(number) < scale:
+                total += int(number)
+            break
+        next_scale = _KOREAN_SCALES.get(unit)
+        if next_scale is None or next_scale >= scale:
+            break
+        total += _scaled(match.group(1), next_scale)
+        scale, pos = next_scale, match.end()
+    return total
 
 
 def normalize_number(text: str) -> Optional[int]:
@@ -11,6 +73,9 @@ def normalize_number(text: str) -> Optional[int]:
     처리 예시:
     - "1,234,567" -> 1234567
     - "12.3만" -> 123000
+    - "1.5억" -> 150000000
+    - "1억 2,345만" -> 123450000
+    - "1억 5천만" -> 150000000
     - "1.2M" -> 1200000
     - "1234" -> 1234
 
@@ -22,53 +87,26 @@ def normalize_number(text: str) -> Optional[int]:
     """
     if not text:
         return None
-    
-    # Remove whitespace
-    text = text.strip()
-    
-    # Remove commas
-    text = text.replace(',', '')
-    
-    # Handle Korean "만" (10,000)
-    if '만' in text:
-        match = re.search(r'([\d.]+)\s*만', text)
-        if match:
-            try:
-                value = float(match.group(1))
-                return int(value * 10000)
-            except ValueError:
-                pass
-    
-    # Handle "M" (million)
-    if 'M' in text.upper():
-        match = re.search(r'([\d.]+)\s*M', text, re.IGNORECASE)
-        if match:
-            try:
-                value = float(match.group(1))
-                return int(value * 1000000)
-            except ValueError:
-                pass
-    
-    # Handle "K" (thousand)
-    if 'K' in text.upper():
-        match = re.search(r'([\d.]+)\s*K', text, re.IGNORECASE)
-        if match:
-            try:
-                value = float(match.group(1))
-                return int(value * 1000)
-            except ValueError:
-                pass
-    
-    # Extract digits and dots only
-    match = re.search(r'[\d.]+', text)
-    if match:
-        try:
-            value = float(match.group(0))
-            return int(value)
-        except ValueError:
-            pass
-    
-    return None
+
+    text = text.replace(",", "")
+    if text.isdecimal():
+        return int(text)
+    if "만" in text or "억" in text or "천" in text:
+        value = _korean_number(text)
+        if value is not None:
+            return value
+
+    tokens = _TOKEN_RE.findall(text)
+    if not tokens:
+        return None
+    # 우선순위가 가장 높은 첫 토큰 (M을 찾으면 바로 멈춘다)
+    number, unit = tokens[0]
+    for token in tokens[1:]:
+        if _PRIORITY[unit] == 0:
+            break
+        if _PRIORITY[token[1]] < _PRIORITY[unit]:
+            number, unit = token
+    return _scaled(number, _SCALES[unit])
 
 
 def extract_number_from_text(text: str) -> Optional[int]:
@@ -81,21 +119,25 @@ def extract_number_from_text(text: str) -> Optional[int]:
     Returns:
         추출된 정수 값, 없으면 None
     """
-    if not text:
-        return None
-    
-    # Try direct normalization first
-    result = normalize_number(text)
-    if result is not None:
-        return result
-    
-    # Extract all digits
-    digits = re.sub(r'[^\d]', '', text)
-    if digits:
-        try:
-            return int(digits)
-        except ValueError:
-            pass
-    
-    return None
+    return normalize_number(text)
+
 
+@TIMINGS.timed("normalize")
+def normalize_numbers(texts: Iterable[Optional[str]]) -> List[Optional[int]]:
+    """
+    문자열 여러 개를 한 번에 정수로 변환한다. (입력 순서 유지)
+
+    서로 다른 문자열만 모아 한 번씩 변환한다. 쉼표 숫자("1,234,567")는 정규식 fullmatch 한 번으로
+    골라 바로 정수로 바꾸고, 단위/문구가 섞인 나머지만 normalize_number로 파싱한다.
+    결과는 문자열마다 normalize_number를 부른 것과 같다.
+    """
+    texts = list(texts)
+    values: Dict[Optional[str], Optional[int]] = {}
+    for text in dict.fromkeys(texts):
+        if not text:
+            values[text] = None
+        elif _PLAIN_RE.fullmatch(text):
+            values[text] = int(text.replace(",", ""))
+        else:
+            values[text] = normalize_number(text)
+    return [values[text] for text in texts]
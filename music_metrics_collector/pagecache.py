@@ -0,0 +1,115 @@
+"""곡 상세 페이지 조건부 요청과 변하지 않은 메트릭 재사용.
+
+청취자 수가 거의 변하지 않는 곡이 많아 매시간 같은 페이지를 받아 다시 파싱하는 일이 잦다.
+URL마다 다음을 `{state.dir}/page_cache.json`에 남겨 두고 다음 실행에서 쓴다.
+
+- 응답의 ETag / Last-Modified → If-None-Match / If-Modified-Since 조건부 요청.
+  서버가 304를 돌려주면 본문을 받지 않고 지난 MetricsResult를 그대로 쓴다.
+- 메트릭 구간(collector.metrics_fragment) 해시 → 200 응답이라도 구간이 같으면 파싱을 건너뛴다.
+  (광고/추천 목록처럼 메트릭과 무관한 부분만 바뀐 경우)
+
+조건부 요청은 재사용할 메트릭이 저장된 URL에만 보낸다. 빈 결과(파싱 실패)는 저장하지 않는다.
+한 인스턴스를 플랫폼 수집 풀(pools.py)의 작업 스레드가 함께 쓰므로 항목과 카운터는 잠금 안에서 바꾼다.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from dataclasses import asdict
+from pathlib import Path
+from typing import Dict, Optional
+
+from .models import MetricsResult
+
+logger = logging.getLogger(__name__)
+
+STATE_FILENAME = "page_cache.json"
+
+
+def fragment_hash(fragment: str) -> str:
+    return hashlib.blake2b(fragment.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class PageCache:
+    """URL별 검증자(ETag/Last-Modified), 메트릭 구간 해시, 마지막 MetricsResult."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.entries: Dict[str, Dict] = {}
+        self.not_modified = 0  # 304로 본문 없이 재사용
+        self.reused = 0  # 본문은 받았지만 구간이 같아 파싱 생략
+        self.parsed = 0
+        self._lock = threading.Lock()
+        if path.exists():
+            try:
+                self.entries = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, json.JSONDecodeError) as e:
+                logger.warning(f"Ignoring unreadable page cache {path}: {e}")
+
+    @classmethod
+    def from_config(cls, config: dict) -> Optional["PageCache"]:
+        """http.page_cache가 false면 None (기본: 사용)."""
+        if not config.get('http', {}).get('page_cache', True):
+            return None
+        state_dir = Path(config.get('state', {}).get('dir', 'data/state'))
+        return cls(state_dir / STATE_FILENAME)
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """재사용할 메트릭이 있는 URL이면 조건부 요청 헤더."""
+        with self._lock:
+            entry = dict(self.entries.get(url) or {})
+        if 'metrics' not in entry:
+            return {}
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def remember_validators(self, url: str, etag: Optional[str], last_modified: Optional[str]) -> None:
+        with self._lock:
+            entry = self.entries.setdefault(url, {})
+            entry['etag'] = etag
+            entry['last_modified'] = last_modified
+
+    def not_modified_metrics(self, url: str) -> MetricsResult:
+        """304 응답을 받은 URL의 지난 메트릭. (호출 쪽에서 고쳐 써도 되도록 새 객체)"""
+        with self._lock:
+            self.not_modified += 1
+            return MetricsResult(**self.entries[url]['metrics'])
+
+    def fragment_digest(self, url: str) -> Optional[str]:
+        """URL의 지난 메트릭 구간 해시 (304 응답을 보관본과 잇는 데 쓴다)."""
+        with self._lock:
+            return self.entries.get(url, {}).get('fragment')
+
+    def reuse(self, url: str, digest: str) -> Optional[MetricsResult]:
+        """메트릭 구간 해시가 지난번과 같으면 지난 메트릭, 아니면 None."""
+        with self._lock:
+            entry = self.entries.get(url)
+            if not entry or digest is None or entry.get('fragment') != digest or 'metrics' not in entry:
+                return None
+            self.reused += 1
+            return MetricsResult(**entry['metrics'])
+
+    def store(self, url: str, digest: Optional[str], metrics: MetricsResult) -> None:
+        with self._lock:
+            self.parsed += 1
+            entry = self.entries.setdefault(url, {})
+            if metrics.is_empty():
+                entry.pop('metrics', None)
+                entry.pop('fragment', None)
+                return
+            entry['fragment'] = digest
+            entry['metrics'] = {k: v for k, v in asdict(metrics).items() if v is not None}
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        with self._lock:
+            data = json.dumps(self.entries, ensure_ascii=False)
+        tmp_path.write_text(data, encoding="utf-8")
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,210 @@
+"""플랫폼별 수집 풀: 동시 수집 수와 요청 간격을 플랫폼마다 따로 둔다.
+
+여러 플랫폼을 켜면 플랫폼마다 작업 스레드를 두어, 응답이 느리거나 브라우저 폴백이 잦은 플랫폼이
+다른 플랫폼의 수집을 막지 않게 한다. 플랫폼 설정(platforms.<PLATFORM>)에서
+
+- concurrency: 동시에 수집하는 곡 수 (작업 스레드 수, 기본 1)
+- rate_limit_per_sec: 초당 시작하는 곡 수 상한 (기본 0: 제한 없음)
+
+을 정한다. 작업 스레드마다 Fetcher(연결 세션)와 Collector를 처음 필요할 때 한 번만 만들어 실행이
+끝날 때까지 재사용하고, 풀을 닫을 때 그 스레드에서 닫는다. auto 모드의 Playwright 폴백 Collector도
+작업 스레드마다 처음 필요할 때 한 번 만든다.
+같은 플랫폼의 곡은 제출한 순서대로 시작한다.
+
+플랫폼이 하나이고 concurrency가 1이면 스레드 없이 호출한 스레드에서 바로 수집한다.
+(기존 순차 수집과 같은 동작, --profile 스택 샘플링도 주 스레드만 본다)
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, Optional
+
+from .collectors.base import BaseCollector
+from .factory import CollectorFactory
+
+if TYPE_CHECKING:
+    from .fetcher import Fetcher
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimiter:
+    """작업 시작 간격을 1/rate_per_sec초 이상으로 벌린다. (스레드 안전)"""
+
+    def __init__(self, rate_per_sec: float = 0.0, clock=time.monotonic, sleep=time.sleep):
+        self.interval = 1.0 / rate_per_sec if rate_per_sec and rate_per_sec > 0 else 0.0
+        self._clock = clock
+        self._sleep = sleep
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        if not self.interval:
+            return
+        with self._lock:
+            now = self._clock()
+            start = max(now, self._next)
+            self._next = start + self.interval
+        if start > now:
+            self._sleep(start - now)
+
+
+class Worker:
+    """작업 스레드 하나의 Collector와 폴백 Collector. (둘 다 처음 쓸 때 만든다)
+
+    Fetcher는 만든 스레드에서만 쓰고 닫는다. (sync Playwright는 만든 스레드에 묶여 있다)
+    """
+
+    def __init__(self, pool: "PlatformPool"):
+        self._pool = pool
+        self._collector: Optional[BaseCollector] = None
+        self._fallback: Optional[BaseCollector] = None
+        self._fetchers: List["Fetcher"] = []
+
+    def _create(self, make_fetcher: Callable[[], "Fetcher"]) -> BaseCollector:
+        fetcher = make_fetcher()
+        try:
+            collector = CollectorFactory.create(self._pool.platform, fetcher)
+        except Exception:
+            fetcher.close()
+            raise
+        self._fetchers.append(fetcher)
+        return collector
+
+    @property
+    def collector(self) -> BaseCollector:
+        """Collector (처음 쓸 때 만들고 이후 재사용, 생성 예외는 호출한 곡의 실패가 된다)."""
+        if self._collector is None:
+            self._collector = self._create(self._pool._make_fetcher)
+        return self._collector
+
+    def fallback(self) -> BaseCollector:
+        """Playwright 폴백 Collector (처음 호출할 때 만들고 이후 재사용)."""
+        if self._fallback is None:
+            self._fallback = self._create(self._pool._make_fallback_fetcher)
+        return self._fallback
+
+    def close(self) -> None:
+        fetchers, self._fetchers = self._fetchers, []
+        self._collector = self._fallback = None
+        for fetcher in fetchers:
+            fetcher.close()
+
+
+class PlatformPool:
+    """플랫폼 하나의 작업 스레드, 요청 간격 제한, 스레드별 Worker."""
+
+    def __init__(
+        self,
+        platform: str,
+        make_fetcher: Callable[[], "Fetcher"],
+        concurrency: int = 1,
+        rate_limit_per_sec: float = 0.0,
+        inline: bool = False,
+        make_fallback_fetcher: Optional[Callable[[], "Fetcher"]] = None,
+    ):
+        self.platform = platform
+        self.concurrency = max(1, int(concurrency))
+        self.limiter = RateLimiter(rate_limit_per_sec)
+        self._make_fetcher = make_fetcher
+        self._make_fallback_fetcher = make_fallback_fetcher or make_fetcher
+        self._local = threading.local()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        if not inline:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.concurrency, thread_name_prefix=f"collect-{platform}"
+            )
+
+    def worker(self) -> Worker:
+        """현재 스레드의 Worker."""
+        worker = getattr(self._local, "worker", None)
+        if worker is None:
+            worker = self._local.worker = Worker(self)
+        return worker
+
+    def _run(self, func: Callable, args: tuple):
+        self.limiter.wait()
+        return func(self.worker(), *args)
+
+    def submit(self, func: Callable, *args) -> Future:
+        """func(worker, *args)를 예약한다. inline 풀이면 바로 실행한다."""
+        if self._executor is not None:
+            return self._executor.submit(self._run, func, args)
+        future: Future = Future()
+        try:
+            future.set_result(self._run(func, args))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def _close_worker(self) -> None:
+        worker = getattr(self._local, "worker", None)
+        if worker is not None:
+            self._local.worker = None
+            worker.close()
+
+    def _close_on_thread(self, barrier: threading.Barrier) -> None:
+        # 모든 작업 스레드가 닫기 작업을 하나씩 잡을 때까지 기다린다.
+        barrier.wait()
+        self._close_worker()
+
+    def close(self) -> None:
+        """남은 작업이 끝날 때까지 기다린 뒤 각 작업 스레드의 Fetcher를 그 스레드에서 닫는다."""
+        if self._executor is None:
+            self._close_worker()
+            return
+        barrier = threading.Barrier(self.concurrency)
+        futures = [self._executor.submit(self._close_on_thread, barrier) for _ in range(self.concurrency)]
+        wait(futures)
+        self._executor.shutdown(wait=True)
+        for future in futures:
+            if future.exception() is not None:
+                logger.warning(f"Failed to close {self.platform} fetcher: {future.exception()}")
+
+
+class CollectorPools:
+    """실행 한 번의 플랫폼별 풀 묶음."""
+
+    def __init__(
+        self,
+        config: dict,
+        platforms: Iterable[str],
+        make_fetcher: Callable[[], "Fetcher"],
+        make_fallback_fetcher: Optional[Callable[[], "Fetcher"]] = None,
+    ):
+        platforms = sorted(set(platforms))
+        platforms_config = config.get('platforms', {})
+        settings = {platform: platforms_config.get(platform, {}) for platform in platforms}
+        inline = len(platforms) == 1 and int(settings[platforms[0]].get('concurrency', 1)) <= 1
+        self.pools: Dict[str, PlatformPool] = {
+            platform: PlatformPool(
+                platform,
+                make_fetcher,
+                concurrency=setting.get('concurrency', 1),
+                rate_limit_per_sec=setting.get('rate_limit_per_sec', 0.0),
+                inline=inline,
+                make_fallback_fetcher=make_fallback_fetcher,
+            )
+            for platform, setting in settings.items()
+        }
+        self._futures: List[Future] = []
+        if not inline:
+            logger.info(
+                "Collector pools: "
+                + ", ".join(f"{p}={pool.concurrency}" for p, pool in self.pools.items())
+            )
+
+    def submit(self, platform: str, func: Callable, *args) -> None:
+        self._futures.append(self.pools[platform].submit(func, *args))
+
+    def wait(self) -> None:
+        """제출한 작업이 모두 끝날 때까지 기다리고, 작업에서 난 예외가 있으면 첫 번째를 다시 던진다."""
+        wait(self._futures)
+        for future in self._futures:
+            future.result()
+
+    def close(self) -> None:
+        for pool in self.pools.values():
+            pool.close()
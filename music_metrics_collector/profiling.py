@@ -0,0 +1,202 @@
+"""`--profile` 실행용 프로파일러: cProfile + 스택 샘플링 + 단계별 tracemalloc.
+
+collect(music_metrics_collector.main)와 render(chart_maker.main)가 함께 쓴다.
+실행 전체를 cProfile로 기록하면서, 별도 스레드가 주 스레드의 호출 스택을 일정 간격으로
+샘플링해 flamegraph용 folded stack을 만들고, 단계(phase)마다 소요 시간과 메모리 최고치,
+tracemalloc 할당 상위 위치를 모은다. 종료 시 out_dir에 다음 파일을 쓴다.
+
+- profile.pstats : cProfile 결과 (`python -m pstats`, snakeviz 등으로 열람)
+- stacks.folded  : "a;b;c 샘플수" 형식 (flamegraph.pl, speedscope, inferno 입력)
+- phases.json    : 단계별 호출 수/시간/메모리 최고치
+- summary.txt    : 단계 표, cProfile 누적/자체 시간 상위 N개, 단계 종료 시점의 할당 상위 N개
+
+tracemalloc과 cProfile 때문에 실행이 수 배 느려지므로 시간의 절대값보다 비율을 본다.
+특히 tracemalloc은 할당이 많은 matplotlib 렌더링을 4~5배 느리게 하므로, 시간 분포만 볼 때는
+trace_memory=False(CLI의 --profile-no-memory)로 끈다.
+곡마다 반복되는 단계(fetch/parse/write)의 할당 스냅샷은 처음 한 번만 찍는다.
+"""
+
+import cProfile
+import io
+import json
+import logging
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# 수집기 계측 단계(timing.TIMINGS) 중 프로파일 단계로 다루는 이름
+COLLECT_PHASES = ("load", "fetch", "parse", "write")
+
+
+class _PhaseStats:
+    __slots__ = ("calls", "total_sec", "peak_bytes", "snapshot")
+
+    def __init__(self):
+        self.calls = 0
+        self.total_sec = 0.0
+        self.peak_bytes = 0
+        self.snapshot: Optional[tracemalloc.Snapshot] = None
+
+    def top_allocations(self, limit: int) -> List[str]:
+        if self.snapshot is None:
+            return []
+        snapshot = self.snapshot.filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+        ))
+        return [str(stat) for stat in snapshot.statistics("lineno")[:limit]]
+
+
+class StackSampler:
+    """대상 스레드의 호출 스택을 interval초마다 샘플링해 folded stack으로 센다."""
+
+    def __init__(self, thread_id: int, interval: float = 0.005):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack:
+                self.samples[";".join(reversed(stack))] += 1
+
+    def write_folded(self, path: Path) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in self.samples.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+class Profiler:
+    """실행 하나를 프로파일링한다. start() → phase(...) 구간들 → stop()"""
+
+    def __init__(self, out_dir: Path, top_n: int = 30, sample_interval: float = 0.005, trace_memory: bool = True):
+        self.out_dir = out_dir
+        self.top_n = top_n
+        self.sample_interval = sample_interval
+        self.trace_memory = trace_memory
+        self.phases: Dict[str, _PhaseStats] = {}
+        self._profile = cProfile.Profile()
+        self._sampler: Optional[StackSampler] = None
+        self._started = 0.0
+        self._elapsed = 0.0
+
+    def start(self) -> "Profiler":
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        if self.trace_memory:
+            tracemalloc.start()
+        self._sampler = StackSampler(threading.get_ident(), self.sample_interval)
+        self._sampler.start()
+        self._started = time.perf_counter()
+        self._profile.enable()
+        return self
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """name 단계의 시간/메모리 최고치를 누적한다. (중첩하지 않는 구간에 사용)"""
+        stats = self.phases.get(name)
+        if stats is None:
+            stats = self.phases[name] = _PhaseStats()
+        tracing = self.trace_memory and tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.reset_peak()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            stats.calls += 1
+            stats.total_sec += time.perf_counter() - start
+            if tracing:
+                stats.peak_bytes = max(stats.peak_bytes, tracemalloc.get_traced_memory()[1])
+                # 스냅샷 집계는 느리므로 stop()에서 (프로파일링을 끈 뒤) 한다.
+                if stats.snapshot is None:
+                    stats.snapshot = tracemalloc.take_snapshot()
+
+    def stage_hook(self, name: str):
+        """timing.TIMINGS.phase_hook으로 등록해 수집기 계측 단계를 프로파일 단계로 받는다."""
+        if name in COLLECT_PHASES:
+            return self.phase(name)
+        return None
+
+    def stop(self) -> Path:
+        """프로파일링을 끝내고 결과 파일을 쓴다. summary.txt 경로를 돌려준다."""
+        self._profile.disable()
+        self._elapsed = time.perf_counter() - self._started
+        if self._sampler is not None:
+            self._sampler.stop()
+        if self.trace_memory and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+        self._profile.dump_stats(str(self.out_dir / "profile.pstats"))
+        if self._sampler is not None:
+            self._sampler.write_folded(self.out_dir / "stacks.folded")
+        (self.out_dir / "phases.json").write_text(json.dumps(self._phase_rows(), indent=2), encoding="utf-8")
+        summary_path = self.out_dir / "summary.txt"
+        summary_path.write_text(self._summary_text(), encoding="utf-8")
+        logger.info(f"Profile written to {self.out_dir}")
+        return summary_path
+
+    def _phase_rows(self) -> List[Dict]:
+        return [
+            {
+                "phase": name,
+                "calls": stats.calls,
+                "total_sec": round(stats.total_sec, 4),
+                "share": round(stats.total_sec / self._elapsed, 4) if self._elapsed else None,
+                "peak_mb": round(stats.peak_bytes / (1024 * 1024), 2) if self.trace_memory else None,
+            }
+            for name, stats in self.phases.items()
+        ]
+
+    def _summary_text(self) -> str:
+        out = io.StringIO()
+        out.write(f"Total elapsed: {self._elapsed:.2f}s (profiling overhead included)\n")
+        if self._sampler is not None:
+            out.write(f"Stack samples: {sum(self._sampler.samples.values())} every {self.sample_interval * 1000:.0f}ms\n")
+        out.write("\nPhases\n")
+        out.write(f"  {'phase':<12} {'calls':>7} {'total':>10} {'share':>7} {'peak MB':>9}\n")
+        for row in self._phase_rows():
+            share = f"{row['share'] * 100:6.1f}%" if row["share"] is not None else "      -"
+            peak = f"{row['peak_mb']:9.1f}" if row["peak_mb"] is not None else "        -"
+            out.write(f"  {row['phase']:<12} {row['calls']:>7} {row['total_sec']:>9.2f}s {share} {peak}\n")
+
+        for sort_key, title in (("cumulative", "cumulative time"), ("tottime", "own time")):
+            out.write(f"\nTop {self.top_n} functions by {title}\n")
+            buf = io.StringIO()
+            pstats.Stats(self._profile, stream=buf).sort_stats(sort_key).print_stats(self.top_n)
+            # pstats 머리말(호출 수 요약, 정렬 기준)은 건너뛰고 표만 남긴다.
+            lines = buf.getvalue().splitlines()
+            start = next((i for i, line in enumerate(lines) if line.lstrip().startswith("ncalls")), 0)
+            out.write("\n".join(lines[start:]).rstrip() + "\n")
+
+        for name, stats in self.phases.items():
+            allocations = stats.top_allocations(self.top_n)
+            stats.snapshot = None
+            if allocations:
+                out.write(f"\nLive allocations at the end of '{name}' (first occurrence)\n")
+                for line in allocations:
+                    out.write(f"  {line}\n")
+        return out.getvalue()
@@ -0,0 +1,132 @@
+"""수집 로그 레코드(JSONL 한 줄) 직렬화.
+
+로그 레코드는 song_data.csv에서 온 곡 고정 필드 25개와 수집 결과 필드 19개(+실패 시 error)로
+이루어진다. 고정 필드는 곡마다 한 번만 JSON으로 직렬화해 앞부분(prefix)으로 두고,
+레코드를 쓸 때는 결과 필드만 문자열로 이어 붙인다. 결과 필드는 대부분 항상 null이므로
+null 구간도 미리 만들어 둔다. 필드 순서와 형식은 json.dumps(ensure_ascii=False)로
+같은 딕셔너리를 직렬화한 결과와 같다. (tests/test_records.py 참고)
+"""
+
+import json
+from typing import Dict, Optional, Tuple
+
+from .logstore import index_values
+from .models import MetricsResult
+
+# song_data.csv 컬럼 → 기본값 (로그 레코드 앞부분, 이 순서대로 기록)
+# platform_song_ids는 CSV의 JSON 문자열이 아니라 해당 플랫폼 song_id 값만 기록한다.
+SONG_FIELDS: Tuple[Tuple[str, str], ...] = (
+    ('platform_seq', ''),
+    ('platform_name', ''),
+    ('song_type_txt', ''),
+    ('album_cd', ''),
+    ('album_name_kor', ''),
+    ('album_name_eng', ''),
+    ('song_cd', ''),
+    ('song_name_kor', ''),
+    ('song_name_eng', ''),
+    ('song_release_date', ''),
+    ('artist_cd', ''),
+    ('artist_name_kor', ''),
+    ('artist_name_eng', ''),
+    ('mem_cd', ''),
+    ('mem_name', ''),
+    ('track_cd', ''),
+    ('isrc_cd', ''),
+    ('interest_yn', 'n'),
+    ('platform_artist_ids', ''),
+    ('platform_song_ids', ''),
+    # 새로 추가된 b2b / new_date 필드
+    ('b2b_artist_cd_spotify', ''),
+    ('b2b_artist_cd_apple', ''),
+    ('b2b_artist_cd_melon', ''),
+    ('b2b_asset_ids_youtube', ''),
+    ('new_date', ''),
+)
+
+# 국가별 감상수 중 아직 수집하지 않는 필드 (항상 null)
+_COUNTRY_FIELDS = ('res_listeners_jp', 'res_listeners_cn', 'res_listeners_us',
+                   'res_listeners_eu', 'res_listeners_ea', 'res_listeners_etc')
+
+# 성별/연령별 비율: 로그 키 → MetricsResult 속성 (확장 예정)
+RATE_FIELDS: Tuple[Tuple[str, str], ...] = (
+    ('res_sex_m_rate', 'sex_m_rate'),
+    ('res_sex_w_rate', 'sex_w_rate'),
+    ('res_age_10_rate', 'age_10_rate'),
+    ('res_age_20_rate', 'age_20_rate'),
+    ('res_age_30_rate', 'age_30_rate'),
+    ('res_age_40_rate', 'age_40_rate'),
+    ('res_age_50_rate', 'age_50_rate'),
+    ('res_age_60_rate', 'age_60_rate'),
+)
+
+# 국내 플랫폼은 전체 감상수를 한국(res_listeners_ko) 감상수로도 기록한다.
+DOMESTIC_PLATFORMS = frozenset({'GENIE'})
+
+
+def _nulls(names) -> str:
+    return "".join(f', "{name}": null' for name in names)
+
+
+_COUNTRY_NULLS = _nulls(_COUNTRY_FIELDS)
+_RATE_NULLS = _nulls(key for key, _ in RATE_FIELDS)
+# 기타 예비 필드
+_RESERVED_NULLS = _nulls(('etc0', 'etc1'))
+# 실패 레코드의 결과 필드 (모두 null)
+_FAILED_RESULT = (
+    _nulls(('res_listeners', 'res_listeners_ko')) + _COUNTRY_NULLS + _RATE_NULLS + _RESERVED_NULLS
+)
+
+
+def _scalar(value) -> str:
+    return "null" if value is None else json.dumps(value)
+
+
+# (platform, song_id) → RecordTemplate (수집 대상 곡 수만큼만 쌓인다)
+_TEMPLATES: Dict[Tuple[str, str], "RecordTemplate"] = {}
+
+
+class RecordTemplate:
+    """곡 하나의 로그 레코드 틀. 고정 필드는 생성 시 한 번만 직렬화한다."""
+
+    __slots__ = ("prefix", "index_values", "domestic", "song_data")
+
+    def __init__(self, platform: str, song_id: str, song_data: Dict[str, str]):
+        self.song_data = dict(song_data)
+        fixed = {name: song_data.get(name, default) for name, default in SONG_FIELDS}
+        fixed['platform_song_ids'] = song_id
+        # 닫는 중괄호를 뺀 앞부분: 결과 필드를 ', "key": value' 형식으로 이어 붙인다.
+        self.prefix = json.dumps(fixed, ensure_ascii=False)[:-1]
+        self.index_values = index_values(fixed)
+        self.domestic = platform in DOMESTIC_PLATFORMS
+
+    @classmethod
+    def for_track(cls, platform: str, song_id: str, song_data: Dict[str, str]) -> "RecordTemplate":
+        """곡의 레코드 틀. 같은 프로세스(스케줄러)의 다음 실행에서 song_data가 같으면 재사용한다."""
+        key = (platform, song_id)
+        template = _TEMPLATES.get(key)
+        if template is None or template.song_data != song_data:
+            template = _TEMPLATES[key] = cls(platform, song_id, song_data)
+        return template
+
+    def success_line(self, req_date: str, metrics: MetricsResult) -> str:
+        """수집 결과 레코드 한 줄 (줄바꿈 제외)."""
+        listeners = _scalar(metrics.total_listeners)
+        values = [getattr(metrics, attr) for _, attr in RATE_FIELDS]
+        # 국내 플랫폼은 비율을 수집하지 않으므로 대부분 미리 만든 null 구간을 쓴다.
+        if any(value is not None for value in values):
+            rates = "".join(f', "{key}": {_scalar(value)}' for (key, _), value in zip(RATE_FIELDS, values))
+        else:
+            rates = _RATE_NULLS
+        return (
+            f'{self.prefix}, "req_date": {json.dumps(req_date)}, "res_listeners": {listeners}, '
+            f'"res_listeners_ko": {listeners if self.domestic else "null"}'
+            f'{_COUNTRY_NULLS}{rates}{_RESERVED_NULLS}}}'
+        )
+
+    def failure_line(self, req_date: str, error: Optional[str]) -> str:
+        """수집 실패 레코드 한 줄: 결과 필드는 모두 null이고 error에 사유를 남긴다."""
+        return (
+            f'{self.prefix}, "req_date": {json.dumps(req_date)}{_FAILED_RESULT}, '
+            f'"error": {json.dumps(error, ensure_ascii=False)}}}'
+        )
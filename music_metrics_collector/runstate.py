@@ -0,0 +1,283 @@
+"""수집 실행 상태 관리: 동시 실행 방지 잠금과 실행 이력.
+
+수집 한 번(run)은 아래 상태를 거친다.
+
+    running → completed | failed
+    (잠금을 얻지 못하면 바로 skipped)
+
+- 같은 프로세스 안에서는 스레드 잠금, 프로세스 사이에서는 잠금 파일(flock)로
+  동시에 하나의 수집만 실행되게 한다. 잠금은 프로세스가 종료되면 OS가 해제하므로
+  비정상 종료 후 남은 잠금 파일을 지울 필요가 없다.
+- 잠금 파일에는 실행 중인 run 정보를, 이력 파일(JSONL)에는 끝난 run의
+  소요 시간/처리량/성공률을 기록한다.
+
+    python -m music_metrics_collector.main status
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from .utils import get_iso8601_now
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+logger = logging.getLogger(__name__)
+
+LOCK_FILENAME = "collect.lock"
+HISTORY_FILENAME = "run_history.jsonl"
+
+# run 상태
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+SKIPPED = "skipped"
+
+
+@dataclass
+class RunRecord:
+    """수집 실행 한 번의 기록"""
+
+    run_id: str
+    trigger: str  # schedule | manual
+    status: str = RUNNING
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+    scheduled_at: Optional[str] = None
+    pid: int = field(default_factory=os.getpid)
+    duration_sec: Optional[float] = None
+    total: int = 0
+    success: int = 0
+    failed: int = 0
+    skipped: int = 0
+    deferred: int = 0  # 시간 예산 때문에 다음 실행으로 미룬 곡 수
+    throughput: Optional[float] = None  # 처리한 곡 수 / 초
+    success_rate: Optional[float] = None  # 성공 / (성공 + 실패)
+    reason: Optional[str] = None  # 건너뛴 이유 또는 오류 메시지
+
+    def finish(self, stats: Optional[Dict], duration_sec: float, error: Optional[str] = None) -> None:
+        """collect_metrics 통계로 run을 종료 상태로 만든다."""
+        self.finished_at = get_iso8601_now()
+        self.duration_sec = round(duration_sec, 3)
+        if stats:
+            for key in ("total", "success", "failed", "skipped"):
+                setattr(self, key, int(stats.get(key, 0)))
+            self.deferred = len(stats.get("deferred", ()))
+        processed = self.success + self.failed
+        if processed:
+            self.success_rate = round(self.success / processed, 4)
+            if duration_sec > 0:
+                self.throughput = round(processed / duration_sec, 3)
+        self.status = FAILED if error else COMPLETED
+        self.reason = error
+
+
+class RunLock:
+    """프로세스 사이에서 공유되는 배타적 잠금 파일."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._fd: Optional[int] = None
+
+    def acquire(self) -> bool:
+        """잠금을 시도한다. 다른 프로세스가 잡고 있으면 기다리지 않고 False."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        except OSError:
+            os.close(fd)
+            return False
+        self._fd = fd
+        return True
+
+    def write_holder(self, record: RunRecord) -> None:
+        """잠금을 잡은 run 정보를 잠금 파일에 기록한다. (status 조회용)"""
+        if self._fd is None:
+            return
+        data = json.dumps(asdict(record), ensure_ascii=False).encode("utf-8")
+        os.ftruncate(self._fd, 0)
+        os.lseek(self._fd, 0, os.SEEK_SET)
+        os.write(self._fd, data)
+
+    def release(self) -> None:
+        if self._fd is None:
+            return
+        try:
+            os.ftruncate(self._fd, 0)
+            if fcntl is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+            else:
+                os.lseek(self._fd, 0, os.SEEK_SET)
+                msvcrt.locking(self._fd, msvcrt.LK_UNLCK, 1)
+        finally:
+            os.close(self._fd)
+            self._fd = None
+
+    def holder(self) -> Optional[Dict]:
+        """잠금을 잡고 있는 run 정보를 반환한다. 실행 중인 run이 없으면 None."""
+        if not self.path.exists():
+            return None
+        if self.acquire():
+            self.release()
+            return None
+        try:
+            text = self.path.read_text(encoding="utf-8")
+            return json.loads(text) if text else {}
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+
+class RunHistory:
+    """끝난 run 기록을 JSONL 파일에 누적한다. (limit의 2배를 넘으면 최근 limit개만 남김)"""
+
+    def __init__(self, path: Path, limit: int = 500):
+        self.path = path
+        self.limit = limit
+
+    def append(self, record: RunRecord) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(asdict(record), ensure_ascii=False) + "\n")
+        self._trim()
+
+    def _trim(self) -> None:
+        with open(self.path, "r", encoding="utf-8") as f:
+            lines = f.readlines()
+        if len(lines) <= self.limit * 2:
+            return
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.writelines(lines[-self.limit:])
+        os.replace(tmp_path, self.path)
+
+    def load(self, limit: Optional[int] = None) -> List[Dict]:
+        """최근 run 기록을 오래된 순서로 반환한다."""
+        if not self.path.exists():
+            return []
+        records = []
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+        return records[-limit:] if limit else records
+
+    def summary(self, limit: int = 50) -> Dict:
+        """최근 run들의 상태별 개수, 평균 소요 시간/처리량/성공률."""
+        records = self.load(limit)
+        finished = [r for r in records if r.get("status") in (COMPLETED, FAILED)]
+
+        def mean(key: str) -> Optional[float]:
+            values = [r[key] for r in finished if r.get(key) is not None]
+            return round(sum(values) / len(values), 3) if values else None
+
+        counts: Dict[str, int] = {}
+        for r in records:
+            counts[r.get("status", "?")] = counts.get(r.get("status", "?"), 0) + 1
+        return {
+            "runs": len(records),
+            "status_counts": counts,
+            "avg_duration_sec": mean("duration_sec"),
+            "avg_throughput": mean("throughput"),
+            "avg_success_rate": mean("success_rate"),
+            "last": records[-1] if records else None,
+        }
+
+
+class RunManager:
+    """한 번에 하나의 수집만 실행하고 결과를 이력에 남긴다."""
+
+    def __init__(self, state_dir: Path, history_limit: int = 500):
+        self.state_dir = Path(state_dir)
+        self.lock = RunLock(self.state_dir / LOCK_FILENAME)
+        self.history = RunHistory(self.state_dir / HISTORY_FILENAME, history_limit)
+        self.current: Optional[RunRecord] = None
+        self._thread_lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: dict) -> "RunManager":
+        state_config = config.get('state', {})
+        return cls(
+            Path(state_config.get('dir', 'data/state')),
+            history_limit=state_config.get('history_limit', 500),
+        )
+
+    def _new_record(self, trigger: str, scheduled_at: Optional[str]) -> RunRecord:
+        now = get_iso8601_now()
+        return RunRecord(
+            run_id=f"{time.strftime('%Y%m%dT%H%M%S')}-{os.getpid()}",
+            trigger=trigger,
+            started_at=now,
+            scheduled_at=scheduled_at,
+        )
+
+    def record_skip(self, trigger: str, reason: str, scheduled_at: Optional[str] = None) -> RunRecord:
+        """실행하지 않은 run(겹침/지연 등)을 이력에 남긴다."""
+        record = self._new_record(trigger, scheduled_at)
+        record.status = SKIPPED
+        record.finished_at = record.started_at
+        record.reason = reason
+        self.history.append(record)
+        logger.warning(f"수집 실행 건너뜀 ({trigger}): {reason}")
+        return record
+
+    def run(
+        self,
+        job: Callable[[], Dict],
+        trigger: str = "manual",
+        scheduled_at: Optional[str] = None,
+    ) -> RunRecord:
+        """잠금을 잡은 상태에서 job을 실행하고 run 기록을 반환한다.
+
+        이미 실행 중인 run이 있으면 job을 실행하지 않고 skipped 기록을 반환한다.
+        job에서 난 예외는 failed로 기록한 뒤 다시 던진다.
+        """
+        if not self._thread_lock.acquire(blocking=False):
+            current = self.current.run_id if self.current else "?"
+            return self.record_skip(trigger, f"이전 수집이 실행 중 (run_id={current})", scheduled_at)
+        try:
+            if not self.lock.acquire():
+                holder = self.lock.holder() or {}
+                return self.record_skip(
+                    trigger,
+                    f"다른 프로세스가 수집 중 (pid={holder.get('pid')}, run_id={holder.get('run_id')})",
+                    scheduled_at,
+                )
+            try:
+                record = self._new_record(trigger, scheduled_at)
+                self.current = record
+                self.lock.write_holder(record)
+                start = time.monotonic()
+                try:
+                    stats = job()
+                except Exception as e:
+                    record.finish(None, time.monotonic() - start, error=f"{type(e).__name__}: {e}")
+                    raise
+                else:
+                    record.finish(stats, time.monotonic() - start)
+                finally:
+                    self.history.append(record)
+                    self.current = None
+                logger.info(
+                    f"수집 run 종료: {record.run_id} {record.status} "
+                    f"({record.duration_sec}s, {record.throughput} tracks/s, 성공률 {record.success_rate})"
+                )
+                return record
+            finally:
+                self.lock.release()
+        finally:
+            self._thread_lock.release()
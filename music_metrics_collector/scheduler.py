@@ -1,10 +1,15 @@
 """APScheduler를 이용해 수집 작업을 주기적으로 실행하는 스케줄러 모듈."""
 
 import logging
+from pathlib import Path
+
+from apscheduler.events import EVENT_JOB_MAX_INSTANCES, EVENT_JOB_MISSED
 from apscheduler.schedulers.blocking import BlockingScheduler
 from apscheduler.triggers.cron import CronTrigger
 import pytz
 
+from .runstate import RunManager
+
 logger = logging.getLogger(__name__)
 
 
@@ -20,6 +25,7 @@ class Scheduler:
         """
         self.config = config
         self.scheduler = BlockingScheduler(timezone=pytz.timezone('Asia/Seoul'))
+        self.run_manager = RunManager.from_config(config)
         self._setup_job()
     
     def _setup_job(self):
@@ -40,6 +46,9 @@ class Scheduler:
         minute, hour, day, month, day_of_week = parts
         
         # 수집 작업 등록
+        # - max_instances=1: 이전 수집이 끝나지 않았으면 이번 실행은 건너뜀 (JSONL 동시 쓰기 방지)
+        # - coalesce=True: 지연/중단으로 밀린 실행이 여러 번이어도 한 번만 실행
+        # - misfire_grace_time: 예정 시각보다 이만큼 늦게 깨어난 실행까지만 허용
         self.scheduler.add_job(
             self._collect_job,
             trigger=CronTrigger(
@@ -52,24 +61,75 @@ class Scheduler:
             ),
             id='collect_metrics',
             name='Collect Music Metrics',
-            replace_existing=True
+            replace_existing=True,
+            max_instances=1,
+            coalesce=True,
+            misfire_grace_time=schedule_config.get('misfire_grace_sec', 300),
         )
+        self.scheduler.add_listener(self._on_job_skipped, EVENT_JOB_MAX_INSTANCES | EVENT_JOB_MISSED)
         
         logger.info(f"스케줄이 cron='{cron_expr}'로 설정되었습니다.")
     
+    def _on_job_skipped(self, event):
+        """APScheduler가 실행하지 않은 예정 실행(겹침/지연)을 실행 이력에 남긴다."""
+        if event.code == EVENT_JOB_MAX_INSTANCES:
+            # JobSubmissionEvent: 합쳐진(coalesce) 예정 시각 목록
+            reason = "이전 수집이 아직 실행 중"
+            run_times = event.scheduled_run_times
+        else:
+            reason = "예정 시각을 놓침 (misfire_grace_sec 초과)"
+            run_times = [event.scheduled_run_time]
+        scheduled_at = run_times[-1].isoformat() if run_times else None
+        self.run_manager.record_skip('schedule', reason, scheduled_at=scheduled_at)
+
     def _collect_job(self):
         """정기 수집 시 실행되는 작업 함수."""
-        # 순환 의존성을 피하기 위해 지연 import 사용
-        from .main import collect_metrics
-        
         logger.info("스케줄러에 의해 수집을 시작합니다...")
         try:
+            record = self.run_manager.run(self._run_collection, trigger='schedule')
+            if record.status == 'completed':
+                logger.info(
+                    f"스케줄 수집 완료: success={record.success}, failed={record.failed}"
+                )
+        except Exception as e:
+            logger.error(f"스케줄 수집 중 오류 발생: {e}", exc_info=True)
+
+    def _run_collection(self) -> dict:
+        """수집 후 로그 압축까지 실행한다. (실행 잠금 안에서 호출)"""
+        # 순환 의존성을 피하기 위해 지연 import 사용
+        from .main import collect_due_metrics, collect_metrics
+
+        # adaptive: 곡별 수집 주기 등급(tiers.py)에 따라 주기가 돌아온 곡만 수집
+        if self.config.get('schedule', {}).get('mode', 'fixed') == 'adaptive':
+            stats = collect_due_metrics(self.config)
+        else:
             stats = collect_metrics(self.config)
+        self._compact_logs()
+        return stats
+
+    def _compact_logs(self):
+        """설정(log.compaction)이 켜져 있으면 지난 일자 로그를 압축 보관한다."""
+        from .logstore import compact_logs
+        from .utils import get_seoul_date
+
+        log_config = self.config.get('log', {})
+        compaction = log_config.get('compaction', {})
+        if not compaction.get('enabled', False):
+            return
+
+        try:
+            stats = compact_logs(
+                Path(log_config.get('base_dir', 'data/logs')),
+                before=get_seoul_date(),
+                codec=compaction.get('codec', 'gzip'),
+                monthly=compaction.get('monthly', False),
+            )
             logger.info(
-                f"스케줄 수집 완료: success={stats['success']}, failed={stats['failed']}"
+                f"로그 압축 완료: files={stats.files}, records={stats.records_in}->{stats.records_out}, "
+                f"bytes={stats.bytes_in}->{stats.bytes_out}"
             )
         except Exception as e:
-            logger.error(f"스케줄 수집 중 오류 발생: {e}", exc_info=True)
+            logger.error(f"로그 압축 중 오류 발생: {e}", exc_info=True)
     
     def start(self):
         """스케줄러를 시작한다."""
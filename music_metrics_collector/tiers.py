@@ -0,0 +1,251 @@
+"""곡별 수집 주기 등급(tier)을 정하고, 이번 실행에서 수집할 곡을 고른다.
+
+adaptive 스케줄 모드(`schedule.mode: adaptive`)에서는 cron이 자주(예: 매시간) 깨어나고,
+실행마다 주기가 돌아온 곡만 수집한다. 등급은 아래 순서로 정한다.
+
+1. interest_yn = Y → hourly
+2. 발매일(new_date, song_release_date)이 new_release_days 이내 → hourly
+3. 최근 lookback_days 동안 로그의 일평균 감상수 증가율이 hot_growth_per_day 이상 → hourly
+4. 관측 기간이 min_observed_days 이상인데 증가율이 cold_growth_per_day 미만 → weekly
+5. 그 외 (관측값이 없는 곡 포함) → daily
+
+곡별 마지막 수집 시각과 등급은 `{state.dir}/tier_state.json`에 저장한다.
+"""
+
+import json
+import logging
+import os
+import re
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .logstore import LOG_NAME_RE, iter_log_records
+
+logger = logging.getLogger(__name__)
+
+HOURLY = "hourly"
+DAILY = "daily"
+WEEKLY = "weekly"
+
+STATE_FILENAME = "tier_state.json"
+
+# 엑셀 날짜 일련번호 기준일 (song_data.csv의 발매일이 일련번호로 들어오는 경우)
+_EXCEL_EPOCH = date(1899, 12, 30)
+_SERIAL_RE = re.compile(r"^(\d{1,5})(?:\.\d+)?$")
+_COMPACT_DATE_RE = re.compile(r"^(\d{4})(\d{2})(\d{2})$")
+_DATE_RE = re.compile(r"^(\d{4})[-./](\d{1,2})[-./](\d{1,2})")
+
+
+def parse_release_date(value: Optional[str]) -> Optional[date]:
+    """발매일 문자열(YYYY-MM-DD, YYYY.MM.DD, YYYYMMDD, 엑셀 일련번호)을 date로 변환한다."""
+    if not value:
+        return None
+    text = str(value).strip()
+    m = _SERIAL_RE.match(text)
+    if m:
+        return _EXCEL_EPOCH + timedelta(days=int(m.group(1)))
+    m = _COMPACT_DATE_RE.match(text) or _DATE_RE.match(text)
+    if not m:
+        return None
+    try:
+        return date(int(m.group(1)), int(m.group(2)), int(m.group(3)))
+    except ValueError:
+        return None
+
+
+@dataclass
+class TierPolicy:
+    """등급별 수집 간격과 등급 판정 기준"""
+
+    intervals: Dict[str, int] = field(
+        default_factory=lambda: {HOURLY: 3600, DAILY: 86400, WEEKLY: 7 * 86400}
+    )
+    new_release_days: int = 30
+    lookback_days: int = 14
+    min_observed_days: int = 7
+    hot_growth_per_day: float = 0.01
+    cold_growth_per_day: float = 0.0005
+    # cron 실행 시각의 흔들림 때문에 한 주기를 통째로 건너뛰지 않도록 두는 여유
+    slack_sec: int = 300
+
+    @classmethod
+    def from_config(cls, config: dict) -> "TierPolicy":
+        tiers_config = config.get('schedule', {}).get('tiers', {}) or {}
+        policy = cls()
+        for tier in (HOURLY, DAILY, WEEKLY):
+            key = f"{tier}_interval_sec"
+            if key in tiers_config:
+                policy.intervals[tier] = int(tiers_config[key])
+        for name in (
+            "new_release_days", "lookback_days", "min_observed_days",
+            "hot_growth_per_day", "cold_growth_per_day", "slack_sec",
+        ):
+            if name in tiers_config:
+                setattr(policy, name, type(getattr(policy, name))(tiers_config[name]))
+        return policy
+
+
+@dataclass
+class Growth:
+    """로그에서 관측한 곡 하나의 감상수 변화"""
+
+    first_date: date
+    first_value: float
+    last_date: date
+    last_value: float
+
+    @property
+    def observed_days(self) -> int:
+        return (self.last_date - self.first_date).days
+
+    @property
+    def growth_per_day(self) -> Optional[float]:
+        """기간 첫 값 대비 일평균 증가율 (관측 기간이 0일이면 None)"""
+        if self.observed_days <= 0:
+            return None
+        return (self.last_value - self.first_value) / max(self.first_value, 1.0) / self.observed_days
+
+
+def observe_growth(
+    log_dir: Path,
+    platform: str,
+    today: date,
+    lookback_days: int,
+) -> Dict[str, Growth]:
+    """최근 lookback_days 일자 로그(압축/월별 파일 포함)에서 곡별 감상수 변화를 구한다."""
+    since = (today - timedelta(days=lookback_days)).isoformat()
+    until = today.isoformat()
+    growth: Dict[str, Growth] = {}
+    if not log_dir.exists():
+        return growth
+
+    for path in sorted(log_dir.iterdir()):
+        m = LOG_NAME_RE.match(path.name)
+        if not m or m.group(2).upper() != platform:
+            continue
+        # 파일명 날짜(월별 파일은 YYYY-MM)로 기간 밖 파일은 열지 않는다.
+        n = len(m.group(1))
+        if m.group(1) < since[:n] or m.group(1) > until[:n]:
+            continue
+        for rec in iter_log_records(path):
+            day = rec.get("req_date")
+            value = rec.get("res_listeners")
+            song_id = rec.get("platform_song_ids")
+            if rec.get("error") or value is None or not song_id or not day or not since <= day <= until:
+                continue
+            try:
+                d = date.fromisoformat(day)
+            except ValueError:
+                continue
+            g = growth.get(str(song_id))
+            if g is None:
+                growth[str(song_id)] = Growth(d, float(value), d, float(value))
+            elif d < g.first_date:
+                g.first_date, g.first_value = d, float(value)
+            elif d >= g.last_date:
+                g.last_date, g.last_value = d, float(value)
+    return growth
+
+
+def assign_tier(
+    song_data: Dict,
+    growth: Optional[Growth],
+    policy: TierPolicy,
+    today: date,
+) -> Tuple[str, str]:
+    """곡 하나의 (등급, 판정 이유)를 반환한다."""
+    if str(song_data.get('interest_yn', '')).strip().upper() == 'Y':
+        return HOURLY, "interest"
+
+    for key in ('new_date', 'song_release_date'):
+        released = parse_release_date(song_data.get(key))
+        if released is not None and 0 <= (today - released).days <= policy.new_release_days:
+            return HOURLY, f"new_release({key})"
+
+    rate = growth.growth_per_day if growth is not None else None
+    if rate is not None:
+        if rate >= policy.hot_growth_per_day:
+            return HOURLY, f"growth {rate:.4f}/day"
+        if growth.observed_days >= policy.min_observed_days and rate < policy.cold_growth_per_day:
+            return WEEKLY, f"growth {rate:.4f}/day"
+    return DAILY, "default"
+
+
+class TierPlanner:
+    """곡별 등급과 마지막 수집 시각으로 이번 실행의 수집 대상을 고른다."""
+
+    def __init__(self, policy: TierPolicy, state_path: Path, log_dir: Path):
+        self.policy = policy
+        self.state_path = state_path
+        self.log_dir = log_dir
+        self.state: Dict[str, Dict] = {}
+        if state_path.exists():
+            try:
+                self.state = json.loads(state_path.read_text(encoding="utf-8"))
+            except (OSError, json.JSONDecodeError) as e:
+                logger.warning(f"수집 등급 상태 파일을 읽지 못해 새로 시작합니다: {state_path} ({e})")
+
+    @classmethod
+    def from_config(cls, config: dict) -> "TierPlanner":
+        state_dir = Path(config.get('state', {}).get('dir', 'data/state'))
+        log_dir = Path(config.get('log', {}).get('base_dir', 'data/logs'))
+        return cls(TierPolicy.from_config(config), state_dir / STATE_FILENAME, log_dir)
+
+    @staticmethod
+    def key(target: Dict) -> str:
+        return f"{target['platform'].upper()}:{target['song_id']}"
+
+    def assign(self, targets: Iterable[Dict], now: datetime) -> Dict[str, Tuple[str, str]]:
+        """대상별 (등급, 이유)를 계산한다. 플랫폼마다 로그를 한 번만 읽는다."""
+        today = now.date()
+        growth_by_platform: Dict[str, Dict[str, Growth]] = {}
+        tiers = {}
+        for target in targets:
+            platform = target['platform'].upper()
+            if platform not in growth_by_platform:
+                growth_by_platform[platform] = observe_growth(
+                    self.log_dir, platform, today, self.policy.lookback_days
+                )
+            growth = growth_by_platform[platform].get(str(target['song_id']))
+            tiers[self.key(target)] = assign_tier(target.get('song_data', {}), growth, self.policy, today)
+        return tiers
+
+    def select_due(self, targets: List[Dict], now: datetime) -> List[Dict]:
+        """주기가 돌아온 대상만 반환한다. (한 번도 수집하지 않은 곡은 항상 포함)"""
+        tiers = self.assign(targets, now)
+        ts = now.timestamp()
+        due = []
+        counts: Dict[str, List[int]] = {}
+        for target in targets:
+            key = self.key(target)
+            tier, reason = tiers[key]
+            entry = self.state.setdefault(key, {})
+            entry['tier'], entry['reason'] = tier, reason
+            # 시간 예산 실행의 우선순위 정렬에 사용 (budget.priority)
+            target['tier'] = tier
+            last = entry.get('last_collected')
+            is_due = last is None or ts - last >= self.policy.intervals[tier] - self.policy.slack_sec
+            counts.setdefault(tier, [0, 0])[0] += 1
+            if is_due:
+                counts[tier][1] += 1
+                due.append(target)
+        logger.info(
+            "수집 등급별 대상(전체/이번 실행): "
+            + ", ".join(f"{tier}={total}/{n_due}" for tier, (total, n_due) in sorted(counts.items()))
+        )
+        return due
+
+    def mark_collected(self, keys: Iterable[str], now: datetime) -> None:
+        """수집에 성공한 대상의 마지막 수집 시각을 갱신하고 상태를 저장한다."""
+        ts = now.timestamp()
+        for key in keys:
+            self.state.setdefault(key, {})['last_collected'] = ts
+        self.save()
+
+    def save(self) -> None:
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.state_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(self.state, ensure_ascii=False, indent=1), encoding="utf-8")
+        os.replace(tmp_path, self.state_path)
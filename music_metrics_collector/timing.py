@@ -0,0 +1,233 @@
+"""수집 단계별 소요 시간 계측과 Prometheus 텍스트 파일 내보내기.
+
+곡 하나를 수집하는 동안 아래 단계의 시간을 잰다. (초 단위 히스토그램)
+
+- http_dns / http_connect / http_tls: 새 연결을 맺을 때만 (연결 재사용 시 없음)
+- http_ttfb: 요청 전송부터 응답 헤더 수신까지 (연결 시간 제외)
+- http_download: 응답 본문 수신
+- fetch: 페이지 하나를 가져오는 전체 (위 HTTP 단계 또는 브라우저 단계 포함)
+- browser_launch / browser_navigate / browser_content: Playwright 실행, 페이지 이동, HTML 추출
+- selector_eval: JavaScript 선택자 평가
+- parse: HTML 파싱 (숫자 변환 포함)
+- normalize: 텍스트 → 숫자 일괄 변환 (normalize_numbers 호출 단위)
+- archive: 받은 페이지의 메트릭 구간 보관 (archive.enabled일 때만)
+- write: JSONL 기록
+- track_total: 곡 하나 전체
+- load: 수집 대상 목록 구성 (실행마다 한 번)
+
+계측은 perf_counter 두 번과 버킷 탐색(bisect) 정도이므로 운영 중에도 켜 둔다.
+히스토그램은 프로세스 안에서 누적되며(스케줄러는 실행을 거듭할수록 누적),
+실행이 끝날 때마다 node_exporter textfile collector 형식으로 내보낸다.
+"""
+
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from functools import wraps
+from pathlib import Path
+from typing import Callable, ContextManager, Dict, Iterable, Iterator, List, Optional
+
+# 히스토그램 버킷 상한(초)
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+HTTP_CONNECT_STAGES = ("http_dns", "http_connect", "http_tls")
+
+METRIC_PREFIX = "music_collector"
+PROMETHEUS_FILENAME = "collector.prom"
+
+
+class Histogram:
+    """고정 버킷 히스토그램 (버킷별 개수는 누적이 아닌 구간 개수로 보관)"""
+
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect_left(BUCKETS, seconds)] += 1
+        self.sum += seconds
+        self.count += 1
+
+    def quantile(self, q: float) -> Optional[float]:
+        """버킷 상한 기준의 근사 분위수 (마지막 버킷이면 60초 초과를 뜻하는 inf)"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return BUCKETS[i] if i < len(BUCKETS) else float("inf")
+        return float("inf")
+
+
+class StageTimings:
+    """단계별 히스토그램과 현재 곡의 단계별 소요 시간."""
+
+    def __init__(self):
+        self.histograms: Dict[str, Histogram] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        # 단계 이름 → 컨텍스트 매니저(또는 None). profiling.Profiler.stage_hook
+        self.phase_hook: Optional[Callable[[str], Optional[ContextManager]]] = None
+
+    def observe(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            hist = self.histograms.get(stage)
+            if hist is None:
+                hist = self.histograms[stage] = Histogram()
+            hist.observe(seconds)
+        local = self._local
+        totals = getattr(local, "totals", None)
+        if totals is None:
+            totals = local.totals = {}
+        totals[stage] = totals.get(stage, 0.0) + seconds
+        track = getattr(local, "track", None)
+        if track is not None:
+            track[stage] = track.get(stage, 0.0) + seconds
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        # --profile 실행 중에는 단계 구간을 프로파일러에도 알린다.
+        hooked = self.phase_hook(name) if self.phase_hook is not None else None
+        if hooked is not None:
+            hooked.__enter__()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+            if hooked is not None:
+                hooked.__exit__(None, None, None)
+
+    def timed(self, name: str) -> Callable:
+        """함수 호출 전체를 name 단계로 계측하는 데코레이터."""
+        def decorator(func: Callable) -> Callable:
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.observe(name, time.perf_counter() - start)
+            return wrapper
+        return decorator
+
+    def begin_track(self) -> None:
+        """곡 하나의 단계별 시간 수집을 시작한다."""
+        self._local.track = {}
+        self._local.track_start = time.perf_counter()
+
+    def end_track(self) -> Dict[str, float]:
+        """곡 구간을 끝내고 track_total을 기록한 뒤 단계별 시간(초)을 돌려준다."""
+        stages = getattr(self._local, "track", None)
+        if stages is None:
+            return {}
+        self._local.track = None
+        total = time.perf_counter() - self._local.track_start
+        self.observe("track_total", total)
+        stages["track_total"] = total
+        return stages
+
+    @contextmanager
+    def track(self) -> Iterator[Dict[str, float]]:
+        """begin_track/end_track의 with 구문 버전."""
+        self.begin_track()
+        stages = self._local.track
+        try:
+            yield stages
+        finally:
+            self.end_track()
+
+    def thread_sum(self, names: Iterable[str]) -> float:
+        """현재 스레드에서 지금까지 기록된 단계 시간의 합 (구간 차이로 안쪽 단계를 빼는 데 쓴다)"""
+        totals = getattr(self._local, "totals", None)
+        if not totals:
+            return 0.0
+        return sum(totals.get(name, 0.0) for name in names)
+
+    def summary(self) -> List[Dict]:
+        """단계별 횟수/합계/평균/근사 p50·p95 (합계가 큰 순)"""
+        with self._lock:
+            items = list(self.histograms.items())
+        rows = []
+        for stage, hist in items:
+            rows.append({
+                "stage": stage,
+                "count": hist.count,
+                "sum_sec": hist.sum,
+                "mean_ms": hist.sum / hist.count * 1000 if hist.count else 0.0,
+                "p50_ms": (hist.quantile(0.5) or 0.0) * 1000,
+                "p95_ms": (hist.quantile(0.95) or 0.0) * 1000,
+            })
+        rows.sort(key=lambda r: r["sum_sec"], reverse=True)
+        return rows
+
+    def render_prometheus(self, gauges: Optional[Dict[str, float]] = None) -> str:
+        """Prometheus 텍스트 노출 형식으로 변환한다."""
+        name = f"{METRIC_PREFIX}_stage_seconds"
+        lines = [
+            f"# HELP {name} Time spent in each collection stage.",
+            f"# TYPE {name} histogram",
+        ]
+        with self._lock:
+            items = sorted((stage, list(h.counts), h.sum, h.count) for stage, h in self.histograms.items())
+        for stage, counts, total, count in items:
+            cumulative = 0
+            for bound, n in zip(BUCKETS, counts):
+                cumulative += n
+                lines.append(f'{name}_bucket{{stage="{stage}",le="{bound:g}"}} {cumulative}')
+            lines.append(f'{name}_bucket{{stage="{stage}",le="+Inf"}} {count}')
+            lines.append(f'{name}_sum{{stage="{stage}"}} {total:.6f}')
+            lines.append(f'{name}_count{{stage="{stage}"}} {count}')
+        for gauge, value in sorted((gauges or {}).items()):
+            lines.append(f"# TYPE {METRIC_PREFIX}_{gauge} gauge")
+            lines.append(f"{METRIC_PREFIX}_{gauge} {value:g}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: Path, gauges: Optional[Dict[str, float]] = None) -> None:
+        """텍스트 파일로 원자적으로 기록한다. (textfile collector가 쓰는 중인 파일을 읽지 않도록)"""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(self.render_prometheus(gauges), encoding="utf-8")
+        os.replace(tmp_path, path)
+
+    def reset(self) -> None:
+        with self._lock:
+            self.histograms.clear()
+
+
+# 프로세스 전체에서 공유하는 계측기
+TIMINGS = StageTimings()
+
+
+def prometheus_path(config: dict) -> Optional[Path]:
+    """metrics.prometheus_file (기본: {state.dir}/collector.prom). 빈 값이면 내보내지 않는다."""
+    metrics_config = config.get('metrics', {})
+    if 'prometheus_file' in metrics_config:
+        value = metrics_config['prometheus_file']
+        return Path(value) if value else None
+    return Path(config.get('state', {}).get('dir', 'data/state')) / PROMETHEUS_FILENAME
+
+
+def track_timings_path(config: dict, day: str) -> Optional[Path]:
+    """metrics.track_timings가 켜져 있으면 {state.dir}/timings/{day}.jsonl"""
+    if not config.get('metrics', {}).get('track_timings', False):
+        return None
+    return Path(config.get('state', {}).get('dir', 'data/state')) / "timings" / f"{day}.jsonl"
+
+
+def format_track_timing(track_key: str, status: str, stages: Dict[str, float], req_date: str) -> str:
+    """곡 하나의 단계별 시간(ms)을 JSONL 한 줄로 만든다."""
+    return json.dumps({
+        "req_date": req_date,
+        "track": track_key,
+        "status": status,
+        "stages_ms": {k: round(v * 1000, 2) for k, v in stages.items()},
+    }, ensure_ascii=False) + "\n"
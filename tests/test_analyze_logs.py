@@ -0,0 +1,64 @@
+import json
+
+import numpy as np
+
+from music_metrics_collector.analyze_logs import SongMetricAggregator, _iter_records
+
+
+def test_aggregator_single_pass_matches_per_metric_sums():
+    records = [
+        {"platform": "GENIE", "date": "2025-12-02", "song_name": "B", "total_plays": 5, "total_listeners": 1},
+        {"platform": "GENIE", "date": "2025-12-01", "song_name": "B", "total_plays": 3, "total_listeners": None},
+        {"platform": "GENIE", "date": "2025-12-01", "song_name": "B", "total_plays": 4, "total_listeners": 2},
+        {"platform": "GENIE", "date": "2025-12-03", "song_name": None, "total_plays": None, "total_listeners": 7},
+        {"platform": "BUGS", "date": "2025-12-01", "song_name": "A", "total_plays": 9, "total_listeners": None},
+        {"platform": "GENIE", "date": None, "song_name": "B", "total_plays": 100, "total_listeners": 100},
+    ]
+    # chunk_size를 작게 잡아 버퍼 합산/배열 확장 경로를 함께 검증
+    agg = SongMetricAggregator(("total_plays", "total_listeners"), chunk_size=2).extend(records)
+
+    plays = agg.song_series("total_plays")
+    assert [name for name, _, _ in plays["GENIE"]] == ["B"]
+    _, dates, values = plays["GENIE"][0]
+    assert dates == ["2025-12-01", "2025-12-02"]
+    np.testing.assert_array_equal(values, [7.0, 5.0])
+
+    listeners = agg.song_series("total_listeners")
+    assert [(name, dates) for name, dates, _ in listeners["GENIE"]] == [
+        ("(제목없음)", ["2025-12-03"]),
+        ("B", ["2025-12-01", "2025-12-02"]),
+    ]
+    assert "BUGS" not in listeners
+    assert agg.has_positive("total_listeners")
+
+
+def test_records_without_platform_are_grouped_under_none():
+    records = [
+        {"platform": "GENIE", "date": "2025-12-01", "song_name": "A", "total_plays": 1},
+        {"date": "2025-12-01", "song_name": "B", "total_plays": 2},
+    ]
+    plays = SongMetricAggregator(("total_plays",)).extend(records).song_series("total_plays")
+    assert [name for name, _, _ in plays["GENIE"]] == ["A"]
+    assert [name for name, _, _ in plays["None"]] == ["B"]
+
+
+def test_grow_extends_only_the_overflowing_axis():
+    # 곡 3개 × 날짜 500개: 날짜 축만 늘어나야 한다.
+    records = [
+        {"platform": "GENIE", "date": f"2025-{i:04d}", "song_name": f"S{i % 3}", "total_plays": 1}
+        for i in range(500)
+    ]
+    agg = SongMetricAggregator(("total_plays",), chunk_size=7).extend(records)
+    rows, cols = agg._sums["total_plays"].shape
+    assert rows <= 6 and 500 <= cols <= 1000
+
+
+def test_iter_records_streams_date_dirs(tmp_path):
+    day = tmp_path / "2025-12-01"
+    day.mkdir()
+    lines = [json.dumps({"platform": "GENIE", "date": "2025-12-01"}), "", "{broken"]
+    (day / "GENIE.jsonl").write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    records = _iter_records(tmp_path)
+    assert not isinstance(records, list)
+    assert [r["platform"] for r in records] == ["GENIE"]
@@ -0,0 +1,87 @@
+import json
+
+import pytest
+
+from benchmarks import genie_server
+from music_metrics_collector import archive, main
+from music_metrics_collector.pagecache import fragment_hash
+
+
+@pytest.fixture
+def app():
+    # 0~499번은 값이 변하지 않는 곡, 500번 이후는 요청마다 값이 바뀌는 곡
+    app = genie_server.GenieStandIn(catalog_size=1000, static_rate=0.5, etag=True)
+    server = genie_server.GenieServer(app=app)
+    server.start_background()
+    app.base_url = server.base_url
+    yield app
+    server.shutdown()
+    server.server_close()
+
+
+def _config(tmp_path, base_url):
+    return {
+        "enabled_platforms": ["GENIE"],
+        "mode": "requests",
+        "http": {"base_url": base_url},
+        "log": {"base_dir": str(tmp_path / "logs")},
+        "state": {"dir": str(tmp_path / "state")},
+        "archive": {"enabled": True, "dir": str(tmp_path / "archive")},
+        "targets": [{"platform": "GENIE", "song_id": genie_server.song_id(i), "song_data": {}} for i in (1, 2, 900)],
+    }
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_reparse_regenerates_logged_records(app, tmp_path, monkeypatch, jobs):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    config = _config(tmp_path, app.base_url)
+    first = main.collect_metrics(config)
+    app.started -= 10  # 변하는 곡의 값이 확실히 바뀌도록 시간을 민다
+    second = main.collect_metrics(config)
+
+    assert first["archive"] == {"stored": 3, "deduplicated": 0}
+    # 변하지 않은 두 곡은 304 응답이어도 지난 보관본을 가리킨다.
+    assert second["archive"] == {"stored": 1, "deduplicated": 2}
+    assert second["page_cache"]["not_modified"] == 2
+
+    out_dir = tmp_path / "reparsed"
+    stats = archive.reparse(config, out_dir, jobs=jobs)
+    assert (stats.records, stats.missing) == (6, 0)
+    logged = next((tmp_path / "logs").glob("*.jsonl"))
+    reparsed = out_dir / logged.name
+    assert reparsed.read_text(encoding="utf-8") == logged.read_text(encoding="utf-8")
+    assert reparsed.with_name(reparsed.name + ".idx").exists()
+
+
+def test_reparse_with_custom_selectors(app, tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    config = _config(tmp_path, app.base_url)
+    main.collect_metrics(config)
+
+    # 재생수와 청취자 수 블록을 맞바꾼 선택자: 청취자 수 자리에 전체 재생수가 들어간다.
+    selectors = {
+        "total_plays": ".daily-chart .total div:nth-child(2) p",
+        "total_listeners": ".daily-chart .total div:first-child p",
+    }
+    stats = archive.reparse(config, tmp_path / "out", selectors=selectors, jobs=1)
+    assert stats.records == 3
+    logged = next((tmp_path / "logs").glob("*.jsonl"))
+    before = [json.loads(line)["res_listeners"] for line in logged.read_text(encoding="utf-8").splitlines()]
+    after = [json.loads(line)["res_listeners"] for line in (tmp_path / "out" / logged.name).read_text().splitlines()]
+    assert all(a > b for a, b in zip(after, before))
+
+
+def test_prune_drops_expired_manifests_and_unreferenced_objects(tmp_path):
+    for day, pages in (("2026-01-01", ["old", "both"]), ("2026-03-01", ["both", "new"])):
+        store = archive.PageArchive(tmp_path, req_date=day)
+        for i, page in enumerate(pages):
+            store.add("GENIE", str(i), page)
+        store.close()
+
+    store = archive.PageArchive(tmp_path)
+    assert len(list((tmp_path / "objects").glob("*/*"))) == 3
+    stats = store.prune("2026-02-01")
+    assert (stats.manifests_removed, stats.objects_removed) == (1, 1)
+    assert store.read(fragment_hash("old")) is None
+    assert store.read(fragment_hash("both")) == "both"
+    assert [day for day, _, _ in store.manifests()] == ["2026-03-01"]
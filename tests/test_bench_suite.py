@@ -0,0 +1,34 @@
+from benchmarks import gen_logs, suite
+from chart_maker import io, metrics, transform
+
+
+def test_generated_history_has_gaps_duplicates_and_drops(tmp_path):
+    stats = gen_logs.write_history(
+        tmp_path, songs=50, days=5, hours=4, gap_rate=0.05, dup_rate=0.05, drop_rate=0.02, seed=1
+    )
+    assert stats.files == 5
+    assert stats.gaps and stats.duplicates and stats.drops
+
+    df_raw = io.load_jsonl(tmp_path)
+    assert len(df_raw) == stats.records
+    assert {"req_date", "platform_song_ids", "res_listeners", "track_cd"} <= set(df_raw.columns)
+
+    df_norm, dup_count = transform.normalize(df_raw)
+    assert dup_count == stats.duplicates
+    assert len(df_norm) == stats.records - stats.duplicates
+    _, anomalies = metrics.add_metrics(df_norm)
+    assert anomalies > 0
+
+
+def test_compare_flags_only_meaningful_slowdowns():
+    params = {"songs": 10}
+    history = [
+        {"params": {"songs": 99}, "results": {"a": {"best_sec": 0.1}}},
+        {"params": params, "results": {"a": {"best_sec": 1.0}, "b": {"best_sec": 0.01}, "c": {"best_sec": 1.0}}},
+    ]
+    current = {"params": params, "results": {"a": {"best_sec": 1.5}, "b": {"best_sec": 0.03}, "c": {"best_sec": 1.1}}}
+    previous = suite.last_matching(history, params)
+    regressions = suite.compare(previous, current, threshold=0.2, min_delta_sec=0.05)
+    # b는 3배지만 절대 차이가 작고, c는 10%라 기준 미만
+    assert [r["name"] for r in regressions] == ["a"]
+    assert suite.compare(None, current, 0.2, 0.05) == []
@@ -0,0 +1,86 @@
+import json
+import time
+
+import pytest
+
+from music_metrics_collector import budget, main
+from music_metrics_collector.models import MetricsResult
+
+
+def _target(song_id, interest="N", tier=None):
+    target = {"platform": "GENIE", "song_id": song_id, "song_data": {"interest_yn": interest}}
+    if tier:
+        target["tier"] = tier
+    return target
+
+
+def test_latency_model_and_ordering(tmp_path):
+    model = budget.LatencyModel(tmp_path / "lat.json", alpha=0.5, default_sec=9.0)
+    assert model.estimate("GENIE:x") == 9.0
+    model.observe("GENIE:a", 4.0)
+    model.observe("GENIE:a", 2.0)
+    model.observe("GENIE:b", 1.0)
+    model.observe("GENIE:c", 10.0)
+    assert model.estimate("GENIE:a") == 3.0
+    # 기록 없는 곡은 같은 플랫폼 중앙값
+    assert model.estimate("GENIE:new") == 3.0
+    model.save()
+    assert budget.LatencyModel(tmp_path / "lat.json").estimate("GENIE:b") == 1.0
+
+    targets = [_target("c"), _target("a"), _target("b", tier="weekly"), _target("d", interest="Y"), _target("new")]
+    ordered = budget.order_targets(targets, model, deferred=["GENIE:new"])
+    # 관심곡 → 미룬 곡 → 나머지(예상 시간 순) → weekly
+    assert [t["song_id"] for t in ordered] == ["d", "new", "a", "c", "b"]
+
+
+class _SlowCollector:
+    def collect(self, track_info, **kwargs):
+        time.sleep(0.05)
+        return MetricsResult(total_listeners=1), "곡", "가수", "앨범"
+
+
+def test_collect_stops_dispatching_at_deadline(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setattr(main.CollectorFactory, "create", classmethod(lambda cls, platform, fetcher: _SlowCollector()))
+    config = {
+        "enabled_platforms": ["GENIE"],
+        "mode": "requests",
+        "log": {"base_dir": str(tmp_path / "logs")},
+        "state": {"dir": str(tmp_path / "state")},
+        "collect": {"default_latency_sec": 0.05},
+    }
+    targets = [_target(str(i)) for i in range(6)]
+
+    stats = main.collect_metrics(config, targets=[dict(t) for t in targets], time_budget_sec=0.18)
+    assert 1 <= stats["success"] <= 3
+    assert stats["success"] + len(stats["deferred"]) == 6
+    deferred = json.loads((tmp_path / "state" / budget.DEFERRED_FILENAME).read_text())["keys"]
+    assert deferred == stats["deferred"]
+
+    # 다음 실행에서는 미룬 곡부터 수집한다.
+    stats2 = main.collect_metrics(config, targets=[dict(t) for t in targets], time_budget_sec=0.18)
+    assert stats2["collected"][0] == deferred[0]
+    latencies = json.loads((tmp_path / "state" / budget.LATENCY_FILENAME).read_text())
+    assert latencies["GENIE:0"] == pytest.approx(0.05, abs=0.05)
+
+
+def test_partial_run_merges_deferred_tracks(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setattr(main.CollectorFactory, "create", classmethod(lambda cls, platform, fetcher: _SlowCollector()))
+    config = {
+        "enabled_platforms": ["GENIE"],
+        "mode": "requests",
+        "log": {"base_dir": str(tmp_path / "logs")},
+        "state": {"dir": str(tmp_path / "state")},
+    }
+    deferred = budget.DeferredTracks(budget.state_paths(config)["deferred"])
+    deferred.save(["GENIE:a", "GENIE:b"], "2026-01-01T00:00:00+09:00")
+
+    # 일부 곡만 수집한 실행(--song-id 등)은 대상 밖의 미룬 곡을 지우지 않는다.
+    main.collect_metrics(config, targets=[_target("a"), _target("c")])
+    assert budget.DeferredTracks(deferred.path).keys == ["GENIE:b"]
+
+    # 전체 실행은 목록을 바꾼다.
+    config["targets"] = [_target("c")]
+    main.collect_metrics(config)
+    assert budget.DeferredTracks(deferred.path).keys == []
@@ -0,0 +1,74 @@
+import csv
+import json
+
+import pytest
+import yaml
+
+from benchmarks import genie_server
+from music_metrics_collector import main
+from music_metrics_collector.generate_song_ids import generate_song_ids
+
+
+@pytest.fixture
+def server():
+    srv = genie_server.GenieServer(app=genie_server.GenieStandIn(catalog_size=100))
+    srv.start_background()
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+
+def _config(tmp_path, base_url):
+    return {
+        "enabled_platforms": ["GENIE"],
+        "mode": "requests",
+        "http": {"base_url": base_url},
+        "log": {"base_dir": str(tmp_path / "logs")},
+        "state": {"dir": str(tmp_path / "state")},
+    }
+
+
+def test_collect_against_stand_in(server, tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    targets = [{"platform": "GENIE", "song_id": genie_server.song_id(i), "song_data": {}} for i in (3, 4, 500)]
+    stats = main.collect_metrics(_config(tmp_path, server.base_url), targets=targets)
+    assert (stats["success"], stats["failed"]) == (2, 1)  # 500번은 카탈로그 밖 (404)
+
+    records = [json.loads(line) for line in next((tmp_path / "logs").glob("*.jsonl")).read_text().splitlines()]
+    assert records[0]["res_listeners"] is not None
+    assert "error" in records[2]
+
+
+def test_rate_limited_responses_fail(server, tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    server.app.faults.rate_limit = 1.0
+    targets = [{"platform": "GENIE", "song_id": genie_server.song_id(1), "song_data": {}}]
+    stats = main.collect_metrics(_config(tmp_path, server.base_url), targets=targets)
+    assert stats["failed"] == 1
+
+
+def test_generate_song_ids_against_stand_in(server, tmp_path):
+    resource_dir = tmp_path / "resource"
+    (resource_dir / "GENIE").mkdir(parents=True)
+    with open(resource_dir / "GENIE" / "search_data.csv", "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=["song_name_kor", "artist_name_kor", "album_name_kor", "track_cd"])
+        writer.writeheader()
+        for i in (11, 12):
+            writer.writerow({
+                "song_name_kor": genie_server.song_name(i),
+                "artist_name_kor": genie_server.artist_name(i),
+                "album_name_kor": genie_server.album_name(i),
+                "track_cd": f"T{i}",
+            })
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(yaml.safe_dump({
+        "enabled_platforms": ["GENIE"],
+        "resource_dir": str(resource_dir),
+        "platforms": {"GENIE": {}},
+        "http": {"base_url": server.base_url},
+    }, allow_unicode=True), encoding="utf-8")
+
+    generate_song_ids(str(config_path))
+    with open(resource_dir / "GENIE" / "song_data.csv", encoding="utf-8-sig") as f:
+        found = {row["track_cd"]: json.loads(row["platform_song_ids"])["GENIE"] for row in csv.DictReader(f)}
+    assert found == {"T11": genie_server.song_id(11), "T12": genie_server.song_id(12)}
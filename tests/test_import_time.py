@@ -0,0 +1,62 @@
+"""CLI 기동 시간 회귀 확인: `python -X importtime`으로 무거운 의존성이 지연 로드되는지 본다."""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# 해당 명령을 실제로 실행할 때만 로드해야 하는 패키지
+HEAVY = {"requests", "urllib3", "bs4", "apscheduler", "matplotlib"}
+
+# import 예산 (마이크로초). 로컬에서 ~0.1s, 느린 CI를 감안해 여유를 둔다.
+IMPORT_BUDGET_US = 500_000
+
+
+def _import_times(module: str) -> dict:
+    """module을 새 인터프리터에서 import하고 {모듈 이름: 누적 import 시간(us)}을 돌려준다."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    times = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+@pytest.mark.parametrize("module", ["music_metrics_collector.main", "music_metrics_collector.analyze_logs"])
+def test_cli_import_defers_heavy_dependencies(module):
+    times = _import_times(module)
+    loaded = {name.split(".")[0] for name in times}
+    assert not loaded & HEAVY, sorted(loaded & HEAVY)
+    assert times[module] < IMPORT_BUDGET_US
+
+
+def test_chart_maker_loads_plot_backends_lazily():
+    # pandas는 render의 모든 경로에서 쓰므로 import 시점에 불러와도 된다.
+    loaded = {name.split(".")[0] for name in _import_times("chart_maker.main")}
+    assert not loaded & {"matplotlib", "plotly"}, sorted(loaded & {"matplotlib", "plotly"})
+
+
+def test_csv_only_render_skips_plot_backends(tmp_path):
+    from benchmarks.gen_logs import write_history
+
+    write_history(tmp_path / "logs", songs=5, days=3)
+    script = (
+        "import sys\n"
+        "from pathlib import Path\n"
+        "from chart_maker.main import cmd_render\n"
+        f"cmd_render(Path({str(tmp_path / 'logs')!r}), Path({str(tmp_path / 'out')!r}), None, None, 10, "
+        "export_html=False, export_png=False)\n"
+        "print(sorted({m.split('.')[0] for m in sys.modules} & {'matplotlib', 'plotly'}))\n"
+    )
+    proc = subprocess.run([sys.executable, "-c", script], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert proc.stdout.strip().splitlines()[-1] == "[]"
+    assert list((tmp_path / "out" / "csv").iterdir())
@@ -0,0 +1,56 @@
+import json
+
+from chart_maker import io, log_index, query
+from music_metrics_collector import logstore
+
+
+def _rec(day, song_id, listeners):
+    return {
+        "req_date": day,
+        "platform_song_ids": song_id,
+        "track_cd": f"T{song_id}",
+        "isrc_cd": f"KR{song_id}",
+        "song_name_kor": f"곡{song_id}",
+        "res_listeners": listeners,
+    }
+
+
+def test_sidecar_lookup_with_unindexed_tail(tmp_path):
+    path = tmp_path / "2026-01-01_GENIE.jsonl"
+    for i, song_id in enumerate(["1", "2", "1", "3"]):
+        logstore.append_record(path, _rec("2026-01-01", song_id, i))
+    # 인덱스 기록 없이 추가된 줄(중단된 쓰기 등)도 순차 조회로 찾아야 한다.
+    with path.open("a", encoding="utf-8") as f:
+        f.write(json.dumps(_rec("2026-01-01", "1", 9), ensure_ascii=False) + "\n")
+
+    index = log_index.lookup_sidecar(path, "platform_song_ids", ["1"])
+    assert len(index.spans) == 2
+    assert index.covered < path.stat().st_size
+
+    rows = list(log_index.iter_matching_records(path, "platform_song_ids", ["1"]))
+    assert [r["res_listeners"] for r in rows] == [0, 2, 9]
+    assert [r["res_listeners"] for r in log_index.iter_matching_records(path, "isrc_cd", ["KR3"])] == [3]
+
+    # 재생성한 인덱스는 전체 줄을 다룬다.
+    assert logstore.rebuild_index(path) == 5
+    assert log_index.lookup_sidecar(path, "track_cd", ["T2"]).covered == path.stat().st_size
+
+
+def test_stale_sidecar_and_readers(tmp_path):
+    path = tmp_path / "2026-01-02_GENIE.jsonl"
+    logstore.append_record(path, _rec("2026-01-02", "1", 5))
+    logstore.append_record(path, _rec("2026-01-02", "2", 7))
+    # 로그를 다시 쓰면 기존 인덱스 오프셋이 맞지 않는다.
+    path.write_text(
+        "".join(json.dumps(_rec("2026-01-02", s, v)) + "\n" for s, v in [("2", 7), ("1", 6)]),
+        encoding="utf-8",
+    )
+    rows = list(log_index.iter_matching_records(path, "platform_song_ids", ["1"]))
+    assert [r["res_listeners"] for r in rows] == [6]
+
+    (tmp_path / "empty_GENIE.jsonl").touch()
+    df = io.load_song_jsonl(tmp_path, "2")
+    assert df["res_listeners"].tolist() == [7]
+
+    spec = query.QuerySpec(where=query.parse_where(["track_cd=T1"]))
+    assert [r["res_listeners"] for r in query.scan(tmp_path, spec, extra_columns=["res_listeners"])] == [6]
@@ -0,0 +1,72 @@
+import gzip
+import json
+
+from chart_maker import io, query
+from music_metrics_collector import logstore
+from music_metrics_collector.analyze_logs import _iter_records
+
+
+def _rec(day, song_id, listeners, error=None):
+    rec = {"req_date": day, "platform_song_ids": song_id, "res_listeners": listeners}
+    if error:
+        rec["error"] = error
+    return rec
+
+
+def test_dedupe_keeps_last_success():
+    lines = [
+        json.dumps(_rec("2026-01-01", "1", 10)),
+        json.dumps(_rec("2026-01-01", "2", None, error="timeout")),
+        json.dumps(_rec("2026-01-01", "1", 12)),
+        json.dumps(_rec("2026-01-01", "1", None, error="timeout")),
+        json.dumps({"date": "2026-01-01", "hour": 3}),
+    ]
+    kept, dropped = logstore.dedupe_lines(lines)
+    assert dropped == 2
+    assert [json.loads(line) for line in kept] == [
+        _rec("2026-01-01", "2", None, error="timeout"),
+        _rec("2026-01-01", "1", 12),
+        {"date": "2026-01-01", "hour": 3},
+    ]
+
+
+def test_compact_daily_then_monthly_reads_transparently(tmp_path):
+    for day, values in [("2026-01-01", [10, 11]), ("2026-01-02", [20]), ("2026-01-03", [30])]:
+        for v in values:
+            logstore.append_record(tmp_path / f"{day}_GENIE.jsonl", _rec(day, "1", v))
+
+    stats = logstore.compact_logs(tmp_path, before="2026-01-03")
+    assert (stats.files, stats.records_in, stats.records_out) == (2, 3, 2)
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "2026-01-01_GENIE.jsonl.gz",
+        "2026-01-02_GENIE.jsonl.gz",
+        "2026-01-03_GENIE.jsonl",
+        "2026-01-03_GENIE.jsonl.idx",
+    ]
+    # 다시 실행해도 이미 압축된 일자는 그대로 둔다.
+    assert logstore.compact_logs(tmp_path, before="2026-01-03").files == 0
+
+    logstore.compact_logs(tmp_path, before="2026-01-04", monthly=True)
+    archive = tmp_path / "2026-01_GENIE.jsonl.gz"
+    assert [p.name for p in tmp_path.iterdir()] == [archive.name]
+    with gzip.open(archive, "rt", encoding="utf-8") as f:
+        assert [json.loads(line)["res_listeners"] for line in f] == [11, 20, 30]
+
+    assert io.load_jsonl(tmp_path)["res_listeners"].tolist() == [11, 20, 30]
+    assert io.load_song_jsonl(tmp_path, "1")["req_date"].tolist() == ["2026-01-01", "2026-01-02", "2026-01-03"]
+    spec = query.QuerySpec(since="2026-01-02", where=query.parse_where(["platform_song_ids=1"]))
+    assert [r["res_listeners"] for r in query.scan(tmp_path, spec, extra_columns=["res_listeners"])] == [20, 30]
+
+
+def test_compact_date_dir_layout(tmp_path):
+    day_dir = tmp_path / "2026-01-01"
+    day_dir.mkdir()
+    (day_dir / "GENIE.jsonl").write_text(
+        "".join(json.dumps({"platform": "GENIE", "song_id": "1", "date": "2026-01-01", "total_plays": v}) + "\n"
+                for v in [1, 2]),
+        encoding="utf-8",
+    )
+    logstore.compact_logs(tmp_path, before="2026-02-01", monthly=True)
+
+    assert [p.relative_to(tmp_path).as_posix() for p in tmp_path.rglob("*")] == ["2026-01", "2026-01/GENIE.jsonl.gz"]
+    assert [r["total_plays"] for r in _iter_records(tmp_path)] == [1, 2]
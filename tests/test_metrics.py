@@ -1,6 +1,6 @@
 import pandas as pd
 
-from chart_maker.metrics import add_metrics
+from chart_maker.metrics import DerivedWindow, add_metrics
 
 
 def test_add_metrics_basic():
@@ -29,3 +29,28 @@ def test_add_metrics_basic():
     assert num_anomalies == 0
 
 
+
+
+def test_add_metrics_song_boundaries_and_windows():
+    ts = pd.to_datetime(["2025-12-17 10:00", "2025-12-18 10:00", "2025-12-19 10:00"])
+    df = pd.DataFrame(
+        {
+            # 정렬되지 않은 입력, 곡 경계를 넘는 diff가 생기면 안 된다.
+            "platform": ["GENIE"] * 6,
+            "song_id": ["2", "1", "2", "1", "2", "1"],
+            "timestamp": [ts[0], ts[2], ts[1], ts[0], ts[2], ts[1]],
+            "total_plays": [10, 300, 20, 100, 40, 150],
+            "total_listeners": [1, 30, 2, 10, 4, 15],
+        }
+    )
+
+    df_metrics, _ = add_metrics(df, windows=[DerivedWindow("total_plays", "delta", 2)])
+    song1 = df_metrics[df_metrics["song_id"] == "1"]
+    song2 = df_metrics[df_metrics["song_id"] == "2"]
+
+    assert song1["delta_plays"].isna().tolist() == [True, False, False]
+    assert song1["delta_plays"].tolist()[1:] == [50.0, 150.0]
+    assert song2["delta2_total_plays"].tolist()[2] == 30.0
+    assert song2["delta2_total_plays"].isna().sum() == 2
+    assert df_metrics["rate_plays_per_min"].dtype == "float64"
+    assert "delta_plays" not in df.columns
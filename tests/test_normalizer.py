@@ -1,7 +1,8 @@
 """Tests for number normalization."""
 
 import unittest
-from music_metrics_collector.normalizer import normalize_number, extract_number_from_text
+from music_metrics_collector.normalizer import normalize_number, normalize_numbers, extract_number_from_text
+from music_metrics_collector.timing import TIMINGS
 
 
 class TestNormalizer(unittest.TestCase):
@@ -20,6 +21,21 @@ class TestNormalizer(unittest.TestCase):
         self.assertEqual(normalize_number("100만"), 1000000)
         self.assertEqual(normalize_number("12만"), 120000)
     
+    def test_normalize_korean_eok_and_compound(self):
+        """Test Korean '억' (100,000,000) and compound Korean notation."""
+        self.assertEqual(normalize_number("1.5억"), 150000000)
+        self.assertEqual(normalize_number("1억 2,345만"), 123450000)
+        self.assertEqual(normalize_number("1억 5천만"), 150000000)
+        self.assertEqual(normalize_number("12만 3456회"), 123456)
+        self.assertEqual(normalize_number("3위 12만"), 120000)
+
+    def test_trailing_number_must_be_below_preceding_unit(self):
+        """A trailing plain number is added only when it is an integer below the preceding unit."""
+        self.assertEqual(normalize_number("1만 20000회"), 10000)
+        self.assertEqual(normalize_number("12만 2024.01.01"), 120000)
+        self.assertEqual(normalize_number("1억 5천만 9999"), 150009999)
+        self.assertEqual(normalize_number("5천 1000"), 5000)
+    
     def test_normalize_million(self):
         """Test normalization of 'M' (million)."""
         self.assertEqual(normalize_number("1.2M"), 1200000)
@@ -44,6 +60,31 @@ class TestNormalizer(unittest.TestCase):
         self.assertIsNone(normalize_number("abc"))
         self.assertIsNone(normalize_number("no numbers here"))
     
+    def test_unit_letter_inside_word_is_ignored(self):
+        """Test that K/M followed by letters is not treated as a unit."""
+        self.assertEqual(normalize_number("1234 mins"), 1234)
+        self.assertEqual(normalize_number("1.2M plays"), 1200000)
+    
+    def test_normalize_numbers_batch(self):
+        """Test batch normalization keeps order and matches single calls."""
+        texts = ["1,234", None, "12.3만", "", "1.2M", "abc", "1,234", "2억"]
+        self.assertEqual(normalize_numbers(texts), [normalize_number(t) for t in texts])
+        self.assertEqual(normalize_numbers(iter(["1K", "1K"])), [1000, 1000])
+        plain = ["1,234,567", "0", "12", "1,2", "１２"]
+        self.assertEqual(normalize_numbers(plain), [normalize_number(t) for t in plain])
+
+    def test_normalize_timing_is_per_batch(self):
+        """Test the normalize stage is observed once per batch, not per value."""
+        def count():
+            hist = TIMINGS.histograms.get("normalize")
+            return hist.count if hist is not None else 0
+
+        before = count()
+        extract_number_from_text("1,234")
+        self.assertEqual(count(), before)
+        normalize_numbers(["1,234", "12만", "1.2M"])
+        self.assertEqual(count(), before + 1)
+    
     def test_extract_number_from_text(self):
         """Test extracting numbers from text."""
         self.assertEqual(extract_number_from_text("재생수: 1,234,567"), 1234567)
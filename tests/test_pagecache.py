@@ -0,0 +1,48 @@
+import json
+
+import pytest
+
+from benchmarks import genie_server
+from music_metrics_collector import main
+from music_metrics_collector.timing import TIMINGS
+
+
+def _collect(tmp_path, base_url, ids):
+    config = {
+        "enabled_platforms": ["GENIE"],
+        "mode": "requests",
+        "http": {"base_url": base_url},
+        "log": {"base_dir": str(tmp_path / "logs")},
+        "state": {"dir": str(tmp_path / "state")},
+    }
+    targets = [{"platform": "GENIE", "song_id": genie_server.song_id(i), "song_data": {}} for i in ids]
+    return main.collect_metrics(config, targets=targets)
+
+
+@pytest.mark.parametrize("etag", [True, False])
+def test_unchanged_pages_reuse_previous_metrics(tmp_path, monkeypatch, etag):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    # 0~499번은 값이 변하지 않는 곡, 500번 이후는 요청마다 값이 바뀌는 곡
+    app = genie_server.GenieStandIn(catalog_size=1000, static_rate=0.5, etag=etag)
+    server = genie_server.GenieServer(app=app)
+    server.start_background()
+    try:
+        first = _collect(tmp_path, server.base_url, [1, 2, 900])
+        connects = TIMINGS.histograms["http_connect"].count if "http_connect" in TIMINGS.histograms else 0
+        app.started -= 10  # 변하는 곡의 값이 확실히 바뀌도록 시간을 민다
+        second = _collect(tmp_path, server.base_url, [1, 2, 900])
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert first["page_cache"] == {"not_modified": 0, "reused": 0, "parsed": 3}
+    if etag:
+        assert second["page_cache"] == {"not_modified": 2, "reused": 0, "parsed": 1}
+        # 304 응답 뒤에도 연결을 재사용한다.
+        assert TIMINGS.histograms["http_connect"].count == connects + 1
+    else:
+        assert second["page_cache"] == {"not_modified": 0, "reused": 2, "parsed": 1}
+
+    records = [json.loads(line) for line in next((tmp_path / "logs").glob("*.jsonl")).read_text().splitlines()]
+    assert [r["res_listeners"] for r in records[3:5]] == [r["res_listeners"] for r in records[0:2]]
+    assert records[5]["res_listeners"] > records[2]["res_listeners"]
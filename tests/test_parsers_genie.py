@@ -1,6 +1,7 @@
 """Tests for GENIE parser."""
 
 import unittest
+from benchmarks.genie_server import SONG_INFO_TEMPLATE
 from music_metrics_collector.collectors.genie import GenieCollector
 from music_metrics_collector.fetcher import Fetcher
 from music_metrics_collector.models import TrackInfo
@@ -61,6 +62,29 @@ class TestGenieParser(unittest.TestCase):
         result = self.collector.parse_metrics(html)
         self.assertIsNotNone(result)
     
+    def test_metrics_fragment_keeps_only_metric_blocks(self):
+        """Fragment holds the metric blocks and parses to the same metrics as the page."""
+        def page(song_name, plays):
+            return SONG_INFO_TEMPLATE.format(
+                request_time="1.0", song_name=song_name, artist_name="가수", album_name="앨범",
+                artist_id=1, album_id=2, total_plays=plays, total_listeners=plays // 3,
+            )
+
+        html = page("노래000001", 1234567)
+        fragment = self.collector.metrics_fragment(html)
+        self.assertIn('class="daily-chart"', fragment)
+        self.assertNotIn("노래000001", fragment)
+        self.assertEqual(fragment.count('class="song-info"'), 2)
+        self.assertEqual(self.collector.parse_metrics(fragment), self.collector.parse_metrics(html))
+        # 메트릭 밖의 영역만 바뀌면 구간은 그대로다.
+        self.assertEqual(self.collector.metrics_fragment(page("다른 제목", 1234567)), fragment)
+        self.assertNotEqual(self.collector.metrics_fragment(page("노래000001", 1234568)), fragment)
+
+    def test_metrics_fragment_falls_back_to_whole_page(self):
+        """Without metric blocks the whole page (minus scripts) is used."""
+        html = "<html><body><script>x()</script><div>재생수: 12.3만</div></body></html>"
+        self.assertEqual(self.collector.metrics_fragment(html), "<html><body><div>재생수: 12.3만</div></body></html>")
+
     def tearDown(self):
         """Clean up."""
         self.fetcher.close()
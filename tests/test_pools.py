@@ -0,0 +1,189 @@
+import json
+import threading
+import time
+from importlib.metadata import EntryPoint
+
+from music_metrics_collector import budget, factory, fetcher, main
+from music_metrics_collector.models import MetricsResult
+from music_metrics_collector.pools import RateLimiter
+
+_finished = []
+_created = []
+_lock = threading.Lock()
+
+
+class _FakeCollector:
+    PLATFORM = ""
+    SUPPORTED_METRICS = ["total_listeners"]
+    DELAY = 0.0
+
+    def __init__(self, fetcher):
+        with _lock:
+            _created.append(self.PLATFORM)
+
+    def collect(self, track_info, **kwargs):
+        time.sleep(self.DELAY)
+        with _lock:
+            _finished.append(track_info.platform)
+        return MetricsResult(total_listeners=int(track_info.song_id)), None, None, None
+
+
+class FastCollector(_FakeCollector):
+    PLATFORM = "FAST"
+
+
+class SlowCollector(_FakeCollector):
+    PLATFORM = "SLOW"
+    DELAY = 0.2
+
+
+class PacedCollector(_FakeCollector):
+    PLATFORM = "FAST"
+    DELAY = 0.05
+
+
+class BrowserOnlyCollector(_FakeCollector):
+    """requests로 받은 페이지에서는 메트릭을 찾지 못하는 Collector (playwright 폴백 확인용)."""
+
+    PLATFORM = "FAST"
+
+    def __init__(self, fetcher):
+        super().__init__(fetcher)
+        self.mode = fetcher.mode
+
+    def collect(self, track_info, **kwargs):
+        if self.mode != "playwright":
+            return MetricsResult(), None, None, None
+        return super().collect(track_info, **kwargs)
+
+
+class BrokenCollector(_FakeCollector):
+    PLATFORM = "SLOW"
+
+    def __init__(self, fetcher):
+        raise RuntimeError("selector config missing")
+
+
+def _config(tmp_path, mode="requests"):
+    return {
+        "enabled_platforms": ["FAST", "SLOW"],
+        "mode": mode,
+        "log": {"base_dir": str(tmp_path / "logs")},
+        "state": {"dir": str(tmp_path / "state")},
+        "http": {"page_cache": False},
+        "collect": {"default_latency_sec": 0.05},
+    }
+
+
+def test_slow_platform_does_not_block_others(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setattr(factory.CollectorFactory, "_collectors", {"FAST": FastCollector, "SLOW": SlowCollector})
+    _finished.clear()
+    _created.clear()
+    config = _config(tmp_path)
+    # 느린 플랫폼 곡을 먼저 넣어도 빠른 플랫폼은 기다리지 않는다.
+    targets = [{"platform": "SLOW", "song_id": str(i), "song_data": {}} for i in range(2)]
+    targets += [{"platform": "FAST", "song_id": str(i), "song_data": {}} for i in range(5)]
+    stats = main.collect_metrics(config, targets=targets)
+
+    assert stats["success"] == 7
+    assert _finished[:5] == ["FAST"] * 5
+    # Collector는 플랫폼마다 한 번만 만든다.
+    assert sorted(_created) == ["FAST", "SLOW"]
+    # 같은 플랫폼 안에서는 제출한 순서대로 기록한다.
+    lines = next((tmp_path / "logs").glob("*_FAST.jsonl")).read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["res_listeners"] for line in lines] == [0, 1, 2, 3, 4]
+
+
+def test_time_budget_defers_per_platform(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setattr(factory.CollectorFactory, "_collectors", {"FAST": PacedCollector, "SLOW": SlowCollector})
+    config = _config(tmp_path)
+    # SLOW 곡은 예산(1초)보다 오래 걸린다고 알려져 있어 시작하지 않는다.
+    latency_path = budget.state_paths(config)["latency"]
+    latency_path.parent.mkdir(parents=True)
+    latency_path.write_text(json.dumps({"SLOW:0": 10.0, "SLOW:1": 10.0}))
+
+    targets = [{"platform": "SLOW", "song_id": str(i), "song_data": {}} for i in range(2)]
+    targets += [{"platform": "FAST", "song_id": str(i), "song_data": {}} for i in range(4)]
+    stats = main.collect_metrics(config, targets=targets, time_budget_sec=1.0)
+
+    assert sorted(stats["deferred"]) == ["SLOW:0", "SLOW:1"]
+    assert stats["collected"] == ["FAST:0", "FAST:1", "FAST:2", "FAST:3"]
+
+
+def test_playwright_fallback_collector_is_reused_per_worker(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setattr(factory.CollectorFactory, "_collectors", {"FAST": BrowserOnlyCollector})
+    _created.clear()
+    targets = [{"platform": "FAST", "song_id": str(i), "song_data": {}} for i in range(3)]
+    stats = main.collect_metrics(_config(tmp_path, mode="auto"), targets=targets)
+
+    assert stats["success"] == 3
+    # requests용 Collector 하나와 폴백 Collector 하나만 만든다.
+    assert _created == ["FAST", "FAST"]
+    lines = next((tmp_path / "logs").glob("*_FAST.jsonl")).read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["res_listeners"] for line in lines] == [0, 1, 2]
+
+
+def test_fetchers_are_closed_on_the_thread_that_created_them(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setattr(factory.CollectorFactory, "_collectors", {"FAST": FastCollector, "SLOW": SlowCollector})
+    opened, closed = {}, {}
+    init = fetcher.Fetcher.__init__
+
+    def record_init(self, *args, **kwargs):
+        init(self, *args, **kwargs)
+        with _lock:
+            opened[id(self)] = threading.current_thread().name
+
+    def record_close(self):
+        with _lock:
+            closed[id(self)] = threading.current_thread().name
+
+    monkeypatch.setattr(fetcher.Fetcher, "__init__", record_init)
+    monkeypatch.setattr(fetcher.Fetcher, "close", record_close)
+    config = _config(tmp_path)
+    config["platforms"] = {"FAST": {"concurrency": 3}}
+    targets = [{"platform": p, "song_id": str(i), "song_data": {}} for p in ("FAST", "SLOW") for i in range(4)]
+    assert main.collect_metrics(config, targets=targets)["success"] == 8
+
+    assert opened and closed == opened
+    assert all(name.startswith("collect-") for name in closed.values())
+
+
+def test_collector_constructor_error_fails_only_its_tracks(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setattr(factory.CollectorFactory, "_collectors", {"FAST": FastCollector, "SLOW": BrokenCollector})
+    targets = [{"platform": p, "song_id": str(i), "song_data": {}} for p in ("SLOW", "FAST") for i in range(2)]
+    stats = main.collect_metrics(_config(tmp_path), targets=targets)
+
+    assert (stats["success"], stats["failed"]) == (2, 2)
+    lines = next((tmp_path / "logs").glob("*_SLOW.jsonl")).read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 2 and "selector config missing" in lines[0]
+
+
+def test_plugin_collectors_are_discovered_lazily(monkeypatch):
+    discovered = [EntryPoint(name="fast", value="tests.test_pools:FastCollector", group=factory.ENTRY_POINT_GROUP)]
+    monkeypatch.setattr(factory, "entry_points", lambda group: discovered)
+    monkeypatch.setattr(factory.CollectorFactory, "_collectors", {})
+    monkeypatch.setattr(factory.CollectorFactory, "_entry_points", None)
+
+    assert factory.CollectorFactory.get_supported_platforms() == ["FAST", "GENIE"]
+    assert factory.CollectorFactory._collectors == {}  # 발견만 하고 아직 import하지 않았다.
+    assert factory.CollectorFactory.get_class("fast") is FastCollector
+    assert factory.CollectorFactory.is_supported("genie") and not factory.CollectorFactory.is_supported("MELON")
+
+
+def test_rate_limiter_spaces_starts():
+    now = [0.0]
+    slept = []
+
+    def sleep(seconds):
+        slept.append(seconds)
+        now[0] += seconds
+
+    limiter = RateLimiter(4.0, clock=lambda: now[0], sleep=sleep)
+    for _ in range(3):
+        limiter.wait()
+    assert slept == [0.25, 0.25]
@@ -0,0 +1,34 @@
+import json
+
+from music_metrics_collector.profiling import Profiler
+from music_metrics_collector.timing import StageTimings
+
+
+def _busy():
+    return sum(i * i for i in range(20_000))
+
+
+def test_profiler_writes_flamegraph_and_summary(tmp_path):
+    profiler = Profiler(tmp_path, top_n=5, sample_interval=0.001).start()
+    timings = StageTimings()
+    timings.phase_hook = profiler.stage_hook
+    try:
+        for _ in range(3):
+            with timings.stage("fetch"):
+                _busy()
+            with timings.stage("http_ttfb"):
+                pass
+        with profiler.phase("render"):
+            _busy()
+    finally:
+        summary = profiler.stop()
+
+    phases = {row["phase"]: row for row in json.loads((tmp_path / "phases.json").read_text())}
+    # 수집기 계측 단계 중 프로파일 단계만 받는다.
+    assert set(phases) == {"fetch", "render"}
+    assert phases["fetch"]["calls"] == 3 and phases["fetch"]["peak_mb"] is not None
+    assert (tmp_path / "profile.pstats").stat().st_size > 0
+    assert any("_busy" in line for line in (tmp_path / "stacks.folded").read_text().splitlines())
+    text = summary.read_text()
+    assert "Top 5 functions by cumulative time" in text
+    assert "Live allocations at the end of 'fetch'" in text
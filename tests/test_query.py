@@ -0,0 +1,110 @@
+import json
+
+from chart_maker import query
+
+
+def _write_day(root, day, records, platform="GENIE"):
+    path = root / f"{day}_{platform}.jsonl"
+    with path.open("w", encoding="utf-8") as f:
+        for rec in records:
+            f.write(json.dumps({"req_date": day, **rec}, ensure_ascii=False) + "\n")
+    return path
+
+
+def _rec(song_id, listeners, mem_cd="L1", isrc="ISRC" + "0"):
+    return {
+        "platform_song_ids": song_id,
+        "song_name_kor": f"곡{song_id}",
+        "mem_cd": mem_cd,
+        "isrc_cd": isrc,
+        "res_listeners": listeners,
+    }
+
+
+def test_scan_prunes_by_filename_and_index(tmp_path):
+    _write_day(tmp_path, "2026-01-01", [_rec("1", 10), _rec("2", 5, mem_cd="L2")])
+    _write_day(tmp_path, "2026-01-02", [_rec("1", 15), _rec("2", 9, mem_cd="L2")])
+    _write_day(tmp_path, "2026-01-03", [_rec("3", 1, mem_cd="L3")])
+
+    spec = query.QuerySpec(since="2026-01-02", where=query.parse_where(["mem_cd=L2"]))
+    index = query.StatsIndex(tmp_path / query.INDEX_FILENAME)
+    rows = list(query.scan(tmp_path, spec, index))
+
+    assert [(r["req_date"], r["platform_song_ids"]) for r in rows] == [("2026-01-02", "2")]
+    # 01-01은 파일명으로 제외되고, 나머지는 읽으면서 모은 통계가 인덱스로 저장된다.
+    assert (tmp_path / query.INDEX_FILENAME).exists()
+    assert query.StatsIndex(tmp_path / query.INDEX_FILENAME).peek(tmp_path / "2026-01-03_GENIE.jsonl")
+
+
+def test_read_only_index_uses_cached_stats_without_computing(tmp_path, monkeypatch):
+    _write_day(tmp_path, "2026-01-01", [_rec("1", 10)])
+    _write_day(tmp_path, "2026-01-02", [_rec("2", 5, mem_cd="L2")])
+    spec = query.QuerySpec(where=query.parse_where(["mem_cd=L2"]))
+
+    def fail(path):
+        raise AssertionError(f"computed stats for {path}")
+
+    monkeypatch.setattr(query, "compute_file_stats", fail)
+    # 쓸 수 없는 인덱스: 통계를 계산하지 않고 모든 파일을 한 번씩만 읽는다.
+    rows = list(query.scan(tmp_path, spec, query.StatsIndex(tmp_path / query.INDEX_FILENAME, read_only=True)))
+    assert [r["platform_song_ids"] for r in rows] == ["2"]
+    assert not (tmp_path / query.INDEX_FILENAME).exists()
+    monkeypatch.undo()
+
+    # 이미 저장된 인덱스는 읽기 전용이어도 가지치기에 쓴다.
+    list(query.scan(tmp_path, spec, query.StatsIndex(tmp_path / query.INDEX_FILENAME)))
+    index = query.StatsIndex(tmp_path / query.INDEX_FILENAME, read_only=True)
+    assert index.peek(tmp_path / "2026-01-01_GENIE.jsonl") is not None
+
+
+def test_cold_index_reads_each_file_once(tmp_path, monkeypatch):
+    for day, mem_cd in (("2026-01-01", "L1"), ("2026-01-02", "L2"), ("2026-01-03", "L3")):
+        _write_day(tmp_path, day, [_rec("1", 10, mem_cd=mem_cd)])
+    opened = []
+    open_log = query.open_log
+
+    def counting_open(path):
+        opened.append(path.name)
+        return open_log(path)
+
+    monkeypatch.setattr(query, "open_log", counting_open)
+    spec = query.QuerySpec(where=query.parse_where(["mem_cd=L2"]))
+    rows = list(query.scan(tmp_path, spec, query.StatsIndex(tmp_path / query.INDEX_FILENAME)))
+    assert [r["req_date"] for r in rows] == ["2026-01-02"]
+    assert sorted(opened) == ["2026-01-01_GENIE.jsonl", "2026-01-02_GENIE.jsonl", "2026-01-03_GENIE.jsonl"]
+
+    # 다음 질의는 저장된 통계로 해당 파일만 연다.
+    opened.clear()
+    list(query.scan(tmp_path, spec, query.StatsIndex(tmp_path / query.INDEX_FILENAME)))
+    assert opened == ["2026-01-02_GENIE.jsonl"]
+
+
+def test_numeric_predicate_and_top_growth(tmp_path):
+    _write_day(tmp_path, "2026-01-01", [_rec("1", 10), _rec("2", 5)])
+    _write_day(tmp_path, "2026-01-02", [_rec("1", 15), _rec("2", 50), _rec("3", None)])
+
+    spec = query.QuerySpec(where=query.parse_where(["res_listeners=15"]))
+    assert [r["platform_song_ids"] for r in query.scan(tmp_path, spec)] == ["1"]
+
+    records = query.scan(tmp_path, query.QuerySpec(), extra_columns=("mem_cd", "isrc_cd"))
+    top = query.top_growth(records, "res_listeners", limit=1)
+    assert [(r["platform_song_ids"], r["growth"]) for r in top] == [("2", 45.0)]
+
+
+def test_top_growth_separates_platforms_with_the_same_song_id(tmp_path):
+    _write_day(tmp_path, "2026-01-01", [_rec("1", 10)])
+    _write_day(tmp_path, "2026-01-02", [_rec("1", 20)])
+    _write_day(tmp_path, "2026-01-01", [_rec("1", 100)], platform="MELON")
+    _write_day(tmp_path, "2026-01-02", [_rec("1", 130)], platform="MELON")
+
+    records = query.scan(tmp_path, query.QuerySpec(), extra_columns=("platform",))
+    top = query.top_growth(records, "res_listeners", limit=5)
+    assert [(r["platform"], r["platform_song_ids"], r["growth"]) for r in top] == [
+        ("MELON", "1", 30.0),
+        ("GENIE", "1", 10.0),
+    ]
+
+
+def test_resolve_period_last_days(tmp_path):
+    _write_day(tmp_path, "2026-01-10", [_rec("1", 1)])
+    assert query.resolve_period(tmp_path, None, None, 7) == ("2026-01-04", "2026-01-10")
@@ -0,0 +1,71 @@
+import json
+
+import pytest
+
+from music_metrics_collector import logstore
+from music_metrics_collector.models import MetricsResult
+from music_metrics_collector.records import RATE_FIELDS, SONG_FIELDS, RecordTemplate
+
+SONG_DATA = {
+    "platform_seq": "1",
+    "song_name_kor": "밤편지 \"Live\"",
+    "track_cd": "T0001\tX",
+    "isrc_cd": "KRA381700123",
+    "interest_yn": "y",
+    "platform_song_ids": '{"GENIE": "89001234"}',
+}
+
+
+def _dict_record(platform, song_id, song_data, req_date, metrics=None, error=None):
+    """레코드 틀을 쓰기 전 collect_metrics가 만들던 딕셔너리와 같은 순서/값."""
+    record = {name: song_data.get(name, default) for name, default in SONG_FIELDS}
+    record["platform_song_ids"] = song_id
+    listeners = metrics.total_listeners if metrics is not None else None
+    record["req_date"] = req_date
+    record["res_listeners"] = listeners
+    record["res_listeners_ko"] = listeners if platform == "GENIE" else None
+    for name in ("jp", "cn", "us", "eu", "ea", "etc"):
+        record[f"res_listeners_{name}"] = None
+    for key, attr in RATE_FIELDS:
+        record[key] = getattr(metrics, attr) if metrics is not None else None
+    record["etc0"] = None
+    record["etc1"] = None
+    if metrics is None:
+        record["error"] = error
+    return json.dumps(record, ensure_ascii=False)
+
+
+@pytest.mark.parametrize("platform", ["GENIE", "MELON"])
+def test_template_lines_match_dict_serialization(platform):
+    template = RecordTemplate(platform, "89001234", SONG_DATA)
+    metrics = MetricsResult(total_plays=10, total_listeners=12345, sex_m_rate=41.5, age_20_rate=30.0)
+
+    assert template.success_line("2026-01-02", metrics) == _dict_record(
+        platform, "89001234", SONG_DATA, "2026-01-02", metrics
+    )
+    assert template.success_line("2026-01-02", MetricsResult()) == _dict_record(
+        platform, "89001234", SONG_DATA, "2026-01-02", MetricsResult()
+    )
+    assert template.failure_line("2026-01-02", 'HTTP 503 "busy"') == _dict_record(
+        platform, "89001234", SONG_DATA, "2026-01-02", error='HTTP 503 "busy"'
+    )
+
+
+def test_append_line_writes_sidecar_index(tmp_path):
+    path = tmp_path / "2026-01-02_GENIE.jsonl"
+    template = RecordTemplate("GENIE", "89001234", SONG_DATA)
+    logstore.append_line(path, template.success_line("2026-01-02", MetricsResult(total_listeners=7)), template.index_values)
+    logstore.append_line(path, template.failure_line("2026-01-02", "timeout"), template.index_values)
+
+    expected = path.with_name(path.name + ".idx").read_text(encoding="utf-8")
+    assert logstore.rebuild_index(path) == 2
+    assert path.with_name(path.name + ".idx").read_text(encoding="utf-8") == expected
+    assert expected.splitlines()[0].split("\t")[2:] == ["89001234", "T0001 X", "KRA381700123"]
+
+
+def test_template_is_reused_until_song_data_changes():
+    first = RecordTemplate.for_track("GENIE", "1", SONG_DATA)
+    assert RecordTemplate.for_track("GENIE", "1", dict(SONG_DATA)) is first
+    changed = RecordTemplate.for_track("GENIE", "1", {**SONG_DATA, "mem_name": "새 기획사"})
+    assert changed is not first
+    assert '"mem_name": "새 기획사"' in changed.prefix
@@ -0,0 +1,21 @@
+import pandas as pd
+
+from chart_maker.report import generate_song_report_html, plotly_asset_name
+
+
+def test_shared_report_references_asset(tmp_path):
+    series = {
+        "timestamp": pd.to_datetime(["2025-12-17 10:00", "2025-12-17 11:00"]).to_numpy(),
+        "total_plays": [100.0, 120.0],
+        "total_listeners": [50.0, None],
+        "delta_plays": [None, 20.0],
+        "delta_listeners": [None, None],
+    }
+    out_path = tmp_path / "GENIE_1_report.html"
+
+    generate_song_report_html(series, pd.Series({"song_id": "1"}), out_path, html_mode="shared")
+
+    page = out_path.read_text(encoding="utf-8")
+    assert f'<script src="{plotly_asset_name()}"></script>' in page
+    assert "2025-12-17T11:00:00" in page
+    assert len(page) < 10_000
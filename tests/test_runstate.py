@@ -0,0 +1,63 @@
+import subprocess
+import sys
+import textwrap
+
+import pytest
+
+from music_metrics_collector.runstate import COMPLETED, FAILED, SKIPPED, RunLock, RunManager
+from music_metrics_collector.scheduler import Scheduler
+
+
+def test_run_records_history_and_skips_overlap(tmp_path):
+    manager = RunManager(tmp_path)
+    stats = {"total": 4, "success": 3, "failed": 1, "skipped": 0}
+
+    def nested():
+        # 실행 중에 다시 들어온 수집은 실행되지 않고 skipped로 기록된다.
+        inner = manager.run(lambda: pytest.fail("겹친 수집이 실행됨"), trigger="schedule")
+        assert inner.status == SKIPPED and manager.lock.holder() is not None
+        return stats
+
+    record = manager.run(nested)
+    assert (record.status, record.success, record.success_rate) == (COMPLETED, 3, 0.75)
+    assert record.throughput > 0
+
+    with pytest.raises(RuntimeError):
+        manager.run(lambda: (_ for _ in ()).throw(RuntimeError("boom")))
+
+    history = manager.history.load()
+    assert [r["status"] for r in history] == [SKIPPED, COMPLETED, FAILED]
+    assert "boom" in history[-1]["reason"]
+    summary = manager.history.summary()
+    assert summary["status_counts"] == {SKIPPED: 1, COMPLETED: 1, FAILED: 1}
+    assert manager.lock.holder() is None
+
+
+def test_lock_is_exclusive_across_processes(tmp_path):
+    script = textwrap.dedent(
+        f"""
+        import sys, time
+        from pathlib import Path
+        from music_metrics_collector.runstate import RunManager
+        manager = RunManager(Path({str(tmp_path)!r}))
+        def job():
+            print("locked", flush=True)
+            sys.stdin.readline()
+            return {{}}
+        manager.run(job)
+        """
+    )
+    proc = subprocess.Popen([sys.executable, "-c", script], stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+    try:
+        assert proc.stdout.readline().strip() == "locked"
+        record = RunManager(tmp_path).run(lambda: pytest.fail("다른 프로세스와 동시에 실행됨"))
+        assert record.status == SKIPPED and str(proc.pid) in record.reason
+    finally:
+        proc.communicate("\n", timeout=30)
+    assert RunLock(tmp_path / "collect.lock").holder() is None
+
+
+def test_scheduler_job_is_single_instance_and_coalesced(tmp_path):
+    config = {"schedule": {"enabled": True, "cron": "0 * * * *"}, "state": {"dir": str(tmp_path)}}
+    job = Scheduler(config).scheduler.get_job("collect_metrics")
+    assert (job.max_instances, job.coalesce, job.misfire_grace_time) == (1, True, 300)
@@ -0,0 +1,27 @@
+import numpy as np
+import pandas as pd
+
+from chart_maker.series_index import SongIndex
+
+
+def test_song_index_unsorted_input():
+    df = pd.DataFrame(
+        {
+            "platform": ["GENIE", "GENIE", "GENIE", "GENIE"],
+            "song_id": ["2", "1", "2", "1"],
+            "timestamp": pd.to_datetime(
+                ["2025-12-17 10:00", "2025-12-17 11:00", "2025-12-17 09:00", "2025-12-17 10:00"]
+            ),
+            "delta_plays": [5.0, 2.0, np.nan, np.nan],
+        }
+    )
+
+    index = SongIndex.build(df)
+    assert list(index.keys()) == [("GENIE", "1"), ("GENIE", "2")]
+
+    i = index.position("GENIE", "2")
+    arrays = index.arrays(i, ["timestamp", "delta_plays"])
+    assert list(arrays["timestamp"]) == sorted(arrays["timestamp"])
+    assert np.isnan(arrays["delta_plays"][0])
+
+    assert list(index.tail_mean("delta_plays", 3)) == [2.0, 5.0]
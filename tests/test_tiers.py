@@ -0,0 +1,64 @@
+from datetime import date, datetime, timedelta
+
+import pytz
+
+from music_metrics_collector import logstore
+from music_metrics_collector.tiers import (
+    DAILY,
+    HOURLY,
+    WEEKLY,
+    TierPlanner,
+    TierPolicy,
+    parse_release_date,
+)
+
+
+def test_parse_release_date_formats():
+    assert parse_release_date("2026-01-05") == date(2026, 1, 5)
+    assert parse_release_date("20260105") == date(2026, 1, 5)
+    assert parse_release_date("2026.1.5") == date(2026, 1, 5)
+    # song_data.csv의 엑셀 일련번호 (소수부는 시각)
+    assert parse_release_date("45040.75") == date(2023, 4, 24)
+    assert parse_release_date("") is None
+    assert parse_release_date("미정") is None
+
+
+def _target(song_id, **song_data):
+    return {"platform": "GENIE", "song_id": song_id, "song_data": {"interest_yn": "N", **song_data}}
+
+
+def test_planner_assigns_tiers_and_selects_due(tmp_path):
+    log_dir = tmp_path / "logs"
+    log_dir.mkdir()
+    today = date(2026, 3, 20)
+    for offset, values in [(10, {"hot": 100, "cold": 5000, "flat": 10}), (0, {"hot": 200, "cold": 5001, "flat": 10})]:
+        day = (today - timedelta(days=offset)).isoformat()
+        for song_id, listeners in values.items():
+            logstore.append_record(
+                log_dir / f"{day}_GENIE.jsonl",
+                {"req_date": day, "platform_song_ids": song_id, "res_listeners": listeners},
+            )
+
+    targets = [
+        _target("fav", interest_yn="Y"),
+        _target("new", song_release_date="2026-03-01"),
+        _target("hot"),
+        _target("cold"),
+        _target("flat", new_date="2025-01-01"),
+        _target("unseen"),
+    ]
+    planner = TierPlanner(TierPolicy(), tmp_path / "tier_state.json", log_dir)
+    now = pytz.timezone("Asia/Seoul").localize(datetime(2026, 3, 20, 12, 0))
+    tiers = {key.split(":")[1]: tier for key, (tier, _) in planner.assign(targets, now).items()}
+    assert tiers == {"fav": HOURLY, "new": HOURLY, "hot": HOURLY, "cold": WEEKLY, "flat": WEEKLY, "unseen": DAILY}
+
+    # 처음에는 모두 수집 대상, 성공한 곡만 마지막 수집 시각이 기록된다.
+    assert len(planner.select_due(targets, now)) == 6
+    planner.mark_collected([TierPlanner.key(t) for t in targets if t["song_id"] != "unseen"], now)
+
+    reloaded = TierPlanner(TierPolicy(), tmp_path / "tier_state.json", log_dir)
+    due = lambda hours: sorted(t["song_id"] for t in reloaded.select_due(targets, now + timedelta(hours=hours)))
+    assert due(0.5) == ["unseen"]
+    assert due(1) == ["fav", "hot", "new", "unseen"]
+    assert due(24) == ["fav", "hot", "new", "unseen"]
+    assert due(24 * 7) == ["cold", "fav", "flat", "hot", "new", "unseen"]
@@ -0,0 +1,87 @@
+import http.server
+import json
+import threading
+
+from music_metrics_collector import main
+from music_metrics_collector.fetcher import Fetcher
+from music_metrics_collector.models import MetricsResult
+from music_metrics_collector.timing import StageTimings, TIMINGS
+
+
+def test_histogram_export_is_cumulative():
+    timings = StageTimings()
+    for seconds in (0.002, 0.02, 0.3, 0.3):
+        timings.observe("parse", seconds)
+    text = timings.render_prometheus({"last_run_tracks_success": 4})
+    assert 'music_collector_stage_seconds_bucket{stage="parse",le="0.005"} 1' in text
+    assert 'music_collector_stage_seconds_bucket{stage="parse",le="0.5"} 4' in text
+    assert 'music_collector_stage_seconds_bucket{stage="parse",le="+Inf"} 4' in text
+    assert 'music_collector_stage_seconds_count{stage="parse"} 4' in text
+    assert "music_collector_last_run_tracks_success 4" in text
+    assert timings.summary()[0]["p50_ms"] == 25.0
+
+    with timings.track() as stages:
+        timings.observe("write", 0.01)
+        timings.observe("write", 0.01)
+    assert stages["write"] == 0.02
+    assert "track_total" in stages
+    # 곡 구간 밖의 관측은 곡별 시간에 섞이지 않는다.
+    timings.observe("write", 1.0)
+    assert stages["write"] == 0.02
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = b"<html>ok</html>"
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_fetcher_splits_http_stages_and_reuses_connection():
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://localhost:{server.server_address[1]}/"
+    try:
+        with Fetcher(mode="requests") as fetcher:
+            with TIMINGS.track() as first:
+                assert fetcher.fetch_html(url) == "<html>ok</html>"
+            with TIMINGS.track() as second:
+                fetcher.fetch_html(url)
+    finally:
+        server.shutdown()
+    assert {"http_dns", "http_connect", "http_ttfb", "http_download"} <= set(first)
+    # 두 번째 요청은 연결을 재사용한다.
+    assert "http_connect" not in second and "http_ttfb" in second
+
+
+class _Collector:
+    def collect(self, track_info, **kwargs):
+        return MetricsResult(total_listeners=1), None, None, None
+
+
+def test_collect_exports_prometheus_and_track_timings(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setattr(main.CollectorFactory, "create", classmethod(lambda cls, platform, fetcher: _Collector()))
+    config = {
+        "enabled_platforms": ["GENIE"],
+        "mode": "requests",
+        "log": {"base_dir": str(tmp_path / "logs")},
+        "state": {"dir": str(tmp_path / "state")},
+        "metrics": {"track_timings": True},
+    }
+    targets = [{"platform": "GENIE", "song_id": str(i), "song_data": {}} for i in range(3)]
+    main.collect_metrics(config, targets=targets)
+
+    prom = (tmp_path / "state" / "collector.prom").read_text()
+    assert 'stage="write"' in prom and 'stage="track_total"' in prom
+    assert "music_collector_last_run_tracks_success 3" in prom
+    lines = [json.loads(line) for line in next((tmp_path / "state" / "timings").glob("*.jsonl")).read_text().splitlines()]
+    assert [line["track"] for line in lines] == ["GENIE:0", "GENIE:1", "GENIE:2"]
+    assert all(line["status"] == "success" and "write" in line["stages_ms"] for line in lines)
@@ -37,3 +37,45 @@ def test_normalize_basic():
     assert "timestamp" in df_norm.columns
 
 
+
+def test_normalize_keeps_last_record_and_drops_invalid_timestamp():
+    base = {
+        "platform": "GENIE",
+        "song_name": "A",
+        "artist_name": "AA",
+        "date": "2025-12-17",
+        "hour": 10,
+        "minute": 0,
+        "total_listeners": 50,
+    }
+    df = pd.DataFrame(
+        [
+            {**base, "song_id": "2", "total_plays": 100},
+            {**base, "song_id": "1", "total_plays": 10},
+            {**base, "song_id": "2", "total_plays": 150},
+            {**base, "song_id": "1", "hour": 25, "total_plays": 20},
+        ]
+    )
+
+    df_norm, dup_count = normalize(df)
+    assert dup_count == 1
+    assert list(df_norm["song_id"]) == ["1", "2"]
+    assert list(df_norm["total_plays"]) == [10, 150]
+    assert len(df) == 4
+
+
+def test_duplicates_among_invalid_timestamps_are_counted():
+    base = {"platform": "GENIE", "song_name": "A", "date": "2025-12-17", "minute": 0, "total_plays": 1}
+    df = pd.DataFrame(
+        [
+            {**base, "song_id": "1", "hour": 10},
+            {**base, "song_id": "1", "hour": 25},
+            {**base, "song_id": "1", "hour": 26},
+            {**base, "song_id": "2", "hour": 25},
+        ]
+    )
+
+    df_norm, dup_count = normalize(df)
+    # 파싱에 실패한 행은 제거하지만, 같은 곡의 NaT 행끼리는 이전처럼 중복으로 센다.
+    assert dup_count == 1
+    assert list(df_norm["song_id"]) == ["1"]
@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from chart_maker.metrics import add_metrics
+from chart_maker.trends import TrendEngine, TrendQuery
+
+
+def _daily_frame(plays_by_song, start="2025-12-01"):
+    rows = []
+    for song_id, plays in plays_by_song.items():
+        for i, value in enumerate(plays):
+            rows.append(
+                {
+                    "platform": "GENIE",
+                    "song_id": song_id,
+                    "timestamp": pd.Timestamp(start) + pd.Timedelta(days=i, hours=9),
+                    "total_plays": value,
+                    "total_listeners": value // 10,
+                }
+            )
+    df_metrics, _ = add_metrics(pd.DataFrame(rows))
+    return df_metrics
+
+
+def test_window_sum_and_growth():
+    # 1: 하루 10씩, 2: 첫 주 1씩 이후 하루 5씩
+    df = _daily_frame(
+        {
+            "1": [10 * i for i in range(15)],
+            "2": list(range(8)) + [7 + 5 * i for i in range(1, 8)],
+        }
+    )
+    engine = TrendEngine.build(df)
+
+    sums = dict(zip(engine.index.song_ids, engine.evaluate(TrendQuery("sum", 7))))
+    assert sums == {"1": 70.0, "2": 35.0}
+
+    wow = dict(zip(engine.index.song_ids, engine.evaluate(TrendQuery("wow", 7))))
+    assert wow["1"] == pytest.approx(0.0)
+    assert wow["2"] == pytest.approx(400.0)
+
+    movers = engine.top_movers(TrendQuery("wow", 7), n=1)
+    assert movers["song_id"].tolist() == ["2"]
+
+
+def test_window_longer_than_history_is_nan_for_every_song():
+    engine = TrendEngine.build(_daily_frame({"1": [0, 10, 20], "2": [5, 6, 7]}))
+    assert np.isnan(engine.evaluate(TrendQuery("sum", 7))).all()
+    assert np.isnan(engine.evaluate(TrendQuery("wow", 7))).all()
+    np.testing.assert_allclose(engine.evaluate(TrendQuery("sum", 2)), [20.0, 2.0])
+
+
+def test_as_of_outside_history():
+    engine = TrendEngine.build(_daily_frame({"1": [0, 10, 20], "2": [5, 6, 7]}))
+    # 마지막 날짜 이후는 마지막 값을 그대로 쓴다.
+    np.testing.assert_allclose(engine.evaluate(TrendQuery("sum", 2), as_of="2025-12-20"), [20.0, 2.0])
+    np.testing.assert_allclose(
+        engine.value_at("total_plays", engine._day_number("2025-12-20")), [20.0, 7.0]
+    )
+    # 첫 날짜 이전에는 관측이 없다.
+    assert np.isnan(engine.value_at("total_plays", engine._day_number("2025-11-01"))).all()
+
+
+def test_ewma_matches_pandas_and_snapshot_cache(tmp_path):
+    plays = [0, 5, 12, 30, 31, 50, 80, 81, 90]
+    df = _daily_frame({"1": plays})
+    engine = TrendEngine.build(df)
+
+    expected = pd.Series(plays).diff().dropna().ewm(span=7, adjust=False).mean().iloc[-1]
+    assert engine.evaluate(TrendQuery("ewma", 7))[0] == pytest.approx(expected)
+
+    first = engine.snapshot(cache_dir=tmp_path)
+    assert len(list(tmp_path.glob("trends_*.csv"))) == 1
+
+    cached = TrendEngine.build(df).snapshot(cache_dir=tmp_path)
+    np.testing.assert_allclose(
+        first["ewma7_total_plays"].to_numpy(), cached["ewma7_total_plays"].to_numpy()
+    )
+
+
+def test_parse_query():
+    assert TrendQuery.parse("sum:28").name == "sum28_total_plays"
+    with pytest.raises(ValueError):
+        TrendQuery.parse("median:3")